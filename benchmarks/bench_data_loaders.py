@@ -0,0 +1,17 @@
+"""
+Benchmarks of the supervised data loading utilities.
+"""
+from data_generators import scale_size, synthetic_strings
+from harness import benchmark
+
+from ml_training_base import compute_data_statistics
+
+
+def _statistics_inputs(scale: str) -> dict:
+    return {'data': synthetic_strings(scale_size(scale))}
+
+
+@benchmark('compute_data_statistics', setup=_statistics_inputs, items=lambda inputs: len(inputs['data']))
+def bench_compute_data_statistics(data):
+    statistics = compute_data_statistics(data, label_fn=lambda row: row[:1], max_rows=None)
+    return {'duplicate_rate': statistics.duplicate_rate}
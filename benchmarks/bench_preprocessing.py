@@ -0,0 +1,110 @@
+"""
+Benchmarks of `BaseDataPreprocessor`.
+"""
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from data_generators import scale_size, synthetic_integers, synthetic_strings
+from harness import benchmark
+
+from ml_training_base import BaseDataPreprocessor, PreprocessingCache
+
+_LOGGER = logging.getLogger('benchmarks')
+
+
+def _dedup_inputs(scale: str) -> dict:
+    return {
+        'preprocessor': BaseDataPreprocessor(logger=_LOGGER),
+        'data': synthetic_strings(scale_size(scale))
+    }
+
+
+def _on_disk_inputs(scale: str) -> dict:
+    inputs = _dedup_inputs(scale)
+    inputs['db_path'] = os.path.join(tempfile.mkdtemp(prefix='bench_dedup_'), 'unique_items.db')
+    return inputs
+
+
+def _concatenate_inputs(scale: str) -> dict:
+    data = synthetic_strings(scale_size(scale))
+    half = len(data) // 2
+    return {'preprocessor': BaseDataPreprocessor(logger=_LOGGER), 'dataset_a': data[:half], 'dataset_b': data[half:]}
+
+
+@benchmark('deduplicate_in_memory', setup=_dedup_inputs, items=lambda inputs: len(inputs['data']))
+def bench_deduplicate_in_memory(preprocessor, data):
+    return {'unique_items': len(preprocessor.deduplicate_in_memory(data))}
+
+
+def _array_inputs(kind: str, as_list: bool):
+    def setup(scale: str) -> dict:
+        n = scale_size(scale)
+        if kind == 'int64':
+            data = synthetic_integers(n)
+        elif kind == 'strings':
+            data = np.array(synthetic_strings(n))
+        else:
+            # 2-D rows of 8 float32 features drawn from a small grid, so rows repeat
+            data = synthetic_integers(n).reshape(-1, 1) % np.arange(3, 11) / 4.0
+            data = data.astype(np.float32)
+        # The generic path receives the same values as a list of NumPy scalars (or of row tuples)
+        if as_list:
+            data = list(map(tuple, data.tolist())) if data.ndim == 2 else list(data)
+        return {'preprocessor': BaseDataPreprocessor(logger=_LOGGER), 'data': data}
+
+    return setup
+
+
+# Vectorised NumPy fast paths of `deduplicate_in_memory`, each with its generic (set-based) counterpart
+for _kind in ('int64', 'strings', 'rows'):
+    for _as_list, _suffix in ((False, ''), (True, '_generic')):
+        benchmark(
+            f'deduplicate_in_memory_{_kind}{_suffix}',
+            setup=_array_inputs(_kind, _as_list),
+            items=lambda inputs: len(inputs['data'])
+        )(bench_deduplicate_in_memory)
+
+
+@benchmark('deduplicate_on_disk', setup=_on_disk_inputs, items=lambda inputs: len(inputs['data']), repeat=3)
+def bench_deduplicate_on_disk(preprocessor, data, db_path):
+    return {'unique_items': len(preprocessor.deduplicate_on_disk(data, db_path=db_path, batch_size=10_000))}
+
+
+@benchmark('concatenate_data', setup=_concatenate_inputs,
+           items=lambda inputs: len(inputs['dataset_a']) + len(inputs['dataset_b']))
+def bench_concatenate_data(preprocessor, dataset_a, dataset_b):
+    preprocessor.concatenate_data(dataset_a, dataset_b)
+
+
+@benchmark('preprocessing_pipeline', setup=_dedup_inputs, items=lambda inputs: len(inputs['data']))
+def bench_preprocessing_pipeline(preprocessor, data):
+    counts = (
+        preprocessor.pipeline(data)
+        .map(str.strip)
+        .filter(bool)
+        .deduplicate()
+        .split({'train': 0.8, 'valid': 0.1, 'test': 0.1})
+        .run()
+    )
+    return {'unique_items': sum(counts.values())}
+
+
+def _memoised_inputs(scale: str) -> dict:
+    inputs = _dedup_inputs(scale)
+    cache = PreprocessingCache(os.path.join(tempfile.mkdtemp(prefix='bench_cache_'), 'cache.db'), logger=_LOGGER)
+    # Warm the on-disk store with half the items, as after a previous data drop
+    inputs['fn'] = cache.memoise(str.upper, version='1')
+    list(inputs['fn'].map(inputs['data'][:len(inputs['data']) // 2]))
+    cache._memory.clear()
+    inputs['cache'] = cache
+    return inputs
+
+
+@benchmark('memoised_map', setup=_memoised_inputs, items=lambda inputs: len(inputs['data']), repeat=3)
+def bench_memoised_map(preprocessor, data, fn, cache):
+    counts = preprocessor.pipeline(data).map(fn).run()
+    cache.close()
+    return {'hit_rate': cache.stats.hit_rate, 'unique_items': counts['all']}
@@ -0,0 +1,66 @@
+"""
+Benchmarks of trainer startup: loading the config, configuring the logger and
+setting up the training environment, before any data or model work.
+"""
+import logging
+import os
+import tempfile
+
+import yaml
+
+from harness import benchmark
+
+from ml_training_base import (
+    BaseKerasSupervisedTrainer,
+    BasePyTorchSupervisedTrainer,
+    KerasTrainingEnvironment,
+    PyTorchTrainingEnvironment
+)
+
+
+class _StartupKerasTrainer(BaseKerasSupervisedTrainer):
+    def _setup_data(self):
+        pass
+
+    def _setup_model(self):
+        pass
+
+
+class _StartupPyTorchTrainer(BasePyTorchSupervisedTrainer):
+    def _setup_data(self):
+        pass
+
+    def _setup_model(self):
+        pass
+
+
+def _trainer_inputs(scale: str) -> dict:
+    output_dir = tempfile.mkdtemp(prefix='bench_trainer_')
+    config = {
+        'data': {'logger_path': os.path.join(output_dir, 'logs', 'train.log'), 'batch_size': 32},
+        'determinism': {'python_seed': 0, 'random_seed': 42, 'numpy_seed': 42, 'tf_seed': 42, 'torch_seed': 42},
+        'training': {'epochs': 1, 'model_save_dir': os.path.join(output_dir, 'model')}
+    }
+    config_path = os.path.join(output_dir, 'config.yaml')
+    with open(config_path, 'w') as file:
+        yaml.safe_dump(config, file)
+
+    return {'config_path': config_path}
+
+
+@benchmark('pytorch_trainer_startup', setup=_trainer_inputs)
+def bench_pytorch_trainer_startup(config_path):
+    trainer = _StartupPyTorchTrainer(
+        config_path=config_path,
+        training_env=PyTorchTrainingEnvironment(logger=logging.getLogger('benchmarks'))
+    )
+    trainer._setup_environment()
+
+
+@benchmark('keras_trainer_startup', setup=_trainer_inputs)
+def bench_keras_trainer_startup(config_path):
+    trainer = _StartupKerasTrainer(
+        config_path=config_path,
+        training_env=KerasTrainingEnvironment(logger=logging.getLogger('benchmarks'))
+    )
+    trainer._setup_environment()
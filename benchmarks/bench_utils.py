@@ -0,0 +1,68 @@
+"""
+Benchmarks of the utility functions and of the package import time.
+"""
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+
+import yaml
+
+from data_generators import scale_size, synthetic_config, synthetic_strings
+from harness import benchmark
+
+from ml_training_base import configure_logger, load_config, write_strings_to_file
+
+_LOGGER = logging.getLogger('benchmarks')
+
+# Calls per run of the benchmarks of fast functions, at each scale
+_CALLS = {'small': 100, 'medium': 1_000, 'large': 10_000}
+
+
+def _write_inputs(scale: str) -> dict:
+    return {
+        'file_path': os.path.join(tempfile.mkdtemp(prefix='bench_write_'), 'lines.txt'),
+        'str_list': synthetic_strings(scale_size(scale)),
+        'logger': _LOGGER,
+        'log_interval': 100_000
+    }
+
+
+def _config_inputs(scale: str) -> dict:
+    config_path = os.path.join(tempfile.mkdtemp(prefix='bench_config_'), 'config.yaml')
+    with open(config_path, 'w') as file:
+        yaml.safe_dump(synthetic_config(), file)
+
+    return {'config_path': config_path, 'calls': _CALLS[scale] // 10}
+
+
+def _logger_inputs(scale: str) -> dict:
+    log_dir = tempfile.mkdtemp(prefix='bench_logger_')
+    return {'log_paths': [os.path.join(log_dir, f"run_{index % 2}.log") for index in range(_CALLS[scale])]}
+
+
+@benchmark('write_strings_to_file', setup=_write_inputs, items=lambda inputs: len(inputs['str_list']))
+def bench_write_strings_to_file(file_path, str_list, logger, log_interval):
+    write_strings_to_file(file_path, str_list, logger, log_interval=log_interval)
+
+
+@benchmark('load_config', setup=_config_inputs, items=lambda inputs: inputs['calls'])
+def bench_load_config(config_path, calls):
+    for _ in range(calls):
+        load_config(config_path)
+
+
+@benchmark('configure_logger', setup=_logger_inputs, items=lambda inputs: len(inputs['log_paths']))
+def bench_configure_logger(log_paths):
+    # Alternating paths exercises re-pointing the file handler, as in sweeps
+    for log_path in log_paths:
+        configure_logger(log_path)
+
+
+@benchmark('import_time', setup=lambda scale: {}, repeat=3)
+def bench_import_time():
+    """
+    Import the package in a fresh interpreter, including TensorFlow and PyTorch.
+    """
+    subprocess.run([sys.executable, '-c', 'import ml_training_base'], check=True, capture_output=True)
@@ -0,0 +1,83 @@
+"""
+Synthetic data generators for the benchmark suite, at several scales.
+"""
+from typing import List
+
+import numpy as np
+
+# The number of items generated at each scale
+SCALES = {
+    'small': 10_000,
+    'medium': 100_000,
+    'large': 1_000_000
+}
+
+# SMILES-like alphabet, so string lengths and hashing costs resemble reaction datasets
+_ALPHABET = np.array(list('CCCCNNOOSPFcn()[]=#123+-@H'))
+
+
+def scale_size(scale: str) -> int:
+    """
+    Return the number of items of a scale.
+    """
+    if scale not in SCALES:
+        raise ValueError(f"Unknown scale '{scale}'. Expected one of {sorted(SCALES)}.")
+
+    return SCALES[scale]
+
+
+def synthetic_strings(n: int, duplicate_fraction: float = 0.3, length: int = 48, seed: int = 0) -> List[str]:
+    """
+    Generate `n` random strings of which about `duplicate_fraction` repeat earlier strings.
+
+    Parameters
+    ----------
+    n : int
+        The number of strings.
+    duplicate_fraction : float, optional
+        The fraction of strings that duplicate another string (default 0.3).
+    length : int, optional
+        The length of every string (default 48).
+    seed : int, optional
+        The random seed (default 0).
+
+    Returns
+    -------
+    List[str]
+        The strings, in random order.
+    """
+    rng = np.random.default_rng(seed)
+    num_unique = max(1, int(n * (1 - duplicate_fraction)))
+    characters = rng.choice(_ALPHABET, size=(num_unique, length))
+    unique = np.ascontiguousarray(characters).view(f'<U{length}').ravel()
+
+    strings = np.concatenate([unique, rng.choice(unique, size=n - num_unique)])
+    rng.shuffle(strings)
+
+    return strings.tolist()
+
+
+def synthetic_integers(n: int, duplicate_fraction: float = 0.3, seed: int = 0) -> np.ndarray:
+    """
+    Generate `n` random int64 values of which about `duplicate_fraction` repeat earlier values.
+    """
+    rng = np.random.default_rng(seed)
+    num_unique = max(1, int(n * (1 - duplicate_fraction)))
+    unique = rng.choice(np.iinfo(np.int64).max, size=num_unique, replace=False)
+    values = np.concatenate([unique, rng.choice(unique, size=n - num_unique)])
+    rng.shuffle(values)
+
+    return values
+
+
+def synthetic_config(num_sections: int = 8, keys_per_section: int = 16) -> dict:
+    """
+    Generate a nested training config with numeric, string and list values.
+    """
+    return {
+        f"section_{section}": {
+            f"key_{key}": [key, f"value_{key}", key * 0.5] if key % 3 == 0 else f"value_{section}_{key}"
+            for key in range(keys_per_section)
+        }
+        for section in range(num_sections)
+    }
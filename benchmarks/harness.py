@@ -0,0 +1,225 @@
+"""
+A minimal benchmark harness: a registry of benchmarks, timing and peak memory
+measurement, JSON results, and comparison against a stored baseline.
+"""
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ml_training_base.utils.memory_utils import PeakRSSMonitor, current_rss_bytes
+
+# Metrics where a higher value is better; for all other metrics lower is better
+HIGHER_IS_BETTER = {'throughput_per_second'}
+
+_REGISTRY: List['Benchmark'] = []
+
+
+@dataclass
+class Benchmark:
+    """
+    A registered benchmark.
+
+    Attributes
+    ----------
+    name : str
+        The benchmark name, unique within the suite.
+    setup : Callable[[str], Dict[str, Any]]
+        Builds the benchmark's inputs for a scale. Not timed.
+    run : Callable[..., Any]
+        The timed function, called with the inputs returned by `setup`.
+    items : Callable[[Dict[str, Any]], int]
+        The number of items processed per run, used to compute throughput.
+    repeat : int
+        The number of timed runs.
+    """
+    name: str
+    setup: Callable[[str], Dict[str, Any]]
+    run: Callable[..., Any]
+    items: Callable[[Dict[str, Any]], int]
+    repeat: int = 5
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    The measurements of a benchmark at one scale.
+    """
+    name: str
+    scale: str
+    items: int
+    median_seconds: float
+    min_seconds: float
+    throughput_per_second: float
+    peak_rss_increase_mb: float
+    peak_traced_mb: float
+    extra: Dict[str, float] = field(default_factory=dict)
+
+
+def benchmark(
+    name: str,
+    setup: Callable[[str], Dict[str, Any]],
+    items: Callable[[Dict[str, Any]], int] = lambda inputs: 1,
+    repeat: int = 5
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Register the decorated function as a benchmark.
+
+    Parameters
+    ----------
+    name : str
+        The benchmark name.
+    setup : Callable[[str], Dict[str, Any]]
+        Builds the keyword arguments of the benchmark for a scale.
+    items : Callable[[Dict[str, Any]], int], optional
+        The number of items processed per run (default 1).
+    repeat : int, optional
+        The number of timed runs (default 5).
+    """
+    def register(fn: Callable[..., Any]) -> Callable[..., Any]:
+        _REGISTRY.append(Benchmark(name=name, setup=setup, run=fn, items=items, repeat=repeat))
+        return fn
+
+    return register
+
+
+def registered_benchmarks() -> List[Benchmark]:
+    """
+    Return every registered benchmark, in registration order.
+    """
+    return list(_REGISTRY)
+
+
+def run_benchmark(bench: Benchmark, scale: str, repeat: Optional[int] = None) -> BenchmarkResult:
+    """
+    Time a benchmark at a scale and measure its peak memory.
+
+    Every run gets fresh inputs from `setup`, so benchmarks may consume or
+    modify them. Two memory measures are reported: the largest increase in
+    the process RSS over a timed run (which includes native allocations but
+    is blurred by allocator reuse), and the peak of Python allocations traced
+    by `tracemalloc` in one additional, untimed run.
+    """
+    timings = []
+    peak_rss_increase = 0
+    extra: Dict[str, float] = {}
+    for _ in range(repeat or bench.repeat):
+        inputs = bench.setup(scale)
+        gc.collect()
+        start_rss = current_rss_bytes()
+        with PeakRSSMonitor() as monitor:
+            start = time.perf_counter()
+            output = bench.run(**inputs)
+            timings.append(time.perf_counter() - start)
+        peak_rss_increase = max(peak_rss_increase, monitor.peak_bytes - start_rss)
+        if isinstance(output, dict):
+            extra = {key: float(value) for key, value in output.items()}
+
+    items = bench.items(inputs)
+    del inputs
+
+    traced_inputs = bench.setup(scale)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        bench.run(**traced_inputs)
+        _, peak_traced = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median_seconds = statistics.median(timings)
+
+    return BenchmarkResult(
+        name=bench.name,
+        scale=scale,
+        items=items,
+        median_seconds=median_seconds,
+        min_seconds=min(timings),
+        throughput_per_second=items / median_seconds if median_seconds > 0 else float('inf'),
+        peak_rss_increase_mb=peak_rss_increase / 2 ** 20,
+        peak_traced_mb=peak_traced / 2 ** 20,
+        extra=extra
+    )
+
+
+def environment_info() -> Dict[str, Any]:
+    """
+    Describe the host and interpreter, so results are only compared like-for-like.
+    """
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor()
+    }
+
+
+def save_results(results: List[BenchmarkResult], path: str) -> None:
+    """
+    Write benchmark results and the environment to a JSON file.
+    """
+    with open(path, 'w') as file:
+        json.dump({'environment': environment_info(), 'results': [asdict(result) for result in results]}, file,
+                  indent=2)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load benchmark results from a JSON file, keyed by `'<name>[<scale>]'`.
+    """
+    with open(path, 'r') as file:
+        results = json.load(file)['results']
+
+    return {f"{result['name']}[{result['scale']}]": result for result in results}
+
+
+def compare_to_baseline(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Dict[str, Any]],
+    thresholds: Dict[str, float]
+) -> List[str]:
+    """
+    Compare results against a baseline and describe every regression.
+
+    Parameters
+    ----------
+    results : List[BenchmarkResult]
+        The current results.
+    baseline : Dict[str, Dict[str, Any]]
+        The baseline results, as returned by `load_results`.
+    thresholds : Dict[str, float]
+        The tolerated relative regression of each compared metric, e.g.
+        `{'median_seconds': 0.2}` fails if a benchmark is more than 20% slower.
+
+    Returns
+    -------
+    List[str]
+        One message per regression (empty if none).
+    """
+    regressions = []
+    for result in results:
+        key = f"{result.name}[{result.scale}]"
+        if key not in baseline:
+            continue
+
+        current = asdict(result)
+        for metric, threshold in thresholds.items():
+            if metric not in current or metric not in baseline[key]:
+                continue
+            value, reference = current[metric], baseline[key][metric]
+            if reference <= 0:
+                continue
+
+            change = (value - reference) / reference
+            regressed = change < -threshold if metric in HIGHER_IS_BETTER else change > threshold
+            if regressed:
+                regressions.append(
+                    f"{key}: {metric} {value:.4g} vs baseline {reference:.4g} ({change:+.1%}, threshold {threshold:.0%})"
+                )
+
+    return regressions
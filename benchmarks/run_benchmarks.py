@@ -0,0 +1,116 @@
+"""
+Run the benchmark suite, save the results as JSON, and compare them against a baseline.
+
+Examples
+--------
+Record a baseline on a benchmark host:
+
+    python benchmarks/run_benchmarks.py --scales small medium --save-baseline benchmarks/baselines/host.json
+
+Check for regressions against it (exits with status 1 on a regression):
+
+    python benchmarks/run_benchmarks.py --scales small medium --baseline benchmarks/baselines/host.json
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import sys
+from typing import List
+
+from data_generators import SCALES
+from harness import (
+    BenchmarkResult,
+    compare_to_baseline,
+    environment_info,
+    load_results,
+    registered_benchmarks,
+    run_benchmark,
+    save_results
+)
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Benchmarks whose cost does not depend on the data scale, run once at the smallest requested scale
+SCALE_INDEPENDENT = {'import_time', 'pytorch_trainer_startup', 'keras_trainer_startup'}
+
+
+def _import_benchmark_modules() -> None:
+    for file_name in sorted(os.listdir(BENCHMARK_DIR)):
+        if file_name.startswith('bench_') and file_name.endswith('.py'):
+            importlib.import_module(file_name[:-3])
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', nargs='+', default=['small'], choices=list(SCALES),
+                        help="Data scales to run (default: small).")
+    parser.add_argument('--filter', default=None, help="Only run benchmarks whose name contains this string.")
+    parser.add_argument('--repeat', type=int, default=None, help="Override the number of timed runs per benchmark.")
+    parser.add_argument('--output', default=os.path.join(BENCHMARK_DIR, 'results', 'latest.json'),
+                        help="Where to write the results (default: benchmarks/results/latest.json).")
+    parser.add_argument('--baseline', default=None, help="A baseline results file to compare against.")
+    parser.add_argument('--save-baseline', default=None, help="Also write the results to this baseline file.")
+    parser.add_argument('--time-threshold', type=float, default=0.25,
+                        help="Tolerated relative increase in median time / decrease in throughput (default 0.25).")
+    parser.add_argument('--memory-threshold', type=float, default=0.25,
+                        help="Tolerated relative increase in peak traced memory (default 0.25).")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = _parse_args(argv)
+    logging.getLogger('benchmarks').setLevel(logging.WARNING)
+    _import_benchmark_modules()
+
+    results: List[BenchmarkResult] = []
+    for bench in registered_benchmarks():
+        if args.filter and args.filter not in bench.name:
+            continue
+        scales = args.scales[:1] if bench.name in SCALE_INDEPENDENT else args.scales
+        for scale in scales:
+            result = run_benchmark(bench, scale, repeat=args.repeat)
+            results.append(result)
+            print(
+                f"{result.name}[{result.scale}]: median {result.median_seconds * 1e3:.2f} ms, "
+                f"{result.throughput_per_second:,.0f} items/s, peak RSS +{result.peak_rss_increase_mb:.1f} MiB, "
+                f"peak traced {result.peak_traced_mb:.1f} MiB"
+            )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    save_results(results, args.output)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        save_results(results, args.save_baseline)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline_environment = json.load(file).get('environment', {})
+        if baseline_environment != environment_info():
+            print("Warning: the baseline was recorded on a different environment; comparisons may be unreliable.")
+
+        regressions = compare_to_baseline(
+            results,
+            load_results(args.baseline),
+            thresholds={
+                'median_seconds': args.time_threshold,
+                'throughput_per_second': args.time_threshold,
+                'peak_traced_mb': args.memory_threshold
+            }
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against the baseline.")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
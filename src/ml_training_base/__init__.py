@@ -2,8 +2,30 @@
 ml-training-base: A Python package providing base classes and utilities for machine learning projects
 """
 from ml_training_base.data.preprocessing.base_data_preprocessors import BaseDataPreprocessor
+from ml_training_base.data.preprocessing.preprocessing_cache import MemoisedFunction, PreprocessingCache
+from ml_training_base.data.preprocessing.preprocessing_pipeline import PreprocessingPipeline, StageStats
+
+from ml_training_base.supervised.checkpoints.async_checkpoint_manager import (
+    AsyncCheckpointManager,
+    AsyncModelCheckpoint
+)
+from ml_training_base.supervised.checkpoints.training_state import BackupAndRestoreWithRngState
 
 from ml_training_base.supervised.data.base_supervised_data_loader import BaseSupervisedDataLoader
+from ml_training_base.supervised.data.bucketing import LengthBucketBatchSampler, bucket_tf_dataset
+from ml_training_base.supervised.data.data_validation import (
+    DataStatistics,
+    DataValidationError,
+    HyperLogLog,
+    compute_data_statistics
+)
+from ml_training_base.supervised.data.pytorch_data_loaders import (
+    SharedArrayDataset,
+    build_data_loader,
+    autotune_num_workers
+)
+
+from ml_training_base.supervised.distributed.pytorch_distributed import launch_distributed
 
 from ml_training_base.supervised.environments.base_training_environments import (
     BaseTrainingEnvironment,
@@ -11,6 +33,24 @@ from ml_training_base.supervised.environments.base_training_environments import
     PyTorchTrainingEnvironment
 )
 
+from ml_training_base.supervised.evaluation.streaming_evaluation import NpyStreamWriter, StreamingEvaluator
+
+from ml_training_base.supervised.export.model_export import (
+    benchmark_latency,
+    export_saved_model,
+    export_torch_program,
+    export_torchscript
+)
+
+from ml_training_base.supervised.memory.activation_checkpointing import (
+    checkpoint_keras_layers,
+    checkpoint_torch_modules
+)
+from ml_training_base.supervised.memory.memory_budget import find_max_batch_size
+
+from ml_training_base.supervised.sweeps.sweep_runner import SweepRunner, grid_trials
+from ml_training_base.supervised.sweeps.trial_schedulers import AsyncSuccessiveHalving, MedianStoppingRule
+
 from ml_training_base.supervised.trainers.base_supervised_trainers import (
     BaseSupervisedTrainer,
     BaseKerasSupervisedTrainer,
@@ -19,27 +59,89 @@ from ml_training_base.supervised.trainers.base_supervised_trainers import (
 
 from ml_training_base.utils.config_utils import load_config
 from ml_training_base.utils.files_utils import write_strings_to_file
+from ml_training_base.utils.hardware_utils import probe_hardware, recommend_settings
 from ml_training_base.utils.logging_utils import configure_logger
+from ml_training_base.utils.memory_utils import EpochMemoryStats, MemoryMonitor, PeakRSSMonitor
+from ml_training_base.utils.resource_utils import ResourceSampler, ResourceSummary
+from ml_training_base.utils.shared_memory_utils import SharedArrayDescriptor, SharedArrayStore, attach_arrays
 
 __all__ = [
     # Public Data Preprocessing Classes
     "BaseDataPreprocessor",
+    "MemoisedFunction",
+    "PreprocessingCache",
+    "PreprocessingPipeline",
+    "StageStats",
+
+    # Public Checkpointing Classes
+    "AsyncCheckpointManager",
+    "AsyncModelCheckpoint",
+    "BackupAndRestoreWithRngState",
 
     # Public Data Loader Classes
     "BaseSupervisedDataLoader",
+    "DataStatistics",
+    "DataValidationError",
+    "HyperLogLog",
+    "LengthBucketBatchSampler",
+    "SharedArrayDataset",
+
+    # Public Data Loader Functions
+    "build_data_loader",
+    "autotune_num_workers",
+    "bucket_tf_dataset",
+    "compute_data_statistics",
+
+    # Public Distributed Training Functions
+    "launch_distributed",
 
     # Public Environment Classes
     "BaseTrainingEnvironment",
     "KerasTrainingEnvironment",
     "PyTorchTrainingEnvironment",
 
+    # Public Evaluation Classes
+    "NpyStreamWriter",
+    "StreamingEvaluator",
+
+    # Public Export Functions
+    "benchmark_latency",
+    "export_saved_model",
+    "export_torch_program",
+    "export_torchscript",
+
+    # Public Memory Functions
+    "checkpoint_keras_layers",
+    "checkpoint_torch_modules",
+    "find_max_batch_size",
+
+    # Public Sweep Classes
+    "SweepRunner",
+    "AsyncSuccessiveHalving",
+    "MedianStoppingRule",
+
+    # Public Sweep Functions
+    "grid_trials",
+
     # Public Trainer Classes
     "BaseSupervisedTrainer",
     "BaseKerasSupervisedTrainer",
     "BasePyTorchSupervisedTrainer",
 
+    # Public Utility Classes
+    "PeakRSSMonitor",
+    "MemoryMonitor",
+    "EpochMemoryStats",
+    "ResourceSampler",
+    "ResourceSummary",
+    "SharedArrayDescriptor",
+    "SharedArrayStore",
+
     # Public Utility Functions
     "load_config",
     "write_strings_to_file",
-    "configure_logger"
+    "probe_hardware",
+    "recommend_settings",
+    "configure_logger",
+    "attach_arrays"
 ]
@@ -1,9 +1,25 @@
+import os
+import re
 import sqlite3
 import logging
-from typing import List, Optional, TypeVar, Generic
+from typing import Any, Dict, Iterable, List, Optional, TypeVar, Generic, Union
+
+import numpy as np
+
+from ml_training_base.data.preprocessing.preprocessing_pipeline import (
+    PreprocessingPipeline,
+    assign_split,
+    split_boundaries
+)
 
 T = TypeVar('T')
 
+# Shards are named `part-<index>.txt`, so their lexical order is their append order
+SHARD_NAME_PATTERN = re.compile(r'^part-(\d{5,})\.txt$')
+
+# Rows hashed per block, so the columns of a block stay in the CPU cache
+_HASH_BLOCK_ROWS = 65536
+
 
 class BaseDataPreprocessor(Generic[T]):
     """
@@ -13,6 +29,26 @@ class BaseDataPreprocessor(Generic[T]):
     def __init__(self, logger: Optional[logging.Logger] = None):
         self._logger = logger if logger else logging.getLogger(__name__)
 
+    def pipeline(self, source: Union[str, os.PathLike, Iterable[T]]) -> PreprocessingPipeline[T]:
+        """
+        Start a lazy preprocessing pipeline reading from `source`.
+
+        The streaming alternative to chaining the helpers below by hand: the
+        stages of the returned `PreprocessingPipeline` process items one at a
+        time instead of materialising a list between every step.
+
+        Parameters
+        ----------
+        source : str, os.PathLike or Iterable[T]
+            A text file, read line by line, or an iterable of items.
+
+        Returns
+        -------
+        PreprocessingPipeline[T]
+            A pipeline sharing this preprocessor's logger.
+        """
+        return PreprocessingPipeline[T](logger=self._logger).read(source)
+
     def concatenate_data(self, dataset_a: List[T], dataset_b: List[T]) -> List[T]:
         """
         Concatenates two lists of the same generic type.
@@ -37,31 +73,55 @@ class BaseDataPreprocessor(Generic[T]):
 
         return dataset_a
 
-    def deduplicate_in_memory(self, data: List[T], content_name: str = "items") -> List[T]:
+    def deduplicate_in_memory(
+        self,
+        data: Union[List[T], np.ndarray, Any],
+        content_name: str = "items"
+    ) -> Union[List[T], np.ndarray, Any]:
         """
-        Deduplicates a list of items using an in-memory set.
+        Deduplicates items in memory, keeping the first occurrence of each.
 
-        This method is fully generic and works with any hashable data type.
+        Lists (and any other iterable of hashable items) are deduplicated
+        with an in-memory set. Arrays take vectorised fast paths instead:
+
+        * 1-D numeric, boolean and datetime arrays use `np.unique` with
+          `return_index`. NaNs are treated as equal to each other.
+        * 1-D fixed-width string (`U`) and bytes (`S`) arrays, and 2-D (or
+          higher) arrays, whose rows are deduplicated, are viewed as rows of
+          64-bit words, hashed, and deduplicated by hash. Rows sharing a
+          hash are compared in full, so hash collisions cannot drop distinct
+          items. Floating-point rows are compared by value, except that NaNs
+          with the same bit pattern are equal.
+        * Object arrays are deduplicated with a dict of first indices.
+        * Arrow arrays and chunked arrays use `pyarrow.compute.unique`,
+          which keeps values in order of first appearance.
 
         Parameters
         ----------
-        data : List[T]
-            The list of items to deduplicate.
+        data : List[T], np.ndarray or pyarrow.Array
+            The items to deduplicate.
         content_name : str, optional
             A descriptive name for the items being processed, for logging.
 
         Returns
         -------
-        List[T]
-            A list containing only the unique items from the input data.
+        List[T], np.ndarray or pyarrow.Array
+            The unique items in order of first occurrence, of the same type
+            as `data` (a list for generic iterables).
         """
         self._logger.info(f"Starting in-memory deduplication for {len(data)} {content_name}.")
-        seen = set()
-        unique_items = []
-        for item in data:
-            if item not in seen:
-                seen.add(item)
-                unique_items.append(item)
+        if isinstance(data, np.ndarray):
+            unique_items = data[_first_occurrence_indices(data)] if len(data) else data
+        elif type(data).__module__.startswith('pyarrow'):
+            import pyarrow.compute as pc
+            unique_items = pc.unique(data)
+        else:
+            seen = set()
+            unique_items = []
+            for item in data:
+                if item not in seen:
+                    seen.add(item)
+                    unique_items.append(item)
         self._logger.info(f"Deduplication completed. Found {len(unique_items)} unique {content_name}.")
 
         return unique_items
@@ -139,6 +199,219 @@ class BaseDataPreprocessor(Generic[T]):
 
         return self._extract_from_db(db_path=db_path, content_name=content_name)
 
+    def deduplicate_new_on_disk(
+        self,
+        data: List[T],
+        db_path: str = 'unique_items.db',
+        content_name: str = "items",
+        batch_size: int = 1000
+    ) -> List[T]:
+        """
+        Adds new items to the unique-item store and returns only those items.
+
+        The incremental counterpart of `deduplicate_on_disk`, using the same
+        SQLite store: items already in the store (from earlier runs) or
+        earlier in `data` are dropped, and the remaining items are inserted.
+        Only the new data is read and returned, so the cost scales with the
+        size of the new data rather than of the store.
+
+        Parameters
+        ----------
+        data : List[T]
+            The new items.
+        db_path : str, optional
+            Path to the SQLite database file of `deduplicate_on_disk`.
+        content_name : str, optional
+            A descriptive name for the items being processed, for logging.
+        batch_size : int, optional
+            The number of items looked up and inserted per transaction.
+
+        Returns
+        -------
+        List[T]
+            The items that were not in the store, in input order, as strings
+            (see the notes of `deduplicate_on_disk`).
+        """
+        self._logger.info(f"Starting incremental SQLite-based deduplication for {len(data)} {content_name}.")
+        conn = sqlite3.connect(db_path)
+        try:
+            new_items = self._insert_new_items(conn, data, batch_size=batch_size, commit_batches=True)
+        finally:
+            conn.close()
+
+        self._logger.info(f"Found {len(new_items)} new unique {content_name}.")
+
+        return new_items
+
+    @staticmethod
+    def _insert_new_items(
+        conn: sqlite3.Connection,
+        data: List[T],
+        batch_size: int,
+        commit_batches: bool
+    ) -> List[T]:
+        """
+        Inserts the items missing from the unique-item store and returns them,
+        committing after every batch or leaving the transaction open for the
+        caller to commit.
+        """
+        new_items: List[T] = []
+        conn.execute("CREATE TABLE IF NOT EXISTS unique_items (item TEXT PRIMARY KEY)")
+        for start in range(0, len(data), batch_size):
+            # Keep the first occurrence of each item within the batch
+            batch = list(dict.fromkeys(str(item) for item in data[start:start + batch_size]))
+            placeholders = ','.join('?' * len(batch))
+            existing = {
+                row[0] for row in conn.execute(
+                    f"SELECT item FROM unique_items WHERE item IN ({placeholders})", batch
+                )
+            }
+            batch_new = [item for item in batch if item not in existing]
+            conn.executemany("INSERT INTO unique_items (item) VALUES (?)", [(item,) for item in batch_new])
+            if commit_batches:
+                conn.commit()
+            new_items.extend(batch_new)
+
+        return new_items
+
+    def write_split_shards(
+        self,
+        data: List[T],
+        output_dir: str,
+        split_fractions: Dict[str, float],
+        seed: int = 0,
+        content_name: str = "items"
+    ) -> Dict[str, str]:
+        """
+        Assigns items to splits and appends each split's items as a new shard.
+
+        Items are assigned with `assign_split`, the content hash used by
+        `PreprocessingPipeline.split`, so an item always lands in the same
+        split for the same fractions and seed, no matter which batch it
+        arrives in. Each split's items are written to the next
+        `<output_dir>/<split>/part-<index>.txt` shard, leaving the existing
+        shards untouched. Every shard is written to a temporary file first,
+        and they are only renamed once all of them are written, so readers
+        never see a partial shard and a failed write leaves no new shards.
+
+        Parameters
+        ----------
+        data : List[T]
+            The items to append.
+        output_dir : str
+            The dataset directory, with one sub-directory of shards per split.
+        split_fractions : Dict[str, float]
+            The fraction of items in each split, e.g.
+            `{'train': 0.8, 'valid': 0.1, 'test': 0.1}`. Must be the same in
+            every run for consistent assignments.
+        seed : int, optional
+            Salt of the assignment hash (default 0).
+        content_name : str, optional
+            A descriptive name for the items being processed, for logging.
+
+        Returns
+        -------
+        Dict[str, str]
+            The path of the new shard of every split that received items.
+        """
+        split_names = list(split_fractions)
+        boundaries = split_boundaries(split_fractions)
+        salt = str(seed).encode('utf-8')
+        split_items: Dict[str, List[str]] = {split_name: [] for split_name in split_names}
+        for item in data:
+            split_items[assign_split(item, split_names, boundaries, salt)].append(str(item))
+
+        shard_paths = {}
+        try:
+            for split_name, items in split_items.items():
+                if not items:
+                    continue
+                split_dir = os.path.join(output_dir, split_name)
+                os.makedirs(split_dir, exist_ok=True)
+                shard_indices = [int(match.group(1)) for match in
+                                 map(SHARD_NAME_PATTERN.match, os.listdir(split_dir)) if match]
+                shard_path = os.path.join(split_dir, f"part-{max(shard_indices, default=-1) + 1:05d}.txt")
+                shard_paths[split_name] = shard_path
+                with open(f"{shard_path}.tmp", 'w') as file:
+                    file.writelines(f"{item}\n" for item in items)
+        except BaseException:
+            for shard_path in shard_paths.values():
+                if os.path.exists(f"{shard_path}.tmp"):
+                    os.remove(f"{shard_path}.tmp")
+            raise
+
+        for split_name, shard_path in shard_paths.items():
+            os.replace(f"{shard_path}.tmp", shard_path)
+            self._logger.info(f"Wrote {len(split_items[split_name])} {content_name} to new {split_name} shard "
+                              f"{shard_path}.")
+
+        return shard_paths
+
+    def append_to_dataset(
+        self,
+        data: List[T],
+        output_dir: str,
+        split_fractions: Dict[str, float],
+        db_path: str = 'unique_items.db',
+        seed: int = 0,
+        content_name: str = "items",
+        batch_size: int = 1000
+    ) -> Dict[str, str]:
+        """
+        Appends a drop of new records to a sharded dataset.
+
+        Records already in the unique-item store are dropped
+        (as in `deduplicate_new_on_disk`), and the new ones are assigned to
+        splits consistently with earlier drops and written as new shards
+        (`write_split_shards`).
+
+        The new records are inserted into the store in a single transaction
+        that is only committed once the shards are in place, so if writing
+        fails (e.g. the disk is full), the drop can simply be appended again.
+
+        Parameters
+        ----------
+        data : List[T]
+            The new records.
+        output_dir : str
+            The dataset directory, with one sub-directory of shards per split.
+        split_fractions : Dict[str, float]
+            The fraction of items in each split (see `write_split_shards`).
+        db_path : str, optional
+            Path to the SQLite unique-item store.
+        seed : int, optional
+            Salt of the split assignment hash (default 0).
+        content_name : str, optional
+            A descriptive name for the items being processed, for logging.
+        batch_size : int, optional
+            The number of items per database transaction.
+
+        Returns
+        -------
+        Dict[str, str]
+            The path of the new shard of every split that received items.
+        """
+        self._logger.info(f"Appending a drop of {len(data)} {content_name} to {output_dir}.")
+        conn = sqlite3.connect(db_path)
+        try:
+            new_items = self._insert_new_items(conn, data, batch_size=batch_size, commit_batches=False)
+            self._logger.info(f"Found {len(new_items)} new unique {content_name}.")
+            shard_paths = self.write_split_shards(
+                new_items,
+                output_dir=output_dir,
+                split_fractions=split_fractions,
+                seed=seed,
+                content_name=content_name
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        return shard_paths
+
     def _extract_from_db(self, db_path: str, content_name: str = "items") -> List[T]:
         """
         Extracts all unique items from the SQLite database.
@@ -163,3 +436,82 @@ class BaseDataPreprocessor(Generic[T]):
             conn.close()
 
         return unique_items
+
+
+def _first_occurrence_indices(data: np.ndarray) -> np.ndarray:
+    """
+    Return the sorted indices of the first occurrence of every unique
+    element (or row, for arrays with more than one dimension) of an array.
+    """
+    if data.dtype.kind == 'O':
+        first: Dict[Any, int] = {}
+        for index, item in enumerate(data.tolist() if data.ndim == 1 else map(tuple, data.tolist())):
+            first.setdefault(item, index)
+        return np.fromiter(first.values(), dtype=np.intp, count=len(first))
+
+    if data.ndim == 1 and data.dtype.kind in 'biufcmM':
+        _, first = np.unique(data, return_index=True)
+        return np.sort(first)
+
+    rows = data.reshape(len(data), -1)
+    if rows.dtype.kind in 'fc':
+        # Adding zero maps -0.0 to 0.0, so rows are equal by value rather than by sign bit
+        rows = rows + rows.dtype.type(0)
+    elif rows.dtype.kind == 'U':
+        # Narrow UCS-4 code points to the smallest width that holds them (e.g. 1 byte for ASCII),
+        # which shrinks the rows to hash and compare by up to 4x
+        code_points = np.ascontiguousarray(rows).view(np.uint32).reshape(len(rows), -1)
+        max_code_point = int(code_points.max()) if code_points.size else 0
+        rows = code_points.astype(np.uint8 if max_code_point < 2 ** 8 else
+                                  np.uint16 if max_code_point < 2 ** 16 else np.uint32)
+    words = _as_word_rows(rows)
+    hashes = _hash_word_rows(words)
+
+    # Group equal hashes with an unstable sort, and take the smallest index of every group
+    order = np.argsort(hashes)
+    sorted_hashes = hashes[order]
+    is_group_start = np.empty(len(hashes), dtype=bool)
+    is_group_start[0] = True
+    np.not_equal(sorted_hashes[1:], sorted_hashes[:-1], out=is_group_start[1:])
+    first = np.minimum.reduceat(order, np.flatnonzero(is_group_start))
+
+    # Every row whose hash equals that of the previous row in sorted order must also equal it in full
+    continuations = np.flatnonzero(~is_group_start)
+    if continuations.size and np.any(words[order[continuations]] != words[order[continuations - 1]]):
+        # A hash collision between distinct rows: deduplicate by exact byte comparison instead
+        row_bytes = np.ascontiguousarray(words).view(np.dtype((np.void, words.shape[1] * 8))).ravel()
+        _, first = np.unique(row_bytes, return_index=True)
+
+    return np.sort(first)
+
+
+def _as_word_rows(rows: np.ndarray) -> np.ndarray:
+    """
+    View every row of a 2-D array as uint64 words, zero-padding the rows to
+    a multiple of 8 bytes.
+    """
+    row_bytes = np.ascontiguousarray(rows).view(np.uint8).reshape(len(rows), -1)
+    num_words = -(-row_bytes.shape[1] // 8)
+    if row_bytes.shape[1] != num_words * 8:
+        padded = np.zeros((len(rows), num_words * 8), dtype=np.uint8)
+        padded[:, :row_bytes.shape[1]] = row_bytes
+        row_bytes = padded
+
+    return row_bytes.view(np.uint64)
+
+
+def _hash_word_rows(words: np.ndarray) -> np.ndarray:
+    """
+    Hash every row of uint64 words to one uint64, with a multiply-xorshift
+    mix of each word.
+    """
+    multiplier, shift = np.uint64(0x9E3779B97F4A7C15), np.uint64(29)
+    hashes = np.full(len(words), 0xCBF29CE484222325, dtype=np.uint64)
+    for start in range(0, len(words), _HASH_BLOCK_ROWS):
+        block_hashes, block_words = hashes[start:start + _HASH_BLOCK_ROWS], words[start:start + _HASH_BLOCK_ROWS]
+        for column in range(words.shape[1]):
+            block_hashes ^= block_words[:, column]
+            block_hashes *= multiplier
+            block_hashes ^= block_hashes >> shift
+
+    return hashes
@@ -0,0 +1,427 @@
+import pickle
+import sqlite3
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Placeholder for a value that is not cached
+MISSING = object()
+
+# Keys per `IN (...)` query, below SQLite's default limit of bound parameters
+_QUERY_BATCH_SIZE = 500
+
+
+@dataclass
+class CacheStats:
+    """
+    Lookup statistics of a `PreprocessingCache`.
+
+    Attributes
+    ----------
+    memory_hits : int
+        Lookups answered by the in-process LRU.
+    disk_hits : int
+        Lookups answered by the on-disk store.
+    misses : int
+        Lookups whose value had to be computed.
+    evictions : int
+        Entries evicted from the on-disk store to respect its size limit.
+    """
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        """
+        The total number of lookups.
+        """
+        return self.memory_hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of lookups answered from the cache (0 if none).
+        """
+        return (self.memory_hits + self.disk_hits) / self.lookups if self.lookups else 0.0
+
+
+class PreprocessingCache:
+    """
+    A content-addressed memoisation store for pure preprocessing functions.
+
+    Values are stored in a SQLite database, keyed by a digest of the input
+    item together with the function's name and version, so the results of a
+    function survive across runs and only new items (or a new function
+    version) are computed. A bounded in-process LRU answers repeated
+    lookups without touching the database, lookups and inserts are batched
+    into one query per `_QUERY_BATCH_SIZE` keys, and the least recently
+    used entries are evicted once the store exceeds `max_disk_mb`.
+
+    The cache must be used from the process (and thread) that opened it;
+    functions memoised with it can still be computed in worker processes
+    by a `PreprocessingPipeline`.
+
+    Examples
+    --------
+    >>> with PreprocessingCache('var/cache/preprocessing.db', max_disk_mb=1024) as cache:
+    ...     canonicalise_cached = cache.memoise(canonicalise, version='2')
+    ...     pipeline.map(canonicalise_cached, num_workers=4)
+
+    Attributes
+    ----------
+    _db_path : str
+        Path to the SQLite database.
+    _max_memory_items : int
+        The capacity of the in-process LRU.
+    _max_disk_bytes : int or None
+        The size limit of the on-disk store (keys plus values), if any.
+    _memory : OrderedDict
+        The in-process LRU, from digest to value.
+    _disk_bytes : int
+        The current size of the on-disk store.
+    _clock : int
+        A logical clock recording the last access of every entry.
+    _stats : CacheStats
+        The lookup statistics since the cache was opened.
+    """
+    def __init__(
+        self,
+        db_path: str,
+        max_memory_items: int = 100_000,
+        max_disk_mb: Optional[float] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Parameters
+        ----------
+        db_path : str
+            Path to the SQLite database, created if it does not exist.
+        max_memory_items : int, optional
+            The number of values kept in the in-process LRU (default 100,000).
+        max_disk_mb : float, optional
+            The size limit of the on-disk store in MiB. When exceeded, the
+            least recently used entries are evicted down to 90% of the limit.
+            Unlimited by default.
+        logger : logging.Logger, optional
+            Logger for cache statistics.
+        """
+        self._logger = logger if logger else logging.getLogger(__name__)
+        self._db_path = db_path
+        self._max_memory_items = max_memory_items
+        self._max_disk_bytes = int(max_disk_mb * 2 ** 20) if max_disk_mb is not None else None
+        self._memory: 'OrderedDict[bytes, Any]' = OrderedDict()
+        self._stats = CacheStats()
+
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS memo ("
+            "key BLOB PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS memo_last_access ON memo (last_access)")
+        self._conn.commit()
+
+        self._disk_bytes, self._clock = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0), COALESCE(MAX(last_access), 0) FROM memo"
+        ).fetchone()
+
+    def __enter__(self) -> 'PreprocessingCache':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        The lookup statistics since the cache was opened.
+        """
+        return self._stats
+
+    @property
+    def disk_bytes(self) -> int:
+        """
+        The size of the on-disk store (keys plus values) in bytes.
+        """
+        return self._disk_bytes
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM memo").fetchone()[0]
+
+    def memoise(
+        self,
+        fn: Callable[[Any], Any],
+        version: str = '0',
+        name: Optional[str] = None
+    ) -> 'MemoisedFunction':
+        """
+        Wrap a pure function so its results are cached.
+
+        Parameters
+        ----------
+        fn : Callable[[Any], Any]
+            A pure, deterministic function of one item. Its results must be
+            picklable.
+        version : str, optional
+            The version of the function. Change it whenever the function's
+            output changes, so stale results are no longer used.
+        name : str, optional
+            The name under which results are stored (default: the function's
+            module and qualified name). Required for lambdas and local
+            functions, whose qualified names are not unique.
+
+        Returns
+        -------
+        MemoisedFunction
+            The memoised function.
+
+        Raises
+        ------
+        ValueError
+            If `name` is not given for a lambda or local function.
+        """
+        if name is None:
+            qualname = getattr(fn, '__qualname__', type(fn).__name__)
+            if '<lambda>' in qualname or '<locals>' in qualname:
+                raise ValueError(
+                    f"Cannot memoise '{qualname}' without a `name`: lambdas and local functions with the same "
+                    f"qualified name would share cached results."
+                )
+            name = f"{getattr(fn, '__module__', '')}.{qualname}"
+        return MemoisedFunction(fn, self, namespace=f"{name}:{version}".encode('utf-8'))
+
+    def lookup(self, digests: Sequence[bytes]) -> List[Any]:
+        """
+        Look up a batch of digests.
+
+        Parameters
+        ----------
+        digests : Sequence[bytes]
+            The digests to look up.
+
+        Returns
+        -------
+        List[Any]
+            The cached value of every digest, or `MISSING`.
+        """
+        values = [self._memory_get(digest) for digest in digests]
+        self._stats.memory_hits += sum(value is not MISSING for value in values)
+
+        missing = list({digest for digest, value in zip(digests, values) if value is MISSING})
+        found = {}
+        for start in range(0, len(missing), _QUERY_BATCH_SIZE):
+            batch = missing[start:start + _QUERY_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(f"SELECT key, value FROM memo WHERE key IN ({placeholders})", batch).fetchall()
+            found.update((key, pickle.loads(value)) for key, value in rows)
+
+        if found:
+            self._clock += 1
+            self._conn.executemany(
+                "UPDATE memo SET last_access = ? WHERE key = ?", [(self._clock, key) for key in found]
+            )
+            for digest, value in found.items():
+                self._memory_put(digest, value)
+
+        for index, digest in enumerate(digests):
+            if values[index] is MISSING and digest in found:
+                values[index] = found[digest]
+                self._stats.disk_hits += 1
+            elif values[index] is MISSING:
+                self._stats.misses += 1
+
+        return values
+
+    def store(self, digests: Sequence[bytes], values: Sequence[Any]):
+        """
+        Store a batch of computed values, evicting old entries if the store
+        exceeds its size limit.
+
+        Parameters
+        ----------
+        digests : Sequence[bytes]
+            The digests of the items.
+        values : Sequence[Any]
+            The computed values.
+        """
+        self._clock += 1
+        rows = {}
+        for digest, value in zip(digests, values):
+            self._memory_put(digest, value)
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows[digest] = (digest, blob, len(digest) + len(blob), self._clock)
+
+        if rows:
+            keys = list(rows)
+            for start in range(0, len(keys), _QUERY_BATCH_SIZE):
+                batch = keys[start:start + _QUERY_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                self._disk_bytes -= self._conn.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM memo WHERE key IN ({placeholders})", batch
+                ).fetchone()[0]
+            self._conn.executemany("INSERT OR REPLACE INTO memo VALUES (?, ?, ?, ?)", rows.values())
+            self._disk_bytes += sum(row[2] for row in rows.values())
+
+        if self._max_disk_bytes is not None and self._disk_bytes > self._max_disk_bytes:
+            self._evict(target_bytes=int(0.9 * self._max_disk_bytes))
+        self._conn.commit()
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        self._memory.clear()
+        self._conn.execute("DELETE FROM memo")
+        self._conn.commit()
+        self._disk_bytes = 0
+
+    def close(self):
+        """
+        Commit pending access times, log the statistics and close the database.
+        """
+        self._conn.commit()
+        self._conn.close()
+        self._logger.info(
+            f"Preprocessing cache: {self._stats.lookups} lookups, hit rate {self._stats.hit_rate:.1%} "
+            f"({self._stats.memory_hits} memory, {self._stats.disk_hits} disk, {self._stats.misses} misses), "
+            f"{self._stats.evictions} evictions, {self._disk_bytes / 2 ** 20:.1f} MiB on disk."
+        )
+
+    def _memory_get(self, digest: bytes) -> Any:
+        value = self._memory.get(digest, MISSING)
+        if value is not MISSING:
+            self._memory.move_to_end(digest)
+        return value
+
+    def _memory_put(self, digest: bytes, value: Any):
+        self._memory[digest] = value
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self._max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict(self, target_bytes: int):
+        """
+        Delete the least recently used entries until the store is no larger
+        than `target_bytes`.
+        """
+        cursor = self._conn.execute("SELECT key, size FROM memo ORDER BY last_access")
+        evicted = []
+        while self._disk_bytes > target_bytes:
+            rows = cursor.fetchmany(_QUERY_BATCH_SIZE)
+            if not rows:
+                break
+            for key, size in rows:
+                evicted.append((key,))
+                self._disk_bytes -= size
+                if self._disk_bytes <= target_bytes:
+                    break
+        cursor.close()
+
+        self._conn.executemany("DELETE FROM memo WHERE key = ?", evicted)
+        self._stats.evictions += len(evicted)
+        self._logger.debug(f"Evicted {len(evicted)} entries from the preprocessing cache.")
+
+
+class MemoisedFunction:
+    """
+    A pure function whose results are cached in a `PreprocessingCache`.
+
+    Calling it computes one item. `map` and `lookup`/`store` work on
+    batches, which is much faster, since every batch needs only one database
+    query. A `PreprocessingPipeline` recognises memoised functions in `map`
+    stages and only computes (or sends to its workers) the items that are
+    not cached.
+
+    Attributes
+    ----------
+    fn : Callable[[Any], Any]
+        The underlying function.
+    _cache : PreprocessingCache
+        The cache storing the results.
+    _namespace : bytes
+        The function's name and version, hashed into every key.
+    """
+    def __init__(self, fn: Callable[[Any], Any], cache: PreprocessingCache, namespace: bytes):
+        self.fn = fn
+        self.__name__ = getattr(fn, '__name__', type(fn).__name__)
+        self._cache = cache
+        self._namespace = namespace
+
+    def __call__(self, item: Any) -> Any:
+        return self.map_batch([item])[0]
+
+    def digest(self, item: Any) -> bytes:
+        """
+        Return the cache key of an item: a digest of the item's content and
+        the function's name and version.
+        """
+        if isinstance(item, str):
+            content = b's' + item.encode('utf-8')
+        elif isinstance(item, bytes):
+            content = b'b' + item
+        else:
+            content = b'p' + pickle.dumps(item, protocol=4)
+
+        return hashlib.blake2b(self._namespace + b'\0' + content, digest_size=16).digest()
+
+    def lookup(self, items: Sequence[Any]) -> Tuple[List[bytes], List[Any]]:
+        """
+        Look up a batch of items.
+
+        Returns
+        -------
+        Tuple[List[bytes], List[Any]]
+            The digest of every item, and its cached value or `MISSING`.
+        """
+        digests = [self.digest(item) for item in items]
+        return digests, self._cache.lookup(digests)
+
+    def store(self, digests: Sequence[bytes], values: Sequence[Any]):
+        """
+        Store the computed values of a batch of items, given their digests.
+        """
+        self._cache.store(digests, values)
+
+    def map_batch(self, items: Sequence[Any]) -> List[Any]:
+        """
+        Apply the function to a batch of items, computing only the uncached
+        ones.
+        """
+        digests, values = self.lookup(items)
+        missing = [index for index, value in enumerate(values) if value is MISSING]
+        computed = [self.fn(items[index]) for index in missing]
+        for index, value in zip(missing, computed):
+            values[index] = value
+        self.store([digests[index] for index in missing], computed)
+
+        return values
+
+    def map(self, items: Iterable[Any], batch_size: int = 1000) -> Iterator[Any]:
+        """
+        Lazily apply the function to every item, looking items up in batches.
+
+        Parameters
+        ----------
+        items : Iterable[Any]
+            The items.
+        batch_size : int, optional
+            The number of items looked up at a time (default 1000).
+
+        Returns
+        -------
+        Iterator[Any]
+            The results, in input order.
+        """
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) == batch_size:
+                yield from self.map_batch(batch)
+                batch = []
+        if batch:
+            yield from self.map_batch(batch)
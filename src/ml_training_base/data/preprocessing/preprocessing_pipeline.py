@@ -0,0 +1,679 @@
+import os
+import time
+import hashlib
+import logging
+import itertools
+import multiprocessing
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from ml_training_base.data.preprocessing.preprocessing_cache import MISSING, MemoisedFunction
+
+T = TypeVar('T')
+
+# Returned by a fused per-item function when one of its stages drops the item
+_DROPPED = object()
+
+
+@dataclass
+class StageStats:
+    """
+    The throughput of one pipeline stage over a run.
+
+    Attributes
+    ----------
+    name : str
+        The stage name.
+    items_in : int
+        The number of items the stage received.
+    items_out : int
+        The number of items the stage emitted.
+    seconds : float
+        The time spent in the stage, excluding upstream stages. Fused stages
+        share the time of their fused pass, since they run item by item in
+        the same loop.
+    fused_group : int
+        The index of the pass the stage ran in; stages with the same index
+        were fused.
+    """
+    name: str
+    items_in: int = 0
+    items_out: int = 0
+    seconds: float = 0.0
+    fused_group: int = 0
+
+    @property
+    def items_per_second(self) -> float:
+        """
+        The number of items the stage received per second.
+        """
+        return self.items_in / self.seconds if self.seconds > 0 else float('inf')
+
+
+class _Stage:
+    """
+    A stage of a `PreprocessingPipeline`.
+
+    Per-item stages implement `process` (returning the output item, or
+    `_DROPPED`), and adjacent per-item stages are fused into one pass.
+    """
+    per_item: bool = True
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def process(self, item: Any) -> Any:
+        raise NotImplementedError
+
+    def reset(self):
+        """
+        Clear any state from a previous run.
+        """
+
+
+class _MapStage(_Stage):
+    def __init__(self, name: str, fn: Callable[[Any], Any]):
+        super().__init__(name)
+        self._fn = fn
+
+    def process(self, item: Any) -> Any:
+        return self._fn(item)
+
+
+class _FilterStage(_Stage):
+    def __init__(self, name: str, predicate: Callable[[Any], bool]):
+        super().__init__(name)
+        self._predicate = predicate
+
+    def process(self, item: Any) -> Any:
+        return item if self._predicate(item) else _DROPPED
+
+
+class _DeduplicateStage(_Stage):
+    def __init__(self, name: str, key: Optional[Callable[[Any], Any]]):
+        super().__init__(name)
+        self._key = key
+        self._seen = set()
+
+    def process(self, item: Any) -> Any:
+        key = self._key(item) if self._key else item
+        if key in self._seen:
+            return _DROPPED
+        self._seen.add(key)
+        return item
+
+    def reset(self):
+        self._seen = set()
+
+
+class _SplitStage(_Stage):
+    def __init__(self, name: str, fractions: Dict[str, float], seed: int, key: Optional[Callable[[Any], Any]]):
+        super().__init__(name)
+        self.split_names = list(fractions)
+        self._key = key
+        self._seed = str(seed).encode('utf-8')
+        self._boundaries = split_boundaries(fractions)
+
+    def process(self, item: Any) -> Tuple[str, Any]:
+        return assign_split(item, self.split_names, self._boundaries, self._seed, self._key), item
+
+
+class _ChunkedMapStage(_Stage):
+    """
+    A map over chunks of items, run in a process pool (`num_workers > 0`)
+    and/or memoised (`fn` is a `MemoisedFunction`).
+    """
+    per_item = False
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], num_workers: int, chunk_size: int, start_method: Optional[str]):
+        super().__init__(name)
+        self.fn = fn
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.start_method = start_method
+
+
+def split_boundaries(fractions: Dict[str, float]) -> List[int]:
+    """
+    Return the exclusive upper bound of each split on the 64-bit hash range,
+    for `assign_split`.
+
+    Parameters
+    ----------
+    fractions : Dict[str, float]
+        The fraction of items in each split, summing to 1.
+
+    Returns
+    -------
+    List[int]
+        The cumulative boundaries, the last of which is `2**64`.
+    """
+    boundaries = [int(fraction * 2 ** 64) for fraction in itertools.accumulate(fractions.values())]
+    boundaries[-1] = 2 ** 64
+
+    return boundaries
+
+
+def assign_split(
+    item: Any,
+    split_names: Sequence[str],
+    boundaries: Sequence[int],
+    seed: bytes = b'0',
+    key: Optional[Callable[[Any], Any]] = None
+) -> str:
+    """
+    Assign an item to a split from a hash of its content.
+
+    The assignment depends only on the item (or its `key`) and the seed, so
+    it is the same in every run and in every process, regardless of the
+    order or the number of the other items.
+
+    Parameters
+    ----------
+    item : Any
+        The item to assign.
+    split_names : Sequence[str]
+        The split names.
+    boundaries : Sequence[int]
+        The exclusive upper bound of each split on the range `[0, 2**64)`.
+    seed : bytes, optional
+        Salt of the hash (default `b'0'`).
+    key : Callable[[Any], Any], optional
+        Maps an item to the value that is hashed (default: the item).
+
+    Returns
+    -------
+    str
+        The name of the item's split.
+    """
+    value = str(key(item) if key else item).encode('utf-8')
+    position = int.from_bytes(hashlib.blake2b(value, digest_size=8, key=seed).digest(), 'little')
+    for name, boundary in zip(split_names, boundaries):
+        if position < boundary:
+            return name
+
+    return split_names[-1]
+
+
+def _map_chunk(fn: Callable[[Any], Any], chunk: List[Any]) -> List[Any]:
+    return [fn(item) for item in chunk]
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    with open(path, 'r') as file:
+        for line in file:
+            yield line.rstrip('\n')
+
+
+class PreprocessingPipeline(Generic[T]):
+    """
+    A declarative, lazy data preprocessing pipeline.
+
+    Stages are added with the builder methods (`read`, `map`, `filter`,
+    `deduplicate`, `split`, `write`) and only run when the pipeline is
+    iterated, run or collected. Items stream through the stages one at a
+    time, so no stage materialises the full dataset:
+
+    * Adjacent per-item stages (`map`, `filter`, `deduplicate` and `split`)
+      are fused into a single loop, so an item passes through all of them
+      before the next item is read.
+    * A `map` with `num_workers > 0` runs in a process pool. Items are sent
+      to the workers in chunks, a bounded number of chunks are in flight at
+      a time, and results are emitted in input order.
+    * A `map` of a `MemoisedFunction` (see `PreprocessingCache`) looks up
+      chunks of items in its cache and only computes the uncached ones.
+
+    After every run, `stats` reports the items in/out and the items/sec of
+    each stage.
+
+    Examples
+    --------
+    >>> pipeline = (
+    ...     PreprocessingPipeline()
+    ...     .read('data/raw/reactions.txt')
+    ...     .map(str.strip)
+    ...     .filter(bool)
+    ...     .map(canonicalise, num_workers=4)
+    ...     .deduplicate()
+    ...     .split({'train': 0.8, 'valid': 0.1, 'test': 0.1})
+    ...     .write('data/processed/{split}.txt')
+    ... )
+    >>> counts = pipeline.run()
+
+    Attributes
+    ----------
+    _source_factory : Callable[[], Iterator[T]] or None
+        Returns a fresh iterator over the input items.
+    _stages : List[_Stage]
+        The stages, in order.
+    _output_paths : Dict[str, str] or None
+        The output file of each split, if the pipeline writes its output.
+    _stats : List[StageStats]
+        The statistics of the last run.
+    """
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self._logger = logger if logger else logging.getLogger(__name__)
+        self._source_factory: Optional[Callable[[], Iterator[T]]] = None
+        self._stages: List[_Stage] = []
+        self._output_paths: Optional[Dict[str, str]] = None
+        self._stats: List[StageStats] = []
+
+    @property
+    def stats(self) -> List[StageStats]:
+        """
+        The statistics of each stage in the last run (including `read` and
+        `write`).
+        """
+        return self._stats
+
+    @property
+    def split_names(self) -> List[str]:
+        """
+        The names of the output splits (`['all']` if the pipeline has no
+        `split` stage).
+        """
+        split = self._split_stage()
+        return split.split_names if split else ['all']
+
+    def read(self, source: Union[str, os.PathLike, Iterable[T]]) -> 'PreprocessingPipeline[T]':
+        """
+        Set the input of the pipeline.
+
+        Parameters
+        ----------
+        source : str, os.PathLike or Iterable[T]
+            A text file, read lazily line by line (without the trailing
+            newline), or any iterable of items. Pass a re-iterable (e.g. a
+            list) rather than a generator to run the pipeline more than once.
+
+        Returns
+        -------
+        PreprocessingPipeline[T]
+            The pipeline, for chaining.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            path = os.fspath(source)
+            self._source_factory = lambda: _read_lines(path)
+        else:
+            self._source_factory = lambda: iter(source)
+
+        return self
+
+    def map(
+        self,
+        fn: Callable[[T], Any],
+        name: Optional[str] = None,
+        num_workers: int = 0,
+        chunk_size: int = 1000,
+        start_method: Optional[str] = None
+    ) -> 'PreprocessingPipeline[T]':
+        """
+        Add a stage that transforms every item.
+
+        Parameters
+        ----------
+        fn : Callable[[T], Any]
+            The transformation. With `num_workers > 0` it must be picklable
+            (e.g. a function defined at module level), since it runs in
+            worker processes. If it is a `MemoisedFunction`, every chunk is
+            looked up in its cache at once, and only the uncached items are
+            computed (in the workers, if any).
+        name : str, optional
+            The stage name in `stats` (default: the name of `fn`).
+        num_workers : int, optional
+            The number of worker processes. With 0 (default) the stage runs
+            in the calling process and, unless memoised, is fused with
+            adjacent stages.
+        chunk_size : int, optional
+            The number of items sent to a worker at a time (default 1000).
+        start_method : str, optional
+            The multiprocessing start method of the pool (default: the
+            platform default). 'spawn' is safer when `fn` uses TensorFlow or
+            PyTorch, but every worker then re-imports the calling module.
+
+        Returns
+        -------
+        PreprocessingPipeline[T]
+            The pipeline, for chaining.
+        """
+        name = name or f"map:{getattr(fn, '__name__', type(fn).__name__)}"
+        if num_workers > 0 or isinstance(fn, MemoisedFunction):
+            return self._add_stage(_ChunkedMapStage(name, fn, num_workers, chunk_size, start_method))
+
+        return self._add_stage(_MapStage(name, fn))
+
+    def filter(self, predicate: Callable[[T], bool], name: Optional[str] = None) -> 'PreprocessingPipeline[T]':
+        """
+        Add a stage that keeps only the items for which `predicate` is true.
+        """
+        name = name or f"filter:{getattr(predicate, '__name__', type(predicate).__name__)}"
+        return self._add_stage(_FilterStage(name, predicate))
+
+    def deduplicate(
+        self,
+        key: Optional[Callable[[T], Any]] = None,
+        name: str = 'deduplicate'
+    ) -> 'PreprocessingPipeline[T]':
+        """
+        Add a stage that drops items seen earlier in the run, keeping the
+        first occurrence of each.
+
+        Parameters
+        ----------
+        key : Callable[[T], Any], optional
+            Maps an item to the hashable value compared (default: the item).
+        name : str, optional
+            The stage name in `stats`.
+        """
+        return self._add_stage(_DeduplicateStage(name, key))
+
+    def split(
+        self,
+        fractions: Dict[str, float],
+        seed: int = 0,
+        key: Optional[Callable[[T], Any]] = None,
+        name: str = 'split'
+    ) -> 'PreprocessingPipeline[T]':
+        """
+        Add a stage that assigns every item to a named split.
+
+        Items are assigned from a hash of their content (see
+        `assign_split`), so an item lands in the same split in every run,
+        which keeps splits stable when the input grows. The split sizes
+        therefore match `fractions` only approximately. Only `write` may
+        follow a split.
+
+        Parameters
+        ----------
+        fractions : Dict[str, float]
+            The fraction of items in each split, e.g.
+            `{'train': 0.8, 'valid': 0.1, 'test': 0.1}`. Must sum to 1.
+        seed : int, optional
+            Salt of the assignment hash (default 0).
+        key : Callable[[T], Any], optional
+            Maps an item to the value that is hashed (default: the item).
+        name : str, optional
+            The stage name in `stats`.
+
+        Raises
+        ------
+        ValueError
+            If `fractions` is empty, has a negative value or does not sum to 1.
+        """
+        if not fractions or any(fraction < 0 for fraction in fractions.values()):
+            raise ValueError(f"Split fractions must be non-negative and non-empty, got {fractions}.")
+        if abs(sum(fractions.values()) - 1.0) > 1e-6:
+            raise ValueError(f"Split fractions must sum to 1, got {sum(fractions.values())}.")
+
+        return self._add_stage(_SplitStage(name, fractions, seed, key))
+
+    def write(self, path: Union[str, Dict[str, str]]) -> 'PreprocessingPipeline[T]':
+        """
+        Write the output items to text files, one item per line.
+
+        Parameters
+        ----------
+        path : str or Dict[str, str]
+            The output file. After a `split`, either a dict mapping every
+            split name to a file, or a path containing `{split}`, which is
+            replaced by each split name.
+
+        Raises
+        ------
+        ValueError
+            If a path is missing for a split.
+        """
+        split_names = self.split_names
+        if isinstance(path, dict):
+            output_paths = dict(path)
+        elif '{split}' in path:
+            output_paths = {split_name: path.format(split=split_name) for split_name in split_names}
+        elif split_names == ['all']:
+            output_paths = {'all': path}
+        else:
+            raise ValueError("The output path of a split pipeline must contain '{split}' or be a dict.")
+
+        missing = set(split_names) - set(output_paths)
+        if missing:
+            raise ValueError(f"No output path for splits: {sorted(missing)}.")
+        self._output_paths = output_paths
+
+        return self
+
+    def iterate(self) -> Iterator[Any]:
+        """
+        Run the pipeline lazily, yielding its output items.
+
+        Items are `(split_name, item)` tuples if the pipeline has a `split`
+        stage. The `write` stage is not applied; use `run` or `collect`.
+        `stats` is complete once the iterator is exhausted.
+        """
+        return self._build(with_write=False)
+
+    def run(self) -> Dict[str, int]:
+        """
+        Run the pipeline to completion, writing the output if a `write`
+        stage was added.
+
+        Returns
+        -------
+        Dict[str, int]
+            The number of output items in each split (`'all'` if the
+            pipeline has no `split` stage).
+        """
+        counts = {split_name: 0 for split_name in self.split_names}
+        for split_name, _ in self._tagged(self._build(with_write=True)):
+            counts[split_name] += 1
+
+        return counts
+
+    def collect(self) -> Dict[str, List[Any]]:
+        """
+        Run the pipeline to completion and return its output items.
+
+        Returns
+        -------
+        Dict[str, List[Any]]
+            The output items of each split (`'all'` if the pipeline has no
+            `split` stage), in input order.
+        """
+        outputs: Dict[str, List[Any]] = {split_name: [] for split_name in self.split_names}
+        for split_name, item in self._tagged(self._build(with_write=True)):
+            outputs[split_name].append(item)
+
+        return outputs
+
+    def _add_stage(self, stage: _Stage) -> 'PreprocessingPipeline[T]':
+        if self._split_stage() is not None:
+            raise ValueError(f"Cannot add stage '{stage.name}' after a split; only write may follow it.")
+        if self._output_paths is not None:
+            raise ValueError(f"Cannot add stage '{stage.name}' after write.")
+        self._stages.append(stage)
+
+        return self
+
+    def _split_stage(self) -> Optional[_SplitStage]:
+        if self._stages and isinstance(self._stages[-1], _SplitStage):
+            return self._stages[-1]
+        return None
+
+    def _tagged(self, items: Iterator[Any]) -> Iterator[Tuple[str, Any]]:
+        if self._split_stage() is not None:
+            return items
+        return (('all', item) for item in items)
+
+    def _build(self, with_write: bool) -> Iterator[Any]:
+        """
+        Chain the stages into one lazy iterator of timed passes, fusing
+        adjacent per-item stages into a single pass.
+        """
+        if self._source_factory is None:
+            raise ValueError("The pipeline has no input; call read() first.")
+
+        for stage in self._stages:
+            stage.reset()
+
+        read_stats = StageStats('read', fused_group=0)
+        passes = [_Pass([read_stats])]
+        iterator = self._timed(self._counted(self._source_factory(), read_stats), passes[-1])
+
+        for per_item, group in itertools.groupby(self._stages, lambda stage: stage.per_item):
+            stages = list(group)
+            if per_item:
+                group_stats = [StageStats(stage.name, fused_group=len(passes)) for stage in stages]
+                passes.append(_Pass(group_stats, upstream=passes[-1]))
+                iterator = self._timed(self._fused(iterator, stages, group_stats), passes[-1])
+                continue
+
+            for stage in stages:
+                stage_stats = StageStats(stage.name, fused_group=len(passes))
+                passes.append(_Pass([stage_stats], upstream=passes[-1]))
+                iterator = self._timed(self._chunked_map(iterator, stage, stage_stats), passes[-1])
+
+        if with_write and self._output_paths is not None:
+            write_stats = StageStats('write', fused_group=len(passes))
+            passes.append(_Pass([write_stats], upstream=passes[-1]))
+            iterator = self._timed(self._write(self._tagged(iterator), write_stats), passes[-1])
+            if self._split_stage() is None:
+                iterator = (item for _, item in iterator)
+
+        self._stats = [stage_stats for timed_pass in passes for stage_stats in timed_pass.stats]
+
+        return self._finalise_on_exhaustion(iterator, passes)
+
+    @staticmethod
+    def _fused(items: Iterator[Any], stages: List[_Stage], stats: List[StageStats]) -> Iterator[Any]:
+        processes = [stage.process for stage in stages]
+        for item in items:
+            for process, stage_stats in zip(processes, stats):
+                stage_stats.items_in += 1
+                item = process(item)
+                if item is _DROPPED:
+                    break
+                stage_stats.items_out += 1
+            else:
+                yield item
+
+    @staticmethod
+    def _chunked_map(items: Iterator[Any], stage: _ChunkedMapStage, stats: StageStats) -> Iterator[Any]:
+        """
+        Map items a chunk at a time, yielding the results in input order.
+
+        Memoised functions look every chunk up in their cache first. The
+        remaining items are computed in the calling process, or submitted to
+        a process pool with a bounded window of chunks in flight.
+        """
+        memoised = stage.fn if isinstance(stage.fn, MemoisedFunction) else None
+        fn = memoised.fn if memoised else stage.fn
+        executor = None
+        if stage.num_workers > 0:
+            context = multiprocessing.get_context(stage.start_method)
+            executor = ProcessPoolExecutor(max_workers=stage.num_workers, mp_context=context)
+        max_in_flight = 2 * stage.num_workers if executor else 1
+
+        def submit(chunk: List[Any]) -> Tuple[List[Any], List[int], List[bytes], Future]:
+            if memoised:
+                digests, values = memoised.lookup(chunk)
+                missing = [index for index, value in enumerate(values) if value is MISSING]
+            else:
+                digests, values, missing = [], [None] * len(chunk), list(range(len(chunk)))
+
+            uncached = [chunk[index] for index in missing]
+            if executor and uncached:
+                future = executor.submit(_map_chunk, fn, uncached)
+            else:
+                future = Future()
+                future.set_result(_map_chunk(fn, uncached))
+
+            return values, missing, [digests[index] for index in missing] if memoised else [], future
+
+        def complete(values: List[Any], missing: List[int], digests: List[bytes], future: Future) -> List[Any]:
+            computed = future.result()
+            for index, value in zip(missing, computed):
+                values[index] = value
+            if memoised:
+                memoised.store(digests, computed)
+            stats.items_out += len(values)
+            return values
+
+        try:
+            pending = deque()
+            for chunk in iter(lambda: list(itertools.islice(items, stage.chunk_size)), []):
+                stats.items_in += len(chunk)
+                pending.append(submit(chunk))
+                if len(pending) >= max_in_flight:
+                    yield from complete(*pending.popleft())
+
+            while pending:
+                yield from complete(*pending.popleft())
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+    def _write(self, items: Iterator[Tuple[str, Any]], stats: StageStats) -> Iterator[Tuple[str, Any]]:
+        files = {}
+        try:
+            for split_name, path in self._output_paths.items():
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                files[split_name] = open(path, 'w')
+
+            for split_name, item in items:
+                stats.items_in += 1
+                files[split_name].write(f"{item}\n")
+                stats.items_out += 1
+                yield split_name, item
+        finally:
+            for file in files.values():
+                file.close()
+
+    @staticmethod
+    def _counted(items: Iterator[Any], stats: StageStats) -> Iterator[Any]:
+        for item in items:
+            stats.items_in += 1
+            stats.items_out += 1
+            yield item
+
+    @staticmethod
+    def _timed(items: Iterator[Any], timed_pass: '_Pass') -> Iterator[Any]:
+        """
+        Accumulate the time spent producing each item of a pass, including
+        the time spent in the upstream passes it pulls items from.
+        """
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(items)
+            except StopIteration:
+                timed_pass.inclusive_seconds += time.perf_counter() - start
+                return
+            timed_pass.inclusive_seconds += time.perf_counter() - start
+            yield item
+
+    def _finalise_on_exhaustion(self, items: Iterator[Any], passes: List['_Pass']) -> Iterator[Any]:
+        yield from items
+
+        for timed_pass in passes:
+            upstream_seconds = timed_pass.upstream.inclusive_seconds if timed_pass.upstream else 0.0
+            for stage_stats in timed_pass.stats:
+                stage_stats.seconds = max(timed_pass.inclusive_seconds - upstream_seconds, 0.0)
+
+        for stage_stats in self._stats:
+            self._logger.info(
+                f"Pipeline stage '{stage_stats.name}': {stage_stats.items_in} in, {stage_stats.items_out} out, "
+                f"{stage_stats.seconds:.3f}s ({stage_stats.items_per_second:,.0f} items/s)"
+            )
+
+
+@dataclass
+class _Pass:
+    """
+    A timed loop over the items: the read, a fused group of per-item stages,
+    a parallel map or the write.
+    """
+    stats: List[StageStats]
+    upstream: Optional['_Pass'] = None
+    inclusive_seconds: float = 0.0
@@ -0,0 +1,358 @@
+import os
+import json
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+from tensorflow.keras.callbacks import Callback
+
+CHECKPOINT_INDEX_FILE = 'checkpoint_index.json'
+
+
+def write_atomic(path: str, write_fn: Callable[[str], None]) -> None:
+    """
+    Write a file atomically by writing to a temporary file and renaming it.
+
+    Readers (e.g. a resumed run) therefore never observe a partially written
+    file, even if the process is killed mid-write.
+
+    Parameters
+    ----------
+    path : str
+        The final path of the file.
+    write_fn : Callable[[str], None]
+        Function writing the file content to the path it is given.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        write_fn(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def snapshot_to_host(state: Any) -> Any:
+    """
+    Recursively copy the tensors and arrays in a (nested) state into host memory.
+
+    The copy decouples the snapshot from the live model, so training can
+    continue to update weights while the snapshot is written to disk.
+
+    Parameters
+    ----------
+    state : Any
+        A (nested) structure of tensors, arrays and plain Python objects,
+        e.g. a PyTorch `state_dict` or a list of Keras weights.
+
+    Returns
+    -------
+    Any
+        The same structure with every tensor or array copied to host memory.
+    """
+    if isinstance(state, torch.Tensor):
+        return state.detach().to('cpu', copy=True)
+    if isinstance(state, np.ndarray):
+        return state.copy()
+    if isinstance(state, dict):
+        return type(state)((key, snapshot_to_host(value)) for key, value in state.items())
+    if isinstance(state, (list, tuple)):
+        return type(state)(snapshot_to_host(value) for value in state)
+
+    return state
+
+
+class AsyncCheckpointManager:
+    """
+    Writes checkpoints from a background thread and manages their retention.
+
+    `save` snapshots the state into host memory on the calling thread and
+    hands it to a single background writer thread, which writes it
+    atomically. At most one write is in flight; a new `save` only blocks if
+    the previous write has not finished, which bounds host memory usage.
+
+    The manager keeps the `max_to_keep` most recent checkpoints plus the best
+    checkpoint according to the monitored metric, and records them in a JSON
+    index file in the checkpoint directory.
+
+    Attributes
+    ----------
+    _checkpoint_dir : str
+        Directory the checkpoints are written to.
+    _write_fn : Callable[[Any, str], None]
+        Function writing a snapshot to a given path.
+    _max_to_keep : int
+        The number of most recent checkpoints to keep.
+    _mode : str
+        Whether a lower (`'min'`) or higher (`'max'`) metric is better.
+    _checkpoints : List[Dict[str, Any]]
+        Index entries of the retained recent checkpoints, oldest first.
+    _best : Dict[str, Any]
+        Index entry of the best checkpoint, if any.
+    """
+    def __init__(
+        self,
+        checkpoint_dir: str,
+        write_fn: Callable[[Any, str], None],
+        max_to_keep: int = 3,
+        mode: str = 'min',
+        file_suffix: str = '.ckpt',
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialise the AsyncCheckpointManager.
+
+        Parameters
+        ----------
+        checkpoint_dir : str
+            Directory to write checkpoints to.
+        write_fn : Callable[[Any, str], None]
+            Function writing a snapshot to a given path, e.g. `torch.save`.
+        max_to_keep : int, optional
+            The number of most recent checkpoints to keep (default 3).
+        mode : str, optional
+            `'min'` if a lower metric is better, `'max'` otherwise (default
+            `'min'`).
+        file_suffix : str, optional
+            Suffix of the checkpoint file names (default `'.ckpt'`).
+        logger : logging.Logger, optional
+            Logger for status messages.
+
+        Raises
+        ------
+        ValueError
+            If `mode` is not `'min'` or `'max'`, or `max_to_keep` is below 1.
+        """
+        if mode not in ('min', 'max'):
+            raise ValueError(f"`mode` must be 'min' or 'max', got '{mode}'.")
+        if max_to_keep < 1:
+            raise ValueError("`max_to_keep` must be at least 1.")
+
+        self._checkpoint_dir = checkpoint_dir
+        self._write_fn = write_fn
+        self._max_to_keep = max_to_keep
+        self._mode = mode
+        self._file_suffix = file_suffix
+        self._logger = logger if logger else logging.getLogger(__name__)
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='checkpoint-writer')
+        self._pending: Optional[Future] = None
+
+        index = self.read_index(checkpoint_dir)
+        self._checkpoints: List[Dict[str, Any]] = index.get('checkpoints', [])
+        self._best: Optional[Dict[str, Any]] = index.get('best')
+
+    def save(self, state: Any, step: int, metric: Optional[float] = None) -> str:
+        """
+        Snapshot the state and write it as a checkpoint in the background.
+
+        Parameters
+        ----------
+        state : Any
+            The state to checkpoint, e.g. a PyTorch `state_dict`.
+        step : int
+            The training step or epoch of the checkpoint.
+        metric : float, optional
+            The monitored metric, used to track the best checkpoint.
+
+        Returns
+        -------
+        str
+            The path the checkpoint will be written to.
+        """
+        path = os.path.join(self._checkpoint_dir, f"ckpt-{step:08d}{self._file_suffix}")
+        entry = {'step': step, 'path': path, 'metric': metric}
+        self._submit(self._write_checkpoint, snapshot_to_host(state), entry)
+
+        return path
+
+    def write(self, state: Any, path: str) -> None:
+        """
+        Snapshot the state and write it atomically to `path` in the background.
+
+        Unlike `save`, the file is not tracked in the checkpoint index.
+
+        Parameters
+        ----------
+        state : Any
+            The state to write.
+        path : str
+            The destination path.
+        """
+        self._submit(self._write_file, snapshot_to_host(state), path)
+
+    def wait(self) -> None:
+        """
+        Block until the in-flight write (if any) has finished.
+
+        Raises
+        ------
+        Exception
+            Re-raises any error raised by the background write.
+        """
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()
+
+    def close(self) -> None:
+        """
+        Wait for the in-flight write and shut down the writer thread.
+        """
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+
+    @property
+    def latest_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Index entry of the most recent completed checkpoint, if any.
+        """
+        return self._checkpoints[-1] if self._checkpoints else None
+
+    @property
+    def best_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Index entry of the best completed checkpoint, if any.
+        """
+        return self._best
+
+    @staticmethod
+    def read_index(checkpoint_dir: str) -> Dict[str, Any]:
+        """
+        Read the checkpoint index of a checkpoint directory.
+
+        Parameters
+        ----------
+        checkpoint_dir : str
+            The checkpoint directory.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The index, with `checkpoints` (oldest first) and `best` entries,
+            or an empty dictionary if there is no index.
+        """
+        index_path = os.path.join(checkpoint_dir, CHECKPOINT_INDEX_FILE)
+        if not os.path.exists(index_path):
+            return {}
+
+        with open(index_path, 'r') as file:
+            return json.load(file)
+
+    def _submit(self, fn: Callable, *args) -> None:
+        """
+        Submit a write to the background thread once the previous one has finished.
+        """
+        self.wait()
+        self._pending = self._executor.submit(fn, *args)
+
+    def _write_file(self, snapshot: Any, path: str) -> None:
+        """
+        Write a snapshot atomically (runs on the writer thread).
+        """
+        write_atomic(path, lambda tmp_path: self._write_fn(snapshot, tmp_path))
+        self._logger.debug(f"Wrote {path}.")
+
+    def _write_checkpoint(self, snapshot: Any, entry: Dict[str, Any]) -> None:
+        """
+        Write a checkpoint, update the index and prune old checkpoints (runs on the writer thread).
+        """
+        self._write_file(snapshot, entry['path'])
+
+        self._checkpoints = [checkpoint for checkpoint in self._checkpoints if checkpoint['path'] != entry['path']]
+        self._checkpoints.append(entry)
+
+        stale = self._checkpoints[:-self._max_to_keep]
+        self._checkpoints = self._checkpoints[-self._max_to_keep:]
+
+        if entry['metric'] is not None and self._is_better(entry['metric']):
+            # A superseded best checkpoint that has also rotated out is no longer retained
+            if self._best is not None and self._best not in self._checkpoints:
+                stale.append(self._best)
+            self._best = entry
+
+        # The index is updated before files are deleted, so it never references a missing checkpoint
+        index = {'checkpoints': self._checkpoints, 'best': self._best}
+        write_atomic(
+            os.path.join(self._checkpoint_dir, CHECKPOINT_INDEX_FILE),
+            lambda tmp_path: self._dump_json(index, tmp_path)
+        )
+
+        for checkpoint in stale:
+            if checkpoint != self._best and os.path.exists(checkpoint['path']):
+                os.remove(checkpoint['path'])
+
+        self._logger.info(f"Checkpoint for step {entry['step']} saved to {entry['path']}.")
+
+    def _is_better(self, metric: float) -> bool:
+        """
+        Return whether `metric` improves on the best checkpoint's metric.
+        """
+        if self._best is None or self._best['metric'] is None:
+            return True
+
+        return metric < self._best['metric'] if self._mode == 'min' else metric > self._best['metric']
+
+    @staticmethod
+    def _dump_json(data: Dict[str, Any], path: str) -> None:
+        with open(path, 'w') as file:
+            json.dump(data, file, indent=2)
+
+
+def save_keras_weights(weights: List[np.ndarray], path: str) -> None:
+    """
+    Write a list of Keras weight arrays (from `model.get_weights()`) to an `.npz` file.
+    """
+    with open(path, 'wb') as file:
+        np.savez(file, *weights)
+
+
+def load_keras_weights(path: str) -> List[np.ndarray]:
+    """
+    Read a list of Keras weight arrays written by `save_keras_weights`.
+    """
+    with np.load(path) as data:
+        return [data[f"arr_{i}"] for i in range(len(data.files))]
+
+
+class AsyncModelCheckpoint(Callback):
+    """
+    Keras callback checkpointing model weights without blocking training.
+
+    At the end of each epoch, the model weights are copied into host memory
+    with `model.get_weights()` and written as an `.npz` file by an
+    `AsyncCheckpointManager`, which keeps the most recent checkpoints plus the
+    best one. Weights can be restored with
+    `model.set_weights(load_keras_weights(path))`.
+    """
+    def __init__(self, checkpoint_manager: AsyncCheckpointManager, monitor: str = 'val_loss'):
+        """
+        Initialise the AsyncModelCheckpoint callback.
+
+        Parameters
+        ----------
+        checkpoint_manager : AsyncCheckpointManager
+            The manager writing the checkpoints, created with
+            `write_fn=save_keras_weights`.
+        monitor : str, optional
+            The metric used to track the best checkpoint (default
+            `'val_loss'`).
+        """
+        super().__init__()
+        self._checkpoint_manager = checkpoint_manager
+        self._monitor = monitor
+
+    def on_epoch_end(self, epoch, logs=None):
+        metric = (logs or {}).get(self._monitor)
+        self._checkpoint_manager.save(
+            self.model.get_weights(),
+            step=epoch + 1,
+            metric=float(metric) if metric is not None else None
+        )
+
+    def on_train_end(self, logs=None):
+        self._checkpoint_manager.wait()
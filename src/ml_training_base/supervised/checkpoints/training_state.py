@@ -0,0 +1,94 @@
+import os
+import pickle
+import random
+from typing import Any, Dict
+
+import numpy as np
+import torch
+from tensorflow.keras.callbacks import BackupAndRestore
+
+from ml_training_base.supervised.checkpoints.async_checkpoint_manager import write_atomic
+
+
+def capture_rng_state() -> Dict[str, Any]:
+    """
+    Capture the state of the Python, NumPy and PyTorch random number generators.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The generator states, which can be restored with `restore_rng_state`.
+    """
+    state = {
+        'python': random.getstate(),
+        'numpy': np.random.get_state(),
+        'torch': torch.get_rng_state()
+    }
+    if torch.cuda.is_available():
+        state['torch_cuda'] = torch.cuda.get_rng_state_all()
+
+    return state
+
+
+def restore_rng_state(state: Dict[str, Any]) -> None:
+    """
+    Restore random number generator states captured by `capture_rng_state`.
+
+    Parameters
+    ----------
+    state : Dict[str, Any]
+        The generator states to restore. Missing entries are skipped.
+    """
+    if 'python' in state:
+        random.setstate(state['python'])
+    if 'numpy' in state:
+        np.random.set_state(state['numpy'])
+    if 'torch' in state:
+        torch.set_rng_state(state['torch'])
+    if 'torch_cuda' in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state['torch_cuda'])
+
+
+class BackupAndRestoreWithRngState(BackupAndRestore):
+    """
+    Keras `BackupAndRestore` callback that also backs up random number generator state.
+
+    `BackupAndRestore` backs up the model and optimizer weights and the epoch
+    counter, and restores them when training restarts, so an interrupted
+    `model.fit()` resumes from the last backup. This subclass additionally
+    backs up the Python and NumPy generator states with every backup (at the
+    end of every epoch, or every `save_freq` batches), so randomness drawn
+    outside TensorFlow (e.g. in Python data augmentation) continues as if
+    training had not been interrupted.
+    """
+    RNG_STATE_FILE = 'rng_state.pkl'
+
+    def __init__(self, backup_dir: str, **kwargs):
+        """
+        Initialise the BackupAndRestoreWithRngState callback.
+
+        Parameters
+        ----------
+        backup_dir : str
+            Directory to store the backup in.
+        **kwargs
+            Additional keyword arguments passed to `BackupAndRestore`.
+        """
+        super().__init__(backup_dir=backup_dir, **kwargs)
+        self._rng_state_path = os.path.join(backup_dir, self.RNG_STATE_FILE)
+
+    def on_train_begin(self, logs=None):
+        super().on_train_begin(logs)
+        if os.path.exists(self._rng_state_path):
+            with open(self._rng_state_path, 'rb') as file:
+                restore_rng_state(pickle.load(file))
+
+    def _save_model(self):
+        # Called by `BackupAndRestore` for both epoch and batch (`save_freq`) backups
+        super()._save_model()
+        write_atomic(self._rng_state_path, self._write_rng_state)
+
+    @staticmethod
+    def _write_rng_state(path: str) -> None:
+        with open(path, 'wb') as file:
+            pickle.dump(capture_rng_state(), file)
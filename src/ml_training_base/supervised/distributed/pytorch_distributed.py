@@ -0,0 +1,137 @@
+import os
+import socket
+from typing import Any, Callable, Optional, Sequence
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+
+
+def is_distributed() -> bool:
+    """
+    Return whether a `torch.distributed` process group is initialised.
+    """
+    return dist.is_available() and dist.is_initialized()
+
+
+def get_rank() -> int:
+    """
+    Return the global rank of this process, or 0 outside distributed training.
+    """
+    return dist.get_rank() if is_distributed() else 0
+
+
+def get_world_size() -> int:
+    """
+    Return the number of processes, or 1 outside distributed training.
+    """
+    return dist.get_world_size() if is_distributed() else 1
+
+
+def get_local_rank() -> int:
+    """
+    Return the rank of this process on its node, as set by `torchrun` (0 if unset).
+    """
+    return int(os.environ.get('LOCAL_RANK', 0))
+
+
+def is_main_process() -> bool:
+    """
+    Return whether this is the rank 0 process, which logs and writes files.
+    """
+    return get_rank() == 0
+
+
+def all_reduce_sum(tensor: torch.Tensor) -> torch.Tensor:
+    """
+    Sum a tensor in place across all processes (a no-op outside distributed training).
+
+    Parameters
+    ----------
+    tensor : torch.Tensor
+        The tensor to reduce.
+
+    Returns
+    -------
+    torch.Tensor
+        The reduced tensor.
+    """
+    if get_world_size() > 1:
+        dist.all_reduce(tensor, op=dist.ReduceOp.SUM)
+
+    return tensor
+
+
+def find_free_port() -> int:
+    """
+    Return a TCP port that is currently free on the local host.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def launch_distributed(
+    fn: Callable[..., Any],
+    nprocs: int,
+    args: Sequence[Any] = (),
+    master_addr: str = '127.0.0.1',
+    master_port: Optional[int] = None
+) -> None:
+    """
+    Run `fn(*args)` in `nprocs` local processes set up like `torchrun` workers.
+
+    Each process gets the `RANK`, `LOCAL_RANK`, `WORLD_SIZE`, `MASTER_ADDR`
+    and `MASTER_PORT` environment variables that `torchrun` would set, so a
+    trainer with `distributed.enabled` set behaves the same under both. This
+    is intended for single-node runs and tests; use `torchrun` for
+    multi-node training.
+
+    Parameters
+    ----------
+    fn : Callable[..., Any]
+        The function to run in every process. It must be picklable, i.e.
+        defined at module level.
+    nprocs : int
+        The number of processes.
+    args : Sequence[Any], optional
+        Positional arguments passed to `fn`.
+    master_addr : str, optional
+        The address of the rank 0 process (default `'127.0.0.1'`).
+    master_port : int, optional
+        The rendezvous port (default: a free port).
+
+    Raises
+    ------
+    torch.multiprocessing.ProcessRaisedException
+        If any process raises an exception.
+    """
+    master_port = master_port if master_port is not None else find_free_port()
+    mp.spawn(
+        _run_worker,
+        args=(fn, nprocs, master_addr, master_port, tuple(args)),
+        nprocs=nprocs,
+        join=True
+    )
+
+
+def _run_worker(
+    local_rank: int,
+    fn: Callable[..., Any],
+    nprocs: int,
+    master_addr: str,
+    master_port: int,
+    args: Sequence[Any]
+) -> None:
+    """
+    Set the `torchrun` environment variables for a spawned process and run `fn`.
+    """
+    os.environ.update({
+        'RANK': str(local_rank),
+        'LOCAL_RANK': str(local_rank),
+        'WORLD_SIZE': str(nprocs),
+        'LOCAL_WORLD_SIZE': str(nprocs),
+        'MASTER_ADDR': master_addr,
+        'MASTER_PORT': str(master_port)
+    })
+    fn(*args)
@@ -2,12 +2,44 @@ import os
 import random
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 import numpy as np
 import tensorflow as tf
 import torch
 
+from ml_training_base.utils.hardware_utils import (
+    DEFAULT_PROBE_CACHE_PATH,
+    available_cpu_count,
+    probe_hardware,
+    recommend_settings,
+    write_json_report
+)
+
+
+def op_determinism_enabled(determinism_config: Dict[str, Any]) -> bool:
+    """
+    Return whether the `determinism` config section requests deterministic ops.
+
+    Deterministic ops are enabled by both determinism tiers:
+    - `deterministic_ops`: Deterministic kernels and ordered input pipelines,
+      with multi-threaded execution kept (typically a modest slowdown).
+    - `full_determinism`: Additionally forces single-threaded execution (and,
+      for TensorFlow, disables the GPU), which is much slower.
+
+    Parameters
+    ----------
+    determinism_config : Dict[str, Any]
+        The subsection of the config related to determinism.
+
+    Returns
+    -------
+    bool
+        Whether deterministic ops are enabled.
+    """
+    return bool(determinism_config.get('deterministic_ops', False)
+                or determinism_config.get('full_determinism', False))
+
 
 class BaseTrainingEnvironment(ABC):
     """
@@ -61,9 +93,16 @@ class BaseTrainingEnvironment(ABC):
         -----
         1. Sets the `PYTHONHASHSEED` environment variable to control the hash seed used by Python.
         2. Seeds Python's and NumPy's random number generators.
+        3. Optionally probes the hardware, writes a report next to the logs and
+           applies the recommended settings (see `_probe_hardware`).
+        4. Configures thread counts and affinity from the optional 'performance'
+           section (see `_setup_performance`). Without the section, the
+           framework and library defaults are left unchanged.
+        5. Sets up distributed training from the optional 'distributed' section
+           (see `_setup_distribution`).
         """
         self._logger.info("Performing framework-agnostic environment setup...")
-        determinism_config = config.get('determinism', {})
+        determinism_config = config.get('determinism') or {}
 
         if not determinism_config:
             raise KeyError("Configuration must have a 'determinism' section.")
@@ -76,8 +115,218 @@ class BaseTrainingEnvironment(ABC):
         # Call the framework-specific implementation
         self._setup_framework_specific_environment(determinism_config)
 
+        if (config.get('performance') or {}).get('hardware_probe', False):
+            self._probe_hardware(config)
+
+        # Read after the probe, which may have filled in recommended settings
+        performance_config = config.get('performance') or {}
+        if performance_config:
+            self._setup_performance(performance_config, determinism_config)
+        self._setup_distribution(config.get('distributed') or {})
+
         self._logger.info("Environment setup for deterministic (reproducible) training complete.")
 
+    def _probe_hardware(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Probe the hardware and write a JSON report alongside the run logs.
+
+        The probe is cached on disk, so it only runs once per host and
+        software stack. The report, including the recommended settings, is
+        written to `hardware_report.json` in the log directory so that
+        performance differences between nodes can be explained after the fact.
+
+        The following keys of the `performance` config section are used:
+        - `probe_cache_path`: The probe cache file (default
+          `~/.cache/ml_training_base/hardware_probe.json`).
+        - `refresh_probe`: Whether to ignore the cache (default `False`).
+        - `hardware_report_path`: Overrides the report path.
+        - `apply_recommendations`: Whether to apply the recommended settings
+          to the config (default `False`). Only keys that are unset or `'auto'`
+          are overridden, so explicit settings always take precedence.
+
+        Parameters
+        ----------
+        config : Dict[str, Any]
+            The full configuration, updated in place when recommendations
+            are applied.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The hardware report, with the recommendations under the
+            `recommendations` key.
+        """
+        performance_config = config.get('performance') or {}
+        report = probe_hardware(
+            cache_path=performance_config.get('probe_cache_path', DEFAULT_PROBE_CACHE_PATH),
+            refresh=performance_config.get('refresh_probe', False),
+            logger=self._logger
+        )
+        report['recommendations'] = recommend_settings(report)
+
+        log_path = config.get('data', {}).get('logger_path', 'var/log/default_logs.log')
+        report_path = performance_config.get(
+            'hardware_report_path',
+            os.path.join(os.path.dirname(log_path), 'hardware_report.json')
+        )
+        write_json_report(report, report_path)
+
+        cpu = report['cpu']
+        self._logger.info(
+            f"Hardware: {cpu['model']} ({cpu['available_cpus']} usable CPUs, "
+            f"flags: {', '.join(cpu['flags']) or 'none'}). Report written to {report_path}."
+        )
+        for note in report['recommendations']['notes']:
+            self._logger.warning(note)
+
+        if performance_config.get('apply_recommendations', False):
+            for section in ('performance', 'training'):
+                section_config = config.setdefault(section, {})
+                for key, value in report['recommendations'][section].items():
+                    if section_config.get(key) in (None, 'auto'):
+                        section_config[key] = value
+            self._logger.info(f"Applied recommended settings: {report['recommendations']}")
+
+        return report
+
+    def _setup_performance(self, performance_config: Dict[str, Any], determinism_config: Dict[str, Any]) -> None:
+        """
+        Configure thread counts, thread affinity and matmul precision.
+
+        Only the keys that are set are applied; the framework and library
+        defaults are kept for the others. The following keys of the
+        `performance` config section are used:
+        - `intra_op_threads`: Threads used to parallelise a single operation,
+          or `'auto'` for every CPU available to the process.
+        - `inter_op_threads`: Threads used to run independent operations
+          concurrently, or `'auto'` for up to 2.
+        - `thread_affinity`: Whether to pin OpenMP threads to cores (default
+          `False`). This helps when the process owns the node, but hurts when
+          cores are shared with other processes.
+        - `matmul_precision`: PyTorch float32 matmul precision, one of
+          `'highest'`, `'high'` or `'medium'` (default: framework default).
+        - `allow_tf32`: Whether to allow TensorFloat-32 matmuls on GPUs
+          (default: framework default).
+
+        Parameters
+        ----------
+        performance_config : Dict[str, Any]
+            The subsection of the config related to performance.
+        determinism_config : Dict[str, Any]
+            The subsection of the config related to determinism.
+
+        Notes
+        -----
+        1. Thread counts are skipped when `full_determinism` is set, which
+           forces single-threaded execution. `deterministic_ops` keeps them,
+           as deterministic kernels give the same results from run to run
+           for a fixed thread count.
+        2. 'auto' thread counts are derived from the CPU affinity mask and the
+           cgroup CPU quota, since `os.cpu_count()` reports the host's cores in
+           CPU-limited containers, and oversubscribing a quota causes throttling.
+        3. `OMP_NUM_THREADS` and `MKL_NUM_THREADS` are set (when
+           `intra_op_threads` is) for native libraries initialised after this
+           point (e.g. in DataLoader workers).
+        """
+        if determinism_config.get('full_determinism', False):
+            self._logger.info("Full determinism is enabled, skipping thread configuration.")
+            return
+
+        intra_op_threads, inter_op_threads = self._resolve_thread_counts(performance_config)
+        self._logger.info(
+            f"Configuring {intra_op_threads or 'default'} intra-op and {inter_op_threads or 'default'} "
+            f"inter-op threads ({available_cpu_count()} CPUs available)."
+        )
+
+        if intra_op_threads is not None:
+            os.environ['OMP_NUM_THREADS'] = str(intra_op_threads)
+            os.environ['MKL_NUM_THREADS'] = str(intra_op_threads)
+
+        if performance_config.get('thread_affinity', False):
+            # Bind OpenMP threads to neighbouring physical cores (GNU OpenMP and Intel OpenMP respectively)
+            os.environ['OMP_PROC_BIND'] = 'close'
+            os.environ['OMP_PLACES'] = 'cores'
+            os.environ['KMP_AFFINITY'] = 'granularity=fine,compact,1,0'
+            os.environ['KMP_BLOCKTIME'] = '1'
+
+        self._setup_framework_specific_performance(intra_op_threads, inter_op_threads, performance_config)
+
+    def _setup_distribution(self, distributed_config: Dict[str, Any]) -> None:
+        """
+        Set up framework-level distributed training.
+
+        Subclasses may override this method; the default does nothing (e.g.
+        PyTorch trainers initialise their process group themselves).
+
+        Parameters
+        ----------
+        distributed_config : Dict[str, Any]
+            The subsection of the config related to distributed training.
+        """
+        pass
+
+    def _setup_framework_specific_performance(
+        self,
+        intra_op_threads: Optional[int],
+        inter_op_threads: Optional[int],
+        performance_config: Dict[str, Any]
+    ) -> None:
+        """
+        Apply thread counts and precision settings to the framework.
+
+        Subclasses may override this method; the default does nothing.
+
+        Parameters
+        ----------
+        intra_op_threads : Optional[int]
+            The resolved number of intra-op threads, or `None` to keep the
+            framework default.
+        inter_op_threads : Optional[int]
+            The resolved number of inter-op threads, or `None` to keep the
+            framework default.
+        performance_config : Dict[str, Any]
+            The subsection of the config related to performance.
+        """
+        pass
+
+    @staticmethod
+    def _resolve_thread_counts(performance_config: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Resolve the configured intra-op and inter-op thread counts.
+
+        Parameters
+        ----------
+        performance_config : Dict[str, Any]
+            The subsection of the config related to performance.
+
+        Returns
+        -------
+        Tuple[Optional[int], Optional[int]]
+            The intra-op and inter-op thread counts, or `None` for a count
+            that is not set.
+
+        Raises
+        ------
+        ValueError
+            If a thread count is neither `'auto'` nor a positive integer.
+        """
+        cpu_count = available_cpu_count()
+        defaults = {'intra_op_threads': cpu_count, 'inter_op_threads': min(2, cpu_count)}
+
+        thread_counts = []
+        for key, default in defaults.items():
+            value = performance_config.get(key)
+            if value is None:
+                thread_counts.append(None)
+                continue
+            if value == 'auto':
+                value = default
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(f"`performance.{key}` must be 'auto' or a positive integer, got '{value}'.")
+            thread_counts.append(value)
+
+        return thread_counts[0], thread_counts[1]
+
     @abstractmethod
     def _setup_framework_specific_environment(self, determinism_config: Dict[str, Any]) -> None:
         """
@@ -97,7 +346,105 @@ class BaseTrainingEnvironment(ABC):
 class KerasTrainingEnvironment(BaseTrainingEnvironment):
     """
     Sets up a deterministic environment specifically for TensorFlow/Keras.
+
+    Attributes
+    ----------
+    _strategy : tf.distribute.Strategy
+        The distribution strategy created from the 'distributed' config
+        section, if distributed training is enabled.
     """
+    _STRATEGIES = ('default', 'mirrored', 'multi_worker_mirrored')
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__(logger)
+        self._strategy: Optional[tf.distribute.Strategy] = None
+
+    @property
+    def strategy(self) -> tf.distribute.Strategy:
+        """
+        The configured distribution strategy, or TensorFlow's default (single
+        device) strategy if none is configured.
+
+        Returns
+        -------
+        tf.distribute.Strategy
+            The distribution strategy.
+        """
+        return self._strategy if self._strategy is not None else tf.distribute.get_strategy()
+
+    def _setup_distribution(self, distributed_config: Dict[str, Any]) -> None:
+        """
+        Create the `tf.distribute` strategy selected in the config.
+
+        The following keys of the `distributed` config section are used:
+        - `enabled`: Whether to train with a distribution strategy (default
+          `False`).
+        - `strategy`: `'mirrored'` (default; synchronous training on the local
+          devices), `'multi_worker_mirrored'` (synchronous training across
+          workers described by `TF_CONFIG`) or `'default'`.
+        - `devices`: Devices for `'mirrored'` (default: all local GPUs, or
+          the CPU devices if there are none).
+        - `logical_cpu_devices`: Optional number of logical devices to split
+          the CPU into, e.g. to test multi-replica training on a CPU-only host.
+        - `communication`: Collective implementation for
+          `'multi_worker_mirrored'`, one of `'auto'` (default), `'ring'` or
+          `'nccl'`.
+
+        Parameters
+        ----------
+        distributed_config : Dict[str, Any]
+            The subsection of the config related to distributed training.
+
+        Raises
+        ------
+        ValueError
+            If the configured strategy is not supported.
+
+        Notes
+        -----
+        Logical devices and multi-worker strategies can only be set up before
+        the TensorFlow runtime is initialised, so the environment should be
+        set up before any other TensorFlow operation runs.
+        """
+        if not distributed_config.get('enabled', False):
+            return
+
+        strategy_name = distributed_config.get('strategy', 'mirrored')
+        if strategy_name not in self._STRATEGIES:
+            raise ValueError(
+                f"Unsupported `distributed.strategy` value '{strategy_name}'. Expected one of {self._STRATEGIES}."
+            )
+
+        logical_cpu_devices = distributed_config.get('logical_cpu_devices')
+        if logical_cpu_devices:
+            try:
+                tf.config.set_logical_device_configuration(
+                    tf.config.list_physical_devices('CPU')[0],
+                    [tf.config.LogicalDeviceConfiguration() for _ in range(logical_cpu_devices)]
+                )
+            except RuntimeError as e:
+                self._logger.warning(f"Could not create {logical_cpu_devices} logical CPU devices: {e}")
+
+        if strategy_name == 'mirrored':
+            devices = distributed_config.get('devices')
+            if devices is None and not tf.config.list_logical_devices('GPU'):
+                devices = [device.name for device in tf.config.list_logical_devices('CPU')]
+            self._strategy = tf.distribute.MirroredStrategy(devices=devices)
+        elif strategy_name == 'multi_worker_mirrored':
+            implementation = getattr(
+                tf.distribute.experimental.CommunicationImplementation,
+                distributed_config.get('communication', 'auto').upper()
+            )
+            self._strategy = tf.distribute.MultiWorkerMirroredStrategy(
+                communication_options=tf.distribute.experimental.CommunicationOptions(implementation=implementation)
+            )
+        else:
+            self._strategy = tf.distribute.get_strategy()
+
+        self._logger.info(
+            f"Using {type(self._strategy).__name__} with {self._strategy.num_replicas_in_sync} replicas in sync."
+        )
+
     def _setup_framework_specific_environment(self, determinism_config: Dict[str, Any]) -> None:
         """
         Configure TensorFlow for deterministic operations.
@@ -115,7 +462,11 @@ class KerasTrainingEnvironment(BaseTrainingEnvironment):
         -----
         1. Seeds TensorFlow's random number generator.
         2. Enables deterministic operations in TensorFlow by setting `TF_DETERMINISTIC_OPS=1`.
-        3. Optionally disables GPU and limits TensorFlow to single-threaded execution when
+        3. When `deterministic_ops` (or `full_determinism`) is set to `True` in the config, calls
+           `tf.config.experimental.enable_op_determinism()`, so that ops use deterministic kernels and
+           `tf.data` pipelines produce elements in a fixed order. Multi-threaded execution is kept, as the
+           kernels that would be non-deterministic across threads are replaced rather than serialised.
+        4. Optionally disables GPU and limits TensorFlow to single-threaded execution when
            `full_determinism` is set to `True` in the config.
             - This is because modern GPUs and CPUs are designed to execute computations in parallel across many cores.
             - This parallelism is typically managed asynchronously, meaning that the order of operations or the
@@ -128,11 +479,14 @@ class KerasTrainingEnvironment(BaseTrainingEnvironment):
         self._logger.info("Performing TensorFlow-specific environment setup...")
         tf.random.set_seed(determinism_config.get('tf_seed', 42))
 
-        tf.random.set_seed(determinism_config['tf_seed'])
-
         # Configure TensorFlow for deterministic operations
         os.environ['TF_DETERMINISTIC_OPS'] = '1'
 
+        if op_determinism_enabled(determinism_config):
+            # Selects deterministic kernels (and raises for ops that have none), but keeps the thread pools
+            self._logger.info("Enabling deterministic TensorFlow ops.")
+            tf.config.experimental.enable_op_determinism()
+
         # Optional, performance-impacting settings for full determinism
         if determinism_config.get('full_determinism', False):
             self._logger.warning("Enabling full determinism for TensorFlow. This will impact performance.")
@@ -158,6 +512,48 @@ class KerasTrainingEnvironment(BaseTrainingEnvironment):
             tf.config.threading.set_intra_op_parallelism_threads(1)
             tf.config.threading.set_inter_op_parallelism_threads(1)
 
+    def _setup_framework_specific_performance(
+        self,
+        intra_op_threads: Optional[int],
+        inter_op_threads: Optional[int],
+        performance_config: Dict[str, Any]
+    ) -> None:
+        """
+        Configure TensorFlow thread pools and TensorFloat-32 execution.
+
+        Parameters
+        ----------
+        intra_op_threads : Optional[int]
+            The resolved number of intra-op threads, or `None` to keep the
+            framework default.
+        inter_op_threads : Optional[int]
+            The resolved number of inter-op threads, or `None` to keep the
+            framework default.
+        performance_config : Dict[str, Any]
+            The subsection of the config related to performance.
+
+        Notes
+        -----
+        TensorFlow thread pools can only be configured before the runtime is
+        initialised (i.e. before the first op runs). If it already has been,
+        a warning is logged and the existing thread pools are kept.
+        """
+        if intra_op_threads is not None:
+            os.environ['TF_NUM_INTRAOP_THREADS'] = str(intra_op_threads)
+        if inter_op_threads is not None:
+            os.environ['TF_NUM_INTEROP_THREADS'] = str(inter_op_threads)
+
+        try:
+            if intra_op_threads is not None:
+                tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+            if inter_op_threads is not None:
+                tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+        except RuntimeError as e:
+            self._logger.warning(f"Could not configure TensorFlow thread pools: {e}")
+
+        if performance_config.get('allow_tf32') is not None:
+            tf.config.experimental.enable_tensor_float_32_execution(performance_config['allow_tf32'])
+
 
 class PyTorchTrainingEnvironment(BaseTrainingEnvironment):
     """
@@ -180,8 +576,13 @@ class PyTorchTrainingEnvironment(BaseTrainingEnvironment):
         1. Seeds PyTorch's random number generators for both CPU (`torch.manual_seed`)
            and all CUDA devices (`torch.cuda.manual_seed_all`) for consistent
            weight initialization and dropout.
-        2. Optionally configures the cuDNN backend for deterministic behavior when
-           `full_determinism` is set to `True` in the config.
+        2. Optionally configures PyTorch for deterministic behavior when
+           `deterministic_ops` (or `full_determinism`) is set to `True` in the config.
+           - `torch.use_deterministic_algorithms(True)` selects deterministic
+             implementations of ops and raises for ops that have none, or only
+             warns if `warn_only` is set in the config.
+           - `CUBLAS_WORKSPACE_CONFIG` is set (unless already set), as cuBLAS
+             requires a fixed workspace size for deterministic results.
            - Modern GPUs use non-deterministic algorithms for operations like
              convolutions because they are often faster.
            - `torch.backends.cudnn.deterministic = True` forces cuDNN to use
@@ -200,8 +601,56 @@ class PyTorchTrainingEnvironment(BaseTrainingEnvironment):
         if torch.cuda.is_available():
             torch.cuda.manual_seed_all(determinism_config.get('torch_seed', 42))
 
-        if determinism_config.get('full_determinism', False):
-            self._logger.warning("Enabling full determinism for PyTorch. This may impact performance.")
+        if op_determinism_enabled(determinism_config):
+            warn_only = determinism_config.get('warn_only', False)
+            self._logger.info(f"Enabling deterministic PyTorch algorithms (warn_only={warn_only}).")
+            os.environ.setdefault('CUBLAS_WORKSPACE_CONFIG', ':4096:8')
+            torch.use_deterministic_algorithms(True, warn_only=warn_only)
             torch.backends.cudnn.deterministic = True
-            torch.backends.cudunn.benchmark = False
+            torch.backends.cudnn.benchmark = False
+
+    def _setup_framework_specific_performance(
+        self,
+        intra_op_threads: Optional[int],
+        inter_op_threads: Optional[int],
+        performance_config: Dict[str, Any]
+    ) -> None:
+        """
+        Configure PyTorch thread pools and matmul precision.
+
+        Parameters
+        ----------
+        intra_op_threads : Optional[int]
+            The resolved number of intra-op threads, or `None` to keep the
+            framework default.
+        inter_op_threads : Optional[int]
+            The resolved number of inter-op threads, or `None` to keep the
+            framework default.
+        performance_config : Dict[str, Any]
+            The subsection of the config related to performance.
+
+        Notes
+        -----
+        1. `torch.set_num_interop_threads` can only be called once, before any
+           inter-op parallel work has started. If that is no longer possible,
+           a warning is logged and the existing thread pool is kept.
+        2. `matmul_precision` below `'highest'` lets float32 matmuls use
+           TensorFloat-32 or bfloat16 internally where the hardware supports it.
+        """
+        if intra_op_threads is not None:
+            torch.set_num_threads(intra_op_threads)
+
+        if inter_op_threads is not None and torch.get_num_interop_threads() != inter_op_threads:
+            try:
+                torch.set_num_interop_threads(inter_op_threads)
+            except RuntimeError as e:
+                self._logger.warning(f"Could not configure PyTorch inter-op threads: {e}")
+
+        matmul_precision = performance_config.get('matmul_precision')
+        if matmul_precision is not None:
+            torch.set_float32_matmul_precision(matmul_precision)
+
+        if performance_config.get('allow_tf32') is not None:
+            torch.backends.cuda.matmul.allow_tf32 = performance_config['allow_tf32']
+            torch.backends.cudnn.allow_tf32 = performance_config['allow_tf32']
         
\ No newline at end of file
@@ -0,0 +1,372 @@
+import os
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import numpy as np
+
+
+class StreamingMetric(ABC):
+    """
+    Abstract base class for a metric accumulated batch by batch.
+
+    The state of a metric is a small float64 vector of running sums, which
+    every batch updates with vectorised NumPy operations. Because the state
+    is additive, the states of several shards (e.g. distributed ranks) can be
+    combined by summing them.
+
+    Attributes
+    ----------
+    name : str
+        The name under which the metric is reported.
+    _state : np.ndarray
+        The running sums of the metric.
+    """
+    name: str = ''
+    _STATE_SIZE: int = 2
+
+    def __init__(self):
+        self._state = np.zeros(self._STATE_SIZE, dtype=np.float64)
+
+    @property
+    def state(self) -> np.ndarray:
+        """
+        The additive state of the metric.
+        """
+        return self._state
+
+    @state.setter
+    def state(self, state: np.ndarray):
+        self._state = np.asarray(state, dtype=np.float64).reshape(self._STATE_SIZE)
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray):
+        """
+        Accumulate a batch of targets and predictions.
+
+        Parameters
+        ----------
+        y_true : np.ndarray
+            The batch of targets.
+        y_pred : np.ndarray
+            The batch of model outputs.
+        """
+        self._state += self._batch_state(np.asarray(y_true), np.asarray(y_pred))
+
+    def result(self) -> float:
+        """
+        Return the metric over all accumulated batches (NaN if none).
+        """
+        total, count = self._state
+        return float(total / count) if count else float('nan')
+
+    @abstractmethod
+    def _batch_state(self, y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+        """
+        Return the additive state contribution of a batch.
+        """
+        raise NotImplementedError
+
+
+class MeanSquaredError(StreamingMetric):
+    """
+    The mean squared error over all target elements.
+    """
+    name = 'mean_squared_error'
+
+    def _batch_state(self, y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+        error = y_pred.astype(np.float64) - y_true.reshape(y_pred.shape)
+        return np.array([np.dot(error.ravel(), error.ravel()), error.size])
+
+
+class MeanAbsoluteError(StreamingMetric):
+    """
+    The mean absolute error over all target elements.
+    """
+    name = 'mean_absolute_error'
+
+    def _batch_state(self, y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+        error = y_pred.astype(np.float64) - y_true.reshape(y_pred.shape)
+        return np.array([np.abs(error).sum(), error.size])
+
+
+class Accuracy(StreamingMetric):
+    """
+    The classification accuracy.
+
+    Predictions with one more dimension than the targets are treated as
+    class scores and reduced with `argmax`; a trailing dimension of size 1
+    is treated as a binary probability and thresholded at 0.5. Otherwise,
+    predictions are compared to the targets directly.
+    """
+    name = 'accuracy'
+
+    def _batch_state(self, y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+        if y_pred.ndim == y_true.ndim + 1 and y_pred.shape[-1] > 1:
+            y_pred = y_pred.argmax(axis=-1)
+        elif y_pred.shape[-1:] == (1,) and np.issubdtype(y_pred.dtype, np.floating):
+            y_pred = (y_pred > 0.5).astype(y_true.dtype)
+
+        correct = y_pred.reshape(y_true.shape) == y_true
+        return np.array([correct.sum(), correct.size])
+
+
+class TopKAccuracy(StreamingMetric):
+    """
+    The fraction of targets among the `k` highest class scores.
+    """
+    name = 'top_k_accuracy'
+
+    def __init__(self, k: int = 5):
+        super().__init__()
+        self._k = k
+
+    def _batch_state(self, y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+        k = min(self._k, y_pred.shape[-1])
+        top_k = np.argpartition(y_pred, -k, axis=-1)[..., -k:]
+        correct = (top_k == y_true.reshape(*y_pred.shape[:-1], 1)).any(axis=-1)
+
+        return np.array([correct.sum(), correct.size])
+
+
+METRICS: Dict[str, Type[StreamingMetric]] = {
+    'mean_squared_error': MeanSquaredError,
+    'mse': MeanSquaredError,
+    'mean_absolute_error': MeanAbsoluteError,
+    'mae': MeanAbsoluteError,
+    'accuracy': Accuracy,
+    'top_k_accuracy': TopKAccuracy
+}
+
+
+def build_metrics(names: Sequence[str]) -> List[StreamingMetric]:
+    """
+    Build streaming metrics from their names.
+
+    Parameters
+    ----------
+    names : Sequence[str]
+        Metric names, from `METRICS`.
+
+    Returns
+    -------
+    List[StreamingMetric]
+        A new accumulator for every metric.
+
+    Raises
+    ------
+    ValueError
+        If a metric name is not supported.
+    """
+    unknown = [name for name in names if name not in METRICS]
+    if unknown:
+        raise ValueError(f"Unsupported evaluation metrics {unknown}. Expected names from {sorted(METRICS)}.")
+
+    return [METRICS[name]() for name in names]
+
+
+class NpyStreamWriter:
+    """
+    Stream batches of rows into a `.npy` file without holding them in memory.
+
+    A fixed-size header is reserved when the file is created, every batch is
+    appended as raw bytes, and the header is rewritten with the final number
+    of rows on `close()`. The resulting file is a standard `.npy` file that
+    can be memory-mapped with `np.load(path, mmap_mode='r')`.
+
+    Attributes
+    ----------
+    _path : str
+        The output path.
+    _file : BinaryIO
+        The open output file, created on the first write.
+    _dtype : np.dtype
+        The dtype of the rows, fixed by the first batch.
+    _row_shape : Tuple[int, ...]
+        The shape of every row, fixed by the first batch.
+    _num_rows : int
+        The number of rows written so far.
+    """
+    # Room for the header of any realistic shape; the format requires a multiple of 64
+    HEADER_SIZE = 256
+
+    def __init__(self, path: str):
+        self._path = path
+        self._file = None
+        self._dtype = None
+        self._row_shape = None
+        self._num_rows = 0
+
+    @property
+    def num_rows(self) -> int:
+        """
+        The number of rows written so far.
+        """
+        return self._num_rows
+
+    def write(self, batch: np.ndarray):
+        """
+        Append a batch of rows.
+
+        Parameters
+        ----------
+        batch : np.ndarray
+            The rows to append, with a leading batch dimension.
+
+        Raises
+        ------
+        ValueError
+            If the rows do not have the shape of the previously written rows.
+        """
+        batch = np.asarray(batch)
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+            self._file = open(self._path, 'wb')
+            self._dtype = batch.dtype
+            self._row_shape = batch.shape[1:]
+            self._write_header()
+        elif batch.shape[1:] != self._row_shape:
+            raise ValueError(
+                f"Cannot write rows of shape {batch.shape[1:]} to '{self._path}', "
+                f"which holds rows of shape {self._row_shape}."
+            )
+
+        self._file.write(np.ascontiguousarray(batch, dtype=self._dtype).tobytes())
+        self._num_rows += batch.shape[0]
+
+    def close(self):
+        """
+        Finalise the header with the number of rows written and close the file.
+        """
+        if self._file is None:
+            return
+
+        self._file.seek(0)
+        self._write_header()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> 'NpyStreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_header(self):
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(self._dtype),
+            'fortran_order': False,
+            'shape': (self._num_rows, *self._row_shape)
+        })
+        # The magic string (8 bytes) and the header length (2 bytes) precede the space-padded header
+        header_length = self.HEADER_SIZE - 10
+        if len(header) + 1 > header_length:
+            raise ValueError(f"The `.npy` header for rows of shape {self._row_shape} is too long.")
+
+        self._file.write(np.lib.format.magic(1, 0))
+        self._file.write(header_length.to_bytes(2, 'little'))
+        self._file.write(header.ljust(header_length - 1).encode('latin1') + b'\n')
+
+
+class StreamingEvaluator:
+    """
+    Accumulates evaluation metrics and exports predictions in a single pass.
+
+    Trainers feed every evaluation batch to `update()`, as NumPy arrays.
+    Metrics are accumulated with vectorised NumPy operations, and
+    predictions are streamed to a `.npy` file, so neither the outputs nor
+    the targets of the whole dataset are held in memory.
+
+    Attributes
+    ----------
+    _metrics : List[StreamingMetric]
+        The metric accumulators.
+    _writer : NpyStreamWriter
+        The prediction writer, if predictions are exported.
+    _loss_state : np.ndarray
+        The sample-weighted loss sum and the number of samples.
+    """
+    def __init__(
+        self,
+        metric_names: Sequence[str] = (),
+        predictions_path: Optional[str] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialise the StreamingEvaluator.
+
+        Parameters
+        ----------
+        metric_names : Sequence[str], optional
+            The names of the metrics to compute (see `METRICS`).
+        predictions_path : str, optional
+            If given, the `.npy` path predictions are streamed to.
+        logger : logging.Logger, optional
+            Logger for the exported predictions.
+        """
+        self._metrics = build_metrics(metric_names)
+        self._writer = NpyStreamWriter(predictions_path) if predictions_path else None
+        self._loss_state = np.zeros(2, dtype=np.float64)
+        self._logger = logger if logger else logging.getLogger(__name__)
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray, loss: Optional[float] = None):
+        """
+        Accumulate a batch.
+
+        Parameters
+        ----------
+        y_true : np.ndarray
+            The batch of targets.
+        y_pred : np.ndarray
+            The batch of model outputs.
+        loss : float, optional
+            The mean loss over the batch.
+        """
+        if loss is not None:
+            self._loss_state += (loss * len(y_pred), len(y_pred))
+        for metric in self._metrics:
+            metric.update(y_true, y_pred)
+        if self._writer is not None:
+            self._writer.write(y_pred)
+
+    def state(self) -> np.ndarray:
+        """
+        Return the additive state of the loss and every metric, as one vector.
+        """
+        return np.concatenate([self._loss_state, *(metric.state for metric in self._metrics)])
+
+    def load_state(self, state: np.ndarray):
+        """
+        Replace the accumulated state, e.g. with the sum of every rank's `state()`.
+        """
+        state = np.asarray(state, dtype=np.float64)
+        self._loss_state = state[:2].copy()
+        offset = 2
+        for metric in self._metrics:
+            metric.state = state[offset:offset + metric.state.size]
+            offset += metric.state.size
+
+    def results(self) -> Dict[str, float]:
+        """
+        Return the loss (if reported) and every metric.
+        """
+        results = {}
+        if self._loss_state[1]:
+            results['loss'] = float(self._loss_state[0] / self._loss_state[1])
+        for metric in self._metrics:
+            results[metric.name] = metric.result()
+
+        return results
+
+    def close(self):
+        """
+        Finalise the prediction file, if any.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._logger.info(f"Wrote {self._writer.num_rows} predictions to {self._writer._path}")
+
+    def __enter__(self) -> 'StreamingEvaluator':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
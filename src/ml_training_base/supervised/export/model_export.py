@@ -0,0 +1,336 @@
+import copy
+import json
+import os
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import torch
+import tensorflow as tf
+
+DEFAULT_BENCHMARK_BATCH_SIZES = (1, 8, 32)
+
+# Module types replaced by dynamically quantised int8 equivalents
+TORCH_DYNAMIC_QUANTIZATION_MODULES = {torch.nn.Linear, torch.nn.LSTM, torch.nn.GRU}
+
+
+def resize_batch(batch: Any, batch_size: int) -> Any:
+    """
+    Tile or truncate a batch along its first dimension to `batch_size` examples.
+
+    Parameters
+    ----------
+    batch : Any
+        A tensor, array, or a (nested) tuple, list or dict of them.
+    batch_size : int
+        The number of examples in the resized batch.
+
+    Returns
+    -------
+    Any
+        The resized batch, with the same structure and types.
+    """
+    if isinstance(batch, (list, tuple)):
+        return type(batch)(resize_batch(item, batch_size) for item in batch)
+    if isinstance(batch, dict):
+        return {key: resize_batch(value, batch_size) for key, value in batch.items()}
+    if isinstance(batch, torch.Tensor):
+        repeats = -(-batch_size // batch.shape[0])
+        return batch.repeat(repeats, *([1] * (batch.dim() - 1)))[:batch_size]
+    if isinstance(batch, (np.ndarray, tf.Tensor)):
+        array = np.asarray(batch)
+        array = np.concatenate([array] * -(-batch_size // array.shape[0]))[:batch_size]
+        return tf.constant(array) if isinstance(batch, tf.Tensor) else array
+
+    return batch
+
+
+def benchmark_latency(
+    predict_fn: Callable[[Any], Any],
+    example_batch: Any,
+    batch_sizes: Sequence[int] = DEFAULT_BENCHMARK_BATCH_SIZES,
+    warmup_iterations: int = 3,
+    iterations: int = 20
+) -> List[Dict[str, float]]:
+    """
+    Measure the CPU latency and throughput of a predict function at several batch sizes.
+
+    Parameters
+    ----------
+    predict_fn : Callable[[Any], Any]
+        Runs inference on a batch. It must block until the outputs are ready.
+    example_batch : Any
+        An example input batch, resized to every batch size with `resize_batch`.
+    batch_sizes : Sequence[int], optional
+        The batch sizes to benchmark (default (1, 8, 32)).
+    warmup_iterations : int, optional
+        Untimed calls per batch size, e.g. to trigger tracing (default 3).
+    iterations : int, optional
+        Timed calls per batch size (default 20).
+
+    Returns
+    -------
+    List[Dict[str, float]]
+        For every batch size, the mean, median and 95th percentile latency in
+        milliseconds, and the throughput in examples per second.
+    """
+    results = []
+    for batch_size in batch_sizes:
+        batch = resize_batch(example_batch, batch_size)
+        for _ in range(warmup_iterations):
+            predict_fn(batch)
+
+        latencies = np.empty(iterations)
+        for iteration in range(iterations):
+            start = time.perf_counter()
+            predict_fn(batch)
+            latencies[iteration] = time.perf_counter() - start
+
+        results.append({
+            'batch_size': batch_size,
+            'mean_latency_ms': float(latencies.mean() * 1e3),
+            'p50_latency_ms': float(np.percentile(latencies, 50) * 1e3),
+            'p95_latency_ms': float(np.percentile(latencies, 95) * 1e3),
+            'throughput_per_second': float(batch_size / latencies.mean())
+        })
+
+    return results
+
+
+def write_benchmark_report(
+    results: Dict[str, List[Dict[str, float]]],
+    path: str,
+    logger: Optional[logging.Logger] = None
+) -> None:
+    """
+    Write benchmark results per exported format to a JSON file and log a summary.
+
+    Parameters
+    ----------
+    results : Dict[str, List[Dict[str, float]]]
+        The `benchmark_latency` results of every format.
+    path : str
+        The output JSON path.
+    logger : logging.Logger, optional
+        Logger for the summary.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump({'device': 'cpu', 'threads': torch.get_num_threads(), 'results': results}, file, indent=2)
+
+    logger = logger if logger else logging.getLogger(__name__)
+    for export_format, rows in results.items():
+        summary = ', '.join(f"bs={row['batch_size']}: {row['mean_latency_ms']:.2f} ms" for row in rows)
+        logger.info(f"Inference latency ({export_format}): {summary}")
+    logger.info(f"Benchmark report written to {path}")
+
+
+def quantize_torch_dynamic_int8(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Return a CPU copy of a model with dynamically quantised int8 linear and recurrent layers.
+
+    Weights are quantised ahead of time, and activations are quantised on the
+    fly for every batch, so no calibration data is needed.
+
+    Parameters
+    ----------
+    model : torch.nn.Module
+        The float model, which is not modified.
+
+    Returns
+    -------
+    torch.nn.Module
+        The quantised model, in evaluation mode.
+    """
+    model = copy.deepcopy(model).cpu().eval()
+    return torch.ao.quantization.quantize_dynamic(model, TORCH_DYNAMIC_QUANTIZATION_MODULES, dtype=torch.qint8)
+
+
+def export_torchscript(model: torch.nn.Module, example_inputs: Any, path: str) -> torch.jit.ScriptModule:
+    """
+    Trace a model to TorchScript, freeze it and optimise it for inference.
+
+    Freezing inlines the parameters as constants, which lets
+    `optimize_for_inference` fold constants and fuse operators such as
+    convolutions and batch normalisation.
+
+    Parameters
+    ----------
+    model : torch.nn.Module
+        The model, called as `model(example_inputs)`.
+    example_inputs : Any
+        An example input batch used for tracing.
+    path : str
+        The output path.
+
+    Returns
+    -------
+    torch.jit.ScriptModule
+        The optimised module, as saved.
+    """
+    model = model.eval()
+    with torch.inference_mode(False), torch.no_grad():
+        traced = torch.jit.trace(model, (example_inputs,))
+        optimized = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    torch.jit.save(optimized, path)
+
+    return optimized
+
+
+def export_torch_program(model: torch.nn.Module, example_inputs: Any, path: str) -> torch.nn.Module:
+    """
+    Export a model with `torch.export`, with a dynamic batch dimension.
+
+    Parameters
+    ----------
+    model : torch.nn.Module
+        The model, called as `model(example_inputs)`.
+    example_inputs : Any
+        An example input batch used for tracing.
+    path : str
+        The output `.pt2` path.
+
+    Returns
+    -------
+    torch.nn.Module
+        A module running the exported program.
+    """
+    program = torch.export.export(
+        model.eval(),
+        (example_inputs,),
+        dynamic_shapes=(_batch_dynamic_shapes(example_inputs),)
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    torch.export.save(program, path)
+
+    return program.module()
+
+
+def export_torch_onnx(model: torch.nn.Module, example_inputs: Any, path: str) -> None:
+    """
+    Export a model to ONNX, with a dynamic batch dimension.
+
+    Parameters
+    ----------
+    model : torch.nn.Module
+        The model, called as `model(example_inputs)`.
+    example_inputs : Any
+        An example input batch used for tracing.
+    path : str
+        The output `.onnx` path.
+
+    Raises
+    ------
+    ImportError
+        If the optional `onnx` and `onnxscript` packages are not installed.
+    """
+    _require_packages('ONNX export', 'onnx', 'onnxscript')
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    torch.onnx.export(
+        model.eval(),
+        (example_inputs,),
+        path,
+        dynamic_shapes=(_batch_dynamic_shapes(example_inputs),),
+        dynamo=True
+    )
+
+
+def quantize_keras_dynamic_int8(model: tf.keras.Model) -> tf.keras.Model:
+    """
+    Return a copy of a Keras model with int8 quantised `Dense`, `EinsumDense` and `Embedding` layers.
+
+    Parameters
+    ----------
+    model : tf.keras.Model
+        The float model, which is not modified. It must be clonable, i.e. a
+        Sequential or functional model, or a subclassed model with `get_config`.
+
+    Returns
+    -------
+    tf.keras.Model
+        The quantised model.
+    """
+    quantized = tf.keras.models.clone_model(model)
+    quantized.set_weights(model.get_weights())
+    quantized.quantize('int8')
+
+    return quantized
+
+
+def export_saved_model(model: tf.keras.Model, input_signature: Any, path: str) -> Callable[[Any], Any]:
+    """
+    Export a Keras model as a TensorFlow SavedModel with a fixed serving signature.
+
+    Parameters
+    ----------
+    model : tf.keras.Model
+        The model to export.
+    input_signature : Any
+        The `tf.TensorSpec` structure of the model inputs, with `None` for
+        dynamic dimensions such as the batch dimension.
+    path : str
+        The output directory.
+
+    Returns
+    -------
+    Callable[[Any], Any]
+        The `serve` endpoint of the reloaded SavedModel.
+    """
+    model.export(path, format='tf_saved_model', input_signature=[input_signature], verbose=False)
+    loaded = tf.saved_model.load(path)
+
+    # The endpoint's variables are owned by the loaded object, which must be kept alive
+    def serve(inputs: Any) -> Any:
+        return loaded.serve(inputs)
+
+    return serve
+
+
+def export_keras_onnx(model: tf.keras.Model, input_signature: Any, path: str) -> None:
+    """
+    Export a Keras model to ONNX.
+
+    Parameters
+    ----------
+    model : tf.keras.Model
+        The model to export.
+    input_signature : Any
+        The `tf.TensorSpec` structure of the model inputs.
+    path : str
+        The output `.onnx` path.
+
+    Raises
+    ------
+    ImportError
+        If the optional `onnx` and `tf2onnx` packages are not installed.
+    """
+    _require_packages('ONNX export', 'onnx', 'tf2onnx')
+    model.export(path, format='onnx', input_signature=[input_signature], verbose=False)
+
+
+def _batch_dynamic_shapes(inputs: Any) -> Any:
+    """
+    Mark the first dimension of every tensor in a (nested) input as dynamic.
+    """
+    if isinstance(inputs, torch.Tensor):
+        return {0: torch.export.Dim.AUTO}
+    if isinstance(inputs, (list, tuple)):
+        return type(inputs)(_batch_dynamic_shapes(item) for item in inputs)
+    if isinstance(inputs, dict):
+        return {key: _batch_dynamic_shapes(value) for key, value in inputs.items()}
+
+    return None
+
+
+def _require_packages(feature: str, *packages: str) -> None:
+    """
+    Raise an ImportError naming the optional packages a feature needs, if any are missing.
+    """
+    import importlib.util
+
+    missing = [package for package in packages if importlib.util.find_spec(package) is None]
+    if missing:
+        raise ImportError(f"{feature} requires the optional packages {missing} (`pip install {' '.join(missing)}`).")
@@ -0,0 +1,89 @@
+import functools
+from typing import Sequence
+
+import tensorflow as tf
+import torch
+from torch.utils.checkpoint import checkpoint
+
+
+def checkpoint_torch_modules(model: torch.nn.Module, module_types: Sequence[str], use_reentrant: bool = False) -> int:
+    """
+    Enable activation checkpointing on every submodule of the given types.
+
+    The activations inside a checkpointed module are not kept for the
+    backward pass; the module's forward pass is recomputed instead, trading
+    extra compute for lower peak memory. Modules are patched in place by
+    replacing their instance `forward`, so parameter names and `state_dict`
+    keys are unchanged. Checkpointing only applies while gradients are
+    enabled, so inference and export are unaffected.
+
+    Parameters
+    ----------
+    model : torch.nn.Module
+        The model to patch.
+    module_types : Sequence[str]
+        Class names of the modules to checkpoint, e.g.
+        `['TransformerEncoderLayer']`.
+    use_reentrant : bool, optional
+        Whether to use the reentrant `torch.utils.checkpoint` implementation
+        (default `False`).
+
+    Returns
+    -------
+    int
+        The number of checkpointed modules.
+    """
+    num_checkpointed = 0
+    for module in model.modules():
+        if type(module).__name__ not in module_types or module is model:
+            continue
+
+        module.forward = functools.partial(_checkpointed_forward, module.forward, use_reentrant)
+        num_checkpointed += 1
+
+    return num_checkpointed
+
+
+def checkpoint_keras_layers(model: tf.keras.Model, layer_types: Sequence[str]) -> int:
+    """
+    Enable activation checkpointing (rematerialisation) on every layer of the given types.
+
+    The Keras equivalent of `checkpoint_torch_modules`: the `call` of every
+    matching layer is wrapped in `tf.recompute_grad`, so its activations are
+    recomputed during the backward pass instead of being stored. The model
+    must be built first, so that no variables are created inside the
+    recomputed function.
+
+    Parameters
+    ----------
+    model : tf.keras.Model
+        The built model to patch.
+    layer_types : Sequence[str]
+        Class names of the layers to checkpoint, e.g. `['TransformerBlock']`.
+
+    Returns
+    -------
+    int
+        The number of checkpointed layers.
+    """
+    num_checkpointed = 0
+    for layer in model._flatten_layers(include_self=False):
+        if type(layer).__name__ not in layer_types:
+            continue
+
+        layer.call = functools.partial(_recomputed_call, layer.call)
+        num_checkpointed += 1
+
+    return num_checkpointed
+
+
+def _checkpointed_forward(forward, use_reentrant: bool, *args, **kwargs):
+    if not torch.is_grad_enabled():
+        return forward(*args, **kwargs)
+
+    return checkpoint(forward, *args, use_reentrant=use_reentrant, **kwargs)
+
+
+def _recomputed_call(call, inputs, *args, **kwargs):
+    # `tf.recompute_grad` only supports keyword arguments in eager mode, so they are bound in a closure
+    return tf.recompute_grad(lambda tensors: call(tensors, *args, **kwargs))(inputs)
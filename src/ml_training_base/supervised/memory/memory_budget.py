@@ -0,0 +1,142 @@
+import gc
+import math
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+from ml_training_base.utils.memory_utils import PeakRSSMonitor
+
+
+def probe_peak_rss(step_fn: Callable[[int], None], batch_size: int) -> Optional[int]:
+    """
+    Run a probing step and return the peak RSS it reached.
+
+    Parameters
+    ----------
+    step_fn : Callable[[int], None]
+        Runs one or more training steps at the given batch size.
+    batch_size : int
+        The batch size to probe.
+
+    Returns
+    -------
+    int or None
+        The peak RSS in bytes, or `None` if the step ran out of memory.
+    """
+    gc.collect()
+    try:
+        with PeakRSSMonitor() as monitor:
+            step_fn(batch_size)
+    except MemoryError:
+        return None
+    except RuntimeError as e:
+        # PyTorch and TensorFlow surface allocation failures as RuntimeErrors (or subclasses)
+        if 'memory' not in str(e).lower():
+            raise
+        return None
+
+    return monitor.peak_bytes
+
+
+def find_max_batch_size(
+    step_fn: Callable[[int], None],
+    max_rss_bytes: int,
+    max_batch_size: int,
+    min_batch_size: int = 1,
+    multiple_of: int = 1,
+    logger: Optional[logging.Logger] = None
+) -> int:
+    """
+    Find the largest batch size whose training step stays under an RSS limit.
+
+    Batch sizes are probed by doubling from `min_batch_size` until a probe
+    exceeds the limit (or `max_batch_size` is reached), and the boundary is
+    then refined by bisection. Peak memory grows with the batch size, so
+    this needs `O(log(max_batch_size))` probes.
+
+    Parameters
+    ----------
+    step_fn : Callable[[int], None]
+        Runs one or more training steps at the given batch size, without
+        changing the model's weights.
+    max_rss_bytes : int
+        The RSS limit, in bytes.
+    max_batch_size : int
+        The largest batch size considered.
+    min_batch_size : int, optional
+        The smallest batch size considered (default 1).
+    multiple_of : int, optional
+        Batch sizes above `min_batch_size` are refined to multiples of this
+        value (default 1).
+    logger : logging.Logger, optional
+        Logger for the probes.
+
+    Returns
+    -------
+    int
+        The largest batch size that fits.
+
+    Raises
+    ------
+    RuntimeError
+        If even `min_batch_size` does not fit under the limit.
+    """
+    logger = logger if logger else logging.getLogger(__name__)
+    results: Dict[int, bool] = {}
+
+    def fits(batch_size: int) -> bool:
+        if batch_size not in results:
+            peak_bytes = probe_peak_rss(step_fn, batch_size)
+            results[batch_size] = peak_bytes is not None and peak_bytes <= max_rss_bytes
+            peak = f"{peak_bytes / 2 ** 20:.0f} MiB" if peak_bytes is not None else "out of memory"
+            logger.info(f"Memory budget probe: batch_size={batch_size} - peak RSS {peak}")
+        return results[batch_size]
+
+    largest_fit, smallest_failure = 0, None
+    batch_size = min_batch_size
+    while batch_size <= max_batch_size:
+        if not fits(batch_size):
+            smallest_failure = batch_size
+            break
+        largest_fit = batch_size
+        if batch_size == max_batch_size:
+            break
+        batch_size = min(batch_size * 2, max_batch_size)
+
+    if smallest_failure is not None:
+        while True:
+            middle = (largest_fit + smallest_failure) // 2 // multiple_of * multiple_of
+            if middle <= max(largest_fit, min_batch_size - 1):
+                break
+            if fits(middle):
+                largest_fit = middle
+            else:
+                smallest_failure = middle
+
+    if largest_fit < min_batch_size:
+        raise RuntimeError(
+            f"No batch size from {min_batch_size} fits under the memory budget of {max_rss_bytes / 2 ** 20:.0f} MiB."
+        )
+
+    return largest_fit
+
+
+def plan_gradient_accumulation(effective_batch_size: int, max_batch_size: int) -> Tuple[int, int]:
+    """
+    Split an effective batch size into the fewest accumulation steps that fit.
+
+    Parameters
+    ----------
+    effective_batch_size : int
+        The number of examples per optimizer step.
+    max_batch_size : int
+        The largest batch size that fits in memory.
+
+    Returns
+    -------
+    Tuple[int, int]
+        The per-step batch size and the number of gradient accumulation
+        steps. Their product is at least `effective_batch_size`, and exceeds
+        it by less than one example per step.
+    """
+    accumulation_steps = math.ceil(effective_batch_size / max_batch_size)
+    return math.ceil(effective_batch_size / accumulation_steps), accumulation_steps
@@ -0,0 +1,352 @@
+import os
+import csv
+import copy
+import json
+import time
+import logging
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+import numpy as np
+import yaml
+
+from ml_training_base.supervised.environments.base_training_environments import BaseTrainingEnvironment
+from ml_training_base.supervised.sweeps.trial_schedulers import TrialScheduler
+from ml_training_base.supervised.trainers.base_supervised_trainers import BaseSupervisedTrainer
+from ml_training_base.utils.config_utils import load_config
+from ml_training_base.utils.hardware_utils import available_cpu_count
+from ml_training_base.utils.logging_utils import configure_logger
+from ml_training_base.utils.shared_memory_utils import MEMMAP, SharedArrayDescriptor, SharedArrayStore, attach_arrays
+
+# Memory-mapped shared arrays, loaded once per worker process by `_init_worker`
+_WORKER_SHARED_DATA: Dict[str, np.ndarray] = {}
+
+
+def grid_trials(search_space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a grid search space into a list of trial config overrides.
+
+    Parameters
+    ----------
+    search_space : Dict[str, Sequence[Any]]
+        Candidate values for each dotted config key, e.g.
+        `{'training.learning_rate': [1e-3, 1e-4]}`.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One override dictionary per combination of values.
+    """
+    keys = list(search_space)
+    return [dict(zip(keys, values)) for values in itertools.product(*search_space.values())]
+
+
+def apply_overrides(config: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a copy of a config with dotted-key overrides applied.
+
+    Parameters
+    ----------
+    config : Dict[str, Any]
+        The base configuration.
+    overrides : Dict[str, Any]
+        Values keyed by dotted paths, e.g. `{'training.epochs': 5}`. Missing
+        intermediate sections are created.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The updated copy of the configuration.
+    """
+    config = copy.deepcopy(config)
+    for dotted_key, value in overrides.items():
+        *sections, key = dotted_key.split('.')
+        section = config
+        for name in sections:
+            section = section.setdefault(name, {})
+        section[key] = value
+
+    return config
+
+
+class SweepRunner:
+    """
+    Runs hyperparameter trials concurrently against one shared, prepared dataset.
+
+    The dataset is prepared once by the caller and published as memory-mapped
+    `.npy` files by a `SharedArrayStore`, which every trial attaches to
+    read-only, so trials neither re-run data preparation nor hold private
+    copies of the data. Trials run in a pool of long-lived worker processes,
+    so each worker imports and initialises the frameworks once and then runs
+    many trials.
+
+    Each trial gets its own directory with its config, logs, checkpoints and
+    model. An optional `TrialScheduler` (e.g. `AsyncSuccessiveHalving` or
+    `MedianStoppingRule`) stops unpromising trials early, and the results of
+    all trials are written to `results.csv` and `results.json`.
+
+    Trainers receive the shared arrays through `set_shared_data`, so their
+    `_setup_data` should build datasets from `self._shared_data`.
+
+    Attributes
+    ----------
+    _trainer_cls : Type[BaseSupervisedTrainer]
+        The trainer class, which must be importable (defined at module level).
+    _training_env_cls : Type[BaseTrainingEnvironment]
+        The training environment class.
+    _config_path : str
+        Path of the base YAML configuration.
+    _trials : List[Dict[str, Any]]
+        The dotted-key config overrides of each trial.
+    _sweep_dir : str
+        Directory for the shared data, trial directories and results.
+    _max_concurrent_trials : int
+        The number of trials run concurrently.
+    _scheduler : TrialScheduler
+        Optional early termination scheduler.
+    """
+    RESULTS_CSV = 'results.csv'
+    RESULTS_JSON = 'results.json'
+
+    def __init__(
+        self,
+        trainer_cls: Type[BaseSupervisedTrainer],
+        training_env_cls: Type[BaseTrainingEnvironment],
+        config_path: str,
+        trials: Sequence[Dict[str, Any]],
+        sweep_dir: str,
+        shared_data: Optional[Dict[str, np.ndarray]] = None,
+        max_concurrent_trials: Optional[int] = None,
+        scheduler: Optional[TrialScheduler] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialise the SweepRunner.
+
+        Parameters
+        ----------
+        trainer_cls : Type[BaseSupervisedTrainer]
+            The trainer class, which must be importable (defined at module
+            level) so worker processes can load it.
+        training_env_cls : Type[BaseTrainingEnvironment]
+            The training environment class, constructed with a logger.
+        config_path : str
+            Path of the base YAML configuration.
+        trials : Sequence[Dict[str, Any]]
+            The dotted-key config overrides of each trial (see `grid_trials`).
+        sweep_dir : str
+            Directory for the shared data, trial directories and results.
+        shared_data : Dict[str, np.ndarray], optional
+            Prepared arrays shared by all trials.
+        max_concurrent_trials : int, optional
+            The number of trials run concurrently (default: the `sweep.
+            max_concurrent_trials` config value, or 1).
+        scheduler : TrialScheduler, optional
+            Early termination scheduler.
+        logger : logging.Logger, optional
+            Logger for sweep progress.
+        """
+        self._trainer_cls = trainer_cls
+        self._training_env_cls = training_env_cls
+        self._config_path = config_path
+        self._trials = [dict(trial) for trial in trials]
+        self._sweep_dir = sweep_dir
+        self._shared_data = shared_data or {}
+        self._scheduler = scheduler
+        self._logger = logger if logger else logging.getLogger(__name__)
+
+        base_config = load_config(config_path)
+        if max_concurrent_trials is None:
+            max_concurrent_trials = base_config.get('sweep', {}).get('max_concurrent_trials', 1)
+        self._max_concurrent_trials = max(1, min(int(max_concurrent_trials), len(self._trials) or 1))
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Run all trials and write the consolidated results table.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            One result per trial, best first. Each result has the trial's
+            `trial_id`, `status` (`'completed'`, `'stopped'` or `'failed'`),
+            `overrides`, `best_metric`, `last_metric`, `epochs`,
+            `duration_seconds`, `trial_dir` and `error`.
+        """
+        os.makedirs(self._sweep_dir, exist_ok=True)
+        trial_specs = [self._prepare_trial(index, overrides) for index, overrides in enumerate(self._trials)]
+
+        self._logger.info(
+            f"Running {len(trial_specs)} trials with up to {self._max_concurrent_trials} concurrent trials..."
+        )
+        results = []
+        context = multiprocessing.get_context('spawn')
+        shared_data_dir = os.path.join(self._sweep_dir, 'shared_data')
+        with SharedArrayStore(backend=MEMMAP, directory=shared_data_dir, logger=self._logger) as store, \
+                context.Manager() as manager:
+            shared_data = {name: store.put(name, array) for name, array in self._shared_data.items()}
+            if self._scheduler is not None:
+                self._scheduler.attach(manager)
+
+            with ProcessPoolExecutor(
+                max_workers=self._max_concurrent_trials,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(shared_data,)
+            ) as executor:
+                futures = [
+                    executor.submit(_run_trial, self._trainer_cls, self._training_env_cls, spec, self._scheduler)
+                    for spec in trial_specs
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    results.append(result)
+                    self._logger.info(
+                        f"Trial {result['trial_id']} {result['status']} after {result['epochs']} epochs "
+                        f"(best {self._metric_name()}: {result['best_metric']})."
+                    )
+
+        results = self._sort_results(results)
+        self._write_results(results)
+
+        return results
+
+    def _prepare_trial(self, index: int, overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Write a trial's config, redirecting its outputs into the trial directory.
+
+        Unless overridden, every trial is limited to its share of the CPUs,
+        so that concurrent trials do not oversubscribe the host.
+        """
+        trial_id = f"trial_{index:04d}"
+        trial_dir = os.path.abspath(os.path.join(self._sweep_dir, trial_id))
+        os.makedirs(trial_dir, exist_ok=True)
+
+        threads_per_trial = max(1, available_cpu_count() // self._max_concurrent_trials)
+        trial_overrides = {
+            'data.logger_path': os.path.join(trial_dir, 'training.log'),
+            'training.model_save_dir': os.path.join(trial_dir, 'model'),
+            'training.checkpoint_dir': os.path.join(trial_dir, 'checkpoints'),
+            'training.tensorboard_dir': os.path.join(trial_dir, 'tensorboard'),
+            'performance.intra_op_threads': threads_per_trial,
+            'performance.inter_op_threads': 1,
+            **overrides
+        }
+        config = apply_overrides(load_config(self._config_path), trial_overrides)
+
+        config_path = os.path.join(trial_dir, 'config.yaml')
+        with open(config_path, 'w') as file:
+            yaml.safe_dump(config, file)
+
+        return {
+            'trial_id': trial_id,
+            'trial_dir': trial_dir,
+            'config_path': config_path,
+            'log_path': config['data']['logger_path'],
+            'overrides': overrides
+        }
+
+    def _metric_name(self) -> str:
+        return self._scheduler.metric if self._scheduler is not None else 'val_loss'
+
+    def _sort_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Sort results best first, with failed trials and trials without metrics last.
+        """
+        sign = -1 if self._scheduler is not None and self._scheduler.mode == 'max' else 1
+
+        def sort_key(result: Dict[str, Any]):
+            metric = result['best_metric']
+            return (metric is None, sign * metric if metric is not None else 0.0, result['trial_id'])
+
+        return sorted(results, key=sort_key)
+
+    def _write_results(self, results: List[Dict[str, Any]]):
+        """
+        Write the consolidated results table as CSV (one column per override) and JSON.
+        """
+        override_keys = sorted({key for result in results for key in result['overrides']})
+        columns = ['trial_id', 'status', *override_keys, 'best_metric', 'last_metric', 'epochs',
+                   'duration_seconds', 'trial_dir', 'error']
+
+        csv_path = os.path.join(self._sweep_dir, self.RESULTS_CSV)
+        with open(csv_path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=columns)
+            writer.writeheader()
+            for result in results:
+                row = {key: value for key, value in result.items() if key != 'overrides'}
+                row.update(result['overrides'])
+                writer.writerow(row)
+
+        with open(os.path.join(self._sweep_dir, self.RESULTS_JSON), 'w') as file:
+            json.dump(results, file, indent=2, default=str)
+
+        self._logger.info(f"Sweep results written to {csv_path}.")
+
+
+def _init_worker(shared_data: Dict[str, SharedArrayDescriptor]) -> None:
+    """
+    Memory-map the shared arrays once per worker process.
+    """
+    _WORKER_SHARED_DATA.clear()
+    _WORKER_SHARED_DATA.update(attach_arrays(shared_data))
+
+
+def _run_trial(
+    trainer_cls: Type[BaseSupervisedTrainer],
+    training_env_cls: Type[BaseTrainingEnvironment],
+    spec: Dict[str, Any],
+    scheduler: Optional[TrialScheduler]
+) -> Dict[str, Any]:
+    """
+    Run a single trial in a worker process and summarise its outcome.
+    """
+    metric = scheduler.metric if scheduler is not None else 'val_loss'
+    mode = scheduler.mode if scheduler is not None else 'min'
+    history: List[float] = []
+    stopped = []
+
+    def report(epoch: int, logs: Dict[str, float]) -> bool:
+        # Epochs without the metric (e.g. `val_loss` without validation) are not reported, since
+        # substituting another metric would compare unrelated quantities across trials
+        value = logs.get(metric)
+        if value is None:
+            return False
+        history.append(float(value))
+        if scheduler is not None and scheduler.should_stop(spec['trial_id'], epoch + 1, float(value)):
+            stopped.append(epoch + 1)
+            return True
+        return False
+
+    start = time.perf_counter()
+    error = None
+    try:
+        # The trainer configures the same logger, so environment setup is logged to the trial's log file
+        os.makedirs(os.path.dirname(spec['log_path']), exist_ok=True)
+        trainer = trainer_cls(
+            config_path=spec['config_path'],
+            training_env=training_env_cls(logger=configure_logger(spec['log_path']))
+        )
+        trainer.set_shared_data(_WORKER_SHARED_DATA)
+        trainer.add_epoch_end_hook(report)
+        trainer.run()
+        status = 'stopped' if stopped else 'completed'
+    except Exception as e:
+        status, error = 'failed', f"{type(e).__name__}: {e}"
+
+    best_metric = None
+    if history:
+        best_metric = min(history) if mode == 'min' else max(history)
+
+    return {
+        'trial_id': spec['trial_id'],
+        'status': status,
+        'overrides': spec['overrides'],
+        'best_metric': best_metric,
+        'last_metric': history[-1] if history else None,
+        'epochs': len(history),
+        'duration_seconds': round(time.perf_counter() - start, 3),
+        'trial_dir': spec['trial_dir'],
+        'error': error
+    }
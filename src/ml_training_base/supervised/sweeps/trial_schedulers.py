@@ -0,0 +1,243 @@
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class TrialScheduler(ABC):
+    """
+    Abstract base class for early termination of sweep trials.
+
+    Trials report their monitored metric at the end of every epoch, and the
+    scheduler decides whether the trial should stop. Reports from all trials
+    are recorded in a shared store, so decisions can compare trials running
+    concurrently in different processes.
+
+    Attributes
+    ----------
+    _metric : str
+        The name of the monitored metric, e.g. `'val_loss'`.
+    _mode : str
+        Whether a lower (`'min'`) or higher (`'max'`) metric is better.
+    _records : Dict[int, Dict[str, float]]
+        For every step, the reported (sign-normalised, lower is better) metric
+        of each trial.
+    """
+    def __init__(self, metric: str = 'val_loss', mode: str = 'min'):
+        """
+        Initialise the TrialScheduler.
+
+        Parameters
+        ----------
+        metric : str, optional
+            The name of the monitored metric (default `'val_loss'`).
+        mode : str, optional
+            `'min'` if a lower metric is better, `'max'` otherwise (default
+            `'min'`).
+
+        Raises
+        ------
+        ValueError
+            If `mode` is not `'min'` or `'max'`.
+        """
+        if mode not in ('min', 'max'):
+            raise ValueError(f"`mode` must be 'min' or 'max', got '{mode}'.")
+
+        self._metric = metric
+        self._mode = mode
+        self._records: Any = {}
+        self._lock: Any = threading.Lock()
+
+    @property
+    def metric(self) -> str:
+        """
+        The name of the monitored metric.
+        """
+        return self._metric
+
+    @property
+    def mode(self) -> str:
+        """
+        Whether a lower (`'min'`) or higher (`'max'`) metric is better.
+        """
+        return self._mode
+
+    def attach(self, manager: Any) -> None:
+        """
+        Move the record store into a `multiprocessing` manager, so that trials
+        running in worker processes share it.
+
+        Parameters
+        ----------
+        manager : multiprocessing.managers.SyncManager
+            A started manager.
+        """
+        self._records = manager.dict()
+        self._lock = manager.Lock()
+
+    def should_stop(self, trial_id: str, step: int, value: float) -> bool:
+        """
+        Record a trial's metric and decide whether the trial should stop.
+
+        Parameters
+        ----------
+        trial_id : str
+            The ID of the reporting trial.
+        step : int
+            The number of completed epochs.
+        value : float
+            The trial's monitored metric after `step` epochs.
+
+        Returns
+        -------
+        bool
+            Whether the trial should stop.
+        """
+        value = value if self._mode == 'min' else -value
+        if math.isnan(value):
+            return True
+
+        with self._lock:
+            step_records = dict(self._records.get(step, {}))
+            step_records[trial_id] = value
+            self._records[step] = step_records
+
+            return self._decide(trial_id, step, value, step_records)
+
+    @abstractmethod
+    def _decide(self, trial_id: str, step: int, value: float, step_records: Dict[str, float]) -> bool:
+        """
+        Decide whether a trial should stop, given every trial's record at `step`.
+
+        Values are normalised so that lower is better.
+        """
+        raise NotImplementedError
+
+
+class MedianStoppingRule(TrialScheduler):
+    """
+    Stop a trial whose best metric so far is worse than the median of other
+    trials' metrics at the same step.
+
+    Attributes
+    ----------
+    _grace_period : int
+        The number of steps before a trial can be stopped.
+    _min_samples : int
+        The minimum number of other trials reported at a step before the rule
+        is applied.
+    _best : Dict[str, float]
+        The best (normalised) metric reported by each trial so far.
+    """
+    def __init__(self, metric: str = 'val_loss', mode: str = 'min', grace_period: int = 1, min_samples: int = 3):
+        """
+        Initialise the MedianStoppingRule.
+
+        Parameters
+        ----------
+        metric : str, optional
+            The name of the monitored metric (default `'val_loss'`).
+        mode : str, optional
+            `'min'` if a lower metric is better, `'max'` otherwise (default
+            `'min'`).
+        grace_period : int, optional
+            The number of steps before a trial can be stopped (default 1).
+        min_samples : int, optional
+            The minimum number of other trials reported at a step before the
+            rule is applied (default 3).
+        """
+        super().__init__(metric=metric, mode=mode)
+        self._grace_period = grace_period
+        self._min_samples = min_samples
+        self._best: Dict[str, float] = {}
+
+    def _decide(self, trial_id: str, step: int, value: float, step_records: Dict[str, float]) -> bool:
+        # Each trial only reports from one process, so its best value can be tracked locally
+        best = min(value, self._best.get(trial_id, value))
+        self._best[trial_id] = best
+
+        others = [other for other_id, other in step_records.items() if other_id != trial_id]
+        if step < self._grace_period or len(others) < self._min_samples:
+            return False
+
+        return best > float(np.median(others))
+
+
+class AsyncSuccessiveHalving(TrialScheduler):
+    """
+    Asynchronous successive halving (ASHA).
+
+    Rungs are placed at `grace_period * reduction_factor ** k` steps. When a
+    trial reaches a rung, it continues only if its metric is within the best
+    `1 / reduction_factor` of the metrics recorded at that rung so far.
+    Decisions never wait for other trials, so workers are never idle.
+
+    Attributes
+    ----------
+    _grace_period : int
+        The step of the first rung.
+    _reduction_factor : int
+        The inverse of the fraction of trials promoted at each rung.
+    _max_t : int
+        The last step at which rungs are placed.
+    """
+    def __init__(
+        self,
+        metric: str = 'val_loss',
+        mode: str = 'min',
+        grace_period: int = 1,
+        reduction_factor: int = 3,
+        max_t: Optional[int] = None
+    ):
+        """
+        Initialise the AsyncSuccessiveHalving scheduler.
+
+        Parameters
+        ----------
+        metric : str, optional
+            The name of the monitored metric (default `'val_loss'`).
+        mode : str, optional
+            `'min'` if a lower metric is better, `'max'` otherwise (default
+            `'min'`).
+        grace_period : int, optional
+            The step of the first rung (default 1).
+        reduction_factor : int, optional
+            The inverse of the fraction of trials promoted at each rung
+            (default 3).
+        max_t : int, optional
+            The last step at which rungs are placed (default: unbounded).
+
+        Raises
+        ------
+        ValueError
+            If `grace_period` is below 1 or `reduction_factor` is below 2.
+        """
+        if grace_period < 1 or reduction_factor < 2:
+            raise ValueError("`grace_period` must be at least 1 and `reduction_factor` at least 2.")
+
+        super().__init__(metric=metric, mode=mode)
+        self._grace_period = grace_period
+        self._reduction_factor = reduction_factor
+        self._max_t = max_t
+
+    def is_rung(self, step: int) -> bool:
+        """
+        Return whether `step` is a rung of the successive halving schedule.
+        """
+        if step < self._grace_period or (self._max_t is not None and step > self._max_t):
+            return False
+
+        rung = self._grace_period
+        while rung < step:
+            rung *= self._reduction_factor
+
+        return rung == step
+
+    def _decide(self, trial_id: str, step: int, value: float, step_records: Dict[str, float]) -> bool:
+        if not self.is_rung(step):
+            return False
+
+        cutoff = float(np.percentile(list(step_records.values()), 100 / self._reduction_factor))
+        return value > cutoff
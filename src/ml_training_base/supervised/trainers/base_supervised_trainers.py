@@ -1,15 +1,82 @@
 import os
+import copy
+import time
+import random
+import logging
+import itertools
+import contextlib
+from datetime import timedelta
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Union
+from typing import Callable, Dict, Any, List, Sequence, Union
+
+import numpy as np
 
 import torch
+import torch.distributed as dist
+import torch.nn.functional as F
 import tensorflow as tf
+from torch.nn.parallel import DistributedDataParallel
+from torch.utils.data.distributed import DistributedSampler
 from tensorflow.keras.callbacks import (Callback, EarlyStopping, TensorBoard,
                                         ReduceLROnPlateau, ModelCheckpoint)
 
+from ml_training_base.supervised.checkpoints.async_checkpoint_manager import (
+    AsyncCheckpointManager,
+    AsyncModelCheckpoint,
+    save_keras_weights
+)
+from ml_training_base.supervised.checkpoints.training_state import (
+    BackupAndRestoreWithRngState,
+    capture_rng_state,
+    restore_rng_state
+)
+from ml_training_base.supervised.data.bucketing import (
+    LengthBucketBatchSampler,
+    bucket_boundaries_from_lengths,
+    bucket_tf_dataset,
+    estimate_tf_bucket_padding_efficiency
+)
+from ml_training_base.supervised.data.pytorch_data_loaders import build_data_loader
+from ml_training_base.supervised.distributed.pytorch_distributed import all_reduce_sum, get_local_rank
 from ml_training_base.supervised.environments.base_training_environments import BaseTrainingEnvironment
+from ml_training_base.supervised.evaluation.streaming_evaluation import StreamingEvaluator
+from ml_training_base.supervised.export.model_export import (
+    DEFAULT_BENCHMARK_BATCH_SIZES,
+    benchmark_latency,
+    resize_batch,
+    export_keras_onnx,
+    export_saved_model,
+    export_torch_onnx,
+    export_torch_program,
+    export_torchscript,
+    quantize_keras_dynamic_int8,
+    quantize_torch_dynamic_int8,
+    write_benchmark_report
+)
+from ml_training_base.supervised.memory.activation_checkpointing import (
+    checkpoint_keras_layers,
+    checkpoint_torch_modules
+)
+from ml_training_base.supervised.memory.memory_budget import find_max_batch_size, plan_gradient_accumulation
 from ml_training_base.utils.config_utils import load_config
 from ml_training_base.utils.logging_utils import configure_logger
+from ml_training_base.utils.memory_utils import MemoryMonitor
+from ml_training_base.utils.resource_utils import ResourceSampler
+
+
+def _flag_last(iterable):
+    """
+    Yield `(item, is_last)` pairs, reading one item ahead.
+    """
+    iterator = iter(iterable)
+    try:
+        item = next(iterator)
+    except StopIteration:
+        return
+    for next_item in iterator:
+        yield item, False
+        item = next_item
+    yield item, True
 
 
 class BaseSupervisedTrainer(ABC):
@@ -29,11 +96,28 @@ class BaseSupervisedTrainer(ABC):
         and device configs for deterministic training).
     _logger : logging.Logger
         Logger instance for logging messages.
+    _shared_data : Dict[str, Any]
+        Prepared data handed to the trainer by its caller (e.g. memory-mapped
+        arrays shared by the trials of a sweep), which `_setup_data` can use
+        instead of loading the data itself.
+    _epoch_end_hooks : List[Callable[[int, Dict[str, float]], bool]]
+        Functions called with the epoch number and metrics at the end of every
+        epoch. Training stops early if any of them returns `True`.
+    _memory_monitor : MemoryMonitor
+        Background memory sampler, set up when `training.memory_monitor` is
+        enabled.
+    _resource_sampler : ResourceSampler
+        Background CPU, load, disk and context-switch sampler, set up when
+        `training.resource_sampler` is enabled.
     """
     def __init__(self, config_path: str, training_env: BaseTrainingEnvironment):
         self._config: Dict[str, Any] = load_config(config_path)
         self._training_env = training_env
         self._logger = self._setup_logger()
+        self._shared_data: Dict[str, Any] = {}
+        self._epoch_end_hooks: List[Callable[[int, Dict[str, float]], bool]] = []
+        self._memory_monitor: Union[MemoryMonitor, None] = None
+        self._resource_sampler: Union[ResourceSampler, None] = None
 
     def run(self):
         """
@@ -46,6 +130,7 @@ class BaseSupervisedTrainer(ABC):
         4. _train
         5. _save_model
         6. _evaluate
+        7. _export_model
 
         Raises
         ------
@@ -60,9 +145,13 @@ class BaseSupervisedTrainer(ABC):
             self._train()
             self._save_model()
             self._evaluate()
+            self._export_model()
         except Exception as e:
             self._logger.error(f"An error occurred during the training pipeline: {e}")
             raise
+        finally:
+            self._stop_memory_monitor()
+            self._stop_resource_sampler()
 
     @abstractmethod
     def _setup_data(self):
@@ -151,6 +240,16 @@ class BaseSupervisedTrainer(ABC):
         """
         raise NotImplementedError
 
+    def _export_model(self):
+        """
+        Export serving artifacts of the trained model.
+
+        Runs last in the pipeline, after evaluation, so that exports and their
+        benchmarks never delay the test metrics. Subclasses may override this
+        method; the default exports nothing.
+        """
+        return
+
     def _setup_environment(self):
         """
         Configure the training environment.
@@ -159,8 +258,123 @@ class BaseSupervisedTrainer(ABC):
         the environment, which typically involves setting random seeds and
         configuring hardware usage (GPU/CPU) for deterministic training.
         """
+        self._setup_resource_sampler()
         self._logger.info("Setting up training environment...")
         self._training_env.setup_environment(self._config)
+        self._setup_memory_monitor()
+
+    def _setup_resource_sampler(self):
+        """
+        Start a `ResourceSampler` if `training.resource_sampler.enabled` is set.
+
+        The `training.resource_sampler` config section supports the following keys:
+        - `enabled`: Whether to sample resource usage (default `False`).
+        - `interval_seconds`: Seconds between samples (default 1.0).
+        - `timeline_path`: The CSV timeline file (default: samples are logged
+          at DEBUG level, i.e. to the log file only).
+        - `underuse_threshold`: The fraction of the available CPUs below
+          which the end-of-run summary warns (default 0.5).
+
+        The sampler is started before the environment is set up and stopped
+        when `run()` finishes, so it covers every stage of the pipeline.
+        """
+        sampler_conf = self._config.get('training', {}).get('resource_sampler') or {}
+        if not sampler_conf.get('enabled', False) or self._resource_sampler is not None:
+            return
+
+        self._resource_sampler = ResourceSampler(
+            interval=sampler_conf.get('interval_seconds', 1.0),
+            timeline_path=sampler_conf.get('timeline_path'),
+            underuse_threshold=sampler_conf.get('underuse_threshold', 0.5),
+            logger=self._logger
+        )
+        self._resource_sampler.start()
+
+    def _stop_resource_sampler(self):
+        """
+        Stop the resource sampler, if running, which logs its end-of-run summary.
+
+        The sampler is dropped, so a later `run()` starts a new sampler.
+        """
+        if self._resource_sampler is not None:
+            self._resource_sampler.stop()
+            self._resource_sampler = None
+
+    def _setup_memory_monitor(self):
+        """
+        Start a `MemoryMonitor` if `training.memory_monitor.enabled` is set.
+
+        The `training.memory_monitor` config section supports the following keys:
+        - `enabled`: Whether to monitor memory (default `False`).
+        - `interval_seconds`: Seconds between RSS samples (default 1.0).
+        - `timeline_path`: The CSV timeline file (default
+          `memory_timeline.csv` in the log directory).
+        - `top_n`: Allocation sites logged per epoch (default 10).
+        - `growth_threshold_mb`: RSS growth per epoch above which a warning
+          is logged (default 256).
+        - `warmup_epochs`: First epochs not checked against the threshold
+          (default 1).
+        - `trace_python`: Whether to trace Python allocations with
+          `tracemalloc` (default `True`).
+        - `traceback_frames`: Frames stored per traced allocation (default 1).
+
+        The monitor takes a snapshot at the end of every epoch (as an epoch
+        end hook), samples the framework allocator statistics returned by
+        `_allocator_stats`, and is stopped when `run()` finishes.
+        """
+        monitor_conf = self._config.get('training', {}).get('memory_monitor') or {}
+        if not monitor_conf.get('enabled', False) or self._memory_monitor is not None:
+            return
+
+        log_path = self._config.get('data', {}).get('logger_path', 'var/log/default_logs.log')
+        self._memory_monitor = MemoryMonitor(
+            interval=monitor_conf.get('interval_seconds', 1.0),
+            timeline_path=monitor_conf.get(
+                'timeline_path',
+                os.path.join(os.path.dirname(log_path), 'memory_timeline.csv')
+            ),
+            top_n=monitor_conf.get('top_n', 10),
+            growth_threshold_mb=monitor_conf.get('growth_threshold_mb', 256),
+            warmup_epochs=monitor_conf.get('warmup_epochs', 1),
+            trace_python=monitor_conf.get('trace_python', True),
+            traceback_frames=monitor_conf.get('traceback_frames', 1),
+            allocator_stats=self._allocator_stats,
+            logger=self._logger
+        )
+        self._memory_monitor.start()
+        self.add_epoch_end_hook(self._memory_monitor_epoch_end)
+
+    def _memory_monitor_epoch_end(self, epoch: int, logs: Dict[str, float]) -> bool:
+        """
+        Epoch end hook taking the memory monitor's epoch snapshot. Never stops training.
+        """
+        self._memory_monitor.epoch_end(epoch)
+        return False
+
+    def _stop_memory_monitor(self):
+        """
+        Stop the memory monitor, if running, which logs its summary and closes its timeline.
+
+        The monitor and its epoch end hook are dropped, so a later `run()`
+        starts a new monitor.
+        """
+        if self._memory_monitor is not None:
+            self._memory_monitor.stop()
+            self._epoch_end_hooks.remove(self._memory_monitor_epoch_end)
+            self._memory_monitor = None
+
+    def _allocator_stats(self) -> Dict[str, int]:
+        """
+        Return framework allocator statistics sampled by the memory monitor.
+
+        Subclasses may override this method; the default returns none.
+
+        Returns
+        -------
+        Dict[str, int]
+            Allocator statistics in bytes, by name.
+        """
+        return {}
 
     def _setup_logger(self):
         """
@@ -191,6 +405,145 @@ class BaseSupervisedTrainer(ABC):
         """
         return self._config
 
+    def set_shared_data(self, shared_data: Dict[str, Any]):
+        """
+        Hand already-prepared data to the trainer before `run()`.
+
+        Parameters
+        ----------
+        shared_data : Dict[str, Any]
+            Named data objects (e.g. NumPy arrays), available to `_setup_data`
+            as `self._shared_data`.
+        """
+        self._shared_data = dict(shared_data)
+
+    def add_epoch_end_hook(self, hook: Callable[[int, Dict[str, float]], bool]):
+        """
+        Register a function called at the end of every training epoch.
+
+        Parameters
+        ----------
+        hook : Callable[[int, Dict[str, float]], bool]
+            Called with the zero-indexed epoch and the epoch's metrics (e.g.
+            `loss` and `val_loss`). Returning `True` stops training early.
+        """
+        self._epoch_end_hooks.append(hook)
+
+    def _run_epoch_end_hooks(self, epoch: int, logs: Dict[str, float]) -> bool:
+        """
+        Call every epoch end hook and return whether any requested to stop training.
+        """
+        stop_training = False
+        for hook in self._epoch_end_hooks:
+            stop_training = bool(hook(epoch, logs)) or stop_training
+
+        return stop_training
+
+    def _plan_memory_budget(self, step_fn: Callable[[int], None]) -> bool:
+        """
+        Fit the batch size to an RSS limit with a short probing run.
+
+        The `training.memory_budget` config section supports the following keys:
+        - `enabled`: Whether to probe for a batch size (default `False`).
+        - `max_rss_mb`: The RSS limit of the process, in MiB (required).
+        - `mode`: `'batch_size'` to train with the largest batch size that
+          fits, up to `max_batch_size`, or `'gradient_accumulation'` to keep
+          the effective batch size (`data.batch_size` times
+          `training.gradient_accumulation_steps`) and split it into the
+          fewest accumulation steps that fit (default `'batch_size'`).
+        - `max_batch_size`: The largest batch size considered in
+          `'batch_size'` mode (default `data.batch_size`).
+        - `min_batch_size`: The smallest batch size considered (default 1).
+        - `multiple_of`: Probed batch sizes are refined to multiples of this
+          value (default 8).
+        - `probe_steps`: Forward and backward passes per probe (default 2).
+
+        The chosen values are written back to `data.batch_size` and
+        `training.gradient_accumulation_steps`.
+
+        Parameters
+        ----------
+        step_fn : Callable[[int], None]
+            Runs `probe_steps` training steps at a batch size, without
+            changing the model's weights.
+
+        Returns
+        -------
+        bool
+            Whether `data.batch_size` changed, so the data must be set up again.
+
+        Raises
+        ------
+        ValueError
+            If `max_rss_mb` is missing or `mode` is not supported.
+        """
+        budget_conf = self._config.get('training', {}).get('memory_budget') or {}
+        if not budget_conf.get('enabled', False):
+            return False
+
+        mode = budget_conf.get('mode', 'batch_size')
+        if mode not in ('batch_size', 'gradient_accumulation'):
+            raise ValueError(f"`memory_budget.mode` must be 'batch_size' or 'gradient_accumulation', got '{mode}'.")
+        if budget_conf.get('max_rss_mb') is None:
+            raise ValueError("`memory_budget.max_rss_mb` must be set when the memory budget is enabled.")
+
+        data_conf = self._config.setdefault('data', {})
+        train_conf = self._config.setdefault('training', {})
+        batch_size = data_conf.get('batch_size', 32)
+        accumulation_steps = train_conf.get('gradient_accumulation_steps', 1)
+
+        if mode == 'batch_size':
+            max_batch_size = budget_conf.get('max_batch_size', batch_size)
+        else:
+            max_batch_size = batch_size * accumulation_steps
+
+        self._logger.info(
+            f"Probing for the largest batch size up to {max_batch_size} under "
+            f"{budget_conf['max_rss_mb']} MiB RSS..."
+        )
+        fitted_batch_size = self._agree_on_batch_size(find_max_batch_size(
+            step_fn,
+            max_rss_bytes=int(budget_conf['max_rss_mb'] * 2 ** 20),
+            max_batch_size=max_batch_size,
+            min_batch_size=budget_conf.get('min_batch_size', 1),
+            multiple_of=budget_conf.get('multiple_of', 8),
+            logger=self._logger
+        ))
+
+        if mode == 'batch_size':
+            new_batch_size = fitted_batch_size
+        else:
+            new_batch_size, accumulation_steps = plan_gradient_accumulation(max_batch_size, fitted_batch_size)
+
+        self._logger.info(
+            f"Memory budget: batch_size={new_batch_size}, gradient_accumulation_steps={accumulation_steps} "
+            f"(configured batch_size={batch_size})."
+        )
+        data_conf['batch_size'] = new_batch_size
+        train_conf['gradient_accumulation_steps'] = accumulation_steps
+
+        return new_batch_size != batch_size
+
+    def _agree_on_batch_size(self, batch_size: int) -> int:
+        """
+        Return the batch size all training processes use, given this process's largest fitting batch size.
+        """
+        return batch_size
+
+class _EpochEndHookCallback(Callback):
+    """
+    Keras callback running a trainer's epoch end hooks and stopping training on request.
+    """
+    def __init__(self, run_hooks: Callable[[int, Dict[str, float]], bool]):
+        super().__init__()
+        self._run_hooks = run_hooks
+
+    def on_epoch_end(self, epoch, logs=None):
+        logs = {key: float(value) for key, value in (logs or {}).items()}
+        if self._run_hooks(epoch, logs):
+            self.model.stop_training = True
+
+
 class BaseKerasSupervisedTrainer(BaseSupervisedTrainer, ABC):
     """
     Abstract base class for a standard TensorFlow/Keras supervised learning workflow.
@@ -202,6 +555,11 @@ class BaseKerasSupervisedTrainer(BaseSupervisedTrainer, ABC):
     callbacks, model saving, and evaluation, while delegating model and data-specific
     logic to subclasses.
 
+    If the training environment provides a `tf.distribute` strategy (see
+    `KerasTrainingEnvironment`), the model is created and built inside its
+    scope. Subclasses should then batch their datasets with
+    `_global_batch_size()`, as `data.batch_size` is the per-replica batch size.
+
     Attributes
     ----------
     _model : tf.keras.Model
@@ -214,14 +572,29 @@ class BaseKerasSupervisedTrainer(BaseSupervisedTrainer, ABC):
         The dataset for testing.
     _callbacks : List[tf.keras.callbacks.Callback]
         A list of callbacks to use during training.
+    _checkpoint_manager : AsyncCheckpointManager
+        Background checkpoint writer, set up when `training.async_checkpointing`
+        is enabled.
+    _strategy : tf.distribute.Strategy
+        The distribution strategy the model is created under.
     """
+    _EXPORT_FORMATS = ('saved_model', 'onnx')
+    _AUTO_SHARD_POLICIES = {
+        'auto': tf.data.experimental.AutoShardPolicy.AUTO,
+        'file': tf.data.experimental.AutoShardPolicy.FILE,
+        'data': tf.data.experimental.AutoShardPolicy.DATA,
+        'off': tf.data.experimental.AutoShardPolicy.OFF
+    }
+
     def __init__(self, config_path: str, training_env: BaseTrainingEnvironment):
         super().__init__(config_path=config_path, training_env=training_env)
+        self._strategy: tf.distribute.Strategy = tf.distribute.get_strategy()
         self._model: Union[tf.keras.Model, None] = None
         self._train_dataset: Union[tf.data.Dataset, None] = None
         self._valid_dataset: Union[tf.data.Dataset, None] = None
         self._test_dataset: Union[tf.data.Dataset, None] = None
         self._callbacks: List[Callback] = []
+        self._checkpoint_manager: Union[AsyncCheckpointManager, None] = None
 
     def run(self):
         """
@@ -229,13 +602,19 @@ class BaseKerasSupervisedTrainer(BaseSupervisedTrainer, ABC):
 
         The pipeline consists of the following steps in order:
         1. _setup_environment
-        2. _setup_data
-        3. _setup_model
-        4. _build_model
-        5. _setup_callbacks
-        6. _train
-        7. _evaluate
-        8. _save_model
+        2. _setup_data (followed by _apply_dataset_distribute_options)
+        3. _setup_model (inside the distribution strategy scope)
+        4. _build_model (inside the distribution strategy scope)
+        5. _apply_activation_checkpointing (inside the distribution strategy scope)
+        6. _apply_memory_budget
+        7. _setup_callbacks
+        8. _train
+        9. _evaluate
+        10. _save_model
+        11. _export_model
+
+        Any background checkpoint writes are waited for and the writer thread
+        is shut down once the pipeline finishes or fails.
 
         Raises
         ------
@@ -246,22 +625,110 @@ class BaseKerasSupervisedTrainer(BaseSupervisedTrainer, ABC):
         try:
             self._setup_environment()
             self._setup_data()
-            self._setup_model()
-            self._build_model()
+            self._apply_dataset_distribute_options()
+            with self._strategy.scope():
+                self._setup_model()
+                self._build_model()
+                self._apply_activation_checkpointing()
+            self._apply_memory_budget()
             self._setup_callbacks()
             self._train()
             self._evaluate()
             self._save_model()
+            self._export_model()
         except Exception as e:
             self._logger.error(f"A critical error occurred during the Keras training pipeline: {e}")
             raise
+        finally:
+            if self._checkpoint_manager is not None:
+                self._checkpoint_manager.close()
+            self._stop_memory_monitor()
+            self._stop_resource_sampler()
+
+    def _setup_environment(self):
+        """
+        Set up the training environment and adopt its distribution strategy, if any.
+        """
+        super()._setup_environment()
+
+        strategy = getattr(self._training_env, 'strategy', None)
+        if strategy is not None:
+            self._strategy = strategy
+
+        if self._strategy.num_replicas_in_sync > 1:
+            self._logger.info(
+                f"Training with {self._strategy.num_replicas_in_sync} replicas; global batch size "
+                f"{self._global_batch_size()}."
+            )
+
+    def _allocator_stats(self) -> Dict[str, int]:
+        """
+        Return the memory currently allocated by TensorFlow on every GPU, in bytes.
+        """
+        return {
+            f"gpu{index}_allocated": tf.config.experimental.get_memory_info(f"GPU:{index}")['current']
+            for index in range(len(tf.config.list_logical_devices('GPU')))
+        }
+
+    def _global_batch_size(self) -> int:
+        """
+        Return the global batch size: `data.batch_size` per replica, times the number of replicas.
+
+        Returns
+        -------
+        int
+            The batch size the datasets should be batched with.
+        """
+        return self._config.get('data', {}).get('batch_size', 32) * self._strategy.num_replicas_in_sync
+
+    def _apply_dataset_distribute_options(self):
+        """
+        Set the auto-shard policy on the datasets when training with multiple replicas.
+
+        The policy is read from `distributed.auto_shard_policy`: `'auto'`
+        (default; shard by file if possible, otherwise by data), `'file'`,
+        `'data'` or `'off'`. Sharding only applies to multi-worker strategies;
+        single-worker strategies split each global batch across replicas.
+
+        Raises
+        ------
+        ValueError
+            If the configured policy is not supported.
+        """
+        if self._strategy.num_replicas_in_sync <= 1:
+            return
+
+        policy_name = self._config.get('distributed', {}).get('auto_shard_policy', 'auto')
+        if policy_name not in self._AUTO_SHARD_POLICIES:
+            raise ValueError(
+                f"Unsupported `distributed.auto_shard_policy` value '{policy_name}'. "
+                f"Expected one of {sorted(self._AUTO_SHARD_POLICIES)}."
+            )
+
+        options = tf.data.Options()
+        options.experimental_distribute.auto_shard_policy = self._AUTO_SHARD_POLICIES[policy_name]
+        for attribute in ('_train_dataset', '_valid_dataset', '_test_dataset'):
+            dataset = getattr(self, attribute)
+            if dataset is not None:
+                setattr(self, attribute, dataset.with_options(options))
 
     def _build_model(self):
         """
-        Build the model by running a forward pass to initialize weights.
+        Build the model to initialize its weights without iterating the training dataset.
+
+        Pulling a real batch with `next(iter(self._train_dataset))` would start
+        the whole input pipeline (shuffle buffers, parallel maps, cache fills)
+        only to discard the iterator. Instead, the model is built from the
+        dataset's `element_spec`:
+        1. Models that are already built (e.g. functional models) are left as is.
+        2. Otherwise, the model is called on symbolic `tf.keras.Input` tensors
+           matching the input spec, which creates weights without computation.
+        3. If the symbolic call fails (e.g. the model's `call` relies on eager
+           tensor values), a forward pass is run on a tiny synthetic batch of
+           zeros, with unknown dimensions set to 1.
+        4. Only if the spec cannot be synthesised (e.g. ragged or sparse
+           inputs, or inputs of unknown rank), a single batch is taken from the training dataset.
 
-        This method takes a single batch from the training dataset and runs a
-        forward pass to trigger the lazy initialization of the model's layers.
         It then logs a summary of the built model.
 
         Raises
@@ -273,18 +740,205 @@ class BaseKerasSupervisedTrainer(BaseSupervisedTrainer, ABC):
         if not self._train_dataset:
             raise RuntimeError("The training dataset must be set up before building the model.")
 
-        self._logger.info("Building Keras model by running a single forward pass...")
-
-        sample_batch = next(iter(self._train_dataset))
-
-        if isinstance(sample_batch, (list, tuple)):
-            _ = self._model(sample_batch[0])
+        if self._model.built:
+            self._logger.info("Keras model is already built, skipping the build step.")
         else:
-            _ = self._model(sample_batch)
+            self._build_model_from_spec(self._input_spec())
 
         self._logger.info("Model built successfully. Logging summary:")
         self._model.summary(print_fn=self._logger.info)
 
+    def _input_spec(self):
+        """
+        Return the spec of the model inputs: the first element of the training
+        dataset's `(inputs, targets)` element spec, or the whole spec if its
+        elements are not tuples.
+        """
+        element_spec = self._train_dataset.element_spec
+        return element_spec[0] if isinstance(element_spec, (list, tuple)) else element_spec
+
+    def _build_model_from_spec(self, input_spec):
+        """
+        Build the model from the input part of the training dataset's `element_spec`.
+
+        Parameters
+        ----------
+        input_spec : tf.TypeSpec or nested structure of tf.TypeSpec
+            The spec of the model inputs.
+        """
+        specs = tf.nest.flatten(input_spec)
+        if not all(isinstance(spec, tf.TensorSpec) and spec.shape.rank is not None for spec in specs):
+            self._logger.info("Building Keras model by running a single forward pass on a training batch...")
+            sample_batch = next(iter(self._train_dataset.take(1)))
+            _ = self._model(sample_batch[0] if isinstance(sample_batch, (list, tuple)) else sample_batch)
+            return
+
+        self._logger.info("Building Keras model from the training dataset's element spec...")
+        try:
+            symbolic_inputs = tf.nest.map_structure(
+                lambda spec: tf.keras.Input(
+                    shape=spec.shape[1:],
+                    batch_size=spec.shape[0],
+                    dtype=spec.dtype.name
+                ),
+                input_spec
+            )
+            _ = self._model(symbolic_inputs)
+        except Exception as e:
+            self._logger.info(
+                f"Symbolic build failed ({e}). Building Keras model with a forward pass on a synthetic batch..."
+            )
+            synthetic_batch = tf.nest.map_structure(
+                lambda spec: tf.zeros([dim if dim is not None else 1 for dim in spec.shape], dtype=spec.dtype),
+                input_spec
+            )
+            _ = self._model(synthetic_batch)
+
+    def _apply_activation_checkpointing(self):
+        """
+        Rematerialise the activations of the configured layer types during backpropagation.
+
+        The `training.activation_checkpointing` config section supports the
+        following keys:
+        - `enabled`: Whether to checkpoint activations (default `False`).
+        - `module_types`: Class names of the layers to checkpoint, e.g.
+          `['TransformerBlock']`.
+
+        See `checkpoint_keras_layers`. The model must already be built.
+        """
+        checkpointing_conf = self._config.get('training', {}).get('activation_checkpointing') or {}
+        if not checkpointing_conf.get('enabled', False):
+            return
+
+        module_types = checkpointing_conf.get('module_types', [])
+        num_checkpointed = checkpoint_keras_layers(self._model, module_types)
+        self._logger.info(f"Activation checkpointing enabled on {num_checkpointed} layers of types {module_types}.")
+
+    def _apply_memory_budget(self):
+        """
+        Fit the batch size (or gradient accumulation) to `training.memory_budget`.
+
+        Every probe runs forward and backward passes of the model on the first
+        training batch, resized to the probed batch size, without applying
+        gradients (see `_plan_memory_budget`). The model's non-trainable
+        variables (e.g. BatchNormalization moving statistics and the states of
+        the layers' seed generators, which training mode forward passes
+        update) and the Python and NumPy generator states are restored
+        afterwards, so probing does not change the training run. The batch
+        size is that of a single replica. If it changes, the data is set up
+        again, and gradient accumulation is applied through the optimizer's
+        `gradient_accumulation_steps`.
+        """
+        budget_conf = self._config.get('training', {}).get('memory_budget') or {}
+        if not budget_conf.get('enabled', False):
+            return
+
+        rng_state = capture_rng_state()
+        non_trainable_values = [variable.numpy() for variable in self._model.non_trainable_variables]
+        example_batch = next(iter(self._train_dataset.take(1)))
+        example_inputs, example_targets = example_batch[0], example_batch[1]
+
+        @tf.function(reduce_retracing=True)
+        def compute_gradients(inputs, targets):
+            with tf.GradientTape() as tape:
+                predictions = self._model(inputs, training=True)
+                loss = self._model.compute_loss(x=inputs, y=targets, y_pred=predictions, training=True)
+            return tape.gradient(loss, self._model.trainable_variables)
+
+        def probe_step(batch_size: int):
+            inputs = resize_batch(example_inputs, batch_size)
+            targets = resize_batch(example_targets, batch_size)
+            for _ in range(budget_conf.get('probe_steps', 2)):
+                compute_gradients(inputs, targets)
+
+        try:
+            batch_size_changed = self._plan_memory_budget(probe_step)
+        finally:
+            restore_rng_state(rng_state)
+            for variable, value in zip(self._model.non_trainable_variables, non_trainable_values):
+                variable.assign(value)
+
+        if batch_size_changed:
+            self._setup_data()
+            self._apply_dataset_distribute_options()
+
+        accumulation_steps = self._config['training'].get('gradient_accumulation_steps', 1)
+        if accumulation_steps > 1:
+            self._model.optimizer.gradient_accumulation_steps = accumulation_steps
+
+    def _bucket_dataset(
+        self,
+        dataset: tf.data.Dataset,
+        element_length_func: Callable,
+        lengths: Sequence[int],
+        padded_shapes=None,
+        padding_values=None
+    ) -> tf.data.Dataset:
+        """
+        Batch an unbatched dataset by grouping elements of similar length.
+
+        This helper is intended to be called from `_setup_data`. It reads the
+        same `data.bucketing` config section as the PyTorch trainer
+        (`bucket_boundaries`, `num_buckets` and `max_tokens`), uses the
+        precomputed `lengths` index to derive bucket boundaries, and logs the
+        estimated padding efficiency. The batch size and token budget are per
+        replica, and are scaled by the number of replicas in sync.
+
+        Parameters
+        ----------
+        dataset : tf.data.Dataset
+            The unbatched dataset.
+        element_length_func : Callable
+            Function mapping a dataset element to its `tf.int32` length.
+        lengths : Sequence[int]
+            The length of every example in the dataset.
+        padded_shapes : optional
+            Passed through to `tf.data.Dataset.bucket_by_sequence_length`.
+        padding_values : optional
+            Passed through to `tf.data.Dataset.bucket_by_sequence_length`.
+
+        Returns
+        -------
+        tf.data.Dataset
+            The bucketed and padded batched dataset.
+        """
+        data_conf = self._config.get('data', {})
+        bucketing_conf = data_conf.get('bucketing') or {}
+        lengths = np.asarray(lengths)
+        num_replicas = self._strategy.num_replicas_in_sync
+        max_tokens = bucketing_conf.get('max_tokens')
+        max_tokens = max_tokens * num_replicas if max_tokens else None
+        batch_size = None if max_tokens else self._global_batch_size()
+
+        bucket_boundaries = bucketing_conf.get('bucket_boundaries')
+        if bucket_boundaries is None:
+            bucket_boundaries = bucket_boundaries_from_lengths(lengths, bucketing_conf.get('num_buckets', 8))
+
+        # tf.data batches each bucket's elements in stream order, so padding is estimated on the unshuffled stream
+        estimate = estimate_tf_bucket_padding_efficiency(
+            lengths,
+            bucket_boundaries,
+            batch_size=batch_size,
+            max_tokens=max_tokens,
+            drop_remainder=data_conf.get('drop_last', False)
+        )
+        self._logger.info(
+            f"Bucketing {len(lengths)} examples into {len(bucket_boundaries) + 1} buckets "
+            f"with estimated padding efficiency {estimate:.2%}."
+        )
+
+        return bucket_tf_dataset(
+            dataset,
+            element_length_func=element_length_func,
+            bucket_boundaries=bucket_boundaries,
+            batch_size=batch_size,
+            max_tokens=max_tokens,
+            max_length=int(lengths.max()),
+            padded_shapes=padded_shapes,
+            padding_values=padding_values,
+            drop_remainder=data_conf.get('drop_last', False)
+        )
+
     def _setup_callbacks(self):
         """
         Set up common Keras callbacks.
@@ -296,13 +950,32 @@ class BaseKerasSupervisedTrainer(BaseSupervisedTrainer, ABC):
           improving.
         - ReduceLROnPlateau: To reduce the learning rate when a metric has
           stopped improving.
-        - ModelCheckpoint: To save the best model during training.
+        - ModelCheckpoint: To save the best model during training. If
+          `training.async_checkpointing` is enabled, `AsyncModelCheckpoint` is
+          used instead, which writes the weights from a background thread and
+          keeps the last `training.checkpoints_to_keep` checkpoints plus the
+          best one.
+
+        If `training.resume` is enabled, a `BackupAndRestoreWithRngState`
+        callback is added first. It backs up the model, optimizer, epoch and
+        RNG state to `<checkpoint_dir>/backup` (every epoch, or every
+        `training.checkpoint_every_n_steps` batches), and restores them when
+        an interrupted run is restarted, so training resumes from the last
+        backup instead of epoch 0.
 
         This method can be extended or overridden by subclasses to add custom
         callbacks.
         """
         self._logger.info("Setting up Keras callbacks...")
         train_conf = self._config.get('training', {})
+        checkpoint_dir = train_conf.get('checkpoint_dir', './checkpoints')
+
+        # Resume from Backup (must restore state before other callbacks start)
+        if train_conf.get('resume', False):
+            self._callbacks.append(BackupAndRestoreWithRngState(
+                backup_dir=os.path.join(checkpoint_dir, 'backup'),
+                save_freq=train_conf.get('checkpoint_every_n_steps') or 'epoch'
+            ))
 
         # TensorBoard
         tensorboard_dir = train_conf.get('tensorboard_dir', './tensorboard')
@@ -323,12 +996,21 @@ class BaseKerasSupervisedTrainer(BaseSupervisedTrainer, ABC):
         ))
 
         # Basic Model Checkpointing
-        checkpoint_dir = train_conf.get('checkpoint_dir', './checkpoints')
-        self._callbacks.append(ModelCheckpoint(
-            filepath=os.path.join(checkpoint_dir, 'best_model.keras'),
-            save_best_only=True,
-            monitor='val_loss'
-        ))
+        if train_conf.get('async_checkpointing', False):
+            self._checkpoint_manager = AsyncCheckpointManager(
+                checkpoint_dir=checkpoint_dir,
+                write_fn=save_keras_weights,
+                max_to_keep=train_conf.get('checkpoints_to_keep', 3),
+                file_suffix='.weights.npz',
+                logger=self._logger
+            )
+            self._callbacks.append(AsyncModelCheckpoint(self._checkpoint_manager, monitor='val_loss'))
+        else:
+            self._callbacks.append(ModelCheckpoint(
+                filepath=os.path.join(checkpoint_dir, 'best_model.keras'),
+                save_best_only=True,
+                monitor='val_loss'
+            ))
 
     def _train(self):
         """
@@ -340,32 +1022,97 @@ class BaseKerasSupervisedTrainer(BaseSupervisedTrainer, ABC):
         """
         self._logger.info("Starting Keras model training with model.fit()...")
         train_conf = self._config.get('training', {})
+        callbacks = list(self._callbacks)
+        if self._epoch_end_hooks:
+            callbacks.append(_EpochEndHookCallback(self._run_epoch_end_hooks))
+
         self._model.fit(
             self._train_dataset,
             epochs=train_conf.get('epochs', 10),
             validation_data=self._valid_dataset,
-            callbacks=self._callbacks
+            callbacks=callbacks
         )
 
-    def _evaluate(self):
+    def _evaluate(self) -> Dict[str, float]:
         """
         Perform a basic evaluation using `model.evaluate()`
 
         This method provides a default implementation for evaluating the model
         on the test set. It can be extended in a subclass to compute and log
         more detailed or custom metrics.
+
+        With `evaluation.streaming` enabled, the model is instead evaluated
+        with `_streaming_evaluate()`, which also exports the predictions.
+
+        Returns
+        -------
+        Dict[str, float]
+            The test evaluation results.
         """
+        evaluation_conf = self._config.get('evaluation', {})
+        if evaluation_conf.get('streaming', False):
+            return self._streaming_evaluate(evaluation_conf)
+
         self._logger.info("Evaluating Keras model with model.evaluate()...")
         results = self._model.evaluate(self._test_dataset, return_dict=True)
         self._logger.info(f"Test Evaluation Results: {results}")
 
+        return results
+
+    def _streaming_evaluate(self, evaluation_conf: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Evaluate the model on the test set in a single pass.
+
+        The test dataset is rebatched to `evaluation.batch_size` (if set),
+        predictions are made with `predict_on_batch` (in inference mode), and
+        every batch updates the loss and the `evaluation.metrics` accumulators
+        and is streamed to `evaluation.predictions_path` (if set), so
+        per-example predictions never require a second pass or a copy of all
+        outputs in memory.
+
+        Parameters
+        ----------
+        evaluation_conf : Dict[str, Any]
+            The `evaluation` config section.
+
+        Returns
+        -------
+        Dict[str, float]
+            The test loss (if the model is compiled with one) and metrics.
+        """
+        self._logger.info("Evaluating Keras model in a single streaming pass...")
+        dataset = self._test_dataset
+        if evaluation_conf.get('batch_size'):
+            dataset = dataset.rebatch(evaluation_conf['batch_size'])
+
+        has_loss = getattr(self._model, 'loss', None) is not None
+        evaluator = StreamingEvaluator(
+            metric_names=evaluation_conf.get('metrics', []),
+            predictions_path=evaluation_conf.get('predictions_path'),
+            logger=self._logger
+        )
+        with evaluator:
+            for batch in dataset:
+                inputs, targets = batch[0], batch[1]
+                predictions = self._model.predict_on_batch(inputs)
+                loss = None
+                if has_loss:
+                    loss = float(self._model.compute_loss(x=inputs, y=targets, y_pred=predictions, training=False))
+                evaluator.update(np.asarray(targets), np.asarray(predictions), loss)
+
+        results = evaluator.results()
+        self._logger.info(f"Test Evaluation Results: {results}")
+
+        return results
+
     def _save_model(self):
         """
         Saves the model in the standard Keras format.
 
         This method provides a default implementation for saving the final
         trained model. It can be extended in a subclass to save the model in
-        additional formats like ONNX or HDF5.
+        additional formats like ONNX or HDF5. Serving artifacts are exported
+        separately, by `_export_model()`.
         """
         self._logger.info("Saving Keras model...")
         model_save_dir = self._config.get('training', {}).get('model_save_dir', './model')
@@ -374,6 +1121,84 @@ class BaseKerasSupervisedTrainer(BaseSupervisedTrainer, ABC):
         self._model.save(save_path)
         self._logger.info(f"Model saved to {save_path}")
 
+    def _export_model(self):
+        """
+        Export serving artifacts and benchmark their inference latency, if
+        `training.export` is set.
+
+        The `export` config section supports the following keys:
+        - `formats`: Any of `'saved_model'` (a TF SavedModel with a fixed
+          serving signature, written to `saved_model/`) and `'onnx'` (written
+          to `model.onnx`, requires `tf2onnx`) (default: no exports).
+        - `quantize_int8`: Whether to also export a copy of the model with
+          dynamically quantised int8 `Dense`, `EinsumDense` and `Embedding`
+          layers, suffixed `_int8` (default `False`). The model must be
+          clonable with `tf.keras.models.clone_model`.
+        - `benchmark`: Whether to benchmark the CPU latency of the Keras
+          model and every exported SavedModel (default `True`).
+        - `benchmark_batch_sizes`: The benchmarked batch sizes (default
+          `[1, 8, 32]`).
+        - `benchmark_iterations`: Timed calls per batch size (default 20).
+
+        Artifacts are written to `training.model_save_dir`. The serving
+        signature is derived from the input spec of the training dataset (see
+        `_input_spec`), with a dynamic batch dimension, and the benchmark
+        report is written to `benchmark.json` in the model directory.
+
+        Raises
+        ------
+        ValueError
+            If an unsupported export format is configured.
+        """
+        train_conf = self._config.get('training') or {}
+        export_conf = self._config.get('export') or {}
+        formats = export_conf.get('formats') or []
+        if not train_conf.get('export', False) or not formats:
+            return
+        model_save_dir = train_conf.get('model_save_dir', './model')
+
+        unsupported = sorted(set(formats) - set(self._EXPORT_FORMATS))
+        if unsupported:
+            raise ValueError(f"Unsupported Keras export formats {unsupported}. Expected any of {self._EXPORT_FORMATS}.")
+
+        input_signature = tf.nest.map_structure(
+            lambda spec: tf.TensorSpec([None, *spec.shape[1:]], spec.dtype),
+            self._input_spec()
+        )
+
+        models = {'': self._model}
+        if export_conf.get('quantize_int8', False):
+            try:
+                models['_int8'] = quantize_keras_dynamic_int8(self._model)
+            except Exception as e:
+                self._logger.warning(f"Skipping int8 export, as the model could not be quantised: {e}")
+
+        predictors = {'keras': self._model.predict_on_batch}
+        for suffix, model in models.items():
+            if 'saved_model' in formats:
+                saved_model_dir = os.path.join(model_save_dir, f"saved_model{suffix}")
+                predictors[f"saved_model{suffix}"] = export_saved_model(model, input_signature, saved_model_dir)
+                self._logger.info(f"SavedModel exported to {saved_model_dir}")
+            if 'onnx' in formats:
+                onnx_path = os.path.join(model_save_dir, f"model{suffix}.onnx")
+                export_keras_onnx(model, input_signature, onnx_path)
+                self._logger.info(f"ONNX model exported to {onnx_path}")
+
+        if export_conf.get('benchmark', True):
+            example_dataset = self._test_dataset if self._test_dataset is not None else self._train_dataset
+            example_batch = next(iter(example_dataset.take(1)))
+            example_batch = example_batch[0] if isinstance(example_batch, (list, tuple)) else example_batch
+            results = {
+                name: benchmark_latency(
+                    predict_fn,
+                    example_batch,
+                    batch_sizes=export_conf.get('benchmark_batch_sizes', DEFAULT_BENCHMARK_BATCH_SIZES),
+                    iterations=export_conf.get('benchmark_iterations', 20)
+                )
+                for name, predict_fn in predictors.items()
+            }
+            write_benchmark_report(results, os.path.join(model_save_dir, 'benchmark.json'), logger=self._logger)
+
 class BasePyTorchSupervisedTrainer(BaseSupervisedTrainer, ABC):
     """
     Abstract base class for a standard PyTorch supervised learning workflow.
@@ -381,8 +1206,15 @@ class BasePyTorchSupervisedTrainer(BaseSupervisedTrainer, ABC):
     This class serves as an intermediate layer for all PyTorch-based trainers.
     It is framework-specific (PyTorch) but remains architecture-agnostic.
 
-    Common PyTorch-related logic can be factored into this class later as
-    patterns emerge from concrete implementations.
+    It provides default implementations for the training loop, evaluation and
+    model saving, while delegating model and data-specific logic to subclasses.
+    Subclasses are expected to populate `_model`, `_optimizer`, `_loss_fn` and
+    the data loaders, which must yield `(inputs, targets)` batches. Data loaders
+    can be built from datasets with `_build_data_loaders`.
+
+    With `distributed.enabled` set, the trainer runs distributed data-parallel
+    training (see `_setup_distributed`), e.g. launched with
+    `torchrun --nproc-per-node=N train.py` or `launch_distributed`.
 
     Attributes
     ----------
@@ -400,8 +1232,45 @@ class BasePyTorchSupervisedTrainer(BaseSupervisedTrainer, ABC):
         The data loader for the validation dataset.
     _test_loader : torch.utils.data.DataLoader
         The data loader for the test dataset.
+    _grad_scaler : torch.amp.GradScaler
+        Gradient scaler used for float16 mixed precision training. It is
+        a no-op unless float16 autocast is enabled on a CUDA device.
+    _compile_time : float
+        Wall-clock seconds spent in forward passes that triggered a
+        `torch.compile` graph compilation.
+    _compiled_graph_count : int
+        Number of graphs compiled for `_model` training forward passes so far.
+    _dynamo_graph_counter : int
+        Last observed value of the process-wide TorchDynamo graph counter.
+    _checkpoint_manager : AsyncCheckpointManager
+        Background checkpoint writer, set up when `training.async_checkpointing`
+        or `training.resume` is enabled.
+    _lr_scheduler : torch.optim.lr_scheduler.LRScheduler
+        Optional learning rate scheduler, stepped once per epoch.
+    _global_step : int
+        The number of training batches processed so far.
+    _start_epoch : int
+        The epoch training starts (or resumes) from.
+    _resume_step_in_epoch : int
+        The number of batches of `_start_epoch` already trained on before
+        resuming.
+    _rank : int
+        The global rank of this process (0 outside distributed training).
+    _world_size : int
+        The number of training processes (1 outside distributed training).
+    _owns_process_group : bool
+        Whether this trainer initialised the `torch.distributed` process
+        group, and therefore destroys it when the run ends.
 
     """
+    _EXPORT_FORMATS = ('torchscript', 'torch_export', 'onnx')
+    _AUTOCAST_DTYPES = {
+        'bf16': torch.bfloat16,
+        'bfloat16': torch.bfloat16,
+        'fp16': torch.float16,
+        'float16': torch.float16
+    }
+
     def __init__(self, config_path: str, training_env: BaseTrainingEnvironment):
         """
         Initialise the BasePyTorchSupervisedTrainer.
@@ -423,5 +1292,1153 @@ class BasePyTorchSupervisedTrainer(BaseSupervisedTrainer, ABC):
         self._train_loader: Union[torch.utils.data.DataLoader, None] = None
         self._valid_loader: Union[torch.utils.data.DataLoader, None] = None
         self._test_loader: Union[torch.utils.data.DataLoader, None] = None
+        self._grad_scaler: Union[torch.amp.GradScaler, None] = None
+        self._compile_time: float = 0.0
+        self._compiled_graph_count: int = 0
+        self._dynamo_graph_counter: int = 0
+        self._checkpoint_manager: Union[AsyncCheckpointManager, None] = None
+        self._lr_scheduler: Any = None
+        self._global_step: int = 0
+        self._start_epoch: int = 0
+        self._resume_step_in_epoch: int = 0
+        self._epoch_generator_state: Union[torch.Tensor, None] = None
+        self._rank: int = 0
+        self._world_size: int = 1
+        self._owns_process_group: bool = False
+
+    def run(self):
+        """
+        Execute the standard end-to-end PyTorch model training pipeline.
+
+        Runs the `BaseSupervisedTrainer` pipeline and then waits for any
+        background checkpoint or model writes to complete, and tears down the
+        distributed process group if this trainer created it.
+        """
+        try:
+            super().run()
+        finally:
+            if self._checkpoint_manager is not None:
+                self._checkpoint_manager.close()
+            if self._owns_process_group:
+                dist.destroy_process_group()
+                self._owns_process_group = False
+
+    def _setup_environment(self):
+        """
+        Set up the training environment, then distributed training if enabled.
+        """
+        super()._setup_environment()
+        self._setup_distributed()
+
+    def _allocator_stats(self) -> Dict[str, int]:
+        """
+        Return the memory allocated and reserved by PyTorch's CUDA caching allocator, in bytes.
+        """
+        if not torch.cuda.is_available():
+            return {}
+
+        return {'cuda_allocated': torch.cuda.memory_allocated(), 'cuda_reserved': torch.cuda.memory_reserved()}
+
+    def _setup_distributed(self):
+        """
+        Initialise distributed data-parallel training if `distributed.enabled` is set.
+
+        The `distributed` config section supports the following keys:
+        - `enabled`: Whether to train with one process per replica (default
+          `False`).
+        - `backend`: The `torch.distributed` backend (default `'gloo'`, which
+          works on CPU-only hosts; use `'nccl'` for multi-GPU training).
+        - `timeout_seconds`: Timeout of collective operations (default 1800).
+
+        The process group is initialised from the environment variables set by
+        `torchrun` (or `launch_distributed`), unless one already exists.
+
+        Notes
+        -----
+        1. Every rank reseeds Python, NumPy and PyTorch with its `determinism`
+           seeds offset by its rank, so per-rank randomness (e.g. dropout,
+           augmentation) is deterministic but differs between ranks. Model
+           weights still start identical, as `DistributedDataParallel`
+           broadcasts the rank 0 weights when wrapping the model.
+        2. Only rank 0 logs below `WARNING`, and writes checkpoints and the
+           final model.
+        """
+        dist_conf = self._config.get('distributed', {})
+        if not dist_conf.get('enabled', False):
+            return
+
+        if not dist.is_initialized():
+            dist.init_process_group(
+                backend=dist_conf.get('backend', 'gloo'),
+                timeout=timedelta(seconds=dist_conf.get('timeout_seconds', 1800))
+            )
+            self._owns_process_group = True
+
+        self._rank = dist.get_rank()
+        self._world_size = dist.get_world_size()
+
+        if torch.cuda.is_available():
+            torch.cuda.set_device(get_local_rank())
+            self._device = f"cuda:{get_local_rank()}"
+
+        determinism_conf = self._config.get('determinism', {})
+        random.seed(determinism_conf.get('random_seed', 42) + self._rank)
+        np.random.seed(determinism_conf.get('numpy_seed', 42) + self._rank)
+        torch.manual_seed(determinism_conf.get('torch_seed', 42) + self._rank)
+
+        if not self._is_main_process():
+            self._logger.setLevel(logging.WARNING)
+
+        self._logger.info(
+            f"Initialised distributed training with {self._world_size} processes "
+            f"(backend='{dist.get_backend()}')."
+        )
+
+    def _build_data_loaders(
+        self,
+        train_dataset: torch.utils.data.Dataset,
+        valid_dataset: Union[torch.utils.data.Dataset, None] = None,
+        test_dataset: Union[torch.utils.data.Dataset, None] = None,
+        train_lengths: Union[Sequence[int], None] = None,
+        valid_lengths: Union[Sequence[int], None] = None,
+        test_lengths: Union[Sequence[int], None] = None,
+        **kwargs
+    ):
+        """
+        Build the train, validation and test data loaders from datasets.
+
+        This helper is intended to be called from `_setup_data`. The loaders
+        are built with `build_data_loader` from the `data` config section
+        (worker count, pinning, prefetching, etc.), and shuffling and worker
+        seeding are derived from the `determinism` config section. Only the
+        training loader is shuffled.
+
+        If `data.bucketing.enabled` is set and a split's example lengths are
+        given, that split is batched with a `LengthBucketBatchSampler` (see
+        `_build_bucket_sampler`). In distributed training, every split is
+        sharded across ranks, with a `DistributedSampler` unless bucketed.
+
+        Parameters
+        ----------
+        train_dataset : torch.utils.data.Dataset
+            The training dataset.
+        valid_dataset : torch.utils.data.Dataset, optional
+            The validation dataset.
+        test_dataset : torch.utils.data.Dataset, optional
+            The test dataset.
+        train_lengths : Sequence[int], optional
+            The length of every example in the training dataset.
+        valid_lengths : Sequence[int], optional
+            The length of every example in the validation dataset.
+        test_lengths : Sequence[int], optional
+            The length of every example in the test dataset.
+        **kwargs
+            Additional keyword arguments passed to every `DataLoader`
+            (e.g. `collate_fn`).
+        """
+        self._logger.info("Building PyTorch data loaders...")
+        self._train_loader = self._build_data_loader(train_dataset, train_lengths, shuffle=True, **kwargs)
+        if valid_dataset is not None:
+            self._valid_loader = self._build_data_loader(valid_dataset, valid_lengths, shuffle=False, **kwargs)
+        if test_dataset is not None:
+            self._test_loader = self._build_data_loader(test_dataset, test_lengths, shuffle=False, **kwargs)
+
+        self._logger.info(
+            f"Data loaders built with num_workers={self._train_loader.num_workers}, "
+            f"pin_memory={self._train_loader.pin_memory}."
+        )
+
+    def _build_data_loader(
+        self,
+        dataset: torch.utils.data.Dataset,
+        lengths: Union[Sequence[int], None],
+        shuffle: bool,
+        **kwargs
+    ) -> torch.utils.data.DataLoader:
+        """
+        Build a single data loader, bucketing by length and sharding across ranks if configured.
+        """
+        data_conf = self._config.get('data', {})
+        bucketing_conf = data_conf.get('bucketing') or {}
+        determinism_conf = self._config.get('determinism')
+
+        if bucketing_conf.get('enabled', False) and lengths is not None:
+            kwargs['batch_sampler'] = self._build_bucket_sampler(lengths, shuffle)
+        elif self._world_size > 1:
+            # The sampler seed must be shared by all ranks so that their shards partition the same permutation
+            kwargs['sampler'] = DistributedSampler(
+                dataset,
+                num_replicas=self._world_size,
+                rank=self._rank,
+                shuffle=shuffle,
+                seed=(determinism_conf or {}).get('torch_seed', 42),
+                drop_last=data_conf.get('drop_last', False)
+            )
+            shuffle = False
+
+        if determinism_conf is not None and self._world_size > 1:
+            # Offset the loader seed so that worker-side randomness differs between ranks
+            determinism_conf = {**determinism_conf, 'torch_seed': determinism_conf.get('torch_seed', 42) + self._rank}
+
+        return build_data_loader(
+            dataset,
+            data_conf,
+            determinism_conf,
+            shuffle=shuffle,
+            logger=self._logger,
+            **kwargs
+        )
+
+    def _build_bucket_sampler(self, lengths: Sequence[int], shuffle: bool) -> LengthBucketBatchSampler:
+        """
+        Build a length-bucketing batch sampler from the `data.bucketing` config.
+
+        The `data.bucketing` config section supports the following keys:
+        - `enabled`: Whether to bucket batches by example length.
+        - `bucket_boundaries`: Explicit bucket boundaries (default: derived
+          from the length quantiles).
+        - `num_buckets`: Number of buckets when deriving boundaries (default 8).
+        - `max_tokens`: Optional budget of padded tokens per batch, used
+          instead of `data.batch_size`.
+
+        Parameters
+        ----------
+        lengths : Sequence[int]
+            The length of every example in the dataset.
+        shuffle : bool
+            Whether the sampler shuffles every epoch.
+
+        Returns
+        -------
+        LengthBucketBatchSampler
+            The configured batch sampler.
+        """
+        data_conf = self._config.get('data', {})
+        bucketing_conf = data_conf.get('bucketing') or {}
+        max_tokens = bucketing_conf.get('max_tokens')
+
+        sampler = LengthBucketBatchSampler(
+            lengths=lengths,
+            batch_size=None if max_tokens else data_conf.get('batch_size', 32),
+            max_tokens=max_tokens,
+            bucket_boundaries=bucketing_conf.get('bucket_boundaries'),
+            num_buckets=bucketing_conf.get('num_buckets', 8),
+            shuffle=shuffle,
+            drop_last=data_conf.get('drop_last', False),
+            seed=(self._config.get('determinism') or {}).get('torch_seed', 42),
+            num_replicas=self._world_size,
+            rank=self._rank
+        )
+        self._logger.info(
+            f"Bucketed {len(lengths)} examples into {len(sampler)} batches "
+            f"with padding efficiency {sampler.padding_efficiency():.2%}."
+        )
+
+        return sampler
+
+    def _train(self):
+        """
+        Execute a default PyTorch training loop.
+
+        The loop is configured through the `training` section of the config:
+        - `epochs`: Number of passes over the training data (default 10).
+        - `gradient_accumulation_steps`: Number of batches whose gradients are
+          accumulated before each optimizer step (default 1).
+        - `mixed_precision`: Optional autocast dtype, either `'bf16'` or
+          `'fp16'` (default `None`, i.e. full precision).
+        - `compile`: Optional `torch.compile` settings (see `_compile_model`).
+        - `activation_checkpointing`: Optional activation checkpointing
+          settings (see `_apply_activation_checkpointing`).
+        - `memory_budget`: Optional settings to fit the batch size to an RSS
+          limit (see `_plan_memory_budget`).
+        - `async_checkpointing`: Whether to checkpoint the training state at
+          the end of every epoch (and every `checkpoint_every_n_steps`
+          batches, if set) from a background thread, keeping the last
+          `checkpoints_to_keep` (default 3) checkpoints in `checkpoint_dir`
+          plus the one with the best validation loss (default `False`).
+        - `resume`: Whether to resume from the latest complete checkpoint in
+          `checkpoint_dir` (see `_restore_checkpoint`). Implies
+          `async_checkpointing` (default `False`).
+
+        In distributed training, the model is wrapped in
+        `DistributedDataParallel` (before compilation), gradients are only
+        all-reduced at the end of each accumulation window, and losses are
+        averaged over all ranks.
+
+        Batches are copied to the device with non-blocking transfers, gradients
+        are reset with `set_to_none=True` and the running loss is accumulated on
+        the device, so the host only synchronises once per epoch when logging.
+        If a validation loader is set, the model is validated after each epoch.
+        Epoch end hooks (see `add_epoch_end_hook`) can stop training early.
+
+        This method can be overridden in a subclass to implement a custom
+        training loop if needed.
+        """
+        self._logger.info("Starting PyTorch model training...")
+        train_conf = self._config.get('training', {})
+        epochs = train_conf.get('epochs', 10)
+
+        self._model.to(self._device)
+        self._apply_activation_checkpointing()
+        self._apply_memory_budget()
+        self._wrap_distributed_model()
+        self._compile_model()
+        self._setup_checkpoint_manager()
+        self._grad_scaler = torch.amp.GradScaler(
+            device=self._device_type(),
+            enabled=self._autocast_dtype() == torch.float16 and self._device_type() == 'cuda'
+        )
+
+        if train_conf.get('resume', False):
+            self._restore_checkpoint()
+
+        for epoch in range(self._start_epoch, epochs):
+            epoch_start = time.perf_counter()
+            compile_time_start = self._compile_time
+            self._set_loader_epoch(self._train_loader, epoch)
+
+            train_results = self._train_epoch(epoch)
+            message = f"Epoch {epoch + 1}/{epochs} - loss: {train_results['loss']:.4f}"
+            logs = {'loss': train_results['loss']}
+
+            monitored_loss = train_results['loss']
+            if self._valid_loader is not None:
+                valid_results = self._run_inference_loop(self._valid_loader)
+                message += f" - val_loss: {valid_results['loss']:.4f}"
+                monitored_loss = valid_results['loss']
+                logs['val_loss'] = valid_results['loss']
+
+            self._step_lr_scheduler(monitored_loss)
+
+            if self._checkpoint_manager is not None:
+                generator = self._train_loader.generator
+                self._checkpoint_manager.save(
+                    self._checkpoint_state(
+                        epoch=epoch + 1,
+                        step_in_epoch=0,
+                        generator_state=generator.get_state() if generator is not None else None
+                    ),
+                    step=self._global_step,
+                    metric=monitored_loss
+                )
+
+            if self._is_compiled():
+                epoch_compile_time = self._compile_time - compile_time_start
+                epoch_step_time = time.perf_counter() - epoch_start - epoch_compile_time
+                message += f" - compile_time: {epoch_compile_time:.2f}s - step_time: {epoch_step_time:.2f}s"
+
+            self._logger.info(message)
+
+            if self._run_epoch_end_hooks(epoch, logs):
+                self._logger.info(f"Stopping training early after epoch {epoch + 1}.")
+                break
+
+    def _train_epoch(self, epoch: int) -> Dict[str, float]:
+        """
+        Run a single training epoch over `self._train_loader`.
+
+        With gradient accumulation, every optimizer step applies the mean
+        gradient of its accumulation window, including the last, possibly
+        shorter, window of the epoch. The next batch is loaded before the
+        current one is trained on, so the last batch is known (and its
+        gradients all-reduced) even for data loaders without a length.
+
+        When resuming mid-epoch, the batches already trained on are skipped.
+        Skipped batches are still loaded, as the DataLoader cannot seek.
+
+        Parameters
+        ----------
+        epoch : int
+            The zero-indexed epoch number.
+
+        Returns
+        -------
+        Dict[str, float]
+            The sample-weighted mean training loss for the epoch (for a
+            resumed epoch, over the remaining batches only).
+        """
+        train_conf = self._config.get('training', {})
+        accumulation_steps = max(1, int(train_conf.get('gradient_accumulation_steps', 1)))
+        checkpoint_every_n_steps = train_conf.get('checkpoint_every_n_steps')
+
+        self._model.train()
+        self._optimizer.zero_grad(set_to_none=True)
+
+        total_loss = torch.zeros((), device=self._device)
+        total_samples = 0
+
+        # The generator state at the start of the epoch determines its shuffle order
+        generator = self._train_loader.generator
+        self._epoch_generator_state = generator.get_state() if generator is not None else None
+
+        skip_steps, self._resume_step_in_epoch = self._resume_step_in_epoch, 0
+        try:
+            num_batches = len(self._train_loader)
+        except TypeError:
+            num_batches = None
+
+        batches = iter(self._train_loader)
+        if skip_steps:
+            self._logger.info(f"Skipping the first {skip_steps} batches of epoch {epoch + 1} to resume training...")
+            batches = itertools.islice(batches, skip_steps, None)
+        step = skip_steps
+
+        for step, (batch, is_last_batch) in enumerate(_flag_last(batches), start=skip_steps + 1):
+            inputs, targets = self._prepare_batch(batch)
+
+            # Gradients are only all-reduced across ranks on the last batch of each accumulation window
+            sync_gradients = step % accumulation_steps == 0 or is_last_batch
+            with self._gradient_sync(sync_gradients):
+                with self._autocast():
+                    outputs = self._forward(inputs)
+                    loss = self._loss_fn(outputs, targets)
+
+                # Scale the loss so that the accumulated gradient is the mean over the batches of its window. The
+                # last window of the epoch may be shorter; without a loader length, it is rescaled when flushed
+                window_start = (step - 1) // accumulation_steps * accumulation_steps
+                window_length = accumulation_steps if num_batches is None else min(
+                    accumulation_steps, num_batches - window_start
+                )
+                self._grad_scaler.scale(loss / window_length).backward()
+
+            if step % accumulation_steps == 0:
+                self._optimizer_step()
+
+            batch_size = self._batch_size(targets)
+            total_loss += loss.detach().float() * batch_size
+            total_samples += batch_size
+            self._global_step += 1
+
+            # Mid-epoch checkpoints are only taken at optimizer step boundaries, when no gradients are pending
+            if (
+                self._checkpoint_manager is not None
+                and checkpoint_every_n_steps
+                and step % checkpoint_every_n_steps == 0
+                and step % accumulation_steps == 0
+            ):
+                self._checkpoint_manager.save(
+                    self._checkpoint_state(
+                        epoch=epoch, step_in_epoch=step, generator_state=self._epoch_generator_state
+                    ),
+                    step=self._global_step
+                )
+
+        # Flush gradients left over from an incomplete accumulation window
+        if step % accumulation_steps != 0:
+            if num_batches is None:
+                with torch.no_grad():
+                    for parameter in self._model.parameters():
+                        if parameter.grad is not None:
+                            parameter.grad.mul_(accumulation_steps / (step % accumulation_steps))
+            self._optimizer_step()
+
+        return {'loss': self._reduce_mean(total_loss, total_samples)}
+
+    def _setup_checkpoint_manager(self):
+        """
+        Create the background checkpoint writer if `training.async_checkpointing`
+        or `training.resume` is enabled (on rank 0 only in distributed training).
+        """
+        train_conf = self._config.get('training', {})
+        checkpointing = train_conf.get('async_checkpointing', False) or train_conf.get('resume', False)
+        if not checkpointing or self._checkpoint_manager is not None or not self._is_main_process():
+            return
+
+        self._checkpoint_manager = AsyncCheckpointManager(
+            checkpoint_dir=train_conf.get('checkpoint_dir', './checkpoints'),
+            write_fn=torch.save,
+            max_to_keep=train_conf.get('checkpoints_to_keep', 3),
+            file_suffix='.pt',
+            logger=self._logger
+        )
+
+    def _checkpoint_state(
+        self,
+        epoch: int,
+        step_in_epoch: int,
+        generator_state: Union[torch.Tensor, None]
+    ) -> Dict[str, Any]:
+        """
+        Collect the state written to a training checkpoint.
+
+        Parameters
+        ----------
+        epoch : int
+            The number of completed epochs.
+        step_in_epoch : int
+            The number of batches of the current epoch already trained on.
+        generator_state : torch.Tensor, optional
+            The state of the training loader's generator at the start of the
+            epoch to resume, which determines its shuffle order.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The model, optimizer, LR scheduler and gradient scaler
+            `state_dict`s, the RNG states and the training position.
+        """
+        return {
+            'epoch': epoch,
+            'step_in_epoch': step_in_epoch,
+            'global_step': self._global_step,
+            'model': self._unwrapped_model().state_dict(),
+            'optimizer': self._optimizer.state_dict(),
+            'lr_scheduler': self._lr_scheduler.state_dict() if self._lr_scheduler is not None else None,
+            'grad_scaler': self._grad_scaler.state_dict(),
+            'rng': capture_rng_state(),
+            'loader_generator': generator_state
+        }
+
+    def _restore_checkpoint(self):
+        """
+        Restore the training state from the latest complete checkpoint.
+
+        Only checkpoints recorded in the checkpoint index are considered, and
+        these are written atomically, so a run killed mid-write resumes from
+        the previous checkpoint. The model, optimizer, LR scheduler, gradient
+        scaler and RNG states are restored, together with the training
+        loader's generator state, so the resumed epoch sees the same data
+        order. Training then continues from the batch after the checkpoint.
+        If no checkpoint exists, training starts from scratch.
+
+        Notes
+        -----
+        Reproducing the data order requires the training loader to have a
+        seeded generator, as set up by `_build_data_loaders`.
+        """
+        checkpoint_dir = self._config.get('training', {}).get('checkpoint_dir', './checkpoints')
+        index = AsyncCheckpointManager.read_index(checkpoint_dir)
+        checkpoint_path = next(
+            (entry['path'] for entry in reversed(index.get('checkpoints', [])) if os.path.exists(entry['path'])),
+            None
+        )
+        if checkpoint_path is None:
+            self._logger.info(f"No checkpoint found in {checkpoint_dir}. Training from scratch.")
+            return
+
+        self._logger.info(f"Resuming training from checkpoint {checkpoint_path}...")
+        # Checkpoints hold RNG states and optimizer metadata, so they are not restricted to weights
+        checkpoint = torch.load(checkpoint_path, map_location='cpu', weights_only=False)
+
+        self._unwrapped_model().load_state_dict(checkpoint['model'])
+        self._optimizer.load_state_dict(checkpoint['optimizer'])
+        if self._lr_scheduler is not None and checkpoint.get('lr_scheduler') is not None:
+            self._lr_scheduler.load_state_dict(checkpoint['lr_scheduler'])
+        self._grad_scaler.load_state_dict(checkpoint['grad_scaler'])
+        restore_rng_state(checkpoint['rng'])
+
+        generator = self._train_loader.generator
+        if generator is not None and checkpoint.get('loader_generator') is not None:
+            generator.set_state(checkpoint['loader_generator'])
+
+        self._start_epoch = checkpoint['epoch']
+        self._resume_step_in_epoch = checkpoint['step_in_epoch']
+        self._global_step = checkpoint['global_step']
+        self._logger.info(
+            f"Resumed at epoch {self._start_epoch + 1}, batch {self._resume_step_in_epoch + 1} "
+            f"(global step {self._global_step})."
+        )
+
+    def _step_lr_scheduler(self, monitored_loss: float):
+        """
+        Step the learning rate scheduler (if any) at the end of an epoch.
+        """
+        if self._lr_scheduler is None:
+            return
+
+        if isinstance(self._lr_scheduler, torch.optim.lr_scheduler.ReduceLROnPlateau):
+            self._lr_scheduler.step(monitored_loss)
+        else:
+            self._lr_scheduler.step()
+
+    @staticmethod
+    def _set_loader_epoch(loader: torch.utils.data.DataLoader, epoch: int):
+        """
+        Propagate the epoch to samplers that reshuffle per epoch (e.g.
+        `LengthBucketBatchSampler`).
+        """
+        for sampler in (loader.sampler, loader.batch_sampler):
+            if hasattr(sampler, 'set_epoch'):
+                sampler.set_epoch(epoch)
+
+    def _optimizer_step(self):
+        """
+        Apply the accumulated gradients and reset them.
+        """
+        self._grad_scaler.step(self._optimizer)
+        self._grad_scaler.update()
+        self._optimizer.zero_grad(set_to_none=True)
+
+    @torch.inference_mode()
+    def _run_inference_loop(self, loader: torch.utils.data.DataLoader) -> Dict[str, float]:
+        """
+        Compute the mean loss of the model over a data loader.
+
+        Parameters
+        ----------
+        loader : torch.utils.data.DataLoader
+            The data loader to evaluate on.
+
+        Returns
+        -------
+        Dict[str, float]
+            The sample-weighted mean loss over the data loader (across all
+            ranks in distributed training).
+        """
+        self._model.eval()
+
+        total_loss = torch.zeros((), device=self._device)
+        total_samples = 0
+
+        for batch in loader:
+            inputs, targets = self._prepare_batch(batch)
+
+            with self._autocast():
+                outputs = self._forward(inputs)
+                loss = self._loss_fn(outputs, targets)
+
+            batch_size = self._batch_size(targets)
+            total_loss += loss.float() * batch_size
+            total_samples += batch_size
+
+        return {'loss': self._reduce_mean(total_loss, total_samples)}
+
+    def _evaluate(self) -> Dict[str, float]:
+        """
+        Perform a basic evaluation of the model on the test loader.
+
+        This method provides a default implementation that computes the mean
+        test loss. It can be extended in a subclass to compute and log more
+        detailed or custom metrics.
+
+        With `evaluation.streaming` enabled, the model is instead evaluated
+        with `_streaming_evaluate()`, which also computes the configured
+        metrics and exports the predictions.
+
+        Returns
+        -------
+        Dict[str, float]
+            The test evaluation results.
+        """
+        self._logger.info("Evaluating PyTorch model on the test dataset...")
+        self._model.to(self._device)
+
+        evaluation_conf = self._config.get('evaluation', {})
+        if evaluation_conf.get('streaming', False):
+            results = self._streaming_evaluate(evaluation_conf)
+        else:
+            results = self._run_inference_loop(self._test_loader)
+        self._logger.info(f"Test Evaluation Results: {results}")
+
+        return results
+
+    @torch.inference_mode()
+    def _streaming_evaluate(self, evaluation_conf: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Evaluate the model on the test loader in a single pass.
+
+        The test loader is rebuilt with `evaluation.batch_size` (if set and the
+        loader is not length-bucketed), and every batch updates the loss and
+        the `evaluation.metrics` accumulators and is streamed to
+        `evaluation.predictions_path` (if set), so per-example predictions
+        never require a second pass or a copy of all outputs in memory.
+
+        In distributed training, the metric states are summed over all ranks,
+        and every rank writes its shard of the predictions to the predictions
+        path suffixed with `.rank<N>`.
+
+        Parameters
+        ----------
+        evaluation_conf : Dict[str, Any]
+            The `evaluation` config section.
+
+        Returns
+        -------
+        Dict[str, float]
+            The test loss and metrics.
+        """
+        loader = self._test_loader
+        if evaluation_conf.get('batch_size') and loader.batch_size is not None:
+            loader = self._build_data_loader(
+                loader.dataset,
+                None,
+                shuffle=False,
+                batch_size=evaluation_conf['batch_size'],
+                num_workers=loader.num_workers,
+                collate_fn=loader.collate_fn
+            )
+
+        predictions_path = evaluation_conf.get('predictions_path')
+        if predictions_path and self._world_size > 1:
+            root, extension = os.path.splitext(predictions_path)
+            predictions_path = f"{root}.rank{self._rank}{extension}"
+
+        self._model.eval()
+        evaluator = StreamingEvaluator(
+            metric_names=evaluation_conf.get('metrics', []),
+            predictions_path=predictions_path,
+            logger=self._logger
+        )
+        with evaluator:
+            for batch in loader:
+                inputs, targets = self._prepare_batch(batch)
+
+                with self._autocast():
+                    outputs = self._forward(inputs)
+                    loss = self._loss_fn(outputs, targets)
+
+                evaluator.update(targets.cpu().numpy(), outputs.float().cpu().numpy(), loss.item())
+
+        if self._world_size > 1:
+            state = all_reduce_sum(torch.from_numpy(evaluator.state()).to(self._device))
+            evaluator.load_state(state.cpu().numpy())
+
+        return evaluator.results()
+
+    def _save_model(self):
+        """
+        Saves the model's `state_dict` in the standard PyTorch format.
+
+        This method provides a default implementation for saving the final
+        trained model. It can be extended in a subclass to save the model in
+        additional formats like TorchScript or ONNX.
+
+        With `training.async_checkpointing` enabled, the `state_dict` is copied
+        to host memory and written atomically from a background thread, so
+        evaluation can proceed while the model is written. Serving artifacts
+        are exported separately, after evaluation, by `_export_model()`.
+
+        In distributed training, only rank 0 saves the model.
+        """
+        if not self._is_main_process():
+            return
+
+        self._logger.info("Saving PyTorch model...")
+        model_save_dir = self._config.get('training', {}).get('model_save_dir', './model')
+        save_path = os.path.join(model_save_dir, 'model.pt')
+        os.makedirs(os.path.dirname(save_path), exist_ok=True)
+
+        if self._checkpoint_manager is not None:
+            self._checkpoint_manager.write(self._unwrapped_model().state_dict(), save_path)
+            self._logger.info(f"Model is being saved to {save_path} in the background")
+        else:
+            torch.save(self._unwrapped_model().state_dict(), save_path)
+            self._logger.info(f"Model saved to {save_path}")
+
+    def _export_model(self):
+        """
+        Export serving artifacts and benchmark their inference latency, if
+        `training.export` is set (on rank 0 only in distributed training).
+
+        The `export` config section supports the following keys:
+        - `formats`: Any of `'torchscript'` (traced, frozen and optimised for
+          inference, written to `model.torchscript.pt`), `'torch_export'`
+          (written to `model.pt2`) and `'onnx'` (written to `model.onnx`,
+          requires `onnx` and `onnxscript`) (default: no exports).
+        - `quantize_int8`: Whether to also export a TorchScript copy of the
+          model with dynamically quantised int8 linear and recurrent layers,
+          to `model_int8.torchscript.pt` (default `False`).
+        - `benchmark`: Whether to benchmark the CPU latency of the eager
+          model and every exported TorchScript and `torch.export` artifact
+          (default `True`).
+        - `benchmark_batch_sizes`: The benchmarked batch sizes (default
+          `[1, 8, 32]`).
+        - `benchmark_iterations`: Timed calls per batch size (default 20).
+
+        Models are exported to `training.model_save_dir` on the CPU with a
+        dynamic batch dimension, from the inputs of the first test (or
+        training) batch, and the benchmark report is written to
+        `benchmark.json` in the model directory.
+
+        Raises
+        ------
+        ValueError
+            If an unsupported export format is configured.
+        """
+        train_conf = self._config.get('training') or {}
+        export_conf = self._config.get('export') or {}
+        formats = export_conf.get('formats') or []
+        if not train_conf.get('export', False) or not formats or not self._is_main_process():
+            return
+        model_save_dir = train_conf.get('model_save_dir', './model')
+
+        unsupported = sorted(set(formats) - set(self._EXPORT_FORMATS))
+        if unsupported:
+            raise ValueError(
+                f"Unsupported PyTorch export formats {unsupported}. Expected any of {self._EXPORT_FORMATS}."
+            )
+
+        model = copy.deepcopy(self._unwrapped_model()).cpu().eval()
+        example_loader = self._test_loader if self._test_loader is not None else self._train_loader
+        example_inputs = next(iter(example_loader))[0]
+
+        predictors = {'eager': model}
+        if 'torchscript' in formats:
+            torchscript_path = os.path.join(model_save_dir, 'model.torchscript.pt')
+            predictors['torchscript'] = export_torchscript(model, example_inputs, torchscript_path)
+            self._logger.info(f"TorchScript model exported to {torchscript_path}")
+        if 'torch_export' in formats:
+            program_path = os.path.join(model_save_dir, 'model.pt2')
+            predictors['torch_export'] = export_torch_program(model, example_inputs, program_path)
+            self._logger.info(f"Exported program saved to {program_path}")
+        if 'onnx' in formats:
+            onnx_path = os.path.join(model_save_dir, 'model.onnx')
+            export_torch_onnx(model, example_inputs, onnx_path)
+            self._logger.info(f"ONNX model exported to {onnx_path}")
+        if export_conf.get('quantize_int8', False):
+            quantized_path = os.path.join(model_save_dir, 'model_int8.torchscript.pt')
+            predictors['torchscript_int8'] = export_torchscript(
+                quantize_torch_dynamic_int8(model), example_inputs, quantized_path
+            )
+            self._logger.info(f"Dynamically quantised int8 TorchScript model exported to {quantized_path}")
+
+        if export_conf.get('benchmark', True):
+            results = {}
+            with torch.inference_mode():
+                for name, predictor in predictors.items():
+                    results[name] = benchmark_latency(
+                        predictor,
+                        example_inputs,
+                        batch_sizes=export_conf.get('benchmark_batch_sizes', DEFAULT_BENCHMARK_BATCH_SIZES),
+                        iterations=export_conf.get('benchmark_iterations', 20)
+                    )
+            write_benchmark_report(results, os.path.join(model_save_dir, 'benchmark.json'), logger=self._logger)
+
+    def _compile_model(self):
+        """
+        Wrap `self._model` in `torch.compile` if enabled in the config.
+
+        The `training.compile` config section supports the following keys:
+        - `enabled`: Whether to compile the model (default `False`).
+        - `mode`: The `torch.compile` mode, e.g. `'default'`,
+          `'reduce-overhead'` or `'max-autotune'` (default `'default'`).
+        - `backend`: The `torch.compile` backend (default `'inductor'`).
+        - `dynamic`: Passed through to `torch.compile` (default `None`).
+        - `cache_dir`: Directory for the persistent Inductor FX graph and
+          AOTAutograd caches, so that repeated runs (e.g. sweep trials) reuse
+          compiled artifacts instead of recompiling (default `None`, i.e. the
+          PyTorch default cache location).
+        - `pad_to_multiple_of`: Optional multiple to pad batch tensors to
+          along `pad_dims` (default `[1]`), using `input_pad_value` (default
+          0) and `target_pad_value` (default -100). Bucketing shapes this way
+          bounds the number of recompilations caused by dynamic shapes.
+
+        Notes
+        -----
+        The original module remains accessible via `_unwrapped_model()`, so
+        saved `state_dict` keys are unaffected by compilation.
+        """
+        compile_conf = self._compile_config()
+        if not compile_conf.get('enabled', False) or self._is_compiled():
+            return
+
+        cache_dir = compile_conf.get('cache_dir')
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            os.environ['TORCHINDUCTOR_CACHE_DIR'] = os.path.abspath(cache_dir)
+            torch._inductor.config.fx_graph_cache = True
+            torch._functorch.config.enable_autograd_cache = True
+
+        mode = compile_conf.get('mode', 'default')
+        self._logger.info(f"Compiling PyTorch model with torch.compile (mode='{mode}')...")
+        self._dynamo_graph_counter = torch._dynamo.utils.counters['stats']['unique_graphs']
+        self._model = torch.compile(
+            self._model,
+            mode=mode,
+            backend=compile_conf.get('backend', 'inductor'),
+            dynamic=compile_conf.get('dynamic')
+        )
+
+    def _forward(self, inputs: Any) -> Any:
+        """
+        Run a forward pass, tracking `torch.compile` compilations.
+
+        For compiled models, the wall-clock time of any forward pass that
+        compiles a new graph is added to `self._compile_time`, and
+        recompilations of the training graph (e.g. triggered by a new input
+        shape) are logged. Graphs compiled for gradient-free forward passes
+        (validation, evaluation and prediction under `torch.inference_mode`)
+        are expected, since dynamo guards on the grad mode, and are not
+        counted as recompilations.
+        """
+        if not self._is_compiled():
+            return self._model(inputs)
+
+        forward_start = time.perf_counter()
+        outputs = self._model(inputs)
+
+        graph_counter = torch._dynamo.utils.counters['stats']['unique_graphs']
+        if graph_counter > self._dynamo_graph_counter:
+            self._compile_time += time.perf_counter() - forward_start
+            new_graphs = graph_counter - self._dynamo_graph_counter
+            self._dynamo_graph_counter = graph_counter
+            if not torch.is_grad_enabled():
+                return outputs
+
+            if self._compiled_graph_count > 0:
+                self._logger.warning(
+                    f"torch.compile recompiled the model for input shapes {self._tensor_shapes(inputs)}. "
+                    f"Consider `training.compile.pad_to_multiple_of` or `training.compile.dynamic` to "
+                    f"avoid shape-driven recompilation."
+                )
+
+            self._compiled_graph_count += new_graphs
+
+        return outputs
+
+    def _prepare_batch(self, batch: Any) -> Any:
+        """
+        Move a batch to the device and apply any configured shape padding.
+        """
+        batch = self._move_to_device(batch)
+
+        compile_conf = self._compile_config()
+        multiple = compile_conf.get('pad_to_multiple_of')
+        if not self._is_compiled() or not multiple:
+            return batch
+
+        inputs, targets = batch
+        pad_dims = compile_conf.get('pad_dims', [1])
+
+        return (
+            self._pad_to_multiple(inputs, multiple, pad_dims, compile_conf.get('input_pad_value', 0)),
+            self._pad_to_multiple(targets, multiple, pad_dims, compile_conf.get('target_pad_value', -100))
+        )
+
+    def _compile_config(self) -> Dict[str, Any]:
+        """
+        Return the `training.compile` config section.
+        """
+        return self._config.get('training', {}).get('compile') or {}
+
+    def _is_compiled(self) -> bool:
+        """
+        Return whether `self._model` has been wrapped by `torch.compile`.
+        """
+        return isinstance(self._model, torch._dynamo.eval_frame.OptimizedModule)
+
+    def _unwrapped_model(self) -> torch.nn.Module:
+        """
+        Return the underlying `torch.nn.Module` of `self._model`, without any
+        `torch.compile` or `DistributedDataParallel` wrappers.
+        """
+        model = getattr(self._model, '_orig_mod', self._model)
+
+        return model.module if isinstance(model, DistributedDataParallel) else model
+
+    def _apply_activation_checkpointing(self):
+        """
+        Recompute the activations of the configured module types during the backward pass.
+
+        The `training.activation_checkpointing` config section supports the
+        following keys:
+        - `enabled`: Whether to checkpoint activations (default `False`).
+        - `module_types`: Class names of the modules to checkpoint, e.g.
+          `['TransformerEncoderLayer']`.
+        - `use_reentrant`: Whether to use the reentrant checkpoint
+          implementation (default `False`).
+
+        See `checkpoint_torch_modules`. Parameter names are unchanged, so
+        checkpoints and saved models are unaffected.
+        """
+        checkpointing_conf = self._config.get('training', {}).get('activation_checkpointing') or {}
+        if not checkpointing_conf.get('enabled', False):
+            return
+
+        module_types = checkpointing_conf.get('module_types', [])
+        num_checkpointed = checkpoint_torch_modules(
+            self._model,
+            module_types,
+            use_reentrant=checkpointing_conf.get('use_reentrant', False)
+        )
+        self._logger.info(f"Activation checkpointing enabled on {num_checkpointed} modules of types {module_types}.")
+
+    def _apply_memory_budget(self):
+        """
+        Fit the batch size (or gradient accumulation) to `training.memory_budget`.
+
+        Every probe runs forward and backward passes of the model on the first
+        training batch, resized to the probed batch size, and discards the
+        gradients (see `_plan_memory_budget`). Random number generator states
+        and module buffers (e.g. BatchNorm running statistics, which training
+        mode forward passes update) are restored afterwards, so probing does
+        not change the training run. If the batch size changes, the data
+        loaders are set up again.
+        """
+        budget_conf = self._config.get('training', {}).get('memory_budget') or {}
+        if not budget_conf.get('enabled', False):
+            return
+
+        rng_state = capture_rng_state()
+        buffers = {name: buffer.clone() for name, buffer in self._model.named_buffers()}
+        generator = self._train_loader.generator
+        generator_state = generator.get_state() if generator is not None else None
+        example_batch = next(iter(self._train_loader))
+
+        def probe_step(batch_size: int):
+            inputs, targets = self._prepare_batch(resize_batch(example_batch, batch_size))
+            self._model.train()
+            for _ in range(budget_conf.get('probe_steps', 2)):
+                with self._autocast():
+                    loss = self._loss_fn(self._model(inputs), targets)
+                loss.backward()
+                self._model.zero_grad(set_to_none=True)
+
+        try:
+            batch_size_changed = self._plan_memory_budget(probe_step)
+        finally:
+            restore_rng_state(rng_state)
+            if generator_state is not None:
+                generator.set_state(generator_state)
+            with torch.no_grad():
+                for name, buffer in self._model.named_buffers():
+                    buffer.copy_(buffers[name])
+
+        if batch_size_changed:
+            self._setup_data()
+
+    def _agree_on_batch_size(self, batch_size: int) -> int:
+        """
+        Return the smallest of every rank's largest fitting batch size.
+        """
+        if self._world_size == 1:
+            return batch_size
+
+        batch_size_tensor = torch.tensor(batch_size, device=self._device)
+        dist.all_reduce(batch_size_tensor, op=dist.ReduceOp.MIN)
+
+        return int(batch_size_tensor.item())
+
+    def _wrap_distributed_model(self):
+        """
+        Wrap `self._model` in `DistributedDataParallel` in distributed training.
+        """
+        if self._world_size <= 1 or isinstance(self._model, DistributedDataParallel):
+            return
+
+        device_ids = [get_local_rank()] if self._device_type() == 'cuda' else None
+        self._model = DistributedDataParallel(self._model, device_ids=device_ids)
+
+    def _gradient_sync(self, sync: bool):
+        """
+        Return a context that skips the gradient all-reduce unless `sync` is set.
+
+        Outside distributed training this is a no-op context.
+        """
+        model = getattr(self._model, '_orig_mod', self._model)
+        if sync or not isinstance(model, DistributedDataParallel):
+            return contextlib.nullcontext()
+
+        return model.no_sync()
+
+    def _reduce_mean(self, total: torch.Tensor, count: int) -> float:
+        """
+        Compute `total / count`, summing both over all ranks in distributed training.
+        """
+        if self._world_size > 1:
+            stats = all_reduce_sum(torch.stack([total.float(), torch.tensor(float(count), device=total.device)]))
+            total, count = stats[0], stats[1].item()
+
+        return (total / max(count, 1)).item()
+
+    def _is_main_process(self) -> bool:
+        """
+        Return whether this is the rank 0 process.
+        """
+        return self._rank == 0
+
+    def _move_to_device(self, batch: Any) -> Any:
+        """
+        Recursively move the tensors in a batch to `self._device`.
+
+        Copies are non-blocking, so host-to-device transfers from pinned memory
+        overlap with computation.
+        """
+        if isinstance(batch, torch.Tensor):
+            return batch.to(self._device, non_blocking=True)
+        if isinstance(batch, (list, tuple)):
+            return type(batch)(self._move_to_device(item) for item in batch)
+        if isinstance(batch, dict):
+            return {key: self._move_to_device(value) for key, value in batch.items()}
+
+        return batch
+
+    def _autocast(self) -> torch.autocast:
+        """
+        Return the autocast context configured by `training.mixed_precision`.
+        """
+        dtype = self._autocast_dtype()
+        return torch.autocast(device_type=self._device_type(), dtype=dtype, enabled=dtype is not None)
+
+    def _autocast_dtype(self) -> Union[torch.dtype, None]:
+        """
+        Resolve the `training.mixed_precision` config value to a torch dtype.
+
+        Raises
+        ------
+        ValueError
+            If the configured precision is not supported.
+        """
+        precision = self._config.get('training', {}).get('mixed_precision')
+        if precision is None:
+            return None
+        if precision not in self._AUTOCAST_DTYPES:
+            raise ValueError(
+                f"Unsupported `mixed_precision` value '{precision}'. "
+                f"Expected one of {sorted(self._AUTOCAST_DTYPES)} or null."
+            )
+
+        return self._AUTOCAST_DTYPES[precision]
+
+    def _device_type(self) -> str:
+        """
+        Return the device type (e.g. 'cuda' or 'cpu') of `self._device`.
+        """
+        return torch.device(self._device).type
+
+    @classmethod
+    def _pad_to_multiple(cls, batch: Any, multiple: int, dims: Sequence[int], value: float) -> Any:
+        """
+        Recursively right-pad the tensors in a batch so that the size of each
+        dimension in `dims` is a multiple of `multiple`.
+        """
+        if isinstance(batch, (list, tuple)):
+            return type(batch)(cls._pad_to_multiple(item, multiple, dims, value) for item in batch)
+        if not isinstance(batch, torch.Tensor):
+            return batch
+
+        # `F.pad` takes (left, right) pairs starting from the last dimension
+        padding = [0] * (2 * batch.dim())
+        for dim in dims:
+            if -batch.dim() <= dim < batch.dim():
+                dim %= batch.dim()
+                padding[2 * (batch.dim() - 1 - dim) + 1] = -batch.shape[dim] % multiple
+
+        if not any(padding):
+            return batch
+
+        return F.pad(batch, padding, value=value)
+
+    @classmethod
+    def _tensor_shapes(cls, batch: Any) -> Any:
+        """
+        Return the shapes of the tensors in a batch, for logging.
+        """
+        if isinstance(batch, torch.Tensor):
+            return tuple(batch.shape)
+        if isinstance(batch, (list, tuple)):
+            return [cls._tensor_shapes(item) for item in batch]
+        if isinstance(batch, dict):
+            return {key: cls._tensor_shapes(value) for key, value in batch.items()}
+
+        return type(batch).__name__
+
+    @staticmethod
+    def _batch_size(targets: Any) -> int:
+        """
+        Return the number of samples in a batch of targets.
+        """
+        if isinstance(targets, torch.Tensor):
+            return targets.shape[0] if targets.dim() > 0 else 1
 
-    pass
\ No newline at end of file
+        return len(targets)
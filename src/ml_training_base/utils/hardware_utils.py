@@ -0,0 +1,379 @@
+import os
+import json
+import math
+import logging
+import platform
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import tensorflow as tf
+import torch
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+DEFAULT_PROBE_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'ml_training_base', 'hardware_probe.json')
+
+# CPU flags relevant to the speed of numeric kernels, as named in `/proc/cpuinfo`
+PERFORMANCE_CPU_FLAGS = [
+    'sse4_2', 'fma', 'avx2', 'avx512f', 'avx512_vnni', 'avx512_bf16', 'avx512_fp16',
+    'amx_tile', 'amx_bf16', 'amx_int8'
+]
+
+# cgroup v1 reports an unlimited memory limit as a very large number rather than `max`
+_UNLIMITED_MEMORY_BYTES = 2 ** 60
+
+
+def cgroup_cpu_limit(cgroup_root: str = CGROUP_ROOT) -> Optional[float]:
+    """
+    Return the CPU quota imposed by the process's cgroup, in CPUs.
+
+    Container runtimes enforce CPU limits with a CFS quota rather than by
+    hiding cores, so `os.cpu_count()` reports the host's cores even when the
+    container may only use a fraction of them. Both cgroup v2 (`cpu.max`) and
+    cgroup v1 (`cpu.cfs_quota_us` / `cpu.cfs_period_us`) are supported.
+
+    Parameters
+    ----------
+    cgroup_root : str, optional
+        The cgroup filesystem mount point (default `'/sys/fs/cgroup'`).
+
+    Returns
+    -------
+    float or None
+        The number of CPUs allowed by the quota (e.g. 2.5), or `None` if no
+        quota is set or the cgroup files cannot be read.
+    """
+    try:
+        with open(os.path.join(cgroup_root, 'cpu.max'), 'r') as file:
+            quota, period = file.read().split()[:2]
+        if quota != 'max':
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open(os.path.join(cgroup_root, 'cpu', 'cpu.cfs_quota_us'), 'r') as file:
+            quota = int(file.read().strip())
+        with open(os.path.join(cgroup_root, 'cpu', 'cpu.cfs_period_us'), 'r') as file:
+            period = int(file.read().strip())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+def available_cpu_count(cgroup_root: str = CGROUP_ROOT) -> int:
+    """
+    Return the number of CPUs the current process can actually use.
+
+    This is the size of the process CPU affinity mask (or `os.cpu_count()`
+    where affinity is not supported), further capped by the cgroup CPU quota
+    rounded up to a whole CPU.
+
+    Parameters
+    ----------
+    cgroup_root : str, optional
+        The cgroup filesystem mount point (default `'/sys/fs/cgroup'`).
+
+    Returns
+    -------
+    int
+        The number of usable CPUs (at least 1).
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        cpu_count = len(os.sched_getaffinity(0))
+    else:
+        cpu_count = os.cpu_count() or 1
+
+    cpu_limit = cgroup_cpu_limit(cgroup_root)
+    if cpu_limit is not None:
+        cpu_count = min(cpu_count, math.ceil(cpu_limit))
+
+    return max(1, cpu_count)
+
+
+def cgroup_memory_limit(cgroup_root: str = CGROUP_ROOT) -> Optional[int]:
+    """
+    Return the memory limit imposed by the process's cgroup, in bytes.
+
+    Parameters
+    ----------
+    cgroup_root : str, optional
+        The cgroup filesystem mount point (default `'/sys/fs/cgroup'`).
+
+    Returns
+    -------
+    int or None
+        The memory limit, or `None` if no limit is set or the cgroup files
+        cannot be read.
+    """
+    for limit_path in (
+        os.path.join(cgroup_root, 'memory.max'),
+        os.path.join(cgroup_root, 'memory', 'memory.limit_in_bytes')
+    ):
+        try:
+            with open(limit_path, 'r') as file:
+                limit = file.read().strip()
+        except OSError:
+            continue
+
+        if limit == 'max' or not limit.isdigit() or int(limit) >= _UNLIMITED_MEMORY_BYTES:
+            return None
+        return int(limit)
+
+    return None
+
+
+def probe_hardware(
+    cache_path: Optional[str] = DEFAULT_PROBE_CACHE_PATH,
+    refresh: bool = False,
+    logger: Optional[logging.Logger] = None
+) -> Dict[str, Any]:
+    """
+    Probe the host's hardware and framework capabilities.
+
+    The report records the CPU model and performance-relevant instruction set
+    flags (AVX2, AVX-512, AMX), logical and physical core counts, cgroup CPU and
+    memory limits, host memory, framework versions, oneDNN/MKL availability and
+    the BLAS backends NumPy and PyTorch are built against.
+
+    The report is cached as JSON and reused while the host fingerprint (host
+    name, architecture, usable CPUs and framework versions) is unchanged.
+
+    Parameters
+    ----------
+    cache_path : str, optional
+        Path of the JSON cache file (default
+        `~/.cache/ml_training_base/hardware_probe.json`). `None` disables
+        caching.
+    refresh : bool, optional
+        Whether to ignore a cached report and probe again (default `False`).
+    logger : logging.Logger, optional
+        Logger for status messages.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The hardware report, with `fingerprint`, `cpu`, `memory` and
+        `frameworks` entries.
+    """
+    logger = logger if logger else logging.getLogger(__name__)
+    fingerprint = _host_fingerprint()
+
+    if cache_path and not refresh and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r') as file:
+                cached_report = json.load(file)
+            if cached_report.get('fingerprint') == fingerprint:
+                logger.debug(f"Using cached hardware probe from {cache_path}.")
+                return cached_report
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable hardware probe cache {cache_path}.")
+
+    logger.info("Probing hardware and framework capabilities...")
+    report = {
+        'fingerprint': fingerprint,
+        'cpu': _probe_cpu(),
+        'memory': _probe_memory(),
+        'frameworks': _probe_frameworks()
+    }
+
+    if cache_path:
+        write_json_report(report, cache_path)
+
+    return report
+
+
+def recommend_settings(report: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Recommend performance settings for the host described by a hardware report.
+
+    Parameters
+    ----------
+    report : Dict[str, Any]
+        A report returned by `probe_hardware`.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Recommended values for the `performance` and `training` config
+        sections, and a list of human-readable `notes` on settings that leave
+        performance on the table.
+
+    Notes
+    -----
+    1. Intra-op threads are limited to physical cores, as hyper-threads share
+       the vector units that dense kernels saturate.
+    2. bfloat16 autocast and reduced float32 matmul precision are recommended
+       when the CPU has native bfloat16 instructions (AVX512_BF16 or AMX) or
+       a CUDA device supports bfloat16.
+    """
+    cpu = report['cpu']
+    frameworks = report['frameworks']
+    flags = set(cpu['flags'])
+
+    intra_op_threads = max(1, min(cpu['available_cpus'], cpu['physical_cores'] or cpu['available_cpus']))
+    performance: Dict[str, Any] = {
+        'intra_op_threads': intra_op_threads,
+        'inter_op_threads': min(2, intra_op_threads)
+    }
+    training: Dict[str, Any] = {}
+    notes: List[str] = []
+
+    cpu_bf16 = bool(flags & {'avx512_bf16', 'amx_bf16'})
+    if frameworks['torch']['cuda_bf16_supported'] or cpu_bf16:
+        training['mixed_precision'] = 'bf16'
+    if frameworks['torch']['cuda_available']:
+        performance['matmul_precision'] = 'high'
+    elif cpu_bf16:
+        performance['matmul_precision'] = 'medium'
+
+    if frameworks['tensorflow']['onednn_opts'] == '0' and flags & {'avx2', 'avx512f'}:
+        notes.append("TensorFlow oneDNN optimisations are disabled (TF_ENABLE_ONEDNN_OPTS=0) on a CPU supporting them.")
+    if not frameworks['torch']['mkldnn_available']:
+        notes.append("PyTorch is built without oneDNN (MKL-DNN); CPU convolutions and matmuls will be slower.")
+    if cpu['cgroup_cpu_limit'] is not None and cpu['cgroup_cpu_limit'] < cpu['logical_cores']:
+        notes.append(
+            f"The cgroup CPU quota ({cpu['cgroup_cpu_limit']:g} CPUs) is below the host's "
+            f"{cpu['logical_cores']} logical cores; thread counts are capped accordingly."
+        )
+
+    return {'performance': performance, 'training': training, 'notes': notes}
+
+
+def write_json_report(report: Dict[str, Any], path: str) -> None:
+    """
+    Write a report dictionary as indented JSON, creating parent directories.
+
+    Parameters
+    ----------
+    report : Dict[str, Any]
+        The report to write.
+    path : str
+        The destination path.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(report, file, indent=2, default=str)
+
+
+def _host_fingerprint() -> Dict[str, Any]:
+    """
+    Identify the host and software stack a cached probe is valid for.
+    """
+    return {
+        'hostname': platform.node(),
+        'machine': platform.machine(),
+        'available_cpus': available_cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'torch': torch.__version__,
+        'tensorflow': tf.__version__
+    }
+
+
+def _read_cpuinfo() -> List[Dict[str, str]]:
+    """
+    Parse `/proc/cpuinfo` into one dictionary per logical CPU (empty if unavailable).
+    """
+    try:
+        with open('/proc/cpuinfo', 'r') as file:
+            blocks = file.read().strip().split('\n\n')
+    except OSError:
+        return []
+
+    processors = []
+    for block in blocks:
+        entries = (line.split(':', 1) for line in block.splitlines() if ':' in line)
+        processors.append({key.strip(): value.strip() for key, value in entries})
+
+    return processors
+
+
+def _probe_cpu() -> Dict[str, Any]:
+    """
+    Probe the CPU model, performance-relevant flags and core counts.
+    """
+    processors = _read_cpuinfo()
+    first = processors[0] if processors else {}
+    flags = set(first.get('flags', '').split())
+
+    # Physical cores are unique (package, core) pairs; without topology information, assume no SMT
+    cores = {(processor.get('physical id'), processor.get('core id')) for processor in processors}
+    physical_cores = len(cores) if processors and 'core id' in first else (os.cpu_count() or 1)
+
+    return {
+        'model': first.get('model name') or platform.processor() or platform.machine(),
+        'flags': [flag for flag in PERFORMANCE_CPU_FLAGS if flag in flags],
+        'logical_cores': os.cpu_count() or 1,
+        'physical_cores': physical_cores,
+        'available_cpus': available_cpu_count(),
+        'cgroup_cpu_limit': cgroup_cpu_limit(),
+        'torch_cpu_capability': torch.backends.cpu.get_cpu_capability()
+    }
+
+
+def _probe_memory() -> Dict[str, Any]:
+    """
+    Probe the host memory and cgroup memory limit, in bytes.
+    """
+    meminfo = {}
+    try:
+        with open('/proc/meminfo', 'r') as file:
+            for line in file:
+                key, value = line.split(':', 1)
+                meminfo[key] = int(value.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    total = meminfo.get('MemTotal')
+    if total is None and hasattr(os, 'sysconf'):
+        total = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+    return {
+        'total_bytes': total,
+        'available_bytes': meminfo.get('MemAvailable'),
+        'cgroup_limit_bytes': cgroup_memory_limit()
+    }
+
+
+def _probe_frameworks() -> Dict[str, Any]:
+    """
+    Probe framework versions, accelerator availability and math library backends.
+    """
+    torch_build = torch.__config__.show()
+    torch_blas = next(
+        (item.split('=', 1)[1] for item in torch_build.replace('\n', ',').split(',') if 'BLAS_INFO=' in item),
+        None
+    )
+
+    try:
+        numpy_blas = np.show_config(mode='dicts')['Build Dependencies']['blas'].get('name')
+    except (TypeError, KeyError):
+        numpy_blas = None
+
+    cuda_available = torch.cuda.is_available()
+
+    return {
+        'python': platform.python_version(),
+        'numpy': {'version': np.__version__, 'blas': numpy_blas},
+        'torch': {
+            'version': torch.__version__,
+            'blas': torch_blas.strip() if torch_blas else None,
+            'mkl_available': torch.backends.mkl.is_available(),
+            'mkldnn_available': torch.backends.mkldnn.is_available(),
+            'openmp_available': torch.backends.openmp.is_available(),
+            'cuda_available': cuda_available,
+            'cuda_device_count': torch.cuda.device_count() if cuda_available else 0,
+            'cuda_bf16_supported': bool(cuda_available and torch.cuda.is_bf16_supported())
+        },
+        'tensorflow': {
+            'version': tf.__version__,
+            'build_info': dict(tf.sysconfig.get_build_info()),
+            'gpus': [device.name for device in tf.config.list_physical_devices('GPU')],
+            # oneDNN optimisations are on by default on x86 Linux unless explicitly disabled
+            'onednn_opts': os.environ.get('TF_ENABLE_ONEDNN_OPTS')
+        }
+    }
@@ -1,3 +1,4 @@
+import os
 import logging
 
 
@@ -5,6 +6,10 @@ def configure_logger(log_path: str) -> logging.Logger:
     """
     Configures and returns a module-specific logger.
 
+    If the logger is already configured with a different log file (e.g. by
+    a previous trial run in the same process), its file handler is replaced
+    so that messages go to the new `log_path`.
+
     Returns:
         logging.Logger: Configured logger.
     """
@@ -28,5 +33,14 @@ def configure_logger(log_path: str) -> logging.Logger:
         # Add handlers to the logger
         logger.addHandler(console_handler)
         logger.addHandler(file_handler)
+    else:
+        for handler in list(logger.handlers):
+            if isinstance(handler, logging.FileHandler) and handler.baseFilename != os.path.abspath(log_path):
+                file_handler = logging.FileHandler(log_path)
+                file_handler.setLevel(handler.level)
+                file_handler.setFormatter(handler.formatter)
+                logger.removeHandler(handler)
+                handler.close()
+                logger.addHandler(file_handler)
 
     return logger
@@ -0,0 +1,421 @@
+import os
+import csv
+import time
+import logging
+import resource
+import threading
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+
+def current_rss_bytes() -> int:
+    """
+    Return the resident set size (RSS) of this process, in bytes.
+
+    The RSS is read from `/proc/self/statm` on Linux. Elsewhere, the peak RSS
+    reported by `getrusage` is returned instead.
+    """
+    try:
+        with open('/proc/self/statm', 'r') as file:
+            resident_pages = int(file.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # `ru_maxrss` is in kilobytes on Linux and bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if os.uname().sysname == 'Darwin' else max_rss * 1024
+
+
+class PeakRSSMonitor:
+    """
+    Track the peak RSS of this process over a block of code.
+
+    The kernel's own high-water mark (`VmHWM`) covers the whole lifetime of
+    the process, so it cannot measure a single block. Instead, a daemon
+    thread samples the RSS at a fixed interval while the block runs, and the
+    RSS is also sampled on entry and exit.
+
+    Examples
+    --------
+    >>> with PeakRSSMonitor() as monitor:
+    ...     run_training_step()
+    >>> monitor.peak_bytes
+
+    Attributes
+    ----------
+    _interval : float
+        Seconds between samples.
+    _peak_bytes : int
+        The highest RSS sampled so far.
+    _stop_event : threading.Event
+        Signals the sampling thread to stop.
+    _thread : threading.Thread
+        The sampling thread, while monitoring.
+    """
+    def __init__(self, interval: float = 0.005):
+        """
+        Initialise the PeakRSSMonitor.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between samples (default 0.005).
+        """
+        self._interval = interval
+        self._peak_bytes = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def peak_bytes(self) -> int:
+        """
+        The highest RSS sampled while monitoring, in bytes.
+        """
+        return self._peak_bytes
+
+    def __enter__(self) -> 'PeakRSSMonitor':
+        self._peak_bytes = current_rss_bytes()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample, name='PeakRSSMonitor', daemon=True)
+        self._thread.start()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._peak_bytes = max(self._peak_bytes, current_rss_bytes())
+
+    def _sample(self):
+        while not self._stop_event.wait(self._interval):
+            self._peak_bytes = max(self._peak_bytes, current_rss_bytes())
+
+
+@dataclass
+class EpochMemoryStats:
+    """
+    Memory usage at the end of a training epoch.
+
+    Attributes
+    ----------
+    epoch : int
+        The zero-indexed epoch.
+    rss_bytes : int
+        The RSS at the end of the epoch.
+    rss_growth_bytes : int
+        The RSS growth since the end of the previous epoch (or since
+        monitoring started, for the first epoch).
+    python_growth_bytes : int
+        The growth of memory allocated by Python code, as traced by
+        `tracemalloc` (0 when not tracing).
+    top_allocations : List[str]
+        The source lines whose traced allocations grew the most during the
+        epoch, with their growth.
+    """
+    epoch: int
+    rss_bytes: int
+    rss_growth_bytes: int
+    python_growth_bytes: int = 0
+    top_allocations: List[str] = field(default_factory=list)
+
+
+class MemoryMonitor:
+    """
+    Sample memory usage in the background and detect growth across epochs.
+
+    A daemon thread samples the RSS (and optional framework allocator
+    statistics) at a fixed interval and appends them to a CSV timeline, which
+    can be graphed to see how memory evolves over a run. At every
+    `epoch_end`, a `tracemalloc` snapshot is compared with the previous one,
+    and the source lines whose allocations grew the most are logged. Tracing
+    starts once the warm-up epochs end, so the many allocations made by lazy
+    imports and one-off caches in the first epoch are never traced, and
+    snapshots stay cheap. A warning is logged when the RSS grows by more than
+    a threshold in an epoch, which is the usual signature of a leak (e.g.
+    accumulating loss tensors or growing caches) long before the process is
+    killed.
+
+    Examples
+    --------
+    >>> with MemoryMonitor(timeline_path='var/log/memory_timeline.csv', growth_threshold_mb=64) as monitor:
+    ...     for epoch in range(epochs):
+    ...         train_epoch()
+    ...         monitor.epoch_end(epoch)
+
+    Attributes
+    ----------
+    _interval : float
+        Seconds between background samples.
+    _timeline_path : str or None
+        The CSV timeline file.
+    _top_n : int
+        The number of allocation sites logged per epoch.
+    _growth_threshold_bytes : int or None
+        The RSS growth per epoch above which a warning is logged.
+    _warmup_epochs : int
+        The first epochs, which are not checked against the threshold.
+    _trace_python : bool
+        Whether Python allocations are traced with `tracemalloc`.
+    _traceback_frames : int
+        The number of frames stored per traced allocation.
+    _allocator_stats : Callable[[], Dict[str, int]] or None
+        Returns framework allocator statistics, in bytes, by name.
+    _logger : logging.Logger
+        Logger for epoch summaries and growth warnings.
+    _epoch_stats : List[EpochMemoryStats]
+        The statistics of every completed epoch.
+    """
+    def __init__(
+        self,
+        interval: float = 1.0,
+        timeline_path: Optional[str] = None,
+        top_n: int = 10,
+        growth_threshold_mb: Optional[float] = None,
+        warmup_epochs: int = 1,
+        trace_python: bool = True,
+        traceback_frames: int = 1,
+        allocator_stats: Optional[Callable[[], Dict[str, int]]] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between background samples (default 1.0).
+        timeline_path : str, optional
+            The CSV file the samples and epoch ends are written to (default:
+            no timeline).
+        top_n : int, optional
+            The number of allocation sites logged per epoch (default 10).
+        growth_threshold_mb : float, optional
+            Log a warning when the RSS grows by more than this many MiB in an
+            epoch (default: never).
+        warmup_epochs : int, optional
+            The number of first epochs not checked against the threshold, as
+            they allocate caches and optimizer state (default 1). Python
+            allocations are traced from the end of the warm-up epochs.
+        trace_python : bool, optional
+            Whether to trace Python allocations with `tracemalloc` (default
+            `True`). Tracing slows down allocation-heavy Python code, and each
+            snapshot takes time proportional to the number of live traced
+            allocations.
+        traceback_frames : int, optional
+            Frames stored per traced allocation (default 1). More frames give
+            more context but cost more memory and time.
+        allocator_stats : Callable[[], Dict[str, int]], optional
+            Returns framework allocator statistics (e.g. CUDA memory
+            allocated and reserved), in bytes, by name. They are sampled with
+            the RSS and written to the timeline.
+        logger : logging.Logger, optional
+            Logger for epoch summaries and growth warnings.
+        """
+        self._interval = interval
+        self._timeline_path = timeline_path
+        self._top_n = top_n
+        self._growth_threshold_bytes = growth_threshold_mb * 2 ** 20 if growth_threshold_mb is not None else None
+        self._warmup_epochs = warmup_epochs
+        self._trace_python = trace_python
+        self._traceback_frames = traceback_frames
+        self._allocator_stats = allocator_stats
+        self._logger = logger if logger else logging.getLogger(__name__)
+
+        self._epoch_stats: List[EpochMemoryStats] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_tracing = False
+        self._start_time = 0.0
+        self._peak_rss_bytes = 0
+        self._last_rss_bytes = 0
+        self._last_allocations: Optional[Dict[tracemalloc.Traceback, tracemalloc.Statistic]] = None
+        self._timeline_file = None
+        self._timeline_writer = None
+        self._allocator_names: List[str] = []
+
+    @property
+    def epoch_stats(self) -> List[EpochMemoryStats]:
+        """
+        The statistics of every completed epoch.
+        """
+        return list(self._epoch_stats)
+
+    @property
+    def peak_rss_bytes(self) -> int:
+        """
+        The highest RSS sampled since monitoring started.
+        """
+        return self._peak_rss_bytes
+
+    def __enter__(self) -> 'MemoryMonitor':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        Start tracing and background sampling.
+        """
+        if self._thread is not None:
+            return
+
+        if self._warmup_epochs <= 0:
+            self._start_tracing()
+
+        self._start_time = time.perf_counter()
+        self._last_rss_bytes = self._peak_rss_bytes = current_rss_bytes()
+
+        if self._timeline_path:
+            self._allocator_names = sorted(self._allocator_stats()) if self._allocator_stats else []
+            os.makedirs(os.path.dirname(os.path.abspath(self._timeline_path)), exist_ok=True)
+            self._timeline_file = open(self._timeline_path, 'w', newline='')
+            self._timeline_writer = csv.writer(self._timeline_file)
+            self._timeline_writer.writerow(
+                ['elapsed_seconds', 'event', 'epoch', 'rss_mb', 'python_traced_mb']
+                + [f"{name}_mb" for name in self._allocator_names]
+            )
+        self._record('start')
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample, name='MemoryMonitor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop sampling and tracing, log a summary and close the timeline.
+        """
+        if self._thread is None:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._record('stop')
+
+        if self._timeline_file is not None:
+            self._timeline_file.close()
+            self._timeline_file = self._timeline_writer = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self._last_allocations = None
+
+        checked = self._epoch_stats[self._warmup_epochs:]
+        mean_growth = sum(stats.rss_growth_bytes for stats in checked) / len(checked) if checked else 0.0
+        self._logger.info(
+            f"Memory monitor: peak RSS {self._peak_rss_bytes / 2 ** 20:.1f} MiB, mean RSS growth "
+            f"{mean_growth / 2 ** 20:+.1f} MiB per epoch after warm-up over {len(self._epoch_stats)} epochs."
+        )
+
+    def epoch_end(self, epoch: int) -> EpochMemoryStats:
+        """
+        Record the memory usage at the end of an epoch, and compare it with
+        the previous epoch.
+
+        Parameters
+        ----------
+        epoch : int
+            The zero-indexed epoch.
+
+        Returns
+        -------
+        EpochMemoryStats
+            The epoch's memory statistics.
+        """
+        rss_bytes = self._record('epoch_end', epoch)
+        stats = EpochMemoryStats(epoch=epoch, rss_bytes=rss_bytes, rss_growth_bytes=rss_bytes - self._last_rss_bytes)
+        self._last_rss_bytes = rss_bytes
+
+        if self._last_allocations is not None:
+            allocations = self._allocation_statistics()
+            differences = [
+                tracemalloc.StatisticDiff(
+                    traceback,
+                    statistic.size if statistic else 0,
+                    (statistic.size if statistic else 0) - (previous.size if previous else 0),
+                    statistic.count if statistic else 0,
+                    (statistic.count if statistic else 0) - (previous.count if previous else 0)
+                )
+                for traceback in allocations.keys() | self._last_allocations.keys()
+                for statistic, previous in [(allocations.get(traceback), self._last_allocations.get(traceback))]
+            ]
+            differences.sort(key=lambda difference: difference.size_diff, reverse=True)
+            stats.python_growth_bytes = sum(difference.size_diff for difference in differences)
+            stats.top_allocations = [str(difference) for difference in differences[:self._top_n]
+                                     if difference.size_diff > 0]
+            self._last_allocations = allocations
+        self._epoch_stats.append(stats)
+        if self._last_allocations is None and len(self._epoch_stats) >= self._warmup_epochs:
+            self._start_tracing()
+
+        self._logger.info(
+            f"Epoch {epoch + 1} memory: RSS {rss_bytes / 2 ** 20:.1f} MiB ({stats.rss_growth_bytes / 2 ** 20:+.1f} "
+            f"MiB), traced Python allocations {stats.python_growth_bytes / 2 ** 20:+.1f} MiB."
+        )
+
+        exceeds_threshold = (self._growth_threshold_bytes is not None and len(self._epoch_stats) > self._warmup_epochs
+                             and stats.rss_growth_bytes > self._growth_threshold_bytes)
+        if exceeds_threshold:
+            self._logger.warning(
+                f"RSS grew by {stats.rss_growth_bytes / 2 ** 20:.1f} MiB in epoch {epoch + 1}, above the threshold "
+                f"of {self._growth_threshold_bytes / 2 ** 20:.1f} MiB. This may be a memory leak."
+            )
+        for allocation in stats.top_allocations:
+            self._logger.log(logging.WARNING if exceeds_threshold else logging.DEBUG, f"  {allocation}")
+
+        return stats
+
+    def _start_tracing(self):
+        """
+        Start tracing Python allocations (unless already traced) and take the
+        baseline snapshot.
+        """
+        if self._trace_python and not tracemalloc.is_tracing():
+            tracemalloc.start(self._traceback_frames)
+            self._started_tracing = True
+        self._last_allocations = self._allocation_statistics()
+
+    def _allocation_statistics(self) -> Optional[Dict[tracemalloc.Traceback, tracemalloc.Statistic]]:
+        """
+        Take a `tracemalloc` snapshot and group its traces by source line.
+
+        Only the grouped statistics are kept, as a retained snapshot would
+        itself be traced and inflate the next one. Allocations of the
+        monitor, `tracemalloc` and the import system are left out.
+        """
+        if not self._trace_python or not tracemalloc.is_tracing():
+            return None
+
+        ignored_files = (__file__, tracemalloc.__file__, '<frozen importlib._bootstrap>',
+                         '<frozen importlib._bootstrap_external>')
+        return {
+            statistic.traceback: statistic for statistic in tracemalloc.take_snapshot().statistics('lineno')
+            if statistic.traceback[0].filename not in ignored_files
+        }
+
+    def _record(self, event: str, epoch: Optional[int] = None) -> int:
+        """
+        Sample the memory usage, write it to the timeline and return the RSS.
+        """
+        rss_bytes = current_rss_bytes()
+        self._peak_rss_bytes = max(self._peak_rss_bytes, rss_bytes)
+        if self._timeline_writer is None:
+            return rss_bytes
+
+        traced_bytes = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        allocator_bytes = self._allocator_stats() if self._allocator_stats else {}
+        with self._lock:
+            self._timeline_writer.writerow(
+                [f"{time.perf_counter() - self._start_time:.3f}", event, '' if epoch is None else epoch,
+                 f"{rss_bytes / 2 ** 20:.2f}", f"{traced_bytes / 2 ** 20:.2f}"]
+                + [f"{allocator_bytes.get(name, 0) / 2 ** 20:.2f}" for name in self._allocator_names]
+            )
+            self._timeline_file.flush()
+
+        return rss_bytes
+
+    def _sample(self):
+        while not self._stop_event.wait(self._interval):
+            self._record('sample')
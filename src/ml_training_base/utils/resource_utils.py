@@ -0,0 +1,531 @@
+import os
+import csv
+import time
+import logging
+import resource
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ml_training_base.utils.hardware_utils import available_cpu_count
+from ml_training_base.utils.memory_utils import current_rss_bytes
+
+PROC_ROOT = '/proc'
+PROC_STAT_PATH = '/proc/stat'
+PROC_IO_PATH = '/proc/self/io'
+
+# Seconds between scans of every process for descendants, where `/proc/<pid>/task/<tid>/children` is unavailable
+DESCENDANT_SCAN_INTERVAL = 10.0
+
+# `getrusage` counts block I/O in 512-byte units
+_BLOCK_SIZE = 512
+
+
+@dataclass
+class ResourceSummary:
+    """
+    The resource usage of a monitored run.
+
+    Attributes
+    ----------
+    duration_seconds : float
+        The wall-clock duration of the run.
+    samples : int
+        The number of background samples taken.
+    available_cpus : int
+        The CPUs the process was allowed to use (affinity mask and cgroup
+        quota).
+    process_cpu_seconds : float
+        The user and system CPU time of this process (all of its threads)
+        and its child processes, e.g. DataLoader workers.
+    core_utilisation : Dict[int, float]
+        The busy fraction of every core in the affinity mask over the run,
+        by core index. This covers all processes on the core, including
+        DataLoader workers.
+    mean_load : float
+        The mean 1-minute load average.
+    peak_rss_bytes : int
+        The highest RSS sampled.
+    read_bytes : int
+        The bytes this process read from storage.
+    write_bytes : int
+        The bytes this process wrote to storage.
+    voluntary_context_switches : int
+        Context switches of this process while waiting (e.g. for I/O or a
+        lock).
+    involuntary_context_switches : int
+        Context switches of this process forced by the scheduler, which
+        are frequent when there are more runnable threads than cores.
+    """
+    duration_seconds: float
+    samples: int
+    available_cpus: int
+    process_cpu_seconds: float
+    core_utilisation: Dict[int, float] = field(default_factory=dict)
+    mean_load: float = 0.0
+    peak_rss_bytes: int = 0
+    read_bytes: int = 0
+    write_bytes: int = 0
+    voluntary_context_switches: int = 0
+    involuntary_context_switches: int = 0
+
+    @property
+    def mean_cores_used(self) -> float:
+        """
+        The mean number of cores kept busy by this process and its children.
+        """
+        return self.process_cpu_seconds / self.duration_seconds if self.duration_seconds > 0 else 0.0
+
+    @property
+    def cpu_utilisation(self) -> float:
+        """
+        The fraction of the available CPUs used by this process and its
+        children.
+        """
+        return self.mean_cores_used / self.available_cpus if self.available_cpus else 0.0
+
+
+@dataclass
+class _Counters:
+    """
+    Cumulative resource counters at one point in time.
+    """
+    time: float
+    cpu_seconds: float
+    core_times: Dict[int, Tuple[int, int]]
+    read_bytes: int
+    write_bytes: int
+    voluntary_context_switches: int
+    involuntary_context_switches: int
+
+
+class ResourceSampler:
+    """
+    Sample CPU, load, memory, disk and context-switch usage in the background.
+
+    A daemon thread reads cumulative counters (`/proc/stat`, `/proc/self/io`,
+    `getrusage` and the `/proc/<pid>/stat` of child processes) at a fixed
+    interval and writes the rates since the previous sample either to a CSV
+    timeline or, when no timeline is given, to the logger at DEBUG level
+    (the log file of `configure_logger`). Each sample costs a few file
+    reads, so sampling every second or so has no measurable effect on
+    training. Descendant processes are found by walking the
+    `/proc/<pid>/task/<tid>/children` files from this process; on kernels
+    without them, every process on the host is scanned instead, at most
+    every `DESCENDANT_SCAN_INTERVAL` seconds.
+
+    CPU time covers this process and all of its descendants, live or exited,
+    so input pipeline workers count towards the utilisation. On `stop`, a
+    `ResourceSummary` of the whole run is logged, with a warning when they
+    used less than `underuse_threshold` of the available CPUs, e.g. because
+    the input pipeline has too few workers or ops run with too few threads.
+
+    Examples
+    --------
+    >>> with ResourceSampler(interval=1.0, timeline_path='var/log/resource_timeline.csv') as sampler:
+    ...     train()
+    >>> sampler.summary.cpu_utilisation
+    0.93
+
+    Attributes
+    ----------
+    _interval : float
+        Seconds between background samples.
+    _timeline_path : str or None
+        The CSV timeline file.
+    _underuse_threshold : float
+        The CPU utilisation below which the summary warns.
+    _logger : logging.Logger
+        Logger for samples, the summary and under-use warnings.
+    _cores : List[int]
+        The cores in the process affinity mask.
+    _summary : ResourceSummary or None
+        The summary of the last completed run.
+    """
+    def __init__(
+        self,
+        interval: float = 1.0,
+        timeline_path: Optional[str] = None,
+        underuse_threshold: float = 0.5,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between background samples (default 1.0).
+        timeline_path : str, optional
+            The CSV file the samples are written to (default: samples are
+            logged at DEBUG level instead).
+        underuse_threshold : float, optional
+            Warn when the process and its children use less than this
+            fraction of the available CPUs over the run (default 0.5).
+        logger : logging.Logger, optional
+            Logger for samples, the summary and under-use warnings.
+        """
+        self._interval = interval
+        self._timeline_path = timeline_path
+        self._underuse_threshold = underuse_threshold
+        self._logger = logger if logger else logging.getLogger(__name__)
+        self._cores: List[int] = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else []
+
+        self._summary: Optional[ResourceSummary] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._first: Optional[_Counters] = None
+        self._last: Optional[_Counters] = None
+        self._samples = 0
+        self._load_total = 0.0
+        self._peak_rss_bytes = 0
+        self._timeline_file = None
+        self._timeline_writer = None
+        self._scanned_descendants: Optional[List[int]] = None
+        self._scan_time = 0.0
+
+    @property
+    def summary(self) -> Optional[ResourceSummary]:
+        """
+        The summary of the last completed run, or `None` before `stop`.
+        """
+        return self._summary
+
+    def __enter__(self) -> 'ResourceSampler':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """
+        Start background sampling.
+        """
+        if self._thread is not None:
+            return
+
+        self._summary = None
+        self._samples = 0
+        self._load_total = 0.0
+        self._peak_rss_bytes = current_rss_bytes()
+        self._scanned_descendants = None
+        self._first = self._last = self._read_counters()
+
+        if self._timeline_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self._timeline_path)), exist_ok=True)
+            self._timeline_file = open(self._timeline_path, 'w', newline='')
+            self._timeline_writer = csv.writer(self._timeline_file)
+            self._timeline_writer.writerow(
+                ['elapsed_seconds', 'process_cpu_pct', 'load_1m', 'rss_mb', 'read_mb_s', 'write_mb_s',
+                 'voluntary_cs_s', 'involuntary_cs_s'] + [f"core{core}_pct" for core in self._cores]
+            )
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sample, name='ResourceSampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Optional[ResourceSummary]:
+        """
+        Stop sampling, close the timeline and log a summary of the run.
+
+        Returns
+        -------
+        ResourceSummary or None
+            The summary, or `None` if the sampler was not running.
+        """
+        if self._thread is None:
+            return None
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self._record()
+
+        if self._timeline_file is not None:
+            self._timeline_file.close()
+            self._timeline_file = self._timeline_writer = None
+
+        first, last = self._first, self._last
+        self._summary = ResourceSummary(
+            duration_seconds=last.time - first.time,
+            samples=self._samples,
+            available_cpus=available_cpu_count(),
+            process_cpu_seconds=last.cpu_seconds - first.cpu_seconds,
+            core_utilisation=_core_utilisation(first.core_times, last.core_times, self._cores),
+            mean_load=self._load_total / self._samples if self._samples else 0.0,
+            peak_rss_bytes=self._peak_rss_bytes,
+            read_bytes=last.read_bytes - first.read_bytes,
+            write_bytes=last.write_bytes - first.write_bytes,
+            voluntary_context_switches=last.voluntary_context_switches - first.voluntary_context_switches,
+            involuntary_context_switches=last.involuntary_context_switches - first.involuntary_context_switches
+        )
+        self._log_summary(self._summary)
+
+        return self._summary
+
+    def _log_summary(self, summary: ResourceSummary):
+        utilisation = list(summary.core_utilisation.values())
+        cores = (f"core busy min/mean/max {min(utilisation):.0%}/{sum(utilisation) / len(utilisation):.0%}/"
+                 f"{max(utilisation):.0%}, " if utilisation else "")
+        self._logger.info(
+            f"Resource usage over {summary.duration_seconds:.1f}s: {summary.mean_cores_used:.2f} of "
+            f"{summary.available_cpus} available CPUs used ({summary.cpu_utilisation:.0%}), {cores}"
+            f"mean load {summary.mean_load:.2f}, peak RSS {summary.peak_rss_bytes / 2 ** 20:.1f} MiB, "
+            f"read {summary.read_bytes / 2 ** 20:.1f} MiB, wrote {summary.write_bytes / 2 ** 20:.1f} MiB, "
+            f"{summary.voluntary_context_switches} voluntary and {summary.involuntary_context_switches} "
+            f"involuntary context switches."
+        )
+
+        if summary.duration_seconds > 0 and summary.cpu_utilisation < self._underuse_threshold:
+            idle_cores = sum(fraction < 0.2 for fraction in utilisation)
+            self._logger.warning(
+                f"Cores are under-used: the run (including its child processes) kept {summary.mean_cores_used:.2f} "
+                f"of {summary.available_cpus} available CPUs busy on average"
+                + (f", and {idle_cores} cores were mostly idle" if idle_cores else "")
+                + ". Consider more input pipeline workers, more intra-op threads or a larger batch size."
+            )
+
+    def _record(self):
+        """
+        Read the counters and write the rates since the previous sample.
+        """
+        counters = self._read_counters()
+        previous, self._last = self._last, counters
+        elapsed = counters.time - previous.time
+        if elapsed <= 0:
+            return
+
+        rss_bytes = current_rss_bytes()
+        load = os.getloadavg()[0] if hasattr(os, 'getloadavg') else 0.0
+        self._peak_rss_bytes = max(self._peak_rss_bytes, rss_bytes)
+        self._load_total += load
+        self._samples += 1
+
+        process_cpu = (counters.cpu_seconds - previous.cpu_seconds) / elapsed
+        read_rate = (counters.read_bytes - previous.read_bytes) / elapsed
+        write_rate = (counters.write_bytes - previous.write_bytes) / elapsed
+        voluntary_rate = (counters.voluntary_context_switches - previous.voluntary_context_switches) / elapsed
+        involuntary_rate = (counters.involuntary_context_switches - previous.involuntary_context_switches) / elapsed
+        core_utilisation = _core_utilisation(previous.core_times, counters.core_times, self._cores)
+
+        if self._timeline_writer is not None:
+            self._timeline_writer.writerow(
+                [f"{counters.time - self._first.time:.3f}", f"{process_cpu * 100:.1f}", f"{load:.2f}",
+                 f"{rss_bytes / 2 ** 20:.2f}", f"{read_rate / 2 ** 20:.3f}", f"{write_rate / 2 ** 20:.3f}",
+                 f"{voluntary_rate:.1f}", f"{involuntary_rate:.1f}"]
+                + [f"{core_utilisation.get(core, 0.0) * 100:.1f}" for core in self._cores]
+            )
+            self._timeline_file.flush()
+        else:
+            cores = " ".join(f"{fraction * 100:.0f}" for fraction in core_utilisation.values())
+            self._logger.debug(
+                f"Resources: process CPU {process_cpu * 100:.0f}%, core busy % [{cores}], load {load:.2f}, "
+                f"RSS {rss_bytes / 2 ** 20:.1f} MiB, read {read_rate / 2 ** 20:.2f} MiB/s, write "
+                f"{write_rate / 2 ** 20:.2f} MiB/s, context switches {voluntary_rate:.0f}/s voluntary, "
+                f"{involuntary_rate:.0f}/s involuntary."
+            )
+
+    def _sample(self):
+        while not self._stop_event.wait(self._interval):
+            self._record()
+
+    def _live_descendants(self) -> List[int]:
+        """
+        Return the pids of the live descendants of this process.
+
+        Where the kernel has no `children` files to walk the process tree,
+        every process on the host must be scanned, so the scanned descendants
+        are reused for `DESCENDANT_SCAN_INTERVAL` seconds.
+        """
+        descendants = _descendant_pids(os.getpid(), scan=False)
+        if descendants is not None:
+            return descendants
+
+        now = time.perf_counter()
+        if self._scanned_descendants is None or now - self._scan_time >= DESCENDANT_SCAN_INTERVAL:
+            self._scanned_descendants = _scan_descendant_pids(os.getpid())
+            self._scan_time = now
+
+        return self._scanned_descendants
+
+    def _read_counters(self) -> _Counters:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        # Exited (and reaped) children are counted by `RUSAGE_CHILDREN`, live descendants from `/proc`
+        children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        read_bytes, write_bytes = _read_process_io()
+        if read_bytes is None:
+            read_bytes, write_bytes = usage.ru_inblock * _BLOCK_SIZE, usage.ru_oublock * _BLOCK_SIZE
+
+        return _Counters(
+            time=time.perf_counter(),
+            cpu_seconds=(usage.ru_utime + usage.ru_stime + children_usage.ru_utime + children_usage.ru_stime
+                         + _cpu_seconds(self._live_descendants())),
+            core_times=_read_core_times(),
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+            voluntary_context_switches=usage.ru_nvcsw,
+            involuntary_context_switches=usage.ru_nivcsw
+        )
+
+
+def _read_core_times(path: str = PROC_STAT_PATH) -> Dict[int, Tuple[int, int]]:
+    """
+    Return the cumulative busy and total time of every core, in clock ticks,
+    from `/proc/stat` (empty where it does not exist).
+    """
+    core_times = {}
+    try:
+        with open(path, 'r') as file:
+            for line in file:
+                if not line.startswith('cpu') or line.startswith('cpu '):
+                    continue
+                name, *values = line.split()
+                # user nice system idle iowait irq softirq steal (guest time is already counted in user time)
+                ticks = [int(value) for value in values[:8]]
+                idle = ticks[3] + (ticks[4] if len(ticks) > 4 else 0)
+                core_times[int(name[3:])] = (sum(ticks) - idle, sum(ticks))
+    except (OSError, ValueError, IndexError):
+        return {}
+
+    return core_times
+
+
+def _descendant_cpu_seconds(pid: int, proc_root: str = PROC_ROOT) -> float:
+    """
+    Return the CPU time of the live descendants of a process, from
+    `/proc/<pid>/stat` (0 where `/proc` does not exist).
+
+    The time of each descendant's own exited children is included, so no
+    process is counted twice as the process tree changes.
+    """
+    return _cpu_seconds(_descendant_pids(pid, proc_root), proc_root)
+
+
+def _descendant_pids(pid: int, proc_root: str = PROC_ROOT, scan: bool = True) -> Optional[List[int]]:
+    """
+    Return the pids of the live descendants of a process.
+
+    The tree is walked through the `/proc/<pid>/task/<tid>/children` files,
+    which only costs a read per descendant thread. Kernels built without
+    them need a scan of every process on the host instead, which is only
+    done when `scan` is set (otherwise `None` is returned).
+    """
+    descendants, stack = [], [pid]
+    while stack:
+        children = _child_pids(stack.pop(), proc_root)
+        if children is None:
+            return _scan_descendant_pids(pid, proc_root) if scan else None
+        descendants.extend(children)
+        stack.extend(children)
+
+    return descendants
+
+
+def _child_pids(pid: int, proc_root: str = PROC_ROOT) -> Optional[List[int]]:
+    """
+    Return the pids of the children of a process, from the `children` files
+    of its threads, or `None` where the kernel does not provide them.
+    """
+    task_dir = os.path.join(proc_root, str(pid), 'task')
+    try:
+        tids = os.listdir(task_dir)
+    except OSError:
+        # The process exited (or `/proc` does not exist)
+        return []
+
+    children = []
+    for tid in tids:
+        try:
+            with open(os.path.join(task_dir, tid, 'children'), 'r') as file:
+                children.extend(int(child) for child in file.read().split())
+        except FileNotFoundError:
+            if not os.path.isdir(os.path.join(task_dir, tid)):
+                # The thread exited while the children were read
+                continue
+            return None
+        except OSError:
+            continue
+
+    return children
+
+
+def _scan_descendant_pids(pid: int, proc_root: str = PROC_ROOT) -> List[int]:
+    """
+    Return the pids of the live descendants of a process by reading the
+    parent of every process in `/proc`.
+    """
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = [entry for entry in os.listdir(proc_root) if entry.isdigit()]
+    except OSError:
+        return []
+
+    for entry in entries:
+        fields = _read_stat_fields(int(entry), proc_root)
+        if fields is not None:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+
+    descendants, stack = [], list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        descendants.append(child)
+        stack.extend(children.get(child, []))
+
+    return descendants
+
+
+def _cpu_seconds(pids: List[int], proc_root: str = PROC_ROOT) -> float:
+    """
+    Return the CPU time of processes and their exited children, from
+    `/proc/<pid>/stat` (processes that have exited are skipped).
+    """
+    total_ticks = 0
+    for pid in pids:
+        fields = _read_stat_fields(pid, proc_root)
+        if fields is not None:
+            # utime, stime, cutime and cstime
+            total_ticks += sum(int(value) for value in fields[11:15])
+
+    return total_ticks / os.sysconf('SC_CLK_TCK')
+
+
+def _read_stat_fields(pid: int, proc_root: str = PROC_ROOT) -> Optional[List[str]]:
+    """
+    Return the fields of `/proc/<pid>/stat` after the command name (the
+    state first), or `None` if the process has exited.
+    """
+    try:
+        with open(os.path.join(proc_root, str(pid), 'stat'), 'r') as file:
+            # The command name may contain spaces and is enclosed in parentheses
+            return file.read().rsplit(')', 1)[1].split()
+    except (OSError, IndexError):
+        return None
+
+
+def _read_process_io(path: str = PROC_IO_PATH) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Return the bytes this process read from and wrote to storage, from
+    `/proc/self/io` (`None` where it cannot be read).
+    """
+    try:
+        with open(path, 'r') as file:
+            fields = dict(line.split(':', 1) for line in file if ':' in line)
+        return int(fields['read_bytes']), int(fields['write_bytes'])
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+
+def _core_utilisation(
+    start: Dict[int, Tuple[int, int]],
+    end: Dict[int, Tuple[int, int]],
+    cores: List[int]
+) -> Dict[int, float]:
+    """
+    Return the busy fraction of each core between two `_read_core_times` readings.
+    """
+    utilisation = {}
+    for core in cores:
+        if core in start and core in end:
+            total = end[core][1] - start[core][1]
+            utilisation[core] = (end[core][0] - start[core][0]) / total if total > 0 else 0.0
+
+    return utilisation
@@ -0,0 +1,280 @@
+import os
+import sys
+import uuid
+import shutil
+import logging
+import tempfile
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+SHARED_MEMORY = 'shared_memory'
+MEMMAP = 'memmap'
+
+
+@dataclass(frozen=True)
+class SharedArrayDescriptor:
+    """
+    A lightweight, picklable handle to an array published by a
+    `SharedArrayStore`.
+
+    Passing a descriptor to another process costs a few bytes, and the
+    process then attaches to the array without copying it, so any number of
+    processes (e.g. DataLoader workers) share a single copy of the data.
+
+    Attributes
+    ----------
+    backend : str
+        'shared_memory' (a `multiprocessing.shared_memory` segment) or
+        'memmap' (a memory-mapped `.npy` file).
+    name : str
+        The name of the shared memory segment, or the path of the `.npy` file.
+    shape : Tuple[int, ...]
+        The array shape.
+    dtype : str
+        The array dtype, as `np.dtype.str`.
+    """
+    backend: str
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The size of the array in bytes.
+        """
+        return int(np.prod(self.shape, dtype=np.int64)) * np.dtype(self.dtype).itemsize
+
+    def attach(self, writable: bool = False) -> np.ndarray:
+        """
+        Attach to the shared array without copying it.
+
+        Parameters
+        ----------
+        writable : bool, optional
+            Whether the returned array may be written to (default `False`).
+            Writes are visible to every attached process.
+
+        Returns
+        -------
+        np.ndarray
+            A view of the shared array.
+        """
+        if self.backend == MEMMAP:
+            return np.load(self.name, mmap_mode='r+' if writable else 'r')
+
+        # `np.frombuffer` holds a buffer export on the segment, so the segment cannot be unmapped while the
+        # array (or any view of it) is alive
+        segment = _attach_shared_memory(self.name)
+        count = int(np.prod(self.shape, dtype=np.int64))
+        array = np.frombuffer(segment.buf, dtype=np.dtype(self.dtype), count=count).reshape(self.shape)
+        array.flags.writeable = writable
+
+        return array
+
+
+class SharedArrayStore:
+    """
+    Publish arrays once for zero-copy access from other processes.
+
+    `put` copies an array into shared memory or a memory-mapped file and
+    returns a `SharedArrayDescriptor`, which other processes `attach` to.
+    This avoids pickling datasets across process boundaries and keeping one
+    copy per process: the pages are shared through the OS, so N
+    preprocessing or DataLoader workers use the memory of one copy.
+
+    The store owns the data it publishes and removes it on `close` (or when
+    used as a context manager, on exit), so it must outlive every consumer.
+
+    Examples
+    --------
+    >>> with SharedArrayStore() as store:
+    ...     descriptors = {'x': store.put('x', x_train), 'y': store.put('y', y_train)}
+    ...     dataset = SharedArrayDataset([descriptors['x'], descriptors['y']])
+    ...     loader = build_data_loader(dataset, config['data'], num_workers=4)
+
+    Attributes
+    ----------
+    _backend : str
+        'shared_memory' or 'memmap'.
+    _directory : str or None
+        The directory of the memory-mapped files.
+    _owns_directory : bool
+        Whether the directory was created by the store (and is removed on
+        `close`).
+    _segments : Dict[str, shared_memory.SharedMemory]
+        The shared memory segments created by the store.
+    _descriptors : Dict[str, SharedArrayDescriptor]
+        The descriptors of the published arrays, by name.
+    """
+    def __init__(
+        self,
+        backend: str = SHARED_MEMORY,
+        directory: Optional[str] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Parameters
+        ----------
+        backend : str, optional
+            'shared_memory' (default) places arrays in POSIX shared memory
+            (`/dev/shm`), which is limited in size in some containers (e.g.
+            64 MiB by default in Docker). 'memmap' writes `.npy` files
+            instead; once in the page cache, they are shared just the same.
+        directory : str, optional
+            The directory of the 'memmap' files (default: a new temporary
+            directory, removed on `close`).
+        logger : logging.Logger, optional
+            Logger for published arrays.
+
+        Raises
+        ------
+        ValueError
+            If `backend` is unknown.
+        """
+        if backend not in (SHARED_MEMORY, MEMMAP):
+            raise ValueError(f"Unknown backend '{backend}'. Expected '{SHARED_MEMORY}' or '{MEMMAP}'.")
+
+        self._logger = logger if logger else logging.getLogger(__name__)
+        self._backend = backend
+        self._owns_directory = backend == MEMMAP and directory is None
+        self._directory = tempfile.mkdtemp(prefix='shared_arrays_') if self._owns_directory else directory
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+        self._descriptors: Dict[str, SharedArrayDescriptor] = {}
+
+    def __enter__(self) -> 'SharedArrayStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def descriptors(self) -> Dict[str, SharedArrayDescriptor]:
+        """
+        The descriptors of the published arrays, by name.
+        """
+        return dict(self._descriptors)
+
+    def put(self, name: str, array: np.ndarray) -> SharedArrayDescriptor:
+        """
+        Publish a copy of an array.
+
+        Parameters
+        ----------
+        name : str
+            The array name, unique within the store.
+        array : np.ndarray
+            The array. Object arrays cannot be shared.
+
+        Returns
+        -------
+        SharedArrayDescriptor
+            The descriptor to attach to the array with.
+
+        Raises
+        ------
+        ValueError
+            If the name is already used or the array has an object dtype.
+        """
+        array = np.asarray(array)
+        if name in self._descriptors:
+            raise ValueError(f"An array named '{name}' is already published.")
+        if array.dtype.hasobject:
+            raise ValueError(f"Array '{name}' has an object dtype, which cannot be shared without pickling.")
+
+        if self._backend == MEMMAP:
+            os.makedirs(self._directory, exist_ok=True)
+            path = os.path.join(self._directory, f"{name}.npy")
+            shared = np.lib.format.open_memmap(path, mode='w+', dtype=array.dtype, shape=array.shape)
+            shared[...] = array
+            shared.flush()
+            del shared
+            descriptor = SharedArrayDescriptor(MEMMAP, path, array.shape, array.dtype.str)
+        else:
+            # Zero-size segments are not allowed, so empty arrays get a one-byte segment
+            segment = shared_memory.SharedMemory(
+                name=f"mltb_{uuid.uuid4().hex[:16]}",
+                create=True,
+                size=max(array.nbytes, 1)
+            )
+            np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+            self._segments[name] = segment
+            descriptor = SharedArrayDescriptor(SHARED_MEMORY, segment.name, array.shape, array.dtype.str)
+
+        self._descriptors[name] = descriptor
+        self._logger.debug(f"Published array '{name}' {array.shape} ({array.nbytes / 2 ** 20:.1f} MiB) "
+                           f"via {self._backend}.")
+
+        return descriptor
+
+    def close(self):
+        """
+        Remove the published data. Processes still attached keep their
+        mappings until they release them.
+        """
+        for segment in self._segments.values():
+            try:
+                segment.close()
+            except BufferError:
+                # Arrays attached in this process still reference the segment; it is freed when they are
+                pass
+            segment.unlink()
+        self._segments.clear()
+
+        if self._backend == MEMMAP:
+            if self._owns_directory:
+                shutil.rmtree(self._directory, ignore_errors=True)
+            else:
+                for descriptor in self._descriptors.values():
+                    if os.path.exists(descriptor.name):
+                        os.remove(descriptor.name)
+        self._descriptors.clear()
+
+
+class _AttachedSharedMemory(shared_memory.SharedMemory):
+    """
+    A shared memory segment attached to by a consumer. Closing it fails while
+    arrays created from it are alive, in which case it stays mapped until
+    they are released.
+    """
+    def __del__(self):
+        try:
+            self.close()
+        except (BufferError, OSError):
+            pass
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return _AttachedSharedMemory(name=name, track=False)
+
+    # Before Python 3.13, attaching registers the segment with this process's resource tracker, which would
+    # unlink it when this process exits even though the store still owns it
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return _AttachedSharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def attach_arrays(descriptors: Dict[str, SharedArrayDescriptor], writable: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Attach to several shared arrays without copying them.
+
+    Parameters
+    ----------
+    descriptors : Dict[str, SharedArrayDescriptor]
+        The descriptors, e.g. `SharedArrayStore.descriptors`.
+    writable : bool, optional
+        Whether the returned arrays may be written to (default `False`).
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        The attached arrays, by name.
+    """
+    return {name: descriptor.attach(writable=writable) for name, descriptor in descriptors.items()}
@@ -3,6 +3,9 @@ import logging
 import sqlite3
 from pathlib import Path
 
+import numpy as np
+
+from ml_training_base.data.preprocessing import base_data_preprocessors
 from ml_training_base.data.preprocessing.base_data_preprocessors import BaseDataPreprocessor
 
 
@@ -85,6 +88,49 @@ class TestBaseDataPreprocessor:
         result = int_preprocessor.deduplicate_in_memory(data, content_name="IDs")
         assert result == expected_result
 
+    @pytest.mark.parametrize("data", [
+        np.array([10, 20, 1, 20, 10, 30], dtype=np.int64),
+        np.array([0.5, -0.0, 0.0, np.nan, 0.5, np.nan]),
+        np.array([True, False, True]),
+        np.array(["C", "A", "B", "A", "C", "Déjà vu", "D", "Déjà vu"]),
+        np.array([b"ab", b"a", b"ab", b"b"]),
+        np.array([1, "a", 1, (2, 3), "a"], dtype=object)
+    ])
+    def test_deduplicate_in_memory_array_fast_paths(self, int_preprocessor: BaseDataPreprocessor[int], data):
+        """
+        Tests that the vectorised array paths match the generic path and preserve first-occurrence order.
+        """
+        result = int_preprocessor.deduplicate_in_memory(data)
+        expected = int_preprocessor.deduplicate_in_memory(data.tolist())
+
+        assert isinstance(result, np.ndarray)
+        assert result.dtype == data.dtype
+        if data.dtype.kind == 'f':
+            # NaNs are treated as equal, and -0.0 equals 0.0
+            np.testing.assert_array_equal(result, np.array([0.5, -0.0, np.nan]))
+        else:
+            assert result.tolist() == expected
+
+    def test_deduplicate_in_memory_rows(self, int_preprocessor: BaseDataPreprocessor[int]):
+        """
+        Tests row-wise deduplication of 2-D arrays.
+        """
+        data = np.array([[1.0, 2.0], [3.0, 4.0], [1.0, 2.0], [-0.0, 1.0], [0.0, 1.0], [2.0, 1.0]], dtype=np.float32)
+        result = int_preprocessor.deduplicate_in_memory(data)
+        np.testing.assert_array_equal(result, data[[0, 1, 3, 5]])
+
+    def test_deduplicate_in_memory_hash_collisions(
+        self,
+        int_preprocessor: BaseDataPreprocessor[int],
+        monkeypatch: pytest.MonkeyPatch
+    ):
+        """
+        Tests that distinct items sharing a hash are not dropped.
+        """
+        monkeypatch.setattr(base_data_preprocessors, "_hash_word_rows", lambda words: np.zeros(len(words), np.uint64))
+        data = np.array(["b", "a", "b", "c", "a"])
+        assert int_preprocessor.deduplicate_in_memory(data).tolist() == ["b", "a", "c"]
+
     def test_deduplicate_on_disk_single_run(self, string_preprocessor: BaseDataPreprocessor[str], tmp_path: Path):
         """
         Tests on-disk deduplication for a single run, ensuring order is preserved.
@@ -132,3 +178,72 @@ class TestBaseDataPreprocessor:
         count = conn.execute("SELECT COUNT(*) FROM unique_items").fetchone()[0]
         conn.close()
         assert count == len(expected_final_result)
+
+    def test_deduplicate_new_on_disk(self, string_preprocessor: BaseDataPreprocessor[str], tmp_path: Path):
+        """
+        Tests that only items missing from the unique-item store are returned, in input order.
+        """
+        db_path = str(tmp_path / "test.db")
+        string_preprocessor.deduplicate_on_disk(["A", "B"], db_path=db_path)
+
+        new_items = string_preprocessor.deduplicate_new_on_disk(["C", "A", "D", "C", "B", "E"], db_path=db_path,
+                                                                batch_size=2)
+        assert new_items == ["C", "D", "E"]
+        assert sorted(string_preprocessor._extract_from_db(db_path)) == ["A", "B", "C", "D", "E"]
+
+    def test_append_to_dataset(self, string_preprocessor: BaseDataPreprocessor[str], tmp_path: Path):
+        """
+        Tests that appended drops are deduplicated, written as new shards and split consistently.
+        """
+        db_path = str(tmp_path / "test.db")
+        output_dir = str(tmp_path / "dataset")
+        fractions = {'train': 0.5, 'valid': 0.25, 'test': 0.25}
+        first_drop = [f"item-{i}" for i in range(200)]
+        second_drop = [f"item-{i}" for i in range(150, 300)]
+
+        first_shards = string_preprocessor.append_to_dataset(first_drop, output_dir, fractions, db_path=db_path)
+        second_shards = string_preprocessor.append_to_dataset(second_drop, output_dir, fractions, db_path=db_path)
+
+        assert all(path.endswith("part-00000.txt") for path in first_shards.values())
+        assert all(path.endswith("part-00001.txt") for path in second_shards.values())
+
+        appended = [line for path in second_shards.values() for line in Path(path).read_text().splitlines()]
+        assert sorted(appended) == sorted(f"item-{i}" for i in range(200, 300))
+
+        # Writing everything in one go assigns every item to the same split
+        string_preprocessor.write_split_shards([f"item-{i}" for i in range(300)], str(tmp_path / "full"), fractions)
+        for split_name in fractions:
+            full = set((tmp_path / "full" / split_name / "part-00000.txt").read_text().splitlines())
+            incremental = set()
+            for shards in (first_shards, second_shards):
+                incremental.update(Path(shards[split_name]).read_text().splitlines())
+            assert full == incremental
+
+    def test_append_to_dataset_retry_after_failed_write(
+        self,
+        string_preprocessor: BaseDataPreprocessor[str],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch
+    ):
+        """
+        Tests that records of a drop whose shard write fails are not marked as seen, so a retry writes them.
+        """
+        db_path = str(tmp_path / "test.db")
+        output_dir = tmp_path / "dataset"
+        fractions = {'train': 0.5, 'valid': 0.5}
+        drop = [f"item-{i}" for i in range(100)]
+
+        def fail_write(self, *args, **kwargs):
+            raise OSError("No space left on device")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(BaseDataPreprocessor, "write_split_shards", fail_write)
+            with pytest.raises(OSError):
+                string_preprocessor.append_to_dataset(drop, str(output_dir), fractions, db_path=db_path)
+
+        assert string_preprocessor._extract_from_db(db_path) == []
+
+        shards = string_preprocessor.append_to_dataset(drop, str(output_dir), fractions, db_path=db_path)
+        written = [line for path in shards.values() for line in Path(path).read_text().splitlines()]
+        assert sorted(written) == sorted(drop)
+        assert not list(output_dir.rglob("*.tmp"))
@@ -0,0 +1,139 @@
+import pytest
+import logging
+from pathlib import Path
+
+from ml_training_base.data.preprocessing.preprocessing_cache import MISSING, PreprocessingCache
+from ml_training_base.data.preprocessing.preprocessing_pipeline import PreprocessingPipeline
+
+
+def _upper(item: str) -> str:
+    return item.upper()
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def mock_logger() -> logging.Logger:
+    """
+    Provides a mock logger instance for tests.
+    """
+    return logging.getLogger("test_logger")
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    """
+    Provides the path of a cache database.
+    """
+    return str(tmp_path / "cache.db")
+
+
+class _CountingFunction:
+    """
+    A pure function that counts the items it computes.
+    """
+    def __init__(self):
+        self.computed = []
+
+    def __call__(self, item: str) -> str:
+        self.computed.append(item)
+        return item.upper()
+
+
+# --- Test Class ---
+
+class TestPreprocessingCache:
+    def test_memory_and_disk_hits(self, db_path: str, mock_logger: logging.Logger):
+        """
+        Tests that repeated items are served from the LRU, and that results persist across cache instances.
+        """
+        fn = _CountingFunction()
+        with PreprocessingCache(db_path, logger=mock_logger) as cache:
+            cached = cache.memoise(fn, version='1', name='upper')
+            assert cached.map_batch(["a", "b", "a"]) == ["A", "B", "A"]
+            assert cached.map_batch(["a", "b"]) == ["A", "B"]
+            assert cache.stats.memory_hits == 2
+            assert cache.stats.misses == 3
+
+        fn.computed.clear()
+        with PreprocessingCache(db_path, logger=mock_logger) as cache:
+            cached = cache.memoise(fn, version='1', name='upper')
+            assert list(cached.map(["a", "b", "c"], batch_size=2)) == ["A", "B", "C"]
+            assert fn.computed == ["c"]
+            assert cache.stats.disk_hits == 2
+            assert cache.stats.hit_rate == pytest.approx(2 / 3)
+
+    def test_version_change_invalidates(self, db_path: str, mock_logger: logging.Logger):
+        """
+        Tests that a new function version does not reuse stale results.
+        """
+        fn = _CountingFunction()
+        with PreprocessingCache(db_path, logger=mock_logger) as cache:
+            assert cache.memoise(fn, version='1', name='upper')("a") == "A"
+            assert cache.memoise(fn, version='2', name='upper')("a") == "A"
+
+        assert fn.computed == ["a", "a"]
+
+    def test_memory_lru_is_bounded(self, db_path: str, mock_logger: logging.Logger):
+        """
+        Tests that the in-process LRU holds at most `max_memory_items` values.
+        """
+        with PreprocessingCache(db_path, max_memory_items=2, logger=mock_logger) as cache:
+            cached = cache.memoise(_upper)
+            cached.map_batch(["a", "b", "c"])
+            assert len(cache._memory) == 2
+
+            cached.map_batch(["a"])
+            assert cache.stats.disk_hits == 1
+
+    def test_lambdas_require_a_name(self, db_path: str, mock_logger: logging.Logger):
+        """
+        Tests that lambdas need a `name`, so two lambdas sharing a cache do not share results.
+        """
+        with PreprocessingCache(db_path, logger=mock_logger) as cache:
+            with pytest.raises(ValueError):
+                cache.memoise(lambda item: item.upper())
+
+            upper = cache.memoise(lambda item: item.upper(), name='upper')
+            lower = cache.memoise(lambda item: item.lower(), name='lower')
+            assert upper("Ab") == "AB"
+            assert lower("Ab") == "ab"
+
+    def test_size_based_eviction(self, db_path: str, mock_logger: logging.Logger):
+        """
+        Tests that the least recently used entries are evicted once the store exceeds its size limit.
+        """
+        value_size = 10_000
+        with PreprocessingCache(db_path, max_memory_items=1, max_disk_mb=0.05, logger=mock_logger) as cache:
+            cached = cache.memoise(lambda item: item * value_size, name='repeat')
+            cached.map_batch(["a"])
+            cached.map_batch(["b", "c", "d"])
+            cached.map_batch(["a"])
+            cached.map_batch(["e", "f"])
+
+            assert cache.stats.evictions > 0
+            assert cache.disk_bytes <= 0.05 * 2 ** 20
+            assert cache.disk_bytes == sum(row[0] for row in cache._conn.execute("SELECT size FROM memo"))
+            # 'a' was used recently, so the oldest untouched entry 'b' is evicted first
+            cache._memory.clear()
+            _, values = cached.lookup(["a", "b"])
+            assert values == ["a" * value_size, MISSING]
+
+    def test_pipeline_computes_only_new_items(self, db_path: str, mock_logger: logging.Logger):
+        """
+        Tests that a pipeline map of a memoised function only computes uncached items, including in workers.
+        """
+        with PreprocessingCache(db_path, logger=mock_logger) as cache:
+            cached = cache.memoise(_upper, version='1')
+            first = PreprocessingPipeline(logger=mock_logger).read(["a", "b"]).map(cached).collect()
+            assert first == {'all': ["A", "B"]}
+
+            second = (
+                PreprocessingPipeline(logger=mock_logger)
+                .read(["b", "c", "a", "d"])
+                .map(cached, num_workers=2, chunk_size=2)
+                .collect()
+            )
+            assert second == {'all': ["B", "C", "A", "D"]}
+            assert cache.stats.misses == 4
+            assert len(cache) == 4
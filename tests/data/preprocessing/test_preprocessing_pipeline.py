@@ -0,0 +1,145 @@
+import pytest
+import logging
+from pathlib import Path
+
+from ml_training_base.data.preprocessing.base_data_preprocessors import BaseDataPreprocessor
+from ml_training_base.data.preprocessing.preprocessing_pipeline import PreprocessingPipeline, assign_split
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def mock_logger() -> logging.Logger:
+    """
+    Provides a mock logger instance for tests.
+    """
+    return logging.getLogger("test_logger")
+
+
+@pytest.fixture
+def pipeline(mock_logger: logging.Logger) -> PreprocessingPipeline:
+    """
+    Provides an empty pipeline.
+    """
+    return PreprocessingPipeline(logger=mock_logger)
+
+
+# --- Test Class ---
+
+class TestPreprocessingPipeline:
+    def test_stages_are_lazy(self, pipeline: PreprocessingPipeline):
+        """
+        Tests that no stage runs before the pipeline is iterated.
+        """
+        calls = []
+        iterator = pipeline.read([1, 2, 3]).map(lambda x: calls.append(x) or x).iterate()
+        assert calls == []
+
+        assert next(iterator) == 1
+        assert calls == [1]
+
+    def test_map_filter_deduplicate(self, pipeline: PreprocessingPipeline):
+        """
+        Tests fused map, filter and deduplicate stages, preserving first-occurrence order.
+        """
+        data = [" C", "A ", "", "B", "A", " C", "D"]
+        result = pipeline.read(data).map(str.strip).filter(bool).deduplicate().collect()
+        assert result == {'all': ["C", "A", "B", "D"]}
+
+    def test_stats_per_stage(self, pipeline: PreprocessingPipeline):
+        """
+        Tests that every stage reports its item counts and that adjacent per-item stages are fused.
+        """
+        pipeline.read(list(range(10))).filter(lambda x: x % 2 == 0, name='even').map(_square, name='square').run()
+
+        stats = {stage_stats.name: stage_stats for stage_stats in pipeline.stats}
+        assert [stage_stats.name for stage_stats in pipeline.stats] == ['read', 'even', 'square']
+        assert (stats['read'].items_in, stats['read'].items_out) == (10, 10)
+        assert (stats['even'].items_in, stats['even'].items_out) == (10, 5)
+        assert (stats['square'].items_in, stats['square'].items_out) == (5, 5)
+        assert stats['even'].fused_group == stats['square'].fused_group != stats['read'].fused_group
+        assert all(stage_stats.seconds >= 0 for stage_stats in pipeline.stats)
+
+    def test_parallel_map_preserves_order(self, pipeline: PreprocessingPipeline):
+        """
+        Tests that a map across worker processes emits results in input order.
+        """
+        data = list(range(2_500))
+        result = pipeline.read(data).map(_square, num_workers=2, chunk_size=100).deduplicate().collect()
+        assert result == {'all': [_square(x) for x in data]}
+
+        stats = {stage_stats.name: stage_stats for stage_stats in pipeline.stats}
+        assert stats['map:_square'].items_out == len(data)
+        assert stats['map:_square'].fused_group != stats['deduplicate'].fused_group
+
+    def test_split_is_deterministic_and_complete(self, pipeline: PreprocessingPipeline):
+        """
+        Tests that split assigns every item once, stably across runs and input orders.
+        """
+        data = [f"item-{i}" for i in range(2_000)]
+        fractions = {'train': 0.8, 'valid': 0.1, 'test': 0.1}
+        first = pipeline.read(data).split(fractions, seed=7).collect()
+        second = PreprocessingPipeline().read(reversed(data)).split(fractions, seed=7).collect()
+
+        assert sorted(sum(first.values(), [])) == sorted(data)
+        assert {name: set(items) for name, items in first.items()} == \
+            {name: set(items) for name, items in second.items()}
+        assert 0.7 < len(first['train']) / len(data) < 0.9
+
+    def test_split_rejects_invalid_fractions(self, pipeline: PreprocessingPipeline):
+        """
+        Tests that split fractions must sum to 1.
+        """
+        with pytest.raises(ValueError):
+            pipeline.read([]).split({'train': 0.8, 'test': 0.1})
+
+    def test_no_stage_after_split(self, pipeline: PreprocessingPipeline):
+        """
+        Tests that only write may follow a split.
+        """
+        pipeline.read([]).split({'train': 1.0})
+        with pytest.raises(ValueError):
+            pipeline.map(str)
+
+    def test_read_and_write_files(self, pipeline: PreprocessingPipeline, tmp_path: Path):
+        """
+        Tests reading lines from a file and writing each split to its own file.
+        """
+        input_path = tmp_path / "raw.txt"
+        input_path.write_text("a\nb\nb\nc\n")
+        counts = (
+            pipeline.read(str(input_path))
+            .deduplicate()
+            .split({'train': 0.5, 'test': 0.5})
+            .write(str(tmp_path / "out" / "{split}.txt"))
+            .run()
+        )
+
+        assert sum(counts.values()) == 3
+        written = []
+        for split_name, count in counts.items():
+            lines = (tmp_path / "out" / f"{split_name}.txt").read_text().splitlines()
+            assert len(lines) == count
+            assert all(assign_split(line, ['train', 'test'], [2 ** 63, 2 ** 64], b'0') == split_name
+                       for line in lines)
+            written.extend(lines)
+        assert sorted(written) == ["a", "b", "c"]
+        assert pipeline.stats[-1].name == 'write'
+
+    def test_pipeline_can_run_twice(self, pipeline: PreprocessingPipeline):
+        """
+        Tests that stateful stages are reset between runs.
+        """
+        pipeline.read(["a", "a", "b"]).deduplicate()
+        assert pipeline.collect() == pipeline.collect() == {'all': ["a", "b"]}
+
+    def test_preprocessor_pipeline(self, mock_logger: logging.Logger):
+        """
+        Tests starting a pipeline from a BaseDataPreprocessor.
+        """
+        preprocessor = BaseDataPreprocessor[str](logger=mock_logger)
+        assert preprocessor.pipeline(["b", "a", "b"]).deduplicate().collect() == {'all': ["b", "a"]}
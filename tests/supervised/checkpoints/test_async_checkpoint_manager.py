@@ -0,0 +1,160 @@
+import os
+import logging
+from pathlib import Path
+
+import numpy as np
+import pytest
+import tensorflow as tf
+import torch
+
+from ml_training_base.supervised.checkpoints.async_checkpoint_manager import (
+    AsyncCheckpointManager,
+    AsyncModelCheckpoint,
+    load_keras_weights,
+    save_keras_weights,
+    snapshot_to_host,
+    write_atomic
+)
+
+# --- Fixtures ---
+
+@pytest.fixture
+def mock_logger() -> logging.Logger:
+    """
+    Provides a mock logger instance for tests.
+    """
+    return logging.getLogger("test_logger")
+
+
+@pytest.fixture
+def torch_manager(tmp_path: Path, mock_logger: logging.Logger) -> AsyncCheckpointManager:
+    """
+    Provides a checkpoint manager writing PyTorch state and keeping two recent checkpoints.
+    """
+    manager = AsyncCheckpointManager(
+        str(tmp_path / "checkpoints"), write_fn=torch.save, max_to_keep=2, file_suffix=".pt", logger=mock_logger
+    )
+    yield manager
+    manager.close()
+
+# --- Test Functions ---
+
+def test_write_atomic_leaves_no_partial_file(tmp_path: Path):
+    """
+    Tests that a failed write neither creates the target file nor leaves a temporary file behind.
+    """
+    target = tmp_path / "file.bin"
+
+    def failing_write(path: str):
+        Path(path).write_text("partial")
+        raise IOError("Disk full")
+
+    with pytest.raises(IOError, match="Disk full"):
+        write_atomic(str(target), failing_write)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_snapshot_to_host_copies_state():
+    """
+    Tests that snapshots are decoupled from the live tensors and arrays.
+    """
+    state = {"weight": torch.zeros(3), "nested": [np.zeros(2)], "step": 1}
+    snapshot = snapshot_to_host(state)
+
+    state["weight"].add_(1)
+    state["nested"][0] += 1
+
+    assert torch.equal(snapshot["weight"], torch.zeros(3))
+    np.testing.assert_array_equal(snapshot["nested"][0], np.zeros(2))
+    assert snapshot["step"] == 1
+
+
+def test_manager_keeps_recent_and_best(torch_manager: AsyncCheckpointManager, tmp_path: Path):
+    """
+    Tests that the last K checkpoints plus the best one are retained and indexed.
+    """
+    metrics = [0.5, 0.1, 0.4, 0.3, 0.2]
+    for step, metric in enumerate(metrics, start=1):
+        torch_manager.save({"weight": torch.full((2,), float(step))}, step=step, metric=metric)
+    torch_manager.wait()
+
+    checkpoint_dir = tmp_path / "checkpoints"
+    assert sorted(os.listdir(checkpoint_dir)) == [
+        "checkpoint_index.json", "ckpt-00000002.pt", "ckpt-00000004.pt", "ckpt-00000005.pt"
+    ]
+
+    index = AsyncCheckpointManager.read_index(str(checkpoint_dir))
+    assert [checkpoint["step"] for checkpoint in index["checkpoints"]] == [4, 5]
+    assert index["best"]["step"] == 2
+    assert torch_manager.latest_checkpoint["step"] == 5
+    assert torch.equal(torch.load(index["best"]["path"])["weight"], torch.full((2,), 2.0))
+
+
+def test_manager_removes_superseded_best(torch_manager: AsyncCheckpointManager, tmp_path: Path):
+    """
+    Tests that a best checkpoint which has rotated out is deleted once a better one is saved.
+    """
+    for step, metric in enumerate([0.1, 0.5, 0.5, 0.05], start=1):
+        torch_manager.save({"step": step}, step=step, metric=metric)
+    torch_manager.wait()
+
+    assert sorted(os.listdir(tmp_path / "checkpoints")) == [
+        "checkpoint_index.json", "ckpt-00000003.pt", "ckpt-00000004.pt"
+    ]
+
+
+def test_manager_resumes_index(torch_manager: AsyncCheckpointManager, tmp_path: Path, mock_logger: logging.Logger):
+    """
+    Tests that a new manager picks up the retained checkpoints of an existing directory.
+    """
+    torch_manager.save({"step": 1}, step=1, metric=0.3)
+    torch_manager.wait()
+
+    manager = AsyncCheckpointManager(str(tmp_path / "checkpoints"), write_fn=torch.save, logger=mock_logger)
+    assert manager.latest_checkpoint["step"] == 1
+    assert manager.best_checkpoint["metric"] == 0.3
+    manager.close()
+
+
+def test_manager_propagates_write_errors(tmp_path: Path, mock_logger: logging.Logger):
+    """
+    Tests that errors raised on the writer thread are re-raised on the caller's thread.
+    """
+    def failing_write(state, path):
+        raise IOError("Disk full")
+
+    manager = AsyncCheckpointManager(str(tmp_path), write_fn=failing_write, logger=mock_logger)
+    manager.save({}, step=1)
+
+    with pytest.raises(IOError, match="Disk full"):
+        manager.close()
+
+
+def test_manager_invalid_mode(tmp_path: Path):
+    """
+    Tests that an invalid monitoring mode raises a ValueError.
+    """
+    with pytest.raises(ValueError, match="`mode` must be 'min' or 'max'"):
+        AsyncCheckpointManager(str(tmp_path), write_fn=torch.save, mode="lowest")
+
+
+def test_async_model_checkpoint_keras(tmp_path: Path, mock_logger: logging.Logger):
+    """
+    Tests that the Keras callback checkpoints restorable weights every epoch.
+    """
+    model = tf.keras.Sequential([tf.keras.Input(shape=(3,)), tf.keras.layers.Dense(1)])
+    model.compile(optimizer="sgd", loss="mse")
+    x = np.random.rand(16, 3).astype("float32")
+    y = np.random.rand(16, 1).astype("float32")
+
+    manager = AsyncCheckpointManager(
+        str(tmp_path), write_fn=save_keras_weights, file_suffix=".weights.npz", logger=mock_logger
+    )
+    model.fit(x, y, validation_data=(x, y), epochs=2, verbose=0, callbacks=[AsyncModelCheckpoint(manager)])
+    manager.close()
+
+    assert manager.latest_checkpoint["step"] == 2
+    restored = load_keras_weights(manager.latest_checkpoint["path"])
+    for restored_weight, weight in zip(restored, model.get_weights()):
+        np.testing.assert_array_equal(restored_weight, weight)
@@ -0,0 +1,138 @@
+import pickle
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+import tensorflow as tf
+import torch
+
+from ml_training_base.supervised.checkpoints.training_state import (
+    BackupAndRestoreWithRngState,
+    capture_rng_state,
+    restore_rng_state
+)
+
+# --- Test Classes and Functions ---
+
+class InterruptingCallback(tf.keras.callbacks.Callback):
+    """
+    Simulates a preemption at the start of a given epoch.
+    """
+    def __init__(self, epoch: int):
+        super().__init__()
+        self._epoch = epoch
+
+    def on_epoch_begin(self, epoch, logs=None):
+        if epoch == self._epoch:
+            raise RuntimeError("Simulated preemption")
+
+
+class EpochRecorder(tf.keras.callbacks.Callback):
+    """
+    Records the epochs run and the NumPy random draw at the start of each epoch.
+    """
+    def __init__(self):
+        super().__init__()
+        self.epochs = []
+        self.draws = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epochs.append(epoch)
+        self.draws.append(np.random.rand())
+
+
+def _build_model() -> tf.keras.Model:
+    model = tf.keras.Sequential([tf.keras.Input(shape=(3,)), tf.keras.layers.Dense(1)])
+    model.compile(optimizer="adam", loss="mse")
+    return model
+
+
+def test_rng_state_round_trip():
+    """
+    Tests that restoring a captured RNG state reproduces the same random draws.
+    """
+    state = capture_rng_state()
+    draws = (random.random(), np.random.rand(), torch.rand(1))
+
+    restore_rng_state(state)
+
+    assert random.random() == draws[0]
+    assert np.random.rand() == draws[1]
+    assert torch.equal(torch.rand(1), draws[2])
+
+
+def test_backup_and_restore_with_rng_state_resumes(tmp_path: Path):
+    """
+    Tests that an interrupted `fit()` resumes from the last backed-up epoch with the same RNG state.
+    """
+    x = np.random.rand(16, 3).astype("float32")
+    y = np.random.rand(16, 1).astype("float32")
+    backup_dir = str(tmp_path / "backup")
+
+    np.random.seed(0)
+    reference = EpochRecorder()
+    _build_model().fit(x, y, epochs=4, verbose=0, callbacks=[reference])
+
+    np.random.seed(0)
+    model = _build_model()
+    with pytest.raises(RuntimeError, match="Simulated preemption"):
+        model.fit(
+            x, y, epochs=4, verbose=0,
+            callbacks=[BackupAndRestoreWithRngState(backup_dir), EpochRecorder(), InterruptingCallback(epoch=2)]
+        )
+
+    # Scramble the RNG state, as a restarted process would have a different one
+    np.random.seed(123)
+    resumed = EpochRecorder()
+    model = _build_model()
+    model.fit(x, y, epochs=4, verbose=0, callbacks=[BackupAndRestoreWithRngState(backup_dir), resumed])
+
+    assert resumed.epochs == [2, 3]
+    assert resumed.draws == reference.draws[2:]
+
+
+class BatchRngRecorder(tf.keras.callbacks.Callback):
+    """
+    Draws a NumPy random number before every batch and records the NumPy RNG state after every batch.
+    """
+    def __init__(self, interrupt_at: tuple):
+        super().__init__()
+        self._interrupt_at = interrupt_at
+        self._epoch = 0
+        self.states = {}
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch = epoch
+
+    def on_train_batch_begin(self, batch, logs=None):
+        if (self._epoch, batch) == self._interrupt_at:
+            raise RuntimeError("Simulated preemption")
+        np.random.rand()
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.states[(self._epoch, batch)] = np.random.get_state()
+
+
+def test_backup_and_restore_with_rng_state_saves_mid_epoch(tmp_path: Path):
+    """
+    Tests that batch-level backups (`save_freq`) also back up the RNG state of the same step.
+    """
+    x = np.random.rand(16, 3).astype("float32")
+    y = np.random.rand(16, 1).astype("float32")
+    backup_dir = tmp_path / "backup"
+    recorder = BatchRngRecorder(interrupt_at=(1, 2))
+
+    np.random.seed(0)
+    with pytest.raises(RuntimeError, match="Simulated preemption"):
+        _build_model().fit(
+            x, y, batch_size=4, epochs=2, verbose=0,
+            callbacks=[BackupAndRestoreWithRngState(str(backup_dir), save_freq=2), recorder]
+        )
+
+    # The last backup was taken after the second batch of the second epoch
+    with open(backup_dir / BackupAndRestoreWithRngState.RNG_STATE_FILE, "rb") as file:
+        np.random.set_state(pickle.load(file)["numpy"])
+    draw = np.random.rand()
+    np.random.set_state(recorder.states[(1, 1)])
+    assert np.random.rand() == draw
@@ -1,7 +1,9 @@
 import pytest
 
+from ml_training_base.data.preprocessing.base_data_preprocessors import BaseDataPreprocessor
 from ml_training_base.utils.logging_utils import configure_logger
 from ml_training_base.supervised.data.base_supervised_data_loader import BaseSupervisedDataLoader
+from ml_training_base.supervised.data.data_validation import DataValidationError
 
 # --- Fixtures ---
 
@@ -61,3 +63,47 @@ def test_base_data_loader_getters(mock_logger):
     assert loader.get_train_dataset() == "Train Dataset Ready"
     assert loader.get_valid_dataset() == "Validation Dataset Ready"
     assert loader.get_test_dataset() == "Test Dataset Ready"
+
+
+def test_base_data_loader_update_datasets(mock_logger, tmp_path):
+    """
+    Tests that update_datasets() only appends the records of shards it has not loaded yet.
+    """
+    loader = ConcreteDataLoader(test_split=0.2, validation_split=0.1, logger=mock_logger)
+    preprocessor = BaseDataPreprocessor[str](logger=mock_logger)
+    data_dir = str(tmp_path / "dataset")
+    db_path = str(tmp_path / "unique.db")
+    assert loader.split_fractions == pytest.approx({'train': 0.7, 'valid': 0.1, 'test': 0.2})
+
+    preprocessor.append_to_dataset([f"r{i}" for i in range(100)], data_dir, loader.split_fractions, db_path=db_path)
+    first = loader.update_datasets(data_dir)
+    assert sum(first.values()) == 100
+    assert loader.update_datasets(data_dir) == {'train': 0, 'valid': 0, 'test': 0}
+
+    preprocessor.append_to_dataset([f"r{i}" for i in range(90, 120)], data_dir, loader.split_fractions,
+                                   db_path=db_path)
+    second = loader.update_datasets(data_dir)
+    assert sum(second.values()) == 20
+
+    all_records = loader.get_train_dataset() + loader.get_valid_dataset() + loader.get_test_dataset()
+    assert sorted(all_records) == sorted(f"r{i}" for i in range(120))
+
+
+def test_base_data_loader_validate_datasets(mock_logger):
+    """
+    Tests that validate_datasets() reports the statistics of every split and fails fast on bad data.
+    """
+    loader = ConcreteDataLoader(test_split=0.2, validation_split=0.1, logger=mock_logger)
+    loader._train_dataset = [f"C{'C' * (i % 7)}O" for i in range(700)]
+    loader._valid_dataset = [f"N{i}" for i in range(99)] + [""]
+
+    statistics = loader.validate_datasets({'max_null_rate': 0.05, 'max_length': 20})
+    assert set(statistics) == {'train', 'valid'}
+    assert statistics['train'].rows == 700
+    assert statistics['train'].duplicate_rate == pytest.approx(1 - 7 / 700)
+    assert statistics['valid'].null_rate == pytest.approx(0.01)
+
+    with pytest.raises(DataValidationError, match="train: duplicate rate") as error:
+        loader.validate_datasets({'max_duplicate_rate': 0.1, 'max_null_rate': 0.05})
+    assert len(error.value.violations) == 1
+    assert error.value.statistics['valid'].rows == 100
@@ -0,0 +1,127 @@
+import pytest
+import numpy as np
+
+from ml_training_base.supervised.data.data_validation import (
+    HyperLogLog,
+    check_data_statistics,
+    compute_data_statistics
+)
+
+# --- Test Functions ---
+
+@pytest.mark.parametrize("cardinality", [10, 1_000, 200_000])
+def test_hyperloglog_count(cardinality: int):
+    """
+    Tests that HyperLogLog estimates distinct counts within a few standard errors, ignoring repeats.
+    """
+    hashes = np.random.default_rng(cardinality).integers(0, 2 ** 64, cardinality, dtype=np.uint64)
+    sketch = HyperLogLog()
+    sketch.add_hashes(hashes)
+    sketch.add_hashes(hashes[:cardinality // 2])
+
+    assert sketch.count() == pytest.approx(cardinality, rel=0.03)
+
+
+def test_hyperloglog_merge():
+    """
+    Tests that merging sketches estimates the cardinality of the union.
+    """
+    hashes = np.random.default_rng(0).integers(0, 2 ** 64, 20_000, dtype=np.uint64)
+    first, second = HyperLogLog(), HyperLogLog()
+    first.add_hashes(hashes[:15_000])
+    second.add_hashes(hashes[5_000:])
+    first.merge(second)
+
+    assert first.count() == pytest.approx(20_000, rel=0.03)
+    with pytest.raises(ValueError):
+        first.merge(HyperLogLog(precision=10))
+
+
+def test_compute_data_statistics():
+    """
+    Tests the null rate, duplicate rate, lengths and labels of a small dataset scanned in several chunks.
+    """
+    data = ["CCO", "", "CCO", None, "c1ccccc1", "CCN", "CCO", "CCCC"] * 100
+    statistics = compute_data_statistics(data, label_fn=lambda row: row[:1], sample_size=1_000, chunk_size=64)
+
+    assert statistics.rows == 800
+    assert statistics.complete
+    assert statistics.null_rate == pytest.approx(0.25)
+    # 6 distinct rows (including '' and None)
+    assert statistics.duplicate_rate == pytest.approx(1 - 6 / 800)
+    assert statistics.length_quantiles == {'min': 0.0, 'p50': 3.0, 'p99': 8.0, 'max': 8.0}
+    assert statistics.length_histogram[0].sum() == 700
+    assert statistics.label_distribution == pytest.approx({'C': 5 / 7, '': 1 / 7, 'c': 1 / 7})
+    assert list(statistics.label_distribution) == ['C', '', 'c']
+
+
+def test_compute_data_statistics_tuple_labels():
+    """
+    Tests that tuple labels (e.g. multi-task or one-hot labels) are counted as whole labels.
+    """
+    data = [(0, 1)] * 6 + [(1, 0)] * 3 + [(1, 1)]
+    statistics = compute_data_statistics(data, length_fn=None, label_fn=lambda row: row)
+
+    assert statistics.label_distribution == pytest.approx({(0, 1): 0.6, (1, 0): 0.3, (1, 1): 0.1})
+    assert list(statistics.label_distribution) == [(0, 1), (1, 0), (1, 1)]
+
+
+def test_compute_data_statistics_reservoir_is_uniform():
+    """
+    Tests that the reservoir sample of a stream is uniform over its rows.
+    """
+    statistics = compute_data_statistics(iter(range(100_000)), length_fn=None, label_fn=lambda row: row // 25_000,
+                                         sample_size=4_000, chunk_size=10_000)
+
+    assert statistics.sample_size == 4_000
+    assert all(fraction == pytest.approx(0.25, abs=0.03) for fraction in statistics.label_distribution.values())
+
+
+@pytest.mark.parametrize("as_iterator", [False, True])
+def test_compute_data_statistics_max_rows(as_iterator: bool):
+    """
+    Tests that scans stop at `max_rows`, with random rows of sequences and leading rows of other iterables.
+    """
+    data = [f"row-{i}" for i in range(10_000)]
+    statistics = compute_data_statistics(iter(data) if as_iterator else data, max_rows=1_000, chunk_size=300)
+
+    assert statistics.rows == 1_000
+    assert not statistics.complete
+    assert statistics.duplicate_rate == pytest.approx(0.0, abs=0.01)
+
+    statistics = compute_data_statistics(iter(data[:1_000]) if as_iterator else data[:1_000], max_rows=1_000)
+    assert statistics.complete
+
+
+def test_compute_data_statistics_array_rows():
+    """
+    Tests that unhashable rows (e.g. array rows) are supported.
+    """
+    data = np.repeat(np.arange(50).reshape(25, 2), 2, axis=0)
+    statistics = compute_data_statistics(data, label_fn=lambda row: int(row[0] % 2))
+
+    assert statistics.rows == 50
+    assert statistics.null_rate == 0.0
+    assert statistics.duplicate_rate == pytest.approx(0.5)
+    assert statistics.length_quantiles['max'] == 2.0
+
+
+def test_check_data_statistics():
+    """
+    Tests that every violated threshold is reported, and unset thresholds are not checked.
+    """
+    data = ["a", "b", "", "a" * 500] + ["a"] * 96
+    statistics = compute_data_statistics(data, label_fn=lambda row: row[:1])
+
+    violations = check_data_statistics(statistics, {
+        'max_null_rate': 0.05,
+        'max_duplicate_rate': 0.5,
+        'max_length': 100,
+        'min_length': 1,
+        'max_class_fraction': 0.9
+    })
+
+    assert [violation.split(" violates ")[1].split(" = ")[0] for violation in violations] == [
+        '`max_duplicate_rate`', '`min_length`', '`max_length`', '`max_class_fraction`'
+    ]
+    assert check_data_statistics(statistics, {'max_null_rate': 0.05}) == []
@@ -0,0 +1,157 @@
+import random
+import logging
+
+import numpy as np
+import pytest
+import torch
+from torch.utils.data import Dataset, TensorDataset
+
+from ml_training_base.supervised.data.pytorch_data_loaders import (
+    autotune_num_workers,
+    build_data_loader,
+    default_num_workers,
+    available_cpu_count
+)
+
+# --- Fixtures ---
+
+@pytest.fixture
+def mock_logger() -> logging.Logger:
+    """
+    Provides a mock logger instance for tests.
+    """
+    return logging.getLogger("test_logger")
+
+
+@pytest.fixture
+def tensor_dataset() -> TensorDataset:
+    """
+    Provides a small dataset of 40 sequential samples.
+    """
+    return TensorDataset(torch.arange(40, dtype=torch.float32).unsqueeze(1))
+
+
+class RandomAugmentationDataset(Dataset):
+    """
+    A dataset whose items depend on the Python and NumPy random state of the loading process.
+    """
+    def __len__(self):
+        return 8
+
+    def __getitem__(self, idx):
+        return torch.tensor([random.random(), np.random.rand()])
+
+# --- Test Functions ---
+
+def test_build_data_loader_config(tensor_dataset: TensorDataset):
+    """
+    Tests that the data config is applied to the DataLoader.
+    """
+    data_config = {"batch_size": 4, "num_workers": 1, "pin_memory": False, "prefetch_factor": 3}
+    loader = build_data_loader(tensor_dataset, data_config)
+
+    assert loader.batch_size == 4
+    assert loader.num_workers == 1
+    assert loader.persistent_workers is True
+    assert loader.prefetch_factor == 3
+    assert loader.pin_memory is False
+
+
+def test_build_data_loader_without_workers(tensor_dataset: TensorDataset):
+    """
+    Tests that worker-only options are omitted when loading in the main process.
+    """
+    loader = build_data_loader(tensor_dataset, {"num_workers": 0, "persistent_workers": True})
+
+    assert loader.num_workers == 0
+    assert loader.persistent_workers is False
+    assert loader.prefetch_factor is None
+
+
+def test_build_data_loader_null_pin_memory(tensor_dataset: TensorDataset):
+    """
+    Tests that a null `pin_memory` falls back to the CUDA-dependent default.
+    """
+    loader = build_data_loader(tensor_dataset, {"num_workers": 0, "pin_memory": None})
+
+    assert loader.pin_memory is torch.cuda.is_available()
+
+
+def test_build_data_loader_default_num_workers(tensor_dataset: TensorDataset):
+    """
+    Tests that the default number of workers leaves a CPU for the main process.
+    """
+    loader = build_data_loader(tensor_dataset, {})
+
+    assert loader.num_workers == default_num_workers()
+    assert default_num_workers() <= max(available_cpu_count() - 1, 0)
+
+
+def test_build_data_loader_null_num_workers(tensor_dataset: TensorDataset):
+    """
+    Tests that a null `num_workers` falls back to the default number of workers.
+    """
+    loader = build_data_loader(tensor_dataset, {"num_workers": None})
+
+    assert loader.num_workers == default_num_workers()
+
+
+def test_build_data_loader_deterministic_shuffle(tensor_dataset: TensorDataset):
+    """
+    Tests that shuffling is reproducible when seeded from the determinism config.
+    """
+    data_config = {"batch_size": 40, "num_workers": 0}
+    determinism_config = {"torch_seed": 123}
+
+    order_1 = next(iter(build_data_loader(tensor_dataset, data_config, determinism_config, shuffle=True)))[0]
+    order_2 = next(iter(build_data_loader(tensor_dataset, data_config, determinism_config, shuffle=True)))[0]
+
+    assert torch.equal(order_1, order_2)
+    assert not torch.equal(order_1, tensor_dataset.tensors[0])
+
+
+def test_build_data_loader_seeds_workers():
+    """
+    Tests that Python and NumPy random states in workers are seeded reproducibly.
+    """
+    data_config = {"batch_size": 8, "num_workers": 1, "persistent_workers": False}
+    determinism_config = {"torch_seed": 7}
+
+    batch_1 = next(iter(build_data_loader(RandomAugmentationDataset(), data_config, determinism_config)))
+    batch_2 = next(iter(build_data_loader(RandomAugmentationDataset(), data_config, determinism_config)))
+
+    assert torch.equal(batch_1, batch_2)
+
+
+def test_build_data_loader_batch_sampler(tensor_dataset: TensorDataset):
+    """
+    Tests that a custom batch sampler overrides the batching options from the config.
+    """
+    batch_sampler = [[0, 1], [2, 3, 4]]
+    loader = build_data_loader(
+        tensor_dataset, {"batch_size": 16, "num_workers": 0, "drop_last": True}, batch_sampler=batch_sampler
+    )
+
+    assert [len(batch[0]) for batch in loader] == [2, 3]
+
+
+def test_autotune_num_workers(tensor_dataset: TensorDataset, mock_logger: logging.Logger):
+    """
+    Tests that auto-tuning returns one of the feasible candidates.
+    """
+    best = autotune_num_workers(
+        tensor_dataset, {"batch_size": 4}, candidates=[0, 1], num_batches=2, logger=mock_logger
+    )
+
+    assert best in {0, 1}
+    assert best <= available_cpu_count()
+
+
+def test_build_data_loader_auto_num_workers(tensor_dataset: TensorDataset):
+    """
+    Tests that `num_workers: auto` resolves to a concrete worker count.
+    """
+    data_config = {"batch_size": 4, "num_workers": "auto", "autotune_candidates": [0], "autotune_batches": 2}
+    loader = build_data_loader(tensor_dataset, data_config)
+
+    assert loader.num_workers == 0
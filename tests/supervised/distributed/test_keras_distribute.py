@@ -0,0 +1,120 @@
+import json
+import logging
+import multiprocessing
+
+import numpy as np
+import pytest
+import tensorflow as tf
+import yaml
+
+from ml_training_base.supervised.environments.base_training_environments import KerasTrainingEnvironment
+from ml_training_base.supervised.trainers.base_supervised_trainers import BaseKerasSupervisedTrainer
+
+# --- Fixtures ---
+
+@pytest.fixture
+def keras_config(tmp_path) -> dict:
+    """
+    Provides a Keras training config using two logical CPU devices.
+    """
+    return {
+        "data": {"logger_path": str(tmp_path / "logs" / "test.log"), "batch_size": 8},
+        "determinism": {"python_seed": 0, "random_seed": 42, "numpy_seed": 42, "tf_seed": 42},
+        "training": {"epochs": 3},
+        "distributed": {"enabled": True, "strategy": "mirrored", "logical_cpu_devices": 2}
+    }
+
+# --- Test Classes and Functions ---
+
+class LinearKerasTrainer(BaseKerasSupervisedTrainer):
+    """
+    A Keras trainer fitting a linear regression with the global batch size.
+    """
+    def _setup_data(self):
+        x = np.random.default_rng(0).standard_normal((64, 4)).astype(np.float32)
+        y = x @ np.array([[1.0], [-2.0], [0.5], [3.0]], dtype=np.float32)
+        self._train_dataset = tf.data.Dataset.from_tensor_slices((x, y)).batch(self._global_batch_size())
+
+    def _setup_model(self):
+        self._model = tf.keras.Sequential([
+            tf.keras.layers.Dense(1, kernel_initializer='zeros', bias_initializer='zeros')
+        ])
+        self._model.compile(optimizer=tf.keras.optimizers.SGD(0.05), loss='mse')
+
+
+def _train_worker(config: dict, config_path: str, output_path: str):
+    with open(config_path, 'w') as file:
+        yaml.dump(config, file)
+
+    trainer = LinearKerasTrainer(
+        config_path=config_path,
+        training_env=KerasTrainingEnvironment(logger=logging.getLogger("test_logger"))
+    )
+    trainer._setup_environment()
+    trainer._setup_data()
+    trainer._apply_dataset_distribute_options()
+    with trainer._strategy.scope():
+        trainer._setup_model()
+        trainer._build_model()
+    trainer._train()
+
+    with open(output_path, 'w') as file:
+        json.dump({
+            'strategy': type(trainer._strategy).__name__,
+            'num_replicas': trainer._strategy.num_replicas_in_sync,
+            'global_batch_size': trainer._global_batch_size(),
+            'mirrored_weights': all('Mirrored' in type(weight.value).__name__ for weight in trainer._model.weights),
+            'losses': trainer._model.history.history['loss'],
+            'weights': [weight.tolist() for weight in trainer._model.get_weights()]
+        }, file)
+
+
+def _run_in_fresh_process(config: dict, tmp_path, name: str) -> dict:
+    """
+    Train in a new process, as logical devices must be configured before TensorFlow initialises.
+    """
+    output_path = str(tmp_path / f"{name}.json")
+    process = multiprocessing.get_context('spawn').Process(
+        target=_train_worker,
+        args=(config, str(tmp_path / f"{name}.yaml"), output_path)
+    )
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+
+    with open(output_path) as file:
+        return json.load(file)
+
+
+def test_mirrored_strategy_on_logical_cpu_devices(keras_config: dict, tmp_path):
+    """
+    Tests that a mirrored strategy over two logical CPU devices creates the
+    model in its scope, scales the global batch size, and matches
+    single-device training on the same global batches.
+    """
+    mirrored = _run_in_fresh_process(keras_config, tmp_path, "mirrored")
+
+    assert mirrored['strategy'] == 'MirroredStrategy'
+    assert mirrored['num_replicas'] == 2
+    assert mirrored['global_batch_size'] == 16
+    assert mirrored['mirrored_weights']
+
+    # A single replica with a per-replica batch size of 16 sees the same global batches
+    keras_config["distributed"]["enabled"] = False
+    keras_config["data"]["batch_size"] = 16
+    single = _run_in_fresh_process(keras_config, tmp_path, "single")
+
+    assert single['num_replicas'] == 1
+    np.testing.assert_allclose(mirrored['losses'], single['losses'], rtol=1e-5)
+    for mirrored_weight, single_weight in zip(mirrored['weights'], single['weights']):
+        np.testing.assert_allclose(mirrored_weight, single_weight, rtol=1e-5, atol=1e-6)
+
+
+def test_unsupported_strategy_error(keras_config: dict):
+    """
+    Tests that a ValueError is raised for an unsupported strategy.
+    """
+    keras_config["distributed"] = {"enabled": True, "strategy": "tpu"}
+    train_env = KerasTrainingEnvironment(logger=logging.getLogger("test_logger"))
+    with pytest.raises(ValueError, match="distributed.strategy"):
+        train_env.setup_environment(keras_config)
@@ -0,0 +1,147 @@
+import os
+import logging
+
+import pytest
+import torch
+import yaml
+from torch.utils.data import DataLoader, TensorDataset
+from torch.utils.data.distributed import DistributedSampler
+
+from ml_training_base.supervised.distributed.pytorch_distributed import (
+    get_rank,
+    get_world_size,
+    is_main_process,
+    launch_distributed
+)
+from ml_training_base.supervised.environments.base_training_environments import PyTorchTrainingEnvironment
+from ml_training_base.supervised.trainers.base_supervised_trainers import BasePyTorchSupervisedTrainer
+
+# --- Fixtures ---
+
+@pytest.fixture
+def distributed_config_file(tmp_path) -> str:
+    """
+    Writes a distributed PyTorch training config to a temporary YAML file and returns its path.
+    """
+    config = {
+        "data": {"logger_path": str(tmp_path / "logs" / "test.log"), "batch_size": 8, "num_workers": 0},
+        "determinism": {"python_seed": 0, "random_seed": 42, "numpy_seed": 42, "torch_seed": 42},
+        "training": {"epochs": 3, "model_save_dir": str(tmp_path / "model")},
+        "distributed": {"enabled": True, "backend": "gloo"}
+    }
+    config_path = tmp_path / "distributed_config.yaml"
+    config_path.write_text(yaml.dump(config))
+
+    return str(config_path)
+
+# --- Test Classes and Functions ---
+
+def _regression_dataset() -> TensorDataset:
+    generator = torch.Generator().manual_seed(0)
+    x = torch.randn(64, 4, generator=generator)
+    y = x @ torch.tensor([[1.0], [-2.0], [0.5], [3.0]])
+
+    return TensorDataset(x, y)
+
+
+class DistributedLinearTrainer(BasePyTorchSupervisedTrainer):
+    """
+    A PyTorch trainer fitting a linear regression, recording its epoch losses.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.epoch_losses = []
+        self.rank_seed = None
+
+    def _setup_distributed(self):
+        super()._setup_distributed()
+        self.rank_seed = torch.initial_seed()
+
+    def _setup_data(self):
+        self._build_data_loaders(_regression_dataset(), test_dataset=_regression_dataset())
+
+    def _setup_model(self):
+        torch.manual_seed(0)
+        self._model = torch.nn.Linear(4, 1)
+        self._optimizer = torch.optim.SGD(self._model.parameters(), lr=0.05)
+        self._loss_fn = torch.nn.MSELoss()
+
+    def _train_epoch(self, epoch: int):
+        results = super()._train_epoch(epoch)
+        self.epoch_losses.append(results['loss'])
+
+        return results
+
+
+class SingleProcessLinearTrainer(DistributedLinearTrainer):
+    """
+    The single-process equivalent of a 2-rank `DistributedLinearTrainer`: each
+    batch of 16 is the union of the two ranks' batches of 8.
+    """
+    def _setup_data(self):
+        dataset = _regression_dataset()
+        sampler = DistributedSampler(dataset, num_replicas=1, rank=0, shuffle=True, seed=42)
+        self._train_loader = DataLoader(dataset, batch_size=16, sampler=sampler)
+        self._test_loader = DataLoader(dataset, batch_size=16)
+
+
+def _train_worker(config_path: str, output_dir: str):
+    trainer = DistributedLinearTrainer(
+        config_path=config_path,
+        training_env=PyTorchTrainingEnvironment(logger=logging.getLogger("test_logger"))
+    )
+    trainer.run()
+
+    torch.save(
+        {
+            'world_size': trainer._world_size,
+            'num_batches': len(trainer._train_loader),
+            'rank_seed': trainer.rank_seed,
+            'epoch_losses': trainer.epoch_losses,
+            'state_dict': trainer._unwrapped_model().state_dict()
+        },
+        os.path.join(output_dir, f"rank{trainer._rank}.pt")
+    )
+
+
+def test_helpers_outside_distributed_training():
+    """
+    Tests that the rank helpers describe a single process without a process group.
+    """
+    assert get_rank() == 0
+    assert get_world_size() == 1
+    assert is_main_process()
+
+
+def test_distributed_training_matches_single_process(distributed_config_file: str, tmp_path):
+    """
+    Tests that 2-rank DDP training over gloo keeps the replicas in sync, seeds
+    ranks differently, reduces losses across ranks, saves only on rank 0, and
+    matches single-process training on the combined batches.
+    """
+    launch_distributed(_train_worker, nprocs=2, args=(distributed_config_file, str(tmp_path)))
+
+    rank0 = torch.load(tmp_path / "rank0.pt")
+    rank1 = torch.load(tmp_path / "rank1.pt")
+
+    assert rank0['world_size'] == rank1['world_size'] == 2
+    assert rank0['num_batches'] == rank1['num_batches'] == 4
+    assert rank0['rank_seed'] == 42 and rank1['rank_seed'] == 43
+    assert rank0['epoch_losses'] == rank1['epoch_losses']
+    for key, value in rank0['state_dict'].items():
+        assert torch.equal(value, rank1['state_dict'][key])
+    assert os.listdir(tmp_path / "model") == ["model.pt"]
+
+    # Train the single-process equivalent in this process
+    single_trainer = SingleProcessLinearTrainer(
+        config_path=distributed_config_file,
+        training_env=PyTorchTrainingEnvironment(logger=logging.getLogger("test_logger"))
+    )
+    single_trainer.config["distributed"]["enabled"] = False
+    single_trainer._setup_data()
+    single_trainer._setup_model()
+    single_trainer._train()
+
+    assert single_trainer.epoch_losses == pytest.approx(rank0['epoch_losses'], rel=1e-5)
+    for key, value in single_trainer._unwrapped_model().state_dict().items():
+        torch.testing.assert_close(value, rank0['state_dict'][key], rtol=1e-5, atol=1e-6)
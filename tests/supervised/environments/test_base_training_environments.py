@@ -1,14 +1,19 @@
 import os
+import json
+import time
 import logging
 import numpy as np
 import pytest
 import torch
 import tensorflow as tf
+from torch.utils.data import TensorDataset
 
 from ml_training_base.supervised.environments.base_training_environments import (
     KerasTrainingEnvironment,
     PyTorchTrainingEnvironment
 )
+from ml_training_base.supervised.data.pytorch_data_loaders import build_data_loader
+from ml_training_base.utils.hardware_utils import available_cpu_count
 
 # --- Fixtures ---
 
@@ -81,3 +86,229 @@ def test_missing_config_key_error(mock_logger):
     train_env = KerasTrainingEnvironment(logger=mock_logger)
     with pytest.raises(KeyError, match="'determinism'"):
         train_env.setup_environment({}) # Empty config
+
+
+@pytest.fixture
+def restore_thread_settings(monkeypatch):
+    """
+    Restores the process thread settings and environment variables changed by a test.
+    """
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OMP_PROC_BIND", "OMP_PLACES",
+                 "KMP_AFFINITY", "KMP_BLOCKTIME", "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"):
+        monkeypatch.delenv(name, raising=False)
+    num_threads = torch.get_num_threads()
+    matmul_precision = torch.get_float32_matmul_precision()
+
+    yield
+
+    torch.set_num_threads(num_threads)
+    torch.set_float32_matmul_precision(matmul_precision)
+
+
+def test_pytorch_environment_performance_setup(mock_config, mock_logger, restore_thread_settings):
+    """
+    Tests that the 'performance' section configures PyTorch threads, affinity and matmul precision.
+    """
+    mock_config["performance"] = {
+        "intra_op_threads": 2,
+        "thread_affinity": True,
+        "matmul_precision": "high"
+    }
+    train_env = PyTorchTrainingEnvironment(logger=mock_logger)
+    train_env.setup_environment(mock_config)
+
+    assert torch.get_num_threads() == 2
+    assert torch.get_float32_matmul_precision() == "high"
+    assert os.environ["OMP_NUM_THREADS"] == "2"
+    assert os.environ["MKL_NUM_THREADS"] == "2"
+    assert os.environ["OMP_PROC_BIND"] == "close"
+
+
+def test_keras_environment_performance_setup(mock_config, mock_logger, restore_thread_settings):
+    """
+    Tests that 'auto' thread counts are derived from the usable CPUs.
+    """
+    mock_config["performance"] = {"intra_op_threads": "auto", "inter_op_threads": "auto"}
+    train_env = KerasTrainingEnvironment(logger=mock_logger)
+    train_env.setup_environment(mock_config)
+
+    cpu_count = available_cpu_count()
+    assert os.environ["TF_NUM_INTRAOP_THREADS"] == str(cpu_count)
+    assert os.environ["TF_NUM_INTEROP_THREADS"] == str(min(2, cpu_count))
+    assert "OMP_PROC_BIND" not in os.environ
+
+
+@pytest.mark.parametrize("performance_config", [
+    pytest.param("missing", id="missing"),
+    pytest.param(None, id="null"),
+    pytest.param({"matmul_precision": "high"}, id="no_thread_keys")
+])
+def test_environment_keeps_default_threads(performance_config, mock_config, mock_logger, restore_thread_settings):
+    """
+    Tests that thread settings are left alone without a `performance` section (or one without values, null in YAML)
+    and when the section does not set the thread counts.
+    """
+    if performance_config != "missing":
+        mock_config["performance"] = performance_config
+    mock_config["distributed"] = None
+    torch.set_num_threads(1)
+    PyTorchTrainingEnvironment(logger=mock_logger).setup_environment(mock_config)
+
+    assert torch.get_num_threads() == 1
+    assert "OMP_NUM_THREADS" not in os.environ
+    assert "MKL_NUM_THREADS" not in os.environ
+
+
+def test_invalid_thread_count_error(mock_config, mock_logger, restore_thread_settings):
+    """
+    Tests that a ValueError is raised for an invalid thread count.
+    """
+    mock_config["performance"] = {"intra_op_threads": 0}
+    train_env = PyTorchTrainingEnvironment(logger=mock_logger)
+    with pytest.raises(ValueError, match="intra_op_threads"):
+        train_env.setup_environment(mock_config)
+
+
+def test_environment_hardware_probe(mock_config, mock_logger, restore_thread_settings, tmp_path):
+    """
+    Tests that the hardware probe writes a report next to the logs and applies
+    recommendations without overriding explicit settings.
+    """
+    mock_config["data"] = {"logger_path": str(tmp_path / "logs" / "training.log")}
+    mock_config["training"] = {"mixed_precision": None}
+    mock_config["performance"] = {
+        "hardware_probe": True,
+        "apply_recommendations": True,
+        "probe_cache_path": str(tmp_path / "probe.json"),
+        "inter_op_threads": 1
+    }
+    train_env = PyTorchTrainingEnvironment(logger=mock_logger)
+    train_env.setup_environment(mock_config)
+
+    with open(tmp_path / "logs" / "hardware_report.json") as file:
+        report = json.load(file)
+
+    recommendations = report["recommendations"]
+    assert mock_config["performance"]["intra_op_threads"] == recommendations["performance"]["intra_op_threads"]
+    assert mock_config["performance"]["inter_op_threads"] == 1
+    assert mock_config["training"]["mixed_precision"] == recommendations["training"].get("mixed_precision")
+    assert torch.get_num_threads() == recommendations["performance"]["intra_op_threads"]
+
+
+@pytest.fixture
+def restore_determinism_settings(restore_thread_settings):
+    """
+    Restores the global deterministic-ops settings changed by a test.
+    """
+    from tensorflow.python.framework import config as tf_config
+
+    tf_op_determinism = tf_config.is_op_determinism_enabled()
+    torch_deterministic = torch.are_deterministic_algorithms_enabled()
+    torch_warn_only = torch.is_deterministic_algorithms_warn_only_enabled()
+
+    yield
+
+    if tf_op_determinism:
+        tf_config.enable_op_determinism()
+    else:
+        tf_config.disable_op_determinism()
+    torch.use_deterministic_algorithms(torch_deterministic, warn_only=torch_warn_only)
+
+
+def _train_torch_losses(config, logger, steps: int = 30):
+    """
+    Sets up the environment, then trains a small MLP on shuffled data and returns its losses and duration.
+    """
+    PyTorchTrainingEnvironment(logger=logger).setup_environment(config)
+
+    generator = torch.Generator().manual_seed(0)
+    inputs = torch.randn(1024, 64, generator=generator)
+    targets = torch.randn(1024, 1, generator=generator)
+    loader = build_data_loader(TensorDataset(inputs, targets), {"batch_size": 64, "num_workers": 0},
+                               config["determinism"], shuffle=True)
+
+    model = torch.nn.Sequential(torch.nn.Linear(64, 256), torch.nn.ReLU(), torch.nn.Dropout(0.1),
+                                torch.nn.Linear(256, 1))
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+
+    losses = []
+    start = time.perf_counter()
+    while len(losses) < steps:
+        for batch_inputs, batch_targets in loader:
+            loss = torch.nn.functional.mse_loss(model(batch_inputs), batch_targets)
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            losses.append(loss.item())
+            if len(losses) == steps:
+                break
+
+    return losses, time.perf_counter() - start
+
+
+def test_pytorch_deterministic_ops(mock_config, mock_logger, restore_determinism_settings, record_property):
+    """
+    Tests that `deterministic_ops` gives bitwise-identical losses across runs while keeping multiple threads.
+    """
+    mock_config["performance"] = {"intra_op_threads": 2}
+    _, default_seconds = _train_torch_losses(mock_config, mock_logger)
+
+    mock_config["determinism"]["deterministic_ops"] = True
+    first_losses, deterministic_seconds = _train_torch_losses(mock_config, mock_logger)
+    second_losses, _ = _train_torch_losses(mock_config, mock_logger)
+
+    assert first_losses == second_losses
+    assert torch.are_deterministic_algorithms_enabled()
+    assert torch.get_num_threads() == 2
+
+    record_property("deterministic_ops_slowdown", deterministic_seconds / default_seconds)
+    mock_logger.info(f"Deterministic ops slowdown: {deterministic_seconds / default_seconds:.2f}x")
+
+
+def _fit_keras_losses(config, logger):
+    """
+    Sets up the environment, then fits a small model on a shuffled, parallel-mapped dataset and returns its losses
+    and duration.
+    """
+    KerasTrainingEnvironment(logger=logger).setup_environment(config)
+    tf.keras.utils.set_random_seed(config["determinism"]["tf_seed"])
+
+    x = np.random.default_rng(0).standard_normal((512, 16)).astype(np.float32)
+    y = x.sum(axis=1, keepdims=True)
+    dataset = (
+        tf.data.Dataset.from_tensor_slices((x, y))
+        .shuffle(512, seed=config["determinism"]["tf_seed"])
+        .map(lambda inputs, target: (inputs * 2.0, target), num_parallel_calls=4, deterministic=False)
+        .batch(32)
+    )
+
+    model = tf.keras.Sequential([tf.keras.Input((16,)), tf.keras.layers.Dense(32, activation="relu"),
+                                 tf.keras.layers.Dense(1)])
+    model.compile(optimizer=tf.keras.optimizers.Adam(0.01), loss="mse")
+
+    start = time.perf_counter()
+    losses = model.fit(dataset, epochs=3, verbose=0).history["loss"]
+
+    return losses, time.perf_counter() - start
+
+
+def test_keras_deterministic_ops(mock_config, mock_logger, restore_determinism_settings, record_property):
+    """
+    Tests that `deterministic_ops` enables op determinism, which also orders the `deterministic=False` parallel map,
+    and gives identical losses across runs.
+    """
+    from tensorflow.python.framework import config as tf_config
+
+    mock_config["performance"] = {"intra_op_threads": "auto"}
+    _, default_seconds = _fit_keras_losses(mock_config, mock_logger)
+
+    mock_config["determinism"]["deterministic_ops"] = True
+    first_losses, deterministic_seconds = _fit_keras_losses(mock_config, mock_logger)
+    second_losses, _ = _fit_keras_losses(mock_config, mock_logger)
+
+    assert tf_config.is_op_determinism_enabled()
+    assert first_losses == second_losses
+    assert os.environ["TF_NUM_INTRAOP_THREADS"] == str(available_cpu_count())
+
+    record_property("deterministic_ops_slowdown", deterministic_seconds / default_seconds)
+    mock_logger.info(f"Deterministic ops slowdown: {deterministic_seconds / default_seconds:.2f}x")
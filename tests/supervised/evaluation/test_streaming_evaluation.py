@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from ml_training_base.supervised.evaluation.streaming_evaluation import (
+    NpyStreamWriter,
+    StreamingEvaluator,
+    build_metrics
+)
+
+# --- Fixtures ---
+
+@pytest.fixture
+def classification_batches() -> list:
+    """
+    Provides batches of integer targets and class scores.
+    """
+    rng = np.random.default_rng(0)
+    return [(rng.integers(0, 4, size=size), rng.standard_normal((size, 4)).astype(np.float32)) for size in (7, 5, 3)]
+
+# --- Test Classes and Functions ---
+
+def test_streaming_metrics_match_full_dataset_metrics(classification_batches: list):
+    """
+    Tests that metrics accumulated batch by batch equal the metrics of the full dataset.
+    """
+    metrics = build_metrics(["accuracy", "top_k_accuracy", "mse", "mae"])
+    for y_true, y_pred in classification_batches:
+        metrics[0].update(y_true, y_pred)
+        metrics[1].update(y_true, y_pred)
+        metrics[2].update(y_pred[:, 0], y_pred[:, 1])
+        metrics[3].update(y_pred[:, 0], y_pred[:, 1])
+
+    y_true = np.concatenate([batch[0] for batch in classification_batches])
+    y_pred = np.concatenate([batch[1] for batch in classification_batches])
+    top_k = np.argsort(y_pred, axis=-1)[:, -4:]
+
+    assert metrics[0].result() == pytest.approx(np.mean(y_pred.argmax(axis=-1) == y_true))
+    assert metrics[1].result() == pytest.approx(np.mean((top_k == y_true[:, None]).any(axis=-1)))
+    assert metrics[2].result() == pytest.approx(np.mean((y_pred[:, 1] - y_pred[:, 0]) ** 2))
+    assert metrics[3].result() == pytest.approx(np.mean(np.abs(y_pred[:, 1] - y_pred[:, 0])))
+
+
+def test_binary_accuracy_thresholds_probabilities():
+    """
+    Tests that single-unit predictions are thresholded at 0.5.
+    """
+    [accuracy] = build_metrics(["accuracy"])
+    accuracy.update(np.array([1, 0, 1, 0]), np.array([[0.9], [0.2], [0.4], [0.6]]))
+
+    assert accuracy.result() == 0.5
+
+
+def test_unsupported_metric_error():
+    """
+    Tests that an unsupported metric name raises a ValueError.
+    """
+    with pytest.raises(ValueError, match="Unsupported evaluation metrics"):
+        build_metrics(["f1"])
+
+
+def test_npy_stream_writer(tmp_path):
+    """
+    Tests that streamed batches form a standard, memory-mappable `.npy` file.
+    """
+    path = str(tmp_path / "predictions" / "outputs.npy")
+    batches = [np.arange(12, dtype=np.float32).reshape(4, 3), np.ones((2, 3), dtype=np.float32)]
+    with NpyStreamWriter(path) as writer:
+        for batch in batches:
+            writer.write(batch)
+        with pytest.raises(ValueError, match="rows of shape"):
+            writer.write(np.ones((2, 4), dtype=np.float32))
+
+    predictions = np.load(path, mmap_mode="r")
+    assert isinstance(predictions, np.memmap)
+    np.testing.assert_array_equal(predictions, np.concatenate(batches))
+
+
+def test_streaming_evaluator_state_merging(classification_batches: list, tmp_path):
+    """
+    Tests that summed evaluator states of two shards equal the results over all batches.
+    """
+    full = StreamingEvaluator(["accuracy"], predictions_path=str(tmp_path / "full.npy"))
+    shards = [StreamingEvaluator(["accuracy"]), StreamingEvaluator(["accuracy"])]
+    with full:
+        for index, (y_true, y_pred) in enumerate(classification_batches):
+            full.update(y_true, y_pred, loss=float(index))
+            shards[index % 2].update(y_true, y_pred, loss=float(index))
+
+    shards[0].load_state(shards[0].state() + shards[1].state())
+
+    assert shards[0].results() == pytest.approx(full.results())
+    assert full.results()["loss"] == pytest.approx((0 * 7 + 1 * 5 + 2 * 3) / 15)
+    assert np.load(tmp_path / "full.npy").shape == (15, 4)
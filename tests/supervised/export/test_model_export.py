@@ -0,0 +1,127 @@
+import importlib.util
+import json
+
+import numpy as np
+import pytest
+import tensorflow as tf
+import torch
+
+from ml_training_base.supervised.export.model_export import (
+    benchmark_latency,
+    export_saved_model,
+    export_torch_onnx,
+    export_torch_program,
+    export_torchscript,
+    quantize_keras_dynamic_int8,
+    quantize_torch_dynamic_int8,
+    resize_batch,
+    write_benchmark_report
+)
+
+# --- Fixtures ---
+
+@pytest.fixture
+def torch_model() -> torch.nn.Module:
+    """
+    Provides a small PyTorch MLP in evaluation mode.
+    """
+    torch.manual_seed(0)
+    return torch.nn.Sequential(torch.nn.Linear(4, 16), torch.nn.ReLU(), torch.nn.Linear(16, 2)).eval()
+
+
+@pytest.fixture
+def keras_model() -> tf.keras.Model:
+    """
+    Provides a small Keras MLP.
+    """
+    tf.keras.utils.set_random_seed(0)
+    return tf.keras.Sequential([
+        tf.keras.Input((4,)),
+        tf.keras.layers.Dense(16, activation="relu"),
+        tf.keras.layers.Dense(2)
+    ])
+
+# --- Test Classes and Functions ---
+
+def test_resize_batch():
+    """
+    Tests that nested batches are tiled or truncated along the first dimension.
+    """
+    batch = (torch.arange(6).reshape(3, 2), {"mask": np.ones((3, 5))})
+    resized = resize_batch(batch, 7)
+
+    assert resized[0].shape == (7, 2)
+    assert torch.equal(resized[0][3:6], batch[0])
+    assert resized[1]["mask"].shape == (7, 5)
+    assert resize_batch(tf.ones((3, 2)), 2).shape == (2, 2)
+
+
+def test_benchmark_latency_and_report(tmp_path):
+    """
+    Tests that the benchmark reports every batch size and is written as JSON.
+    """
+    calls = []
+    results = benchmark_latency(lambda batch: calls.append(len(batch)), np.zeros((2, 3)), batch_sizes=[1, 4],
+                                warmup_iterations=1, iterations=5)
+
+    assert [row["batch_size"] for row in results] == [1, 4]
+    assert calls == [1] * 6 + [4] * 6
+    assert all(row["p95_latency_ms"] >= row["p50_latency_ms"] >= 0 for row in results)
+
+    write_benchmark_report({"eager": results}, str(tmp_path / "benchmark.json"))
+    report = json.loads((tmp_path / "benchmark.json").read_text())
+    assert report["results"]["eager"] == results
+
+
+def test_torch_exports_match_eager_model(torch_model: torch.nn.Module, tmp_path):
+    """
+    Tests that TorchScript and `torch.export` artifacts reload, accept other
+    batch sizes, and match the eager model.
+    """
+    example = torch.randn(4, 4)
+    export_torchscript(torch_model, example, str(tmp_path / "model.torchscript.pt"))
+    export_torch_program(torch_model, example, str(tmp_path / "model.pt2"))
+
+    inputs = torch.randn(9, 4)
+    expected = torch_model(inputs)
+    torch.testing.assert_close(torch.jit.load(tmp_path / "model.torchscript.pt")(inputs), expected)
+    torch.testing.assert_close(torch.export.load(tmp_path / "model.pt2").module()(inputs), expected)
+
+
+def test_torch_dynamic_int8_quantization(torch_model: torch.nn.Module, tmp_path):
+    """
+    Tests that int8 quantisation leaves the float model intact and stays close to its outputs.
+    """
+    quantized = quantize_torch_dynamic_int8(torch_model)
+    scripted = export_torchscript(quantized, torch.randn(4, 4), str(tmp_path / "model_int8.torchscript.pt"))
+
+    inputs = torch.randn(8, 4)
+    assert isinstance(torch_model[0], torch.nn.Linear) and type(torch_model[0]) is torch.nn.Linear
+    assert type(quantized[0]) is not torch.nn.Linear
+    torch.testing.assert_close(scripted(inputs), torch_model(inputs), atol=0.05, rtol=0.05)
+
+
+@pytest.mark.skipif(importlib.util.find_spec("onnxscript") is not None, reason="ONNX export dependencies installed")
+def test_torch_onnx_export_requires_optional_packages(torch_model: torch.nn.Module, tmp_path):
+    """
+    Tests that ONNX export names the missing optional packages.
+    """
+    with pytest.raises(ImportError, match="onnx"):
+        export_torch_onnx(torch_model, torch.randn(2, 4), str(tmp_path / "model.onnx"))
+
+
+def test_keras_saved_model_and_int8(keras_model: tf.keras.Model, tmp_path):
+    """
+    Tests that SavedModel exports of the float and int8 models serve any batch
+    size close to the Keras model, without modifying it.
+    """
+    signature = tf.TensorSpec([None, 4], tf.float32)
+    serve = export_saved_model(keras_model, signature, str(tmp_path / "saved_model"))
+    quantized = quantize_keras_dynamic_int8(keras_model)
+    serve_int8 = export_saved_model(quantized, signature, str(tmp_path / "saved_model_int8"))
+
+    inputs = np.random.default_rng(0).standard_normal((5, 4)).astype(np.float32)
+    expected = keras_model.predict_on_batch(inputs)
+    np.testing.assert_allclose(serve(inputs), expected, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(serve_int8(inputs), expected, atol=0.05)
+    assert keras_model.layers[0].kernel.dtype == "float32"
@@ -0,0 +1,81 @@
+import numpy as np
+import tensorflow as tf
+import torch
+
+from ml_training_base.supervised.memory.activation_checkpointing import (
+    checkpoint_keras_layers,
+    checkpoint_torch_modules
+)
+
+# --- Test Classes and Functions ---
+
+class Block(torch.nn.Module):
+    """
+    A residual MLP block that counts its forward passes.
+    """
+    def __init__(self):
+        super().__init__()
+        self.linear = torch.nn.Linear(8, 8)
+        self.calls = 0
+
+    def forward(self, x):
+        self.calls += 1
+        return x + torch.relu(self.linear(x))
+
+
+def _make_torch_model() -> torch.nn.Sequential:
+    torch.manual_seed(0)
+    return torch.nn.Sequential(Block(), Block(), torch.nn.Linear(8, 1))
+
+
+def test_torch_activation_checkpointing_recomputes_matching_modules():
+    """
+    Tests that checkpointed modules are recomputed in the backward pass with
+    identical gradients and unchanged `state_dict` keys, and that inference
+    is not recomputed.
+    """
+    x = torch.randn(4, 8)
+    reference = _make_torch_model()
+    reference(x).sum().backward()
+
+    model = _make_torch_model()
+    assert checkpoint_torch_modules(model, ["Block"]) == 2
+    model(x).sum().backward()
+
+    assert [block.calls for block in model[:2]] == [2, 2]
+    assert list(model.state_dict()) == list(reference.state_dict())
+    for param, reference_param in zip(model.parameters(), reference.parameters()):
+        torch.testing.assert_close(param.grad, reference_param.grad)
+
+    with torch.no_grad():
+        model(x)
+    assert [block.calls for block in model[:2]] == [3, 3]
+
+
+def test_keras_activation_checkpointing_matches_training():
+    """
+    Tests that training with rematerialised layers matches regular training.
+    """
+    def make_model():
+        tf.keras.utils.set_random_seed(0)
+        model = tf.keras.Sequential([
+            tf.keras.Input((4,)),
+            tf.keras.layers.Dense(8, activation="relu"),
+            tf.keras.layers.Dense(1)
+        ])
+        model.compile(optimizer=tf.keras.optimizers.SGD(0.1), loss="mse")
+        return model
+
+    x = np.random.default_rng(0).random((32, 4)).astype(np.float32)
+    y = x.sum(axis=1, keepdims=True)
+
+    reference = make_model()
+    reference_history = reference.fit(x, y, batch_size=8, epochs=2, shuffle=False, verbose=0)
+
+    model = make_model()
+    assert checkpoint_keras_layers(model, ["Dense"]) == 2
+    history = model.fit(x, y, batch_size=8, epochs=2, shuffle=False, verbose=0)
+
+    np.testing.assert_allclose(history.history["loss"], reference_history.history["loss"], rtol=1e-6)
+    for weight, reference_weight in zip(model.get_weights(), reference.get_weights()):
+        np.testing.assert_allclose(weight, reference_weight, rtol=1e-6)
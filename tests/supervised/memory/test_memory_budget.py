@@ -0,0 +1,72 @@
+import pytest
+
+from ml_training_base.supervised.memory import memory_budget
+from ml_training_base.supervised.memory.memory_budget import (
+    find_max_batch_size,
+    plan_gradient_accumulation,
+    probe_peak_rss
+)
+
+MIB = 2 ** 20
+
+# --- Fixtures ---
+
+@pytest.fixture
+def linear_memory(monkeypatch) -> list:
+    """
+    Makes every probe report 1 MiB of peak RSS per example, and records the probed batch sizes.
+    """
+    probed = []
+
+    def fake_probe_peak_rss(step_fn, batch_size):
+        probed.append(batch_size)
+        return batch_size * MIB
+
+    monkeypatch.setattr(memory_budget, "probe_peak_rss", fake_probe_peak_rss)
+    return probed
+
+# --- Test Classes and Functions ---
+
+def test_find_max_batch_size_doubles_then_bisects(linear_memory: list):
+    """
+    Tests that the largest fitting batch size is found by doubling and bisection.
+    """
+    assert find_max_batch_size(lambda batch_size: None, max_rss_bytes=100 * MIB, max_batch_size=512) == 100
+    assert linear_memory[:8] == [1, 2, 4, 8, 16, 32, 64, 128]
+    assert len(linear_memory) <= 16
+
+
+def test_find_max_batch_size_bounds(linear_memory: list):
+    """
+    Tests the maximum batch size, multiples, and the error when nothing fits.
+    """
+    assert find_max_batch_size(lambda batch_size: None, 1000 * MIB, max_batch_size=48) == 48
+    assert find_max_batch_size(lambda batch_size: None, 100 * MIB, max_batch_size=512, multiple_of=8) == 96
+
+    with pytest.raises(RuntimeError, match="No batch size"):
+        find_max_batch_size(lambda batch_size: None, 10 * MIB, max_batch_size=64, min_batch_size=16)
+
+
+def test_probe_peak_rss_out_of_memory():
+    """
+    Tests that out-of-memory errors are reported as not fitting, and other errors are raised.
+    """
+    def out_of_memory(batch_size):
+        raise MemoryError
+
+    def unrelated_error(batch_size):
+        raise RuntimeError("shape mismatch")
+
+    assert probe_peak_rss(out_of_memory, 8) is None
+    with pytest.raises(RuntimeError, match="shape mismatch"):
+        probe_peak_rss(unrelated_error, 8)
+    assert probe_peak_rss(lambda batch_size: None, 8) > 0
+
+
+def test_plan_gradient_accumulation():
+    """
+    Tests that an effective batch size is split into the fewest steps that fit.
+    """
+    assert plan_gradient_accumulation(64, 64) == (64, 1)
+    assert plan_gradient_accumulation(64, 24) == (22, 3)
+    assert plan_gradient_accumulation(16, 6) == (6, 3)
@@ -0,0 +1,181 @@
+import csv
+import json
+import logging
+
+import numpy as np
+import pytest
+import torch
+import yaml
+from torch.utils.data import TensorDataset
+
+from ml_training_base.supervised.environments.base_training_environments import PyTorchTrainingEnvironment
+from ml_training_base.supervised.sweeps.sweep_runner import SweepRunner, apply_overrides, grid_trials
+from ml_training_base.supervised.sweeps.trial_schedulers import AsyncSuccessiveHalving
+from ml_training_base.supervised.trainers.base_supervised_trainers import BasePyTorchSupervisedTrainer
+
+# --- Fixtures ---
+
+@pytest.fixture
+def sweep_config_file(tmp_path) -> str:
+    """
+    Writes a base PyTorch training config for sweeps and returns its path.
+    """
+    config = {
+        "data": {"logger_path": str(tmp_path / "logs" / "base.log"), "batch_size": 16, "num_workers": 0},
+        "determinism": {"python_seed": 0, "random_seed": 42, "numpy_seed": 42, "torch_seed": 42},
+        "training": {"epochs": 4, "learning_rate": 0.05, "model_save_dir": str(tmp_path / "base_model")}
+    }
+    config_path = tmp_path / "sweep_config.yaml"
+    config_path.write_text(yaml.dump(config))
+
+    return str(config_path)
+
+
+@pytest.fixture
+def shared_regression_data() -> dict:
+    """
+    Provides a small prepared regression dataset as NumPy arrays.
+    """
+    x = np.random.default_rng(0).standard_normal((64, 4)).astype(np.float32)
+    y = x @ np.array([[1.0], [-2.0], [0.5], [3.0]], dtype=np.float32)
+
+    return {"x": x, "y": y}
+
+# --- Test Classes and Functions ---
+
+class SharedDataLinearTrainer(BasePyTorchSupervisedTrainer):
+    """
+    A PyTorch trainer fitting a linear regression on the sweep's shared arrays.
+    """
+    def _setup_data(self):
+        assert isinstance(self._shared_data["x"], np.memmap)
+        dataset = TensorDataset(torch.from_numpy(np.array(self._shared_data["x"])),
+                                torch.from_numpy(np.array(self._shared_data["y"])))
+        self._build_data_loaders(dataset, valid_dataset=dataset, test_dataset=dataset)
+
+    def _setup_model(self):
+        torch.manual_seed(0)
+        self._model = torch.nn.Linear(4, 1)
+        learning_rate = self._config.get('training', {}).get('learning_rate')
+        self._optimizer = torch.optim.SGD(self._model.parameters(), lr=learning_rate)
+        self._loss_fn = torch.nn.MSELoss()
+
+
+def test_grid_trials_and_overrides():
+    """
+    Tests grid expansion and dotted-key overrides, which must not modify the base config.
+    """
+    trials = grid_trials({"training.learning_rate": [0.1, 0.01], "model.units": [8]})
+    assert trials == [
+        {"training.learning_rate": 0.1, "model.units": 8},
+        {"training.learning_rate": 0.01, "model.units": 8}
+    ]
+
+    base = {"training": {"epochs": 2}}
+    config = apply_overrides(base, trials[0])
+    assert config == {"training": {"epochs": 2, "learning_rate": 0.1}, "model": {"units": 8}}
+    assert base == {"training": {"epochs": 2}}
+
+
+def test_sweep_runs_trials_concurrently_with_early_stopping(
+    sweep_config_file: str,
+    shared_regression_data: dict,
+    tmp_path
+):
+    """
+    Tests that a sweep runs trials in parallel on memory-mapped shared data,
+    isolates each trial's outputs, stops a diverging trial at the first rung,
+    and writes a results table sorted best first.
+    """
+    sweep_dir = tmp_path / "sweep"
+    runner = SweepRunner(
+        trainer_cls=SharedDataLinearTrainer,
+        training_env_cls=PyTorchTrainingEnvironment,
+        config_path=sweep_config_file,
+        trials=[
+            {"training.learning_rate": 0.05},
+            {"training.learning_rate": 0.05, "determinism.numpy_seed": 7},
+            {"training.learning_rate": 1.5}
+        ],
+        sweep_dir=str(sweep_dir),
+        shared_data=shared_regression_data,
+        max_concurrent_trials=2,
+        scheduler=AsyncSuccessiveHalving(grace_period=2, reduction_factor=2),
+        logger=logging.getLogger("test_logger")
+    )
+    results = runner.run()
+
+    # The two equal trials tie at the first rung, and the diverging trial only
+    # starts once one of them has freed a worker, so it is always compared there
+    assert [result["trial_id"] for result in results] == ["trial_0000", "trial_0001", "trial_0002"]
+    assert [result["status"] for result in results] == ["completed", "completed", "stopped"]
+    assert [result["epochs"] for result in results] == [4, 4, 2]
+    assert results[0]["best_metric"] < 1.0
+    assert all(result["error"] is None for result in results)
+
+    for result in results:
+        trial_config = yaml.safe_load(open(sweep_dir / result["trial_id"] / "config.yaml"))
+        assert trial_config["training"]["learning_rate"] == result["overrides"]["training.learning_rate"]
+        assert trial_config["performance"]["inter_op_threads"] == 1
+        trial_log = (sweep_dir / result["trial_id"] / "training.log").read_text()
+        assert "Performing framework-agnostic environment setup" in trial_log
+    assert (sweep_dir / results[0]["trial_id"] / "model" / "model.pt").exists()
+
+    with open(sweep_dir / "results.csv") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["trial_id"] for row in rows] == [result["trial_id"] for result in results]
+    assert "training.learning_rate" in rows[0]
+    assert json.load(open(sweep_dir / "results.json"))[0]["trial_id"] == results[0]["trial_id"]
+
+
+def test_failed_trials_are_reported(sweep_config_file: str, tmp_path):
+    """
+    Tests that an exception in a trial is reported as a failed result instead of aborting the sweep.
+    """
+    runner = SweepRunner(
+        trainer_cls=SharedDataLinearTrainer,
+        training_env_cls=PyTorchTrainingEnvironment,
+        config_path=sweep_config_file,
+        trials=[{}],
+        sweep_dir=str(tmp_path / "sweep"),
+        logger=logging.getLogger("test_logger")
+    )
+    [result] = runner.run()
+
+    assert result["status"] == "failed"
+    assert "KeyError" in result["error"]
+
+
+class NoValidationLinearTrainer(SharedDataLinearTrainer):
+    """
+    A shared-data PyTorch trainer without a validation set, so epochs log no `val_loss`.
+    """
+    def _setup_data(self):
+        dataset = TensorDataset(torch.from_numpy(np.array(self._shared_data["x"])),
+                                torch.from_numpy(np.array(self._shared_data["y"])))
+        self._build_data_loaders(dataset, test_dataset=dataset)
+
+
+def test_trials_without_the_metric_are_not_reported(
+    sweep_config_file: str,
+    shared_regression_data: dict,
+    tmp_path
+):
+    """
+    Tests that epochs whose logs lack the scheduler's metric are not reported, instead of reporting the training loss.
+    """
+    runner = SweepRunner(
+        trainer_cls=NoValidationLinearTrainer,
+        training_env_cls=PyTorchTrainingEnvironment,
+        config_path=sweep_config_file,
+        trials=[{"training.learning_rate": 0.05}, {"training.learning_rate": 1.5}],
+        sweep_dir=str(tmp_path / "sweep"),
+        shared_data=shared_regression_data,
+        max_concurrent_trials=1,
+        scheduler=AsyncSuccessiveHalving(grace_period=1, reduction_factor=2),
+        logger=logging.getLogger("test_logger")
+    )
+    results = runner.run()
+
+    assert [result["status"] for result in results] == ["completed", "completed"]
+    assert all(result["epochs"] == 0 and result["best_metric"] is None for result in results)
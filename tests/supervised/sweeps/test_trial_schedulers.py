@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from ml_training_base.supervised.sweeps.trial_schedulers import AsyncSuccessiveHalving, MedianStoppingRule
+
+# --- Test Classes and Functions ---
+
+def test_asha_rungs():
+    """
+    Tests that rungs are placed at `grace_period * reduction_factor ** k`, up to `max_t`.
+    """
+    scheduler = AsyncSuccessiveHalving(grace_period=1, reduction_factor=3, max_t=9)
+    assert [step for step in range(1, 30) if scheduler.is_rung(step)] == [1, 3, 9]
+
+
+def test_asha_stops_trials_outside_top_fraction():
+    """
+    Tests that a trial reaching a rung continues only if it is within the best
+    `1 / reduction_factor` of the trials recorded there, and never stops between rungs.
+    """
+    scheduler = AsyncSuccessiveHalving(grace_period=1, reduction_factor=2)
+
+    assert not scheduler.should_stop("a", 1, 0.5)
+    assert scheduler.should_stop("b", 1, 0.9)
+    assert not scheduler.should_stop("c", 1, 0.1)
+    assert not scheduler.should_stop("b", 3, 100.0)
+
+
+def test_asha_max_mode():
+    """
+    Tests that `mode='max'` treats higher metrics as better.
+    """
+    scheduler = AsyncSuccessiveHalving(metric="val_accuracy", mode="max", grace_period=1, reduction_factor=2)
+
+    assert not scheduler.should_stop("a", 1, 0.5)
+    assert not scheduler.should_stop("b", 1, 0.9)
+    assert scheduler.should_stop("c", 1, 0.1)
+
+
+def test_median_stopping_rule():
+    """
+    Tests that a trial is stopped once its best metric is worse than the
+    median of the other trials, after the grace period and minimum samples.
+    """
+    scheduler = MedianStoppingRule(grace_period=2, min_samples=2)
+    for trial_id, value in [("a", 1.0), ("b", 2.0), ("c", 3.0)]:
+        assert not scheduler.should_stop(trial_id, 1, value)
+
+    assert not scheduler.should_stop("a", 2, 0.5)
+    assert not scheduler.should_stop("b", 2, 0.7)
+    assert scheduler.should_stop("c", 2, 2.5)
+
+
+def test_invalid_scheduler_arguments():
+    """
+    Tests that invalid modes and schedules raise ValueErrors, and that NaN metrics stop trials.
+    """
+    with pytest.raises(ValueError, match="mode"):
+        MedianStoppingRule(mode="lowest")
+    with pytest.raises(ValueError, match="reduction_factor"):
+        AsyncSuccessiveHalving(reduction_factor=1)
+
+    assert MedianStoppingRule().should_stop("a", 1, math.nan)
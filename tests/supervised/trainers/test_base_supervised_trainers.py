@@ -1,11 +1,22 @@
 import os
+import json
 import pytest
 import logging
 import yaml
 import tempfile
 from unittest.mock import patch
 
-from ml_training_base.supervised.trainers.base_supervised_trainers import BaseSupervisedTrainer
+import numpy as np
+import torch
+import tensorflow as tf
+
+from ml_training_base.supervised.data.bucketing import LengthBucketBatchSampler
+from ml_training_base.supervised.memory import memory_budget
+from ml_training_base.supervised.trainers.base_supervised_trainers import (
+    BaseSupervisedTrainer,
+    BaseKerasSupervisedTrainer,
+    BasePyTorchSupervisedTrainer
+)
 from ml_training_base.supervised.environments.base_training_environments import BaseTrainingEnvironment
 
 # --- Fixtures ---
@@ -42,6 +53,14 @@ def mock_config_file(mock_config: dict) -> str:
     os.remove(tmp_path)
 
 
+@pytest.fixture
+def linear_memory(monkeypatch):
+    """
+    Makes every memory budget probe report 1 MiB of peak RSS per example.
+    """
+    monkeypatch.setattr(memory_budget, "probe_peak_rss", lambda step_fn, batch_size: step_fn(batch_size) or batch_size * 2 ** 20)
+
+
 @pytest.fixture
 def mock_logger():
     """
@@ -108,3 +127,834 @@ def test_trainer_run_orchestration(mock_config_file: str, mock_logger: logging.L
         mock_train.assert_called_once()
         mock_evaluate.assert_called_once()
         mock_save.assert_called_once()
+
+
+class SequenceClassifier(tf.keras.Model):
+    """
+    A subclassed Keras model with lazily built layers.
+    """
+    def __init__(self, eager_only: bool = False):
+        super().__init__()
+        self._eager_only = eager_only
+        self._embedding = tf.keras.layers.Embedding(16, 4)
+        self._pooling = tf.keras.layers.GlobalAveragePooling1D()
+        self._dense = tf.keras.layers.Dense(2)
+
+    def call(self, inputs):
+        if self._eager_only:
+            # Reading tensor values fails on symbolic inputs
+            _ = inputs.numpy()
+
+        return self._dense(self._pooling(self._embedding(inputs)))
+
+
+class ConcreteKerasTrainer(BaseKerasSupervisedTrainer):
+    """
+    A minimal Keras trainer on a synthetic sequence dataset whose iteration is tracked.
+    """
+    def __init__(self, *args, eager_only: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.eager_only = eager_only
+        self.iterated = tf.Variable(False)
+
+    def _setup_data(self):
+        def mark_iterated(x, y):
+            self.iterated.assign(True)
+            return x, y
+
+        x = tf.zeros((8, 5), dtype=tf.int32)
+        y = tf.zeros((8,), dtype=tf.int32)
+        self._train_dataset = tf.data.Dataset.from_tensor_slices((x, y)).map(mark_iterated).batch(4)
+
+    def _setup_model(self):
+        self._model = SequenceClassifier(eager_only=self.eager_only)
+
+
+@pytest.mark.parametrize("eager_only", [False, True])
+def test_keras_trainer_build_model_skips_dataset_iteration(
+    mock_config_file: str,
+    mock_logger: logging.Logger,
+    eager_only: bool
+):
+    """
+    Tests that the Keras model is built from the dataset's element spec, with a
+    synthetic batch fallback, without ever iterating the training dataset.
+    """
+    trainer = ConcreteKerasTrainer(
+        config_path=mock_config_file,
+        training_env=MockTrainingEnvironment(logger=mock_logger),
+        eager_only=eager_only
+    )
+    trainer._setup_data()
+    trainer._setup_model()
+
+    trainer._build_model()
+
+    assert trainer._model.built
+    assert len(trainer._model.weights) == 3
+    assert not bool(trainer.iterated.numpy())
+    assert trainer._model(tf.ones((2, 5), dtype=tf.int32)).shape == (2, 2)
+
+
+class RegressionKerasTrainer(BaseKerasSupervisedTrainer):
+    """
+    A minimal Keras trainer fitting a linear regression on synthetic data.
+    """
+    def _setup_data(self):
+        x = np.random.default_rng(0).standard_normal((40, 4)).astype(np.float32)
+        y = x @ np.array([[1.0], [-2.0], [0.5], [3.0]], dtype=np.float32)
+        self._train_dataset = tf.data.Dataset.from_tensor_slices((x, y)).batch(8)
+        self._test_dataset = tf.data.Dataset.from_tensor_slices((x, y)).batch(8)
+
+    def _setup_model(self):
+        self._model = tf.keras.Sequential([tf.keras.Input((4,)), tf.keras.layers.Dense(1)])
+        self._model.compile(optimizer="sgd", loss="mse", metrics=["mae"])
+
+
+def test_keras_trainer_streaming_evaluation(mock_config_file: str, mock_logger: logging.Logger, tmp_path):
+    """
+    Tests that streaming evaluation matches `model.evaluate()` in one pass and
+    exports the predictions of every example.
+    """
+    trainer = RegressionKerasTrainer(
+        config_path=mock_config_file,
+        training_env=MockTrainingEnvironment(logger=mock_logger)
+    )
+    trainer._setup_data()
+    trainer._setup_model()
+    expected = trainer._evaluate()
+
+    predictions_path = tmp_path / "predictions.npy"
+    trainer.config["evaluation"] = {
+        "streaming": True,
+        "batch_size": 32,
+        "metrics": ["mae", "mse"],
+        "predictions_path": str(predictions_path)
+    }
+    results = trainer._evaluate()
+
+    assert results["loss"] == pytest.approx(expected["loss"], rel=1e-5)
+    assert results["mean_absolute_error"] == pytest.approx(expected["mae"], rel=1e-5)
+    assert results["mean_squared_error"] == pytest.approx(expected["loss"], rel=1e-5)
+    x = np.concatenate([batch[0].numpy() for batch in trainer._test_dataset])
+    np.testing.assert_allclose(np.load(predictions_path), trainer._model.predict(x), rtol=1e-5)
+
+
+def test_keras_trainer_export_and_benchmark(mock_config_file: str, mock_logger: logging.Logger, tmp_path):
+    """
+    Tests that the Keras trainer exports float and int8 SavedModels and writes
+    a latency benchmark to the model directory.
+    """
+    trainer = RegressionKerasTrainer(
+        config_path=mock_config_file,
+        training_env=MockTrainingEnvironment(logger=mock_logger)
+    )
+    trainer.config["training"] = {"model_save_dir": str(tmp_path / "model"), "export": True}
+    trainer.config["export"] = {
+        "formats": ["saved_model"],
+        "quantize_int8": True,
+        "benchmark_batch_sizes": [1, 4],
+        "benchmark_iterations": 2
+    }
+    trainer._setup_data()
+    trainer._setup_model()
+    trainer._export_model()
+
+    assert (tmp_path / "model" / "saved_model" / "saved_model.pb").exists()
+    assert (tmp_path / "model" / "saved_model_int8" / "saved_model.pb").exists()
+    report = json.loads((tmp_path / "model" / "benchmark.json").read_text())
+    assert set(report["results"]) == {"keras", "saved_model", "saved_model_int8"}
+    assert [row["batch_size"] for row in report["results"]["saved_model"]] == [1, 4]
+
+
+class FailingKerasTrainer(RegressionKerasTrainer):
+    """
+    A Keras trainer whose training fails after the callbacks are set up.
+    """
+    def _train(self):
+        raise RuntimeError("training failed")
+
+
+def test_keras_trainer_closes_async_checkpoint_manager(
+    mock_config_file: str,
+    mock_logger: logging.Logger,
+    tmp_path
+):
+    """
+    Tests that the Keras `run()` shuts down the async checkpoint writer even
+    when training fails.
+    """
+    trainer = FailingKerasTrainer(
+        config_path=mock_config_file,
+        training_env=MockTrainingEnvironment(logger=mock_logger)
+    )
+    trainer.config["training"] = {
+        "async_checkpointing": True,
+        "checkpoint_dir": str(tmp_path / "checkpoints"),
+        "tensorboard_dir": str(tmp_path / "tensorboard"),
+        "model_save_dir": str(tmp_path / "model")
+    }
+
+    with pytest.raises(RuntimeError, match="training failed"):
+        trainer.run()
+
+    assert trainer._checkpoint_manager._executor._shutdown
+
+
+def test_keras_trainer_memory_budget(mock_config_file: str, mock_logger: logging.Logger, linear_memory):
+    """
+    Tests that the Keras memory budget probes real training steps, keeps the
+    effective batch size with gradient accumulation, and rebuilds the data.
+    """
+    trainer = RegressionKerasTrainer(
+        config_path=mock_config_file,
+        training_env=MockTrainingEnvironment(logger=mock_logger)
+    )
+    trainer.config["data"]["batch_size"] = 16
+    trainer.config["training"] = {
+        "memory_budget": {"enabled": True, "max_rss_mb": 6, "mode": "gradient_accumulation", "multiple_of": 1}
+    }
+    trainer._setup_data()
+    trainer._setup_model()
+    trainer._apply_memory_budget()
+
+    assert trainer.config["data"]["batch_size"] == 6
+    assert trainer._model.optimizer.gradient_accumulation_steps == 3
+
+
+class BatchNormKerasTrainer(RegressionKerasTrainer):
+    """
+    A Keras trainer whose model has BatchNormalization and Dropout layers.
+    """
+    def _setup_model(self):
+        tf.keras.utils.set_random_seed(0)
+        self._model = tf.keras.Sequential([
+            tf.keras.Input((4,)),
+            tf.keras.layers.Dense(8),
+            tf.keras.layers.BatchNormalization(),
+            tf.keras.layers.Dropout(0.2),
+            tf.keras.layers.Dense(1)
+        ])
+        self._model.compile(optimizer="sgd", loss="mse")
+
+
+def test_keras_trainer_memory_budget_keeps_non_trainable_variables(
+    mock_config_file: str,
+    mock_logger: logging.Logger,
+    linear_memory
+):
+    """
+    Tests that the Keras memory budget probes leave the BatchNorm moving
+    statistics and the seed generator states unchanged.
+    """
+    trainer = BatchNormKerasTrainer(
+        config_path=mock_config_file,
+        training_env=MockTrainingEnvironment(logger=mock_logger)
+    )
+    trainer.config["data"]["batch_size"] = 16
+    trainer.config["training"] = {"memory_budget": {"enabled": True, "max_rss_mb": 6, "multiple_of": 1}}
+    trainer._setup_data()
+    trainer._setup_model()
+    initial_values = [variable.numpy() for variable in trainer._model.non_trainable_variables]
+    trainer._apply_memory_budget()
+
+    assert trainer.config["data"]["batch_size"] == 6
+    assert len(initial_values) == 3
+    for variable, value in zip(trainer._model.non_trainable_variables, initial_values):
+        np.testing.assert_array_equal(variable.numpy(), value)
+
+
+class ConcretePyTorchTrainer(BasePyTorchSupervisedTrainer):
+    """
+    A minimal PyTorch trainer fitting a linear regression on synthetic data.
+    """
+    def _setup_data(self):
+        generator = torch.Generator().manual_seed(0)
+        x = torch.randn(64, 4, generator=generator)
+        y = x @ torch.tensor([[1.0], [-2.0], [0.5], [3.0]])
+        dataset = torch.utils.data.TensorDataset(x, y)
+        self._train_loader = torch.utils.data.DataLoader(dataset, batch_size=8)
+        self._valid_loader = torch.utils.data.DataLoader(dataset, batch_size=16)
+        self._test_loader = torch.utils.data.DataLoader(dataset, batch_size=16)
+
+    def _setup_model(self):
+        torch.manual_seed(0)
+        self._model = torch.nn.Linear(4, 1)
+        self._optimizer = torch.optim.SGD(self._model.parameters(), lr=0.05)
+        self._loss_fn = torch.nn.MSELoss()
+
+
+@pytest.fixture
+def pytorch_config_file(mock_config: dict, tmp_path) -> str:
+    """
+    Writes a PyTorch training config to a temporary YAML file and returns its path.
+    """
+    mock_config["training"] = {
+        "epochs": 5,
+        "model_save_dir": str(tmp_path / "model")
+    }
+    config_path = tmp_path / "pytorch_config.yaml"
+    config_path.write_text(yaml.dump(mock_config))
+
+    return str(config_path)
+
+
+def _make_pytorch_trainer(config_path: str, mock_logger: logging.Logger, **training_overrides):
+    trainer = ConcretePyTorchTrainer(
+        config_path=config_path,
+        training_env=MockTrainingEnvironment(logger=mock_logger)
+    )
+    trainer.config["training"].update(training_overrides)
+    trainer._setup_data()
+    trainer._setup_model()
+
+    return trainer
+
+
+def test_pytorch_trainer_loss_decreases(pytorch_config_file: str, mock_logger: logging.Logger):
+    """
+    Tests that the default PyTorch training loop reduces the loss.
+    """
+    trainer = _make_pytorch_trainer(pytorch_config_file, mock_logger)
+    initial_loss = trainer._run_inference_loop(trainer._valid_loader)["loss"]
+
+    trainer._train()
+    final_loss = trainer._run_inference_loop(trainer._valid_loader)["loss"]
+
+    assert final_loss < initial_loss
+
+
+def test_pytorch_trainer_memory_monitor(pytorch_config_file: str, mock_logger: logging.Logger, tmp_path):
+    """
+    Tests that `training.memory_monitor` snapshots every epoch and writes a timeline until `run()` ends, and that a
+    later `run()` starts a new monitor.
+    """
+    trainer = ConcretePyTorchTrainer(
+        config_path=pytorch_config_file,
+        training_env=MockTrainingEnvironment(logger=mock_logger)
+    )
+    trainer.config["training"]["memory_monitor"] = {
+        "enabled": True,
+        "interval_seconds": 0.01,
+        "timeline_path": str(tmp_path / "memory_timeline.csv")
+    }
+
+    for _ in range(2):
+        trainer.run()
+
+        assert trainer._memory_monitor is None
+        assert trainer._epoch_end_hooks == []
+        timeline = (tmp_path / "memory_timeline.csv").read_text().splitlines()
+        assert timeline[0].startswith("elapsed_seconds,event,epoch,rss_mb")
+        events = [row.split(",")[:3] for row in timeline[1:]]
+        assert [epoch for _, event, epoch in events if event == "epoch_end"] == ["0", "1", "2", "3", "4"]
+        assert events[0][1] == "start" and events[-1][1] == "stop"
+
+
+def test_pytorch_trainer_resource_sampler(
+    pytorch_config_file: str,
+    mock_logger: logging.Logger,
+    tmp_path,
+    caplog: pytest.LogCaptureFixture
+):
+    """
+    Tests that `training.resource_sampler` samples for the whole of `run()` and summarises it when `run()` ends, and
+    that a later `run()` starts a new sampler.
+    """
+    trainer = ConcretePyTorchTrainer(
+        config_path=pytorch_config_file,
+        training_env=MockTrainingEnvironment(logger=mock_logger)
+    )
+    trainer.config["training"]["resource_sampler"] = {
+        "enabled": True,
+        "interval_seconds": 0.01,
+        "timeline_path": str(tmp_path / "resource_timeline.csv")
+    }
+
+    for _ in range(2):
+        caplog.clear()
+        with caplog.at_level(logging.INFO, logger=trainer._logger.name):
+            trainer.run()
+
+        assert trainer._resource_sampler is None
+        summaries = [record.message for record in caplog.records if record.message.startswith("Resource usage over")]
+        assert len(summaries) == 1
+        timeline = (tmp_path / "resource_timeline.csv").read_text().splitlines()
+        assert timeline[0].startswith("elapsed_seconds,process_cpu_pct,load_1m,rss_mb")
+        assert len(timeline) > 1
+
+
+def test_pytorch_trainer_streaming_evaluation(pytorch_config_file: str, mock_logger: logging.Logger, tmp_path):
+    """
+    Tests that streaming evaluation with a larger inference batch size matches
+    the mean test loss and exports the predictions of every example.
+    """
+    trainer = _make_pytorch_trainer(pytorch_config_file, mock_logger)
+    predictions_path = tmp_path / "predictions.npy"
+    trainer.config["evaluation"] = {
+        "streaming": True,
+        "batch_size": 48,
+        "metrics": ["mse", "mae"],
+        "predictions_path": str(predictions_path)
+    }
+    results = trainer._evaluate()
+
+    x, y = trainer._test_loader.dataset.tensors
+    with torch.no_grad():
+        expected = trainer._model(x)
+    assert results["loss"] == pytest.approx(trainer._run_inference_loop(trainer._test_loader)["loss"], rel=1e-5)
+    assert results["mean_squared_error"] == pytest.approx(results["loss"], rel=1e-5)
+    assert results["mean_absolute_error"] == pytest.approx((expected - y).abs().mean().item(), rel=1e-5)
+    np.testing.assert_allclose(np.load(predictions_path), expected.numpy(), rtol=1e-6)
+
+
+def test_pytorch_trainer_gradient_accumulation(pytorch_config_file: str, mock_logger: logging.Logger):
+    """
+    Tests that accumulating gradients over N batches matches a single step on an N-times larger batch.
+    """
+    trainer_accumulated = _make_pytorch_trainer(
+        pytorch_config_file, mock_logger, epochs=1, gradient_accumulation_steps=2
+    )
+    trainer_accumulated._train()
+
+    trainer_large_batch = _make_pytorch_trainer(pytorch_config_file, mock_logger, epochs=1)
+    trainer_large_batch._train_loader = torch.utils.data.DataLoader(
+        trainer_large_batch._train_loader.dataset, batch_size=16
+    )
+    trainer_large_batch._train()
+
+    for param_a, param_b in zip(trainer_accumulated._model.parameters(), trainer_large_batch._model.parameters()):
+        assert torch.allclose(param_a, param_b, atol=1e-6)
+
+
+class _SampleStream(torch.utils.data.IterableDataset):
+    """
+    Streams the examples of a tensor dataset, so its data loader has no length.
+    """
+    def __init__(self, dataset: torch.utils.data.TensorDataset):
+        self._dataset = dataset
+
+    def __iter__(self):
+        return iter(self._dataset)
+
+
+@pytest.mark.parametrize("iterable", [False, True])
+def test_pytorch_trainer_gradient_accumulation_partial_window(pytorch_config_file: str, mock_logger: logging.Logger,
+                                                              iterable: bool):
+    """
+    Tests that the last, shorter accumulation window of an epoch applies the mean gradient of its batches.
+    """
+    # 8 batches of 8 examples are accumulated in windows of 3, 3 and 2 batches
+    trainer_accumulated = _make_pytorch_trainer(
+        pytorch_config_file, mock_logger, epochs=1, gradient_accumulation_steps=3
+    )
+    if iterable:
+        trainer_accumulated._train_loader = torch.utils.data.DataLoader(
+            _SampleStream(trainer_accumulated._train_loader.dataset), batch_size=8
+        )
+    trainer_accumulated._train()
+
+    trainer_large_batch = _make_pytorch_trainer(pytorch_config_file, mock_logger, epochs=1)
+    trainer_large_batch._train_loader = torch.utils.data.DataLoader(
+        trainer_large_batch._train_loader.dataset, batch_size=24
+    )
+    trainer_large_batch._train()
+
+    for param_a, param_b in zip(trainer_accumulated._model.parameters(), trainer_large_batch._model.parameters()):
+        assert torch.allclose(param_a, param_b, atol=1e-6)
+
+
+def test_pytorch_trainer_bf16_autocast(pytorch_config_file: str, mock_logger: logging.Logger):
+    """
+    Tests that the training loop runs under bfloat16 autocast on the CPU.
+    """
+    trainer = _make_pytorch_trainer(pytorch_config_file, mock_logger, epochs=1, mixed_precision="bf16")
+    trainer._train()
+
+    assert trainer._autocast_dtype() == torch.bfloat16
+
+
+def test_pytorch_trainer_invalid_mixed_precision(pytorch_config_file: str, mock_logger: logging.Logger):
+    """
+    Tests that an unsupported mixed precision value raises a ValueError.
+    """
+    trainer = _make_pytorch_trainer(pytorch_config_file, mock_logger, mixed_precision="fp8")
+    with pytest.raises(ValueError, match="Unsupported `mixed_precision`"):
+        trainer._train()
+
+
+def test_pytorch_trainer_save_model(pytorch_config_file: str, mock_logger: logging.Logger, tmp_path):
+    """
+    Tests that the model `state_dict` is saved and can be reloaded.
+    """
+    trainer = _make_pytorch_trainer(pytorch_config_file, mock_logger)
+    trainer._save_model()
+
+    state_dict = torch.load(tmp_path / "model" / "model.pt")
+    assert torch.equal(state_dict["weight"], trainer._model.weight)
+
+
+def test_pytorch_trainer_export_and_benchmark(pytorch_config_file: str, mock_logger: logging.Logger, tmp_path):
+    """
+    Tests that the PyTorch trainer exports TorchScript, `torch.export` and int8
+    artifacts and writes a latency benchmark to the model directory, only with
+    `training.export` set.
+    """
+    trainer = _make_pytorch_trainer(pytorch_config_file, mock_logger)
+    trainer.config["export"] = {
+        "formats": ["torchscript", "torch_export"],
+        "quantize_int8": True,
+        "benchmark_batch_sizes": [1, 4],
+        "benchmark_iterations": 2
+    }
+    trainer._save_model()
+    trainer._export_model()
+
+    model_dir = tmp_path / "model"
+    assert {path.name for path in model_dir.iterdir()} == {"model.pt"}
+
+    trainer.config["training"]["export"] = True
+    trainer._export_model()
+    assert {path.name for path in model_dir.iterdir()} == {
+        "model.pt", "model.torchscript.pt", "model.pt2", "model_int8.torchscript.pt", "benchmark.json"
+    }
+    report = json.loads((model_dir / "benchmark.json").read_text())
+    assert set(report["results"]) == {"eager", "torchscript", "torch_export", "torchscript_int8"}
+
+    trainer.config["export"]["formats"] = ["tflite"]
+    with pytest.raises(ValueError, match="Unsupported PyTorch export formats"):
+        trainer._export_model()
+
+
+class ConfiguredBatchPyTorchTrainer(ConcretePyTorchTrainer):
+    """
+    A PyTorch trainer whose training loader uses the configured batch size.
+    """
+    def _setup_data(self):
+        super()._setup_data()
+        self._build_data_loaders(self._train_loader.dataset)
+
+
+def test_pytorch_trainer_memory_budget(pytorch_config_file: str, mock_logger: logging.Logger, linear_memory):
+    """
+    Tests that the PyTorch memory budget picks the largest fitting batch size,
+    rebuilds the loaders, and leaves the weights and random state untouched.
+    """
+    trainer = ConfiguredBatchPyTorchTrainer(
+        config_path=pytorch_config_file,
+        training_env=MockTrainingEnvironment(logger=mock_logger)
+    )
+    trainer.config["data"]["batch_size"] = 8
+    trainer.config["training"]["memory_budget"] = {"enabled": True, "max_rss_mb": 40, "max_batch_size": 64}
+    trainer._setup_data()
+    trainer._setup_model()
+    weight = trainer._model.weight.detach().clone()
+    rng_state = torch.get_rng_state()
+
+    trainer._apply_memory_budget()
+
+    assert trainer.config["data"]["batch_size"] == 40
+    assert trainer._train_loader.batch_size == 40
+    assert torch.equal(trainer._model.weight, weight) and trainer._model.weight.grad is None
+    assert torch.equal(torch.get_rng_state(), rng_state)
+
+    trainer.config["training"]["memory_budget"]["mode"] = "largest"
+    with pytest.raises(ValueError, match="memory_budget.mode"):
+        trainer._apply_memory_budget()
+
+
+class BatchNormPyTorchTrainer(ConfiguredBatchPyTorchTrainer):
+    """
+    A PyTorch trainer whose model normalises its inputs with BatchNorm.
+    """
+    def _setup_model(self):
+        super()._setup_model()
+        self._model = torch.nn.Sequential(torch.nn.BatchNorm1d(4), torch.nn.Linear(4, 1))
+
+
+def test_pytorch_trainer_memory_budget_keeps_buffers(pytorch_config_file: str, mock_logger: logging.Logger,
+                                                     linear_memory):
+    """
+    Tests that memory budget probes leave BatchNorm running statistics untouched.
+    """
+    trainer = BatchNormPyTorchTrainer(
+        config_path=pytorch_config_file,
+        training_env=MockTrainingEnvironment(logger=mock_logger)
+    )
+    trainer.config["data"]["batch_size"] = 8
+    trainer.config["training"]["memory_budget"] = {"enabled": True, "max_rss_mb": 40, "max_batch_size": 64,
+                                                   "min_batch_size": 2}
+    trainer._setup_data()
+    trainer._setup_model()
+    buffers = {name: buffer.clone() for name, buffer in trainer._model.named_buffers()}
+
+    trainer._apply_memory_budget()
+
+    assert trainer.config["data"]["batch_size"] == 40
+    for name, buffer in trainer._model.named_buffers():
+        assert torch.equal(buffer, buffers[name]), name
+
+
+def test_pytorch_trainer_activation_checkpointing(pytorch_config_file: str, mock_logger: logging.Logger):
+    """
+    Tests that configured module types are checkpointed without changing training.
+    """
+    reference = _make_pytorch_trainer(pytorch_config_file, mock_logger, epochs=1)
+    reference._train()
+
+    trainer = _make_pytorch_trainer(
+        pytorch_config_file, mock_logger, epochs=1,
+        activation_checkpointing={"enabled": True, "module_types": ["Linear"]}
+    )
+    trainer._model = torch.nn.Sequential(trainer._model)
+    trainer._optimizer = torch.optim.SGD(trainer._model.parameters(), lr=0.05)
+    trainer._train()
+
+    assert trainer._model[0].forward.func.__name__ == "_checkpointed_forward"
+    torch.testing.assert_close(trainer._model[0].weight, reference._model.weight)
+
+
+def test_pytorch_trainer_compile(
+    pytorch_config_file: str,
+    mock_logger: logging.Logger,
+    tmp_path,
+    monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Tests that `torch.compile` wraps the model, tracks compile time and keeps saved keys unprefixed.
+    """
+    # Restore the process-wide cache directory after the test
+    monkeypatch.setenv("TORCHINDUCTOR_CACHE_DIR", str(tmp_path / "default_cache"))
+    trainer = _make_pytorch_trainer(
+        pytorch_config_file,
+        mock_logger,
+        epochs=1,
+        compile={"enabled": True, "backend": "eager", "dynamic": False, "cache_dir": str(tmp_path / "cache")}
+    )
+    trainer._train()
+
+    assert trainer._is_compiled()
+    assert trainer._compiled_graph_count >= 1
+    assert trainer._compile_time > 0
+    assert os.environ["TORCHINDUCTOR_CACHE_DIR"] == str(tmp_path / "cache")
+
+    trainer._save_model()
+    state_dict = torch.load(tmp_path / "model" / "model.pt")
+    assert set(state_dict) == {"weight", "bias"}
+
+
+def test_pytorch_trainer_compile_logs_recompilation(
+    pytorch_config_file: str,
+    mock_logger: logging.Logger,
+    caplog: pytest.LogCaptureFixture
+):
+    """
+    Tests that a recompilation caused by a new input shape is logged.
+    """
+    trainer = _make_pytorch_trainer(
+        pytorch_config_file,
+        mock_logger,
+        epochs=1,
+        compile={"enabled": True, "backend": "eager", "dynamic": False}
+    )
+    # 64 samples with a batch size of 10 leaves a final batch of 4, triggering a recompilation
+    trainer._train_loader = torch.utils.data.DataLoader(trainer._train_loader.dataset, batch_size=10)
+    trainer._valid_loader = None
+
+    with caplog.at_level(logging.WARNING, logger=mock_logger.name):
+        trainer._train()
+
+    assert "recompiled the model for input shapes (4, 4)" in caplog.text
+
+
+def test_pytorch_trainer_compile_ignores_inference_graphs(
+    pytorch_config_file: str,
+    mock_logger: logging.Logger,
+    caplog: pytest.LogCaptureFixture
+):
+    """
+    Tests that the graphs compiled for validation and evaluation under inference mode are not logged as recompilations.
+    """
+    # Start from an empty code cache, so the graphs compiled by earlier tests are not reused
+    torch._dynamo.reset()
+    trainer = _make_pytorch_trainer(
+        pytorch_config_file,
+        mock_logger,
+        epochs=2,
+        compile={"enabled": True, "backend": "eager", "dynamic": False}
+    )
+
+    with caplog.at_level(logging.WARNING, logger=mock_logger.name):
+        trainer._train()
+        trainer._evaluate()
+
+    assert trainer._compiled_graph_count == 1
+    assert "recompiled" not in caplog.text
+
+
+def test_pytorch_trainer_pad_to_multiple():
+    """
+    Tests that batch tensors are right-padded to a multiple along the requested dimensions.
+    """
+    inputs = torch.ones(3, 5, dtype=torch.long)
+    targets = torch.ones(3, 5, dtype=torch.long)
+
+    padded_inputs, padded_targets = BasePyTorchSupervisedTrainer._pad_to_multiple(
+        (inputs, targets), multiple=4, dims=[1], value=0
+    )
+
+    assert padded_inputs.shape == (3, 8)
+    assert padded_targets.shape == (3, 8)
+    assert torch.equal(padded_inputs[:, 5:], torch.zeros(3, 3, dtype=torch.long))
+    assert torch.equal(padded_inputs[:, :5], inputs)
+
+
+def test_pytorch_trainer_build_data_loaders(pytorch_config_file: str, mock_logger: logging.Logger):
+    """
+    Tests that the data loaders are built from the data config and only the training loader is shuffled.
+    """
+    trainer = _make_pytorch_trainer(pytorch_config_file, mock_logger)
+    trainer.config["data"].update({"batch_size": 4, "num_workers": 0})
+    dataset = trainer._train_loader.dataset
+
+    trainer._build_data_loaders(dataset, valid_dataset=dataset)
+
+    assert trainer._train_loader.batch_size == 4
+    assert isinstance(trainer._train_loader.sampler, torch.utils.data.RandomSampler)
+    assert isinstance(trainer._valid_loader.sampler, torch.utils.data.SequentialSampler)
+
+
+def test_pytorch_trainer_build_bucketed_data_loaders(pytorch_config_file: str, mock_logger: logging.Logger):
+    """
+    Tests that a split with a length index is batched with a length-bucketing sampler.
+    """
+    trainer = _make_pytorch_trainer(pytorch_config_file, mock_logger)
+    trainer.config["data"].update({"batch_size": 8, "num_workers": 0, "bucketing": {"enabled": True}})
+    dataset = trainer._train_loader.dataset
+    lengths = list(range(1, len(dataset) + 1))
+
+    trainer._build_data_loaders(dataset, valid_dataset=dataset, train_lengths=lengths)
+
+    assert isinstance(trainer._train_loader.batch_sampler, LengthBucketBatchSampler)
+    assert not isinstance(trainer._valid_loader.batch_sampler, LengthBucketBatchSampler)
+    assert sum(len(batch[0]) for batch in trainer._train_loader) == len(dataset)
+
+
+def test_pytorch_trainer_async_checkpointing(pytorch_config_file: str, mock_logger: logging.Logger, tmp_path):
+    """
+    Tests that per-epoch checkpoints and the final model are written in the background.
+    """
+    trainer = _make_pytorch_trainer(
+        pytorch_config_file,
+        mock_logger,
+        epochs=3,
+        async_checkpointing=True,
+        checkpoints_to_keep=2,
+        checkpoint_dir=str(tmp_path / "checkpoints")
+    )
+    trainer._train()
+    trainer._save_model()
+    trainer._checkpoint_manager.close()
+
+    # Checkpoints are named after the global step, with 8 batches per epoch
+    checkpoints = sorted(path.name for path in (tmp_path / "checkpoints").glob("*.pt"))
+    assert checkpoints[-2:] == ["ckpt-00000016.pt", "ckpt-00000024.pt"]
+
+    checkpoint = torch.load(tmp_path / "checkpoints" / "ckpt-00000024.pt", weights_only=False)
+    assert checkpoint["epoch"] == 3
+    assert checkpoint["global_step"] == 24
+    assert {"model", "optimizer", "lr_scheduler", "rng", "loader_generator"} <= set(checkpoint)
+    assert torch.equal(torch.load(tmp_path / "model" / "model.pt")["weight"], trainer._model.weight)
+
+
+class DropoutPyTorchTrainer(ConcretePyTorchTrainer):
+    """
+    A PyTorch trainer with shuffled, seeded loaders, dropout and an LR scheduler, so resuming
+    depends on restoring the data order, RNG and scheduler state.
+    """
+    def _setup_data(self):
+        super()._setup_data()
+        self.config["data"].update({"batch_size": 8, "num_workers": 0})
+        self._build_data_loaders(self._train_loader.dataset, valid_dataset=self._valid_loader.dataset)
+
+    def _setup_model(self):
+        torch.manual_seed(0)
+        self._model = torch.nn.Sequential(torch.nn.Linear(4, 1), torch.nn.Dropout(0.2))
+        self._optimizer = torch.optim.SGD(self._model.parameters(), lr=0.05)
+        self._lr_scheduler = torch.optim.lr_scheduler.StepLR(self._optimizer, step_size=1, gamma=0.5)
+        self._loss_fn = torch.nn.MSELoss()
+
+
+class SimulatedPreemption(Exception):
+    pass
+
+
+def _make_resumable_trainer(config_path: str, mock_logger: logging.Logger, checkpoint_dir: str, **overrides):
+    trainer = DropoutPyTorchTrainer(config_path=config_path, training_env=MockTrainingEnvironment(logger=mock_logger))
+    trainer.config["training"].update({"epochs": 3, "resume": True, "checkpoint_dir": checkpoint_dir, **overrides})
+    trainer._setup_data()
+    trainer._setup_model()
+
+    return trainer
+
+
+def _preempt_after(trainer: BasePyTorchSupervisedTrainer, num_batches: int):
+    loss_fn = trainer._loss_fn
+    calls = {"count": 0}
+
+    def preemptible_loss_fn(outputs, targets):
+        # Only training batches count towards the preemption point
+        calls["count"] += int(trainer._model.training)
+        if calls["count"] > num_batches:
+            raise SimulatedPreemption
+        return loss_fn(outputs, targets)
+
+    trainer._loss_fn = preemptible_loss_fn
+
+
+@pytest.mark.parametrize("checkpoint_every_n_steps", [None, 3])
+def test_pytorch_trainer_resume_matches_uninterrupted_run(
+    pytorch_config_file: str,
+    mock_logger: logging.Logger,
+    tmp_path,
+    checkpoint_every_n_steps
+):
+    """
+    Tests that a run interrupted mid-epoch and resumed ends with the same weights as an uninterrupted run.
+    """
+    reference = _make_resumable_trainer(pytorch_config_file, mock_logger, str(tmp_path / "reference"))
+    reference._train()
+    reference._checkpoint_manager.close()
+
+    interrupted = _make_resumable_trainer(
+        pytorch_config_file, mock_logger, str(tmp_path / "resumed"), checkpoint_every_n_steps=checkpoint_every_n_steps
+    )
+    # Preempt during the second epoch (8 batches per epoch), after the mid-epoch checkpoint at batch 12
+    _preempt_after(interrupted, 13)
+    with pytest.raises(SimulatedPreemption):
+        interrupted._train()
+    interrupted._checkpoint_manager.close()
+
+    resumed = _make_resumable_trainer(
+        pytorch_config_file, mock_logger, str(tmp_path / "resumed"), checkpoint_every_n_steps=checkpoint_every_n_steps
+    )
+    resumed._train()
+    resumed._checkpoint_manager.close()
+
+    assert resumed._start_epoch == 1
+    assert resumed._global_step == reference._global_step == 24
+    assert resumed._lr_scheduler.get_last_lr() == reference._lr_scheduler.get_last_lr()
+    for param_resumed, param_reference in zip(resumed._model.parameters(), reference._model.parameters()):
+        assert torch.equal(param_resumed, param_reference)
+
+
+def test_pytorch_trainer_resume_without_checkpoint(pytorch_config_file: str, mock_logger: logging.Logger, tmp_path):
+    """
+    Tests that resuming without any checkpoint trains from scratch.
+    """
+    trainer = _make_resumable_trainer(pytorch_config_file, mock_logger, str(tmp_path / "empty"), epochs=1)
+    trainer._train()
+    trainer._checkpoint_manager.close()
+
+    assert trainer._start_epoch == 0
+    assert trainer._global_step == 8
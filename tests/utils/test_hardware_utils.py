@@ -0,0 +1,135 @@
+import os
+import json
+
+import pytest
+
+from ml_training_base.utils import hardware_utils
+from ml_training_base.utils.hardware_utils import (
+    available_cpu_count,
+    cgroup_cpu_limit,
+    cgroup_memory_limit,
+    probe_hardware,
+    recommend_settings
+)
+
+# --- Fixtures ---
+
+@pytest.fixture
+def cgroup_v2_root(tmp_path):
+    """
+    Provides a fake cgroup v2 filesystem with a 1.5 CPU quota.
+    """
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    return str(tmp_path)
+
+
+@pytest.fixture
+def cgroup_v1_root(tmp_path):
+    """
+    Provides a fake cgroup v1 filesystem with a 2 CPU quota.
+    """
+    cpu_dir = tmp_path / "cpu"
+    cpu_dir.mkdir()
+    (cpu_dir / "cpu.cfs_quota_us").write_text("200000\n")
+    (cpu_dir / "cpu.cfs_period_us").write_text("100000\n")
+    return str(tmp_path)
+
+# --- Test Functions ---
+
+def test_cgroup_cpu_limit_v2(cgroup_v2_root):
+    """
+    Tests that a cgroup v2 `cpu.max` quota is converted to CPUs.
+    """
+    assert cgroup_cpu_limit(cgroup_v2_root) == pytest.approx(1.5)
+
+
+def test_cgroup_cpu_limit_v1(cgroup_v1_root):
+    """
+    Tests that a cgroup v1 CFS quota is converted to CPUs.
+    """
+    assert cgroup_cpu_limit(cgroup_v1_root) == pytest.approx(2.0)
+
+
+def test_cgroup_cpu_limit_unlimited(tmp_path):
+    """
+    Tests that an unlimited or missing quota yields None.
+    """
+    assert cgroup_cpu_limit(str(tmp_path)) is None
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_limit(str(tmp_path)) is None
+
+
+def test_available_cpu_count_respects_quota(cgroup_v2_root):
+    """
+    Tests that the usable CPU count is capped by the (rounded up) cgroup quota.
+    """
+    cpu_count = available_cpu_count(cgroup_v2_root)
+
+    assert 1 <= cpu_count <= 2
+    assert cpu_count <= len(os.sched_getaffinity(0))
+
+
+def test_cgroup_memory_limit(tmp_path):
+    """
+    Tests that cgroup v2 memory limits are read and unlimited values yield None.
+    """
+    assert cgroup_memory_limit(str(tmp_path)) is None
+
+    (tmp_path / "memory.max").write_text("max\n")
+    assert cgroup_memory_limit(str(tmp_path)) is None
+
+    (tmp_path / "memory.max").write_text("1073741824\n")
+    assert cgroup_memory_limit(str(tmp_path)) == 1073741824
+
+
+def test_probe_hardware_is_cached(tmp_path, monkeypatch):
+    """
+    Tests that the probe report is cached on disk and reused until refreshed.
+    """
+    cache_path = str(tmp_path / "cache" / "probe.json")
+    report = probe_hardware(cache_path=cache_path)
+
+    assert report["cpu"]["available_cpus"] == available_cpu_count()
+    assert report["frameworks"]["torch"]["version"]
+    with open(cache_path) as file:
+        assert json.load(file)["fingerprint"] == report["fingerprint"]
+
+    probe_calls = []
+    original_probe_cpu = hardware_utils._probe_cpu
+    monkeypatch.setattr(hardware_utils, "_probe_cpu", lambda: probe_calls.append(1) or original_probe_cpu())
+
+    assert probe_hardware(cache_path=cache_path) == report
+    assert not probe_calls
+
+    probe_hardware(cache_path=cache_path, refresh=True)
+    assert len(probe_calls) == 1
+
+
+def test_recommend_settings():
+    """
+    Tests that recommendations follow the physical cores, bf16 support and backend availability.
+    """
+    report = {
+        "cpu": {
+            "flags": ["avx2", "avx512f", "amx_bf16"],
+            "logical_cores": 16,
+            "physical_cores": 8,
+            "available_cpus": 12,
+            "cgroup_cpu_limit": 12.0
+        },
+        "frameworks": {
+            "torch": {"cuda_available": False, "cuda_bf16_supported": False, "mkldnn_available": True},
+            "tensorflow": {"onednn_opts": "0"}
+        }
+    }
+
+    recommendations = recommend_settings(report)
+
+    assert recommendations["performance"] == {
+        "intra_op_threads": 8,
+        "inter_op_threads": 2,
+        "matmul_precision": "medium"
+    }
+    assert recommendations["training"] == {"mixed_precision": "bf16"}
+    assert len(recommendations["notes"]) == 2
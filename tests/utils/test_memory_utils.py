@@ -0,0 +1,59 @@
+import csv
+import time
+import logging
+import tracemalloc
+
+import numpy as np
+
+from ml_training_base.utils.memory_utils import MemoryMonitor, PeakRSSMonitor, current_rss_bytes
+
+# --- Test Classes and Functions ---
+
+def test_peak_rss_monitor_tracks_transient_allocations():
+    """
+    Tests that the monitor captures a transient allocation that is freed before the block ends.
+    """
+    with PeakRSSMonitor(interval=0.001) as monitor:
+        start = current_rss_bytes()
+        array = np.ones(64 * 2 ** 20, dtype=np.uint8)
+        time.sleep(0.05)
+        del array
+
+    assert current_rss_bytes() > 0
+    assert monitor.peak_bytes >= start + 48 * 2 ** 20
+
+
+def test_memory_monitor_detects_growth(tmp_path, caplog):
+    """
+    Tests that growth above the threshold is warned about with its allocation site, and the timeline is written.
+    """
+    timeline_path = tmp_path / "memory_timeline.csv"
+    leak = []
+    with caplog.at_level(logging.DEBUG, logger="test_logger"):
+        with MemoryMonitor(interval=0.01, timeline_path=str(timeline_path), growth_threshold_mb=16, top_n=3,
+                           allocator_stats=lambda: {'fake_allocated': 2 ** 20},
+                           logger=logging.getLogger("test_logger")) as monitor:
+            for epoch in range(3):
+                leak.append(np.empty(32 * 2 ** 20, dtype=np.uint8))
+                leak[-1].fill(1)
+                time.sleep(0.03)
+                monitor.epoch_end(epoch)
+
+    assert len(monitor.epoch_stats) == 3
+    assert all(stats.rss_growth_bytes >= 24 * 2 ** 20 for stats in monitor.epoch_stats)
+    # Python allocations are traced from the end of the warm-up epoch
+    assert monitor.epoch_stats[0].python_growth_bytes == 0
+    assert all(stats.python_growth_bytes >= 32 * 2 ** 20 for stats in monitor.epoch_stats[1:])
+    assert "test_memory_utils.py" in monitor.epoch_stats[-1].top_allocations[0]
+
+    # The first (warm-up) epoch is not checked against the threshold
+    warnings = [record.message for record in caplog.records if record.levelno == logging.WARNING]
+    assert sum("above the threshold" in message for message in warnings) == 2
+
+    with open(timeline_path, newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert [row["epoch"] for row in rows if row["event"] == "epoch_end"] == ["0", "1", "2"]
+    assert rows[0]["event"] == "start" and rows[-1]["event"] == "stop"
+    assert any(row["event"] == "sample" for row in rows)
+    assert all(float(row["fake_allocated_mb"]) == 1.0 for row in rows)
+    assert not tracemalloc.is_tracing()
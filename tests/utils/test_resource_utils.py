@@ -0,0 +1,142 @@
+import os
+import csv
+import time
+import logging
+import multiprocessing
+
+import pytest
+
+from ml_training_base.utils.resource_utils import (
+    ResourceSampler,
+    _core_utilisation,
+    _descendant_cpu_seconds,
+    _descendant_pids,
+    _read_core_times
+)
+
+# --- Test Functions ---
+
+def _busy_wait(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_resource_sampler_timeline_and_summary(tmp_path, caplog):
+    """
+    Tests that samples are written to the timeline and the summary reports CPU time, disk writes and under-use.
+    """
+    timeline_path = tmp_path / "resource_timeline.csv"
+    with caplog.at_level(logging.INFO, logger="test_logger"):
+        with ResourceSampler(interval=0.02, timeline_path=str(timeline_path), underuse_threshold=float("inf"),
+                             logger=logging.getLogger("test_logger")) as sampler:
+            _busy_wait(0.3)
+            with open(tmp_path / "data.bin", "wb") as file:
+                file.write(os.urandom(2 ** 20))
+                file.flush()
+                os.fsync(file.fileno())
+
+    summary = sampler.summary
+    assert summary.samples >= 2
+    assert summary.duration_seconds >= 0.3
+    assert summary.process_cpu_seconds >= 0.2
+    assert summary.mean_cores_used == pytest.approx(summary.process_cpu_seconds / summary.duration_seconds)
+    assert summary.peak_rss_bytes > 0
+    assert all(0.0 <= fraction <= 1.0 for fraction in summary.core_utilisation.values())
+    if os.path.exists("/proc/self/io"):
+        assert summary.write_bytes >= 2 ** 20
+
+    with open(timeline_path, newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == summary.samples
+    assert max(float(row["process_cpu_pct"]) for row in rows) > 50.0
+    assert [float(row["elapsed_seconds"]) for row in rows] == sorted(float(row["elapsed_seconds"]) for row in rows)
+
+    messages = [record.message for record in caplog.records]
+    assert any(message.startswith("Resource usage over") for message in messages)
+    assert any(message.startswith("Cores are under-used") for message in messages)
+
+
+def _burn_cpu(seconds: float) -> float:
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+    return seconds
+
+
+def test_resource_sampler_counts_worker_processes():
+    """
+    Tests that the CPU time of live worker processes counts towards the utilisation, so busy workers do not look like
+    under-used cores.
+    """
+    with multiprocessing.get_context("fork").Pool(2) as pool:
+        with ResourceSampler(interval=0.05, logger=logging.getLogger("test_logger")) as sampler:
+            # The main process sleeps while the (still live) workers burn CPU
+            pool.map(_burn_cpu, [0.3, 0.3])
+            assert _descendant_cpu_seconds(os.getpid()) >= 0.6
+
+    summary = sampler.summary
+    assert summary.process_cpu_seconds >= 0.5
+    assert summary.mean_cores_used > 0.5
+
+
+def test_resource_sampler_logs_samples_without_timeline(caplog):
+    """
+    Tests that samples are logged at DEBUG level when no timeline file is given, and that stopping is idempotent.
+    """
+    sampler = ResourceSampler(interval=0.01, underuse_threshold=0.0, logger=logging.getLogger("test_logger"))
+    with caplog.at_level(logging.DEBUG, logger="test_logger"):
+        sampler.start()
+        time.sleep(0.1)
+        summary = sampler.stop()
+
+    assert sampler.stop() is None
+    assert summary is sampler.summary
+    samples = [record for record in caplog.records if record.message.startswith("Resources:")]
+    assert len(samples) == summary.samples
+    assert all(record.levelno == logging.DEBUG for record in samples)
+    assert not any(record.levelno == logging.WARNING for record in caplog.records)
+
+
+def test_read_core_times(tmp_path):
+    """
+    Tests that per-core busy time excludes idle and I/O wait time, and that the aggregate line is skipped.
+    """
+    stat_path = tmp_path / "stat"
+    stat_path.write_text(
+        "cpu  30 0 10 100 10 0 0 0 0 0\n"
+        "cpu0 20 0 5 50 5 0 0 0 0 0\n"
+        "cpu1 10 0 5 50 5 0 0 0 0 0\n"
+        "intr 12345\n"
+    )
+
+    start = _read_core_times(str(stat_path))
+    assert start == {0: (25, 80), 1: (15, 70)}
+    assert _read_core_times(str(tmp_path / "missing")) == {}
+
+    end = {0: (65, 120), 1: (15, 110)}
+    assert _core_utilisation(start, end, [0, 1, 2]) == {0: 1.0, 1: 0.0}
+
+
+def _write_process(proc_root, pid: int, ppid: int, ticks: int, children=None):
+    process_dir = proc_root / str(pid)
+    (process_dir / "task" / str(pid)).mkdir(parents=True)
+    # The command name contains a space and a parenthesis; utime, stime, cutime and cstime are fields 14-17
+    (process_dir / "stat").write_text(f"{pid} (py worker) S {ppid} " + "0 " * 9 + f"{ticks} 0 0 0 20 0\n")
+    if children is not None:
+        (process_dir / "task" / str(pid) / "children").write_text("".join(f"{child} " for child in children))
+
+
+@pytest.mark.parametrize("children_files", [True, False])
+def test_descendant_pids(tmp_path, children_files: bool):
+    """
+    Tests that descendants are found through the `children` files, or by a scan of every process without them.
+    """
+    tree = {10: (1, [11, 12]), 11: (10, [13]), 12: (10, []), 13: (11, []), 20: (1, [])}
+    for pid, (ppid, children) in tree.items():
+        _write_process(tmp_path, pid, ppid, ticks=pid, children=children if children_files else None)
+
+    assert sorted(_descendant_pids(10, str(tmp_path))) == [11, 12, 13]
+    assert _descendant_pids(10, str(tmp_path), scan=False) == (None if not children_files else [11, 12, 13])
+    assert _descendant_pids(99, str(tmp_path)) == []
+    assert _descendant_cpu_seconds(10, str(tmp_path)) == pytest.approx((11 + 12 + 13) / os.sysconf("SC_CLK_TCK"))
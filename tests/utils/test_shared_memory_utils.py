@@ -0,0 +1,106 @@
+import pickle
+import multiprocessing
+
+import numpy as np
+import pytest
+import torch
+from torch.utils.data import DataLoader
+
+from ml_training_base.supervised.data.pytorch_data_loaders import SharedArrayDataset
+from ml_training_base.utils.shared_memory_utils import (
+    MEMMAP,
+    SHARED_MEMORY,
+    SharedArrayStore,
+    attach_arrays
+)
+
+
+def _sum_in_child(descriptor, queue):
+    queue.put(float(descriptor.attach().sum()))
+
+
+@pytest.mark.parametrize("backend", [SHARED_MEMORY, MEMMAP])
+def test_put_and_attach(backend):
+    """
+    Tests that attached arrays match the published ones, are read-only, and share memory.
+    """
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    with SharedArrayStore(backend=backend) as store:
+        descriptor = store.put("x", array)
+        assert len(pickle.dumps(descriptor)) < 512
+        assert descriptor.nbytes == array.nbytes
+
+        attached = attach_arrays(store.descriptors)["x"]
+        np.testing.assert_array_equal(attached, array)
+        assert not attached.flags.writeable
+
+        writable = descriptor.attach(writable=True)
+        writable[0, 0] = 100.0
+        assert attached[0, 0] == 100.0
+
+
+@pytest.mark.parametrize("backend", [SHARED_MEMORY, MEMMAP])
+def test_attach_from_spawned_process(backend):
+    """
+    Tests that another process attaches via the descriptor alone, without unlinking the data on exit.
+    """
+    context = multiprocessing.get_context('spawn')
+    array = np.arange(1_000, dtype=np.int64)
+    with SharedArrayStore(backend=backend) as store:
+        descriptor = store.put("x", array)
+        queue = context.Queue()
+        process = context.Process(target=_sum_in_child, args=(descriptor, queue))
+        process.start()
+        assert queue.get(timeout=60) == float(array.sum())
+        process.join()
+
+        np.testing.assert_array_equal(descriptor.attach(), array)
+
+
+def test_put_rejects_invalid_arrays():
+    """
+    Tests that duplicate names and object arrays are rejected.
+    """
+    with SharedArrayStore() as store:
+        store.put("x", np.zeros(3))
+        with pytest.raises(ValueError, match="already published"):
+            store.put("x", np.zeros(3))
+        with pytest.raises(ValueError, match="object dtype"):
+            store.put("y", np.array([1, "a"], dtype=object))
+
+
+def test_close_removes_data(tmp_path):
+    """
+    Tests that closing the store removes its memory-mapped files.
+    """
+    store = SharedArrayStore(backend=MEMMAP, directory=str(tmp_path))
+    descriptor = store.put("x", np.ones(4))
+    assert (tmp_path / "x.npy").exists()
+
+    store.close()
+    assert not (tmp_path / "x.npy").exists()
+    assert store.descriptors == {}
+    with pytest.raises(FileNotFoundError):
+        descriptor.attach()
+
+
+def test_shared_array_dataset_with_workers():
+    """
+    Tests that DataLoader workers read every row of a SharedArrayDataset.
+    """
+    x = np.arange(40, dtype=np.float32).reshape(20, 2)
+    y = np.arange(20, dtype=np.int64)
+    with SharedArrayStore() as store:
+        dataset = SharedArrayDataset([store.put("x", x), store.put("y", y)])
+        assert len(dataset) == 20
+        assert "_arrays" not in pickle.loads(pickle.dumps(dataset)).__dict__ or \
+            pickle.loads(pickle.dumps(dataset))._arrays is None
+
+        loader = DataLoader(dataset, batch_size=8, num_workers=2, multiprocessing_context='spawn')
+        batches = list(loader)
+
+    assert torch.equal(torch.cat([batch[0] for batch in batches]), torch.from_numpy(x))
+    assert torch.equal(torch.cat([batch[1] for batch in batches]), torch.from_numpy(y))
+
+    with pytest.raises(ValueError):
+        SharedArrayDataset([])